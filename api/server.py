@@ -3,11 +3,13 @@
 import os
 import sys
 import time
+import threading
 from flask import send_from_directory
-from flask import Flask, jsonify, request, send_from_directory, send_file
+from flask import Flask, Response, jsonify, request, send_from_directory, send_file
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import json
+from functools import wraps
 
 # Obtener ruta absoluta del proyecto
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -24,11 +26,13 @@ from utils.statistics import BlockchainStatistics
 from contracts.smart_contract import ContractManager, ContractType
 from network.node import Node
 from mining.pool import MiningPool
+from mining.jobs import MiningJobManager
 from blockchain.hd_wallet import HDWallet
 from utils.qr_generator import QRGenerator
-from utils.event_system import event_system, EventType
+from utils.event_system import event_system, EventType, Event, EventSubscription
 from utils.backup_system import BackupSystem
 from utils.metrics import metrics
+from utils.response_cache import response_cache
 import config
 
 app = Flask(__name__,
@@ -53,8 +57,10 @@ def after_request(response):
             duration = time.time() - g.start_time
             success = response.status_code < 400
             
-            # Registrar en métricas
-            metrics.record_request(request.path, duration, success)
+            # Registrar en métricas por regla de URL (no por ruta concreta),
+            # para no crear una entrada por cada bloque o dirección consultada
+            route = request.url_rule.rule if request.url_rule else None
+            metrics.record_request(route, duration, success)
     except:
         pass  # No romper si falla el logging
 
@@ -66,7 +72,8 @@ limiter = Limiter(
     app=app,
     key_func=get_remote_address,  # Limitar por IP
     default_limits=["200 per day", "50 per hour"],  # Límites globales
-    storage_uri="memory://"  # Guardar en memoria (simple)
+    storage_uri="memory://",  # Guardar en memoria (simple)
+    enabled=config.API_RATE_LIMITS_ENABLED
 )
 
 # Sistema de backups
@@ -94,69 +101,271 @@ blockchain = None
 contract_manager = None
 p2p_node = None
 mining_pool = None
+mining_jobs = None
 storage = BlockchainStorage()
 current_wallet = None
 
-# ==================== UTILIDADES ====================
+# ==================== CONCURRENCIA ====================
 
-def init_blockchain():
-    """Inicializa o carga blockchain"""
-    global blockchain, contract_manager, p2p_node, mining_pool
+# Métodos que solo leen la cadena
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+def without_chain_lock(view):
+    """
+    Marca un endpoint que no toma el lock de la cadena durante la petición
     
-    if blockchain is None:
-        try:
-            blockchain = storage.load_blockchain("colcript_main.json")
-            if blockchain:
-                blockchain.storage = storage
-                blockchain.save_filename = "colcript_main.json"
-                blockchain.auto_save = True
-            else:
-                blockchain = Blockchain(auto_save=True)
-        except:
-            blockchain = Blockchain(auto_save=True)
-    
-    # Inicializar contract manager
-    if contract_manager is None and blockchain is not None:
-        contract_manager = ContractManager(blockchain)
-
-    # Inicializar nodo P2P
-    if p2p_node is None and blockchain is not None:
-        try:
-            import socket
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
-            p2p_node = Node(host=local_ip, port=6000, blockchain=blockchain)
-            p2p_node.start()
-        except Exception as e:
-            print(f"⚠️  No se pudo iniciar nodo P2P: {e}")
-            # Crear nodo con localhost si falla
-            p2p_node = Node(host='127.0.0.1', port=6000, blockchain=blockchain)
-            p2p_node.start()
+    POR QUÉ: Endpoints que esperan a otro hilo que escribe en la cadena
+    (minería) o que hacen I/O de red largo; los métodos de Blockchain que
+    la modifican toman el lock por su cuenta (ver write_locked)
+    """
+    view.without_chain_lock = True
+    return view
 
-    # Inicializar nodo P2P
-    if p2p_node is None and blockchain is not None:
-        try:
-            import socket
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
-            p2p_node = Node(host=local_ip, port=6000, blockchain=blockchain)
-            p2p_node.start()
-        except Exception as e:
-            print(f"⚠️  No se pudo iniciar nodo P2P: {e}")
-            p2p_node = Node(host='127.0.0.1', port=6000, blockchain=blockchain)
+@app.before_request
+def acquire_chain_lock():
+    """
+    Lee (GET) o escribe (resto) la cadena con su lock durante la petición
+    
+    POR QUÉ: Con un servidor con hilos, las consultas se atienden en
+    paralelo y ven la cadena estable; bloques y transacciones entran de
+    uno en uno
+    """
+    from flask import g
+    
+    view = app.view_functions.get(request.endpoint)
+    if blockchain is None or view is None or getattr(view, 'without_chain_lock', False):
+        return
+    
+    lock = blockchain.lock
+    write = request.method not in READ_METHODS
+    if write:
+        lock.acquire_write()
+    else:
+        lock.acquire_read()
+    g.chain_lock = (lock, write)
+
+@app.teardown_request
+def release_chain_lock(exc):
+    """Suelta el lock tomado en acquire_chain_lock"""
+    from flask import g
+    
+    held = g.pop('chain_lock', None)
+    if held:
+        lock, write = held
+        if write:
+            lock.release_write()
+        else:
+            lock.release_read()
+
+# ==================== ARRANQUE ====================
+
+# Estados del arranque (ver startup)
+STARTUP_STOPPED = 'stopped'
+STARTUP_WARMING = 'warming'
+STARTUP_READY = 'ready'
+STARTUP_FAILED = 'failed'
+
+startup_state = {
+    'status': STARTUP_STOPPED,
+    'started_at': None,
+    'ready_at': None,
+    'error': None
+}
+startup_lock = threading.Lock()  # Protege startup_state
+load_lock = threading.Lock()  # Serializa la carga de los servicios
+
+# Endpoints que responden mientras la cadena se carga
+WARMING_ALLOWED_ENDPOINTS = {'health_check', 'prometheus_metrics', 'static', 'index', 'api_index', 'docs'}
+
+def _load_services():
+    """
+    Carga la cadena y crea los servicios que falten
+    
+    Deja índices, intervalos de actividad y agregados al día para que
+    ninguna petición pague el primer cálculo
+    """
+    global blockchain, contract_manager, p2p_node, mining_pool, mining_jobs
+    
+    with load_lock:
+        if blockchain is None:
+            try:
+                loaded = storage.load_blockchain("colcript_main.json")
+                if loaded:
+                    loaded.storage = storage
+                    loaded.save_filename = "colcript_main.json"
+                    loaded.auto_save = True
+                else:
+                    loaded = Blockchain(auto_save=True)
+            except:
+                loaded = Blockchain(auto_save=True)
+            
+            loaded.get_index()
+            loaded.get_rollups()
+            BlockchainStatistics(loaded).get_aggregates()
+            blockchain = loaded
+        
+        # Inicializar contract manager
+        if contract_manager is None:
+            contract_manager = ContractManager(blockchain)
+        
+        # Inicializar nodo P2P
+        if p2p_node is None:
+            try:
+                import socket
+                local_ip = socket.gethostbyname(socket.gethostname())
+                p2p_node = Node(host=local_ip, port=6000, blockchain=blockchain)
+            except Exception as e:
+                print(f"⚠️  No se pudo resolver la IP local: {e}")
+                # Crear nodo con localhost si falla
+                p2p_node = Node(host='127.0.0.1', port=6000, blockchain=blockchain)
             p2p_node.start()
+        
+        # Inicializar pool de minería
+        if mining_pool is None:
+            mining_pool = MiningPool(
+                blockchain=blockchain,
+                pool_name="ColCript Official Pool",
+                pool_fee=1.5
+            )
+        
+        # Inicializar trabajos de minería (el pool de procesos se crea al primer trabajo)
+        if mining_jobs is None:
+            mining_jobs = MiningJobManager()
+
+def _warm_up():
+    """Carga los servicios y marca el servidor como listo (o fallido)"""
+    try:
+        _load_services()
+    except Exception as e:
+        with startup_lock:
+            startup_state.update(status=STARTUP_FAILED, error=str(e))
+        print(f"❌ Error al arrancar el servidor: {e}")
+        return
     
-    # Inicializar pool de minería
-    if mining_pool is None and blockchain is not None:
-        mining_pool = MiningPool(
-            blockchain=blockchain,
-            pool_name="ColCript Official Pool",
-            pool_fee=1.5
-        )
+    with startup_lock:
+        startup_state.update(status=STARTUP_READY, ready_at=time.time())
+    
+    elapsed = startup_state['ready_at'] - startup_state['started_at']
+    print(f"✅ Servidor listo: {len(blockchain.chain)} bloques cargados en {elapsed:.2f}s")
+
+def startup(background=False):
+    """
+    Arranque explícito: carga e indexa la cadena una sola vez
+    
+    Con background=True vuelve enseguida; mientras carga, /api/health
+    informa 'warming' y el resto de la API responde 503.
+    
+    POR QUÉ: La carga completa (con verificación de firmas) la pagaba la
+    primera petición que llegaba
+    """
+    with startup_lock:
+        if startup_state['status'] in (STARTUP_WARMING, STARTUP_READY):
+            return
+        startup_state.update(status=STARTUP_WARMING, started_at=time.time(), ready_at=None, error=None)
+    
+    if background:
+        threading.Thread(target=_warm_up, daemon=True, name="startup").start()
+    else:
+        _warm_up()
 
+def get_startup_info():
+    """Estado del arranque para /api/health"""
+    with startup_lock:
+        info = dict(startup_state)
+    
+    if info['status'] == STARTUP_READY:
+        info['warmup_seconds'] = round(info['ready_at'] - info['started_at'], 3)
+    return info
+
+@app.before_request
+def reject_while_warming():
+    """
+    Responde 503 mientras el arranque en segundo plano no termina o si falló
+    
+    POR QUÉ: Tras un arranque fallido, cada petición reintentaría la
+    carga; solo un nuevo startup() la reintenta
+    """
+    status = startup_state['status']
+    if status not in (STARTUP_WARMING, STARTUP_FAILED) or request.endpoint in WARMING_ALLOWED_ENDPOINTS:
+        return None
+    
+    if status == STARTUP_FAILED:
+        response = jsonify({
+            "success": False,
+            "error": f"Server failed to start: {startup_state['error']}",
+            "status": STARTUP_FAILED
+        })
+        return response, 503
+    
+    response = jsonify({
+        "success": False,
+        "error": "Server is warming up, retry shortly",
+        "status": STARTUP_WARMING
+    })
+    response.headers['Retry-After'] = '2'
+    return response, 503
 
+# ==================== UTILIDADES ====================
+
+def init_blockchain():
+    """
+    Blockchain del servidor
+    
+    Tras startup() solo la devuelve. Sin startup() (tests, scripts),
+    carga lo que falte en la primera llamada; si el arranque falló no
+    carga nada (las peticiones reciben 503, ver reject_while_warming).
+    
+    POR QUÉ: Con los servicios ya creados no hace falta pasar por
+    load_lock, que serializaría todas las peticiones
+    """
+    if startup_state['status'] in (STARTUP_READY, STARTUP_FAILED):
+        return blockchain
+    if None in (blockchain, contract_manager, p2p_node, mining_pool, mining_jobs):
+        _load_services()
     return blockchain
 
+def page_limit_arg(default=None):
+    """
+    Tamaño de página de la query (limit), acotado a API_MAX_PAGE_SIZE
+    
+    POR QUÉ: La respuesta no debe crecer con la cadena
+    """
+    limit = request.args.get('limit', default or config.API_DEFAULT_PAGE_SIZE, type=int)
+    return max(1, min(limit, config.API_MAX_PAGE_SIZE))
+
+def chain_page(limit):
+    """
+    Página de bloques hacia atrás desde before_height (exclusivo)
+    
+    Los bloques de la página van en orden de cadena; sin cursor, es la
+    página de los más recientes.
+    
+    Returns: (bloques, cursor de la siguiente página o None)
+    """
+    before = request.args.get('before_height', type=int)
+    end = len(blockchain.chain) if before is None else max(0, min(before, len(blockchain.chain)))
+    start = max(0, end - limit)
+    
+    next_page = {'before_height': start} if start > 0 else None
+    return blockchain.chain[start:end], next_page
+
+def history_cursor_arg():
+    """
+    Lee la posición (before_height, before_position) de la query
+    
+    POR QUÉ posición: una página puede terminar a mitad de un bloque
+    """
+    height = request.args.get('before_height', type=int)
+    if height is None:
+        return None
+    return (height, request.args.get('before_position', 0, type=int))
+
+def history_cursor_response(before):
+    """Parámetros para pedir la siguiente página (None si no hay más)"""
+    if before is None:
+        return None
+    return {'before_height': before[0], 'before_position': before[1]}
+
 def response_success(data, message="Success"):
     """Respuesta exitosa estándar"""
     return jsonify({
@@ -172,6 +381,37 @@ def response_error(message, code=400):
         "error": message
     }), code
 
+def cached_response(view):
+    """
+    Sirve la respuesta desde response_cache si la cadena no ha cambiado
+    
+    Clave: (ruta, argumentos de la query); la punta de la cadena (hash
+    del último bloque y dificultad) invalida todo al añadirse un bloque.
+    Solo se guardan respuestas 200.
+    
+    POR QUÉ: Solo para endpoints que dependen únicamente de la cadena y
+    de los parámetros (nada de mempool, wallet cargada ni hora actual)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        init_blockchain()
+        tip = (blockchain.chain[-1].hash, blockchain.difficulty)
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        
+        cached = response_cache.get(key, tip)
+        if cached is not None:
+            response = app.response_class(cached, status=200, mimetype='application/json')
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        
+        response = app.make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response_cache.set(key, tip, response.get_data())
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    
+    return wrapper
+
 # ==================== ENDPOINTS DE INFO ====================
 
 @app.route('/')
@@ -230,7 +470,7 @@ def docs():
         "endpoints": {
             "GET /": "Información de la API",
             "GET /api/info": "Información de ColCript",
-            "GET /api/blockchain": "Ver blockchain completa",
+            "GET /api/blockchain": "Ver blockchain por páginas (query: limit, before_height)",
             "GET /api/blockchain/info": "Información de la blockchain",
             "GET /api/blockchain/validate": "Validar blockchain",
             "GET /api/blockchain/list": "Listar blockchains guardadas",
@@ -240,24 +480,29 @@ def docs():
             "POST /api/wallet/load": "Cargar wallet (body: {filename})",
             "GET /api/wallet/balance": "Ver balance de wallet actual",
             "GET /api/wallet/address": "Ver dirección de wallet actual",
-            "GET /api/wallet/history": "Ver historial de transacciones",
+            "GET /api/wallet/history": "Ver historial de transacciones por páginas (query: limit, before_height, before_position)",
             "POST /api/transaction/send": "Enviar CLC (body: {recipient, amount, fee?})",
             "GET /api/transaction/pending": "Ver transacciones pendientes",
-            "POST /api/mining/mine": "Minar bloque",
+            "POST /api/mining/mine": "Minar bloque (espera al resultado)",
+            "POST /api/mining/jobs": "Empezar a minar en segundo plano (devuelve job_id)",
+            "GET /api/mining/jobs": "Trabajos de minería recientes",
+            "GET /api/mining/jobs/:id": "Progreso de un trabajo (nonces, hashrate, ETA)",
+            "DELETE /api/mining/jobs/:id": "Cancelar trabajo de minería",
             "GET /api/mining/stats": "Estadísticas de minería",
             "GET /api/explorer/block/:number": "Ver bloque por número",
-            "GET /api/explorer/blocks": "Ver últimos bloques",
-            "GET /api/explorer/search": "Buscar (query: hash, address)",
+            "GET /api/explorer/blocks": "Ver últimos bloques (query: limit, before_height)",
+            "GET /api/explorer/search": "Buscar (query q: hash o prefijo de bloque, minero, ID de transacción; limit: bloques del minero)",
             "GET /api/statistics/dashboard": "Dashboard completo",
             "GET /api/statistics/supply": "Información de supply",
             "GET /api/statistics/wallets": "Top wallets",
+            "GET /api/statistics/activity": "Actividad por intervalos (query: resolution=minute|hour|day, points)",
             "GET /api/faucet/info": "Información del faucet",
             "POST /api/faucet/claim": "Reclamar del faucet",
             "GET /api/difficulty/info": "Información de dificultad",
             "POST /api/difficulty/set": "Configurar dificultad (body: {difficulty})",
             "POST /api/difficulty/toggle": "Habilitar/deshabilitar auto-ajuste (body: {enabled})",
             "POST /api/difficulty/config": "Configurar parámetros (body: {target_time, interval})",
-            "GET /api/contracts/list": "Listar contratos (query: status)",
+            "GET /api/contracts/list": "Listar contratos (query: status, limit, after_id)",
             "GET /api/contracts/:id": "Ver contrato",
             "POST /api/contracts/timelock/create": "Crear Timelock (body: {creator, unlock_block, amount, recipient})",
             "POST /api/contracts/multisig/create": "Crear Multisig (body: {creator, required_sigs, signers, amount, recipient})",
@@ -266,12 +511,17 @@ def docs():
             "POST /api/contracts/multisig/:id/sign": "Firmar Multisig (body: {signer})",
             "POST /api/contracts/escrow/:id/decide": "Decidir Escrow (body: {arbiter, approve})",
             "GET /api/network/info": "Información del nodo P2P",
-            "GET /api/network/peers": "Listar peers conectados",
+            "GET /api/network/peers": "Listar peers conectados con latencia, fallos y backoff",
             "POST /api/network/peer/add": "Agregar peer (body: {host, port})",
             "POST /api/network/peer/remove": "Eliminar peer (body: {host, port})",
             "POST /api/network/sync": "Sincronizar con red",
             "POST /api/network/transaction": "Recibir transacción de peer",
-            "POST /api/network/block": "Recibir bloque de peer",
+            "POST /api/network/transactions": "Recibir lote de transacciones de peer (body: {transactions})",
+            "POST /api/network/block": "Recibir bloque de peer (valida y conecta a la cadena)",
+            "POST /api/network/compact_block": "Recibir bloque compacto (body: {header, tx_count, short_ids, prefilled})",
+            "POST /api/network/block/transactions": "Completar bloque compacto (body: {block_hash, transactions})",
+            "GET /api/network/blocks": "Bloques completos para sincronizar (query: start, limit)",
+            "GET /api/network/acceptance": "Estadísticas de aceptación de bloques (huérfanos, latencia)",
             "POST /api/network/discover": "Descubrir peers (body: {seed_nodes})",
             "GET /api/pool/info": "Información del pool",
             "GET /api/pool/miners": "Lista de mineros",
@@ -292,13 +542,16 @@ def docs():
             "GET /api/qr/address/:address": "Generar QR de dirección (query: size, border)",
             "POST /api/qr/payment": "Generar QR de pago (body: {address, amount?, memo?, size?, border?})",
             "POST /api/qr/parse": "Parsear URI de pago (body: {uri})",
-            "GET /api/events/history": "Historial de eventos (query: type, limit)",
+            "GET /api/events/history": "Historial de eventos (query: type, limit, before_seq)",
             "GET /api/events/types": "Tipos de eventos disponibles",
+            "GET /api/events/stream": "Eventos en vivo (Server-Sent Events; query: types=a,b)",
             "GET /api/webhooks": "Lista de webhooks",
-            "POST /api/webhooks/add": "Agregar webhook (body: {event_type, url})",
+            "POST /api/webhooks/add": "Agregar webhook (body: {event_type, url, batch_size?, batch_window?, secret?})",
             "POST /api/webhooks/:id/remove": "Eliminar webhook",
             "POST /api/webhooks/:id/enable": "Habilitar webhook",
             "POST /api/webhooks/:id/disable": "Deshabilitar webhook",
+            "GET /api/webhooks/deliveries": "Estado de la cola de entregas y dead letters",
+            "POST /api/webhooks/dead-letters/retry": "Reintentar entregas fallidas (body: {webhook_id?})",
             "POST /api/notifications/test": "Emitir evento de prueba (body: {event_type?, data?})",
             "GET /api/limits/status": "Ver límites de rate limiting actuales",
             "POST /api/backup/create": "Crear backup manual (body: {tag?})",
@@ -306,8 +559,9 @@ def docs():
             "POST /api/backup/restore": "Restaurar desde backup (body: {backup_file})",
             "GET /api/backup/stats": "Estadísticas de backups",
             "GET /api/metrics/system": "Métricas del sistema (CPU, RAM, disco)",
-            "GET /api/metrics/api": "Métricas de la API (requests, errors, uptime)",
-            "GET /api/health": "Health check del servidor",
+            "GET /api/metrics/api": "Métricas de la API (requests, errors, latencias p50/p95/p99, caché de respuestas)",
+            "GET /metrics": "Métricas en formato de texto de Prometheus (histogramas de latencia por ruta)",
+            "GET /api/health": "Health check del servidor (status 'warming' mientras carga la cadena)",
             "POST /api/metrics/reset": "Reiniciar métricas (1/hour)"
         },
 
@@ -343,12 +597,15 @@ def api_info():
 # ==================== ENDPOINTS DE BLOCKCHAIN ====================
 
 @app.route('/api/blockchain')
+@cached_response
 def get_blockchain():
-    """Obtiene la blockchain completa"""
+    """Obtiene la blockchain por páginas (query: limit, before_height)"""
     init_blockchain()
     
+    blocks, next_page = chain_page(page_limit_arg())
+    
     chain_data = []
-    for block in blockchain.chain:
+    for block in blocks:
         chain_data.append({
             "index": block.index,
             "timestamp": block.timestamp,
@@ -361,7 +618,8 @@ def get_blockchain():
     
     return response_success({
         "chain": chain_data,
-        "length": len(blockchain.chain)
+        "length": len(blockchain.chain),
+        "next": next_page
     })
 
 @app.route('/api/blockchain/info')
@@ -504,11 +762,21 @@ def wallet_history():
     init_blockchain()
     history = TransactionHistory(blockchain, current_wallet.get_address())
     
-    return response_success({
+    # Paginado por altura (query: limit, before_height, before_position)
+    cursor = history_cursor_arg()
+    transactions, next_before = history.get_page(page_limit_arg(), cursor)
+    
+    data = {
         "wallet": current_wallet.name,
-        "summary": history.get_summary(),
-        "transactions": history.get_all_transactions()
-    })
+        "transactions": transactions,
+        "next": history_cursor_response(next_before)
+    }
+    
+    # El resumen solo en la primera página
+    if cursor is None:
+        data["summary"] = history.get_summary()
+    
+    return response_success(data)
 
 # ==================== ENDPOINTS DE TRANSACCIONES ====================
 
@@ -543,6 +811,20 @@ def send_transaction():
     # Agregar al pool
     blockchain.add_transaction(transaction)
     
+    # Propagar a los peers en el próximo lote
+    if p2p_node:
+        p2p_node.broadcast_transaction(transaction)
+    
+    event_system.emit(EventType.TRANSACTION_CREATED, {
+        'source': 'local',
+        'count': 1,
+        'from': transaction.sender,
+        'to': transaction.recipient,
+        'amount': transaction.amount,
+        'fee': transaction.fee,
+        'pending_transactions': len(blockchain.pending_transactions)
+    })
+    
     return response_success({
         "transaction": {
             "from": current_wallet.get_address(),
@@ -577,47 +859,116 @@ def pending_transactions():
 
 # ==================== ENDPOINTS DE MINERÍA ====================
 
+def announce_mined_block(block):
+    """
+    Anuncia un bloque minado localmente: evento BLOCK_MINED y propagación
+
+    POR QUÉ: Lo usan /api/mining/mine y los trabajos en segundo plano,
+    que terminan fuera de la petición
+    """
+    event_system.emit(EventType.BLOCK_MINED, {
+        'block_index': block.index,
+        'hash': block.hash,
+        'miner': block.miner_address,
+        'reward': blockchain.mining_reward,
+        'transactions': len(block.transactions),
+        'timestamp': block.timestamp,
+        'blockchain_height': len(blockchain.chain),
+        'pending_transactions': len(blockchain.pending_transactions)
+    })
+    
+    # Propagar a los peers (compact block, en segundo plano)
+    if p2p_node:
+        p2p_node.relay_block(block)
+
 @app.route('/api/mining/mine', methods=['POST'])
+@without_chain_lock
 @limiter.limit("5 per minute")
 def mine_block():
-    """Mina un nuevo bloque"""
+    """
+    Mina un nuevo bloque y espera al resultado
+    
+    La prueba de trabajo corre en el pool de procesos de minería; para no
+    esperar, usar POST /api/mining/jobs
+    """
     if not current_wallet:
         return response_error("No wallet loaded. Need miner address.", 400)
     
     init_blockchain()
     
-    import time
-    start_time = time.time()
-    
     pending_count = len(blockchain.pending_transactions)
-    block = blockchain.mine_pending_transactions(current_wallet.get_address())
+    job, started = mining_jobs.submit(blockchain, current_wallet.get_address(), announce_mined_block)
+    if not started:
+        return response_error(f"A mining job is already running: {job.job_id}", 409)
     
-    end_time = time.time()
-    mining_time = end_time - start_time
-
-    # Emitir evento
-    event_system.emit(EventType.BLOCK_MINED, {
-        'block_index': block.index,
-        'hash': block.hash,
-        'miner': miner_address,
-        'reward': blockchain.mining_reward,
-        'transactions': len(block.transactions)
-    })
+    job.wait()
+    if job.status != job.COMPLETED:
+        return response_error(f"Mining job {job.status}: {job.error}", 409)
     
+    block = job.block
     return response_success({
         "block": {
             "index": block.index,
             "hash": block.hash,
             "nonce": block.nonce,
             "transactions": len(block.transactions),
-            "miner": current_wallet.get_address()
+            "miner": block.miner_address
         },
-        "mining_time": round(mining_time, 2),
+        "mining_time": round(job.finished_at - job.started_at, 2),
         "pending_transactions": pending_count,
         "reward": config.MINING_REWARD
     }, "Block mined successfully")
 
+@app.route('/api/mining/jobs', methods=['POST'])
+@limiter.limit("5 per minute")
+def start_mining_job():
+    """Empieza a minar en segundo plano; devuelve el ID del trabajo"""
+    if not current_wallet:
+        return response_error("No wallet loaded. Need miner address.", 400)
+    
+    init_blockchain()
+    
+    job, started = mining_jobs.submit(blockchain, current_wallet.get_address(), announce_mined_block)
+    if not started:
+        return response_error(f"A mining job is already running: {job.job_id}", 409)
+    
+    return response_success(job.to_dict(), "Mining job started")
+
+@app.route('/api/mining/jobs')
+def list_mining_jobs():
+    """Trabajos de minería recientes"""
+    init_blockchain()
+    
+    jobs = mining_jobs.get_jobs()
+    return response_success({
+        "count": len(jobs),
+        "jobs": jobs
+    })
+
+@app.route('/api/mining/jobs/<job_id>')
+def get_mining_job(job_id):
+    """Progreso de un trabajo de minería (nonces, hashrate, ETA)"""
+    init_blockchain()
+    
+    job = mining_jobs.get_job(job_id)
+    if not job:
+        return response_error("Job not found", 404)
+    
+    return response_success(job.to_dict())
+
+@app.route('/api/mining/jobs/<job_id>', methods=['DELETE'])
+def cancel_mining_job(job_id):
+    """Cancela un trabajo de minería"""
+    init_blockchain()
+    
+    success, msg = mining_jobs.cancel(job_id)
+    if not success:
+        return response_error(msg, 404 if msg == "Job not found" else 409)
+    
+    return response_success({"job_id": job_id}, msg)
+
 @app.route('/api/mining/stats')
+@cached_response
 def mining_stats():
     """Estadísticas de minería"""
     init_blockchain()
@@ -628,6 +979,7 @@ def mining_stats():
 # ==================== ENDPOINTS DE EXPLORADOR ====================
 
 @app.route('/api/explorer/block/<int:block_number>')
+@cached_response
 def get_block(block_number):
     """Obtiene un bloque por número"""
     init_blockchain()
@@ -645,12 +997,12 @@ def get_block(block_number):
     })
 
 @app.route('/api/explorer/blocks')
+@cached_response
 def get_blocks():
-    """Obtiene los últimos bloques"""
+    """Obtiene los últimos bloques (query: limit, before_height)"""
     init_blockchain()
     
-    limit = int(request.args.get('limit', 10))
-    blocks = blockchain.chain[-limit:]
+    blocks, next_page = chain_page(page_limit_arg(10))
     
     blocks_data = []
     for block in blocks:
@@ -664,10 +1016,12 @@ def get_blocks():
     
     return response_success({
         "blocks": blocks_data,
-        "count": len(blocks_data)
+        "count": len(blocks_data),
+        "next": next_page
     })
 
 @app.route('/api/explorer/search')
+@cached_response
 def search():
     """Busca por hash o dirección"""
     init_blockchain()
@@ -678,28 +1032,46 @@ def search():
     if not query:
         return response_error("Query parameter 'q' required")
     
-    # Buscar por hash
+    # Buscar por hash (completo o prefijo)
     block = explorer.get_block_by_hash(query)
     if block:
+        index = blockchain.get_index()
         return response_success({
             "type": "block",
-            "result": explorer.get_block_stats(block)
+            "result": explorer.get_block_stats(block),
+            "matches": [
+                {"index": h, "hash": blockchain.chain[h].hash}
+                for h in index.search_block_hashes(query, limit=10)
+            ]
         })
     
-    # Buscar por minero
-    blocks = explorer.search_blocks_by_miner(query)
+    # Buscar por minero (los más recientes, query: limit)
+    # POR QUÉ: Un prefijo corto coincide con casi todos los mineros
+    blocks = explorer.search_blocks_by_miner(query, page_limit_arg())
     if blocks:
         return response_success({
             "type": "miner",
-            "blocks_count": len(blocks),
+            "blocks_count": blockchain.get_index().count_miner_blocks(query),
             "blocks": [{"index": b.index, "hash": b.hash} for b in blocks]
         })
     
+    # Buscar por ID de transacción o firma
+    location = blockchain.get_index().find_transaction(query)
+    if location:
+        block = blockchain.chain[location[0]]
+        return response_success({
+            "type": "transaction",
+            "block": block.index,
+            "position": location[1],
+            "result": block.transactions[location[1]].to_dict()
+        })
+    
     return response_error("No results found", 404)
 
 # ==================== ENDPOINTS DE ESTADÍSTICAS ====================
 
 @app.route('/api/statistics/dashboard')
+@cached_response
 def statistics_dashboard():
     """Dashboard completo de estadísticas"""
     init_blockchain()
@@ -708,6 +1080,7 @@ def statistics_dashboard():
     return response_success(stats.get_complete_dashboard())
 
 @app.route('/api/statistics/supply')
+@cached_response
 def statistics_supply():
     """Información de supply"""
     init_blockchain()
@@ -720,6 +1093,7 @@ def statistics_supply():
     })
 
 @app.route('/api/statistics/wallets')
+@cached_response
 def statistics_wallets():
     """Top wallets"""
     init_blockchain()
@@ -730,7 +1104,30 @@ def statistics_wallets():
     
     return response_success({
         "top_wallets": [{"address": addr, "balance": bal} for addr, bal in top],
-        "total_wallets": len(stats.get_all_addresses())
+        "total_wallets": stats.get_address_count()
+    })
+
+@app.route('/api/statistics/activity')
+def statistics_activity():
+    """Actividad de la red por minuto, hora o día (para gráficas)"""
+    init_blockchain()
+    
+    resolution = request.args.get('resolution', 'hour')
+    points = min(request.args.get('points', 24, type=int), 1440)
+    
+    rollups = blockchain.get_rollups()
+    if resolution not in rollups.RESOLUTIONS or points < 1:
+        return response_error("resolution must be minute, hour or day")
+    
+    # Últimos N intervalos hasta ahora, incluidos los vacíos
+    size = rollups.RESOLUTIONS[resolution]
+    now = time.time()
+    series = rollups.get_series(resolution, since=now - (points - 1) * size, until=now)
+    
+    return response_success({
+        "resolution": resolution,
+        "bucket_seconds": size,
+        "series": series
     })
 
 # ==================== ENDPOINTS DE FAUCET ====================
@@ -845,7 +1242,10 @@ def list_contracts():
     init_blockchain()
     
     status = request.args.get('status', None)
-    contracts = contract_manager.list_contracts(status)
+    limit = page_limit_arg()
+    contracts = contract_manager.list_contracts(
+        status, limit=limit, after=request.args.get('after_id')
+    )
     
     contracts_data = []
     for contract in contracts:
@@ -858,9 +1258,14 @@ def list_contracts():
             'info': info
         })
     
+    next_page = None
+    if len(contracts) == limit:
+        next_page = {'after_id': contracts[-1].contract_id}
+    
     return response_success({
         'count': len(contracts_data),
-        'contracts': contracts_data
+        'contracts': contracts_data,
+        'next': next_page
     })
 
 @app.route('/api/contracts/<contract_id>')
@@ -1087,10 +1492,12 @@ def list_peers():
     
     return response_success({
         'count': len(peers),
-        'peers': peers
+        'peers': peers,
+        'health': p2p_node.peer_manager.get_peer_details()
     })
 
 @app.route('/api/network/peer/add', methods=['POST'])
+@without_chain_lock
 def add_peer():
     """Agrega un peer a la red"""
     init_blockchain()
@@ -1141,6 +1548,7 @@ def remove_peer():
         return response_error(msg)
 
 @app.route('/api/network/sync', methods=['POST'])
+@without_chain_lock
 def sync_network():
     """Sincroniza con todos los peers"""
     init_blockchain()
@@ -1158,100 +1566,191 @@ def sync_network():
         'blockchain_height': len(blockchain.chain)
     }, "Network synchronized")
 
+def announce_received_transactions(result):
+    """Evento TRANSACTION_CREATED para las transacciones aceptadas de un peer"""
+    if not result['accepted']:
+        return
+    
+    event_system.emit(EventType.TRANSACTION_CREATED, {
+        'source': 'network',
+        'count': result['accepted'],
+        'pending_transactions': len(blockchain.pending_transactions)
+    })
+
 @app.route('/api/network/transaction', methods=['POST'])
 def receive_transaction():
     """Recibe una transacción de otro nodo"""
     init_blockchain()
     
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
     data = request.get_json()
     if not data:
         return response_error("Transaction data required")
     
     try:
-        from blockchain.transaction import Transaction
-        
-        # Reconstruir transacción
-        tx = Transaction(
-            data['sender'],
-            data['recipient'],
-            data['amount']
-        )
-        tx.timestamp = data['timestamp']
-        tx.signature = data.get('signature')
-        tx.fee = data.get('fee', 0)
-        
-        # Validar y agregar al pool
-        if tx.is_valid():
-            blockchain.add_transaction(tx)
-            
-            if p2p_node:
-                p2p_node.transactions_received += 1
-            
-            return response_success({
-                'transaction_added': True
-            }, "Transaction received and added to pool")
-        else:
-            return response_error("Invalid transaction")
-            
+        result = p2p_node.receive_transactions([data])
     except Exception as e:
         return response_error(str(e))
+    
+    announce_received_transactions(result)
+    
+    if result['accepted']:
+        return response_success({
+            'transaction_added': True
+        }, "Transaction received and added to pool")
+    
+    if result['duplicates']:
+        return response_success({
+            'transaction_added': False
+        }, "Transaction already known")
+    
+    return response_error("Invalid transaction")
+
+@app.route('/api/network/transactions', methods=['POST'])
+def receive_transactions():
+    """Recibe un lote de transacciones de otro nodo"""
+    init_blockchain()
+    
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
+    data = request.get_json()
+    if not data or not isinstance(data.get('transactions'), list):
+        return response_error("Transactions list required")
+    
+    try:
+        result = p2p_node.receive_transactions(data['transactions'])
+    except Exception as e:
+        return response_error(f"Malformed transactions: {str(e)}")
+    
+    announce_received_transactions(result)
+    
+    return response_success(result, f"{result['accepted']} transactions added to pool")
+
+def block_result_response(result):
+    """
+    Respuesta estándar para bloques recibidos (completos o compactos)
+    
+    POR QUÉ: Ambos formatos terminan en el mismo pipeline de aceptación
+    y deben emitir los mismos eventos
+    """
+    # 'incomplete' y 'failed' no son errores: el emisor completa o
+    # reenvía el bloque completo según el status
+    if result['status'] == 'rejected':
+        return response_error(result['message'])
+    
+    if result['status'] == 'accepted':
+        chain = p2p_node.blockchain.chain
+        block = chain[result['block_index']]
+        event_system.emit(EventType.BLOCK_ADDED, {
+            'block_index': result['block_index'],
+            'hash': result['block_hash'],
+            'miner': block.miner_address,
+            'transactions': len(block.transactions),
+            'connected_orphans': result['connected_orphans'],
+            'blockchain_height': len(chain),
+            'pending_transactions': len(p2p_node.blockchain.pending_transactions)
+        })
+    
+    data = dict(result)
+    data['block_received'] = True
+    data['blockchain_height'] = len(p2p_node.blockchain.chain)
+    
+    return response_success(data, result['message'])
 
 @app.route('/api/network/block', methods=['POST'])
 def receive_block():
-    """Recibe un bloque de otro nodo"""
+    """Recibe un bloque de otro nodo y lo conecta a la cadena"""
     init_blockchain()
     
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
     data = request.get_json()
     if not data:
         return response_error("Block data required")
     
     try:
         from blockchain.block import Block
-        from blockchain.transaction import Transaction
-        
-        # Reconstruir transacciones
-        transactions = []
-        for tx_data in data['transactions']:
-            tx = Transaction(
-                tx_data['sender'],
-                tx_data['recipient'],
-                tx_data['amount']
-            )
-            tx.timestamp = tx_data['timestamp']
-            tx.signature = tx_data.get('signature')
-            tx.fee = tx_data.get('fee', 0)
-            transactions.append(tx)
-        
-        # Reconstruir bloque
-        block = Block(
-            data['index'],
-            transactions,
-            data['previous_hash'],
-            data['miner_address']
-        )
-        block.timestamp = data['timestamp']
-        block.nonce = data['nonce']
-        block.hash = data['hash']
-        
-        # Validar bloque
-        if block.hash == block.calculate_hash():
-            # Aquí deberías validar que el bloque es el siguiente válido
-            # Por ahora solo lo aceptamos si es válido
-            
-            if p2p_node:
-                p2p_node.blocks_received += 1
-            
-            return response_success({
-                'block_received': True,
-                'block_index': block.index
-            }, "Block received")
-        else:
-            return response_error("Invalid block hash")
-            
+        block = Block.from_dict(data)
     except Exception as e:
-        return response_error(str(e))
+        return response_error(f"Malformed block: {str(e)}")
+    
+    # Validar (enlace, PoW, firmas, balances) y añadir o guardar como huérfano
+    return block_result_response(p2p_node.receive_block(block))
+
+@app.route('/api/network/compact_block', methods=['POST'])
+def receive_compact_block():
+    """Recibe un bloque compacto (header + IDs cortos de transacciones)"""
+    init_blockchain()
+    
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
+    data = request.get_json()
+    if not data or 'header' not in data:
+        return response_error("Compact block data required")
+    
+    try:
+        result = p2p_node.receive_compact_block(data)
+    except Exception as e:
+        return response_error(f"Malformed compact block: {str(e)}")
+    
+    return block_result_response(result)
+
+@app.route('/api/network/block/transactions', methods=['POST'])
+def receive_block_transactions():
+    """Recibe las transacciones que faltaban para reconstruir un bloque compacto"""
+    init_blockchain()
+    
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
+    data = request.get_json()
+    if not data or 'block_hash' not in data or 'transactions' not in data:
+        return response_error("block_hash and transactions required")
+    
+    try:
+        result = p2p_node.receive_block_transactions(data['block_hash'], data['transactions'])
+    except Exception as e:
+        return response_error(f"Malformed transactions: {str(e)}")
+    
+    return block_result_response(result)
+
+@app.route('/api/network/blocks')
+def network_blocks():
+    """Bloques completos desde una altura (sincronización entre nodos)"""
+    init_blockchain()
+    
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
+    start = request.args.get('start', 0, type=int)
+    limit = request.args.get('limit', config.SYNC_BATCH_SIZE, type=int)
+    
+    if start < 0:
+        return response_error("start must be >= 0")
+    
+    return response_success({
+        'start': start,
+        'blocks': p2p_node.get_blocks(start, limit),
+        'height': len(p2p_node.blockchain.chain)
+    })
+
+@app.route('/api/network/acceptance')
+def block_acceptance_stats():
+    """Estadísticas del pipeline de aceptación de bloques"""
+    init_blockchain()
+    
+    if not p2p_node:
+        return response_error("P2P node not initialized")
+    
+    return response_success(p2p_node.block_acceptor.get_stats())
 
 @app.route('/api/network/discover', methods=['POST'])
+@without_chain_lock
 def discover_peers():
     """Descubre peers a través de nodos semilla"""
     init_blockchain()
@@ -1348,6 +1847,11 @@ def pool_join():
     success, msg = mining_pool.add_miner(data['miner_id'], data['address'])
     
     if success:
+        event_system.emit(EventType.POOL_MINER_JOINED, {
+            'miner_id': data['miner_id'],
+            'pool_stats': mining_pool.get_stats()
+        })
+        
         return response_success({
             'miner_id': data['miner_id'],
             'pool_name': mining_pool.pool_name,
@@ -1378,8 +1882,15 @@ def pool_leave():
         return response_error(msg)
 
 @app.route('/api/pool/mine', methods=['POST'])
+@without_chain_lock
 def pool_mine():
-    """Minar bloque colaborativamente"""
+    """
+    Minar bloque colaborativamente
+    
+    POR QUÉ sin lock de la cadena: la prueba de trabajo corre como trabajo
+    de minería (igual que /api/mining/mine) y las lecturas siguen
+    atendiéndose mientras tanto
+    """
     init_blockchain()
     
     if not mining_pool:
@@ -1388,14 +1899,42 @@ def pool_mine():
     if len(mining_pool.miners) == 0:
         return response_error("No miners in pool")
     
+    mined = []
+    
+    def mine_with_job(address):
+        job, started = mining_jobs.submit(blockchain, address)
+        if not started:
+            return None, f"A mining job is already running: {job.job_id}"
+        job.wait()
+        if job.status != job.COMPLETED:
+            return None, f"Mining job {job.status}: {job.error}"
+        mined.append(job.block)
+        return job.block, None
+    
     # Minar bloque
-    success, msg, distribution = mining_pool.mine_block()
+    success, msg, distribution = mining_pool.mine_block(mine=mine_with_job)
     
     if success:
+        block = mined[0]
+        if p2p_node:
+            p2p_node.relay_block(block)
+        
+        pool_stats = mining_pool.get_stats()
+        event_system.emit(EventType.POOL_BLOCK_MINED, {
+            'block_index': block.index,
+            'hash': block.hash,
+            'miner': block.miner_address,
+            'transactions': len(block.transactions),
+            'timestamp': block.timestamp,
+            'blockchain_height': len(blockchain.chain),
+            'pending_transactions': len(blockchain.pending_transactions),
+            'pool_stats': pool_stats
+        })
+        
         return response_success({
-            'block_index': len(blockchain.chain) - 1,
+            'block_index': block.index,
             'distribution': distribution,
-            'pool_stats': mining_pool.get_stats()
+            'pool_stats': pool_stats
         }, msg)
     else:
         return response_error(msg)
@@ -1423,9 +1962,15 @@ def pool_submit_share():
     
     if success:
         miner_stats = mining_pool.get_miner_stats(data['miner_id'])
+        pool_stats = mining_pool.get_stats()
+        event_system.emit(EventType.POOL_SHARE_SUBMITTED, {
+            'miner_id': data['miner_id'],
+            'pool_stats': pool_stats
+        })
+        
         return response_success({
             'miner_stats': miner_stats,
-            'pool_stats': mining_pool.get_stats()
+            'pool_stats': pool_stats
         }, msg)
     else:
         return response_error(msg)
@@ -1739,17 +2284,84 @@ def qr_parse():
 
 @app.route('/api/events/history')
 def events_history():
-    """Historial de eventos"""
+    """Historial de eventos (más recientes primero, paginado por secuencia)"""
     event_type = request.args.get('type')
-    limit = request.args.get('limit', 50, type=int)
+    limit = page_limit_arg(50)
+    before_seq = request.args.get('before_seq', type=int)
+    
+    history = event_system.get_history(event_type, limit, before_seq)
     
-    history = event_system.get_history(event_type, limit)
+    next_page = None
+    if len(history) == limit:
+        next_page = {'before_seq': history[-1]['seq']}
     
     return response_success({
         'count': len(history),
-        'events': history
+        'events': history,
+        'next': next_page
     })
 
+# Plazas para conexiones de /api/events/stream
+event_stream_slots = threading.BoundedSemaphore(config.EVENT_STREAM_MAX_CLIENTS)
+
+def format_sse(event):
+    """Serializa un Event en el formato de text/event-stream"""
+    payload = json.dumps(event.to_dict())
+    return f"id: {event.id}\nevent: {event.event_type}\ndata: {payload}\n\n"
+
+@app.route('/api/events/stream')
+@without_chain_lock
+@limiter.exempt  # EventSource reconecta solo; el límite es EVENT_STREAM_MAX_CLIENTS
+def events_stream():
+    """
+    Eventos en vivo con Server-Sent Events
+    
+    Cada evento emitido llega como 'event: <tipo>' con el Event completo
+    en 'data'. Al conectar se envía 'ready'; 'resync' indica que el
+    cliente se quedó atrás y debe recargar su estado.
+    
+    POR QUÉ: La interfaz web se actualiza con cada bloque, transacción o
+    share en lugar de consultar el dashboard completo cada 30 segundos
+    """
+    types = request.args.get('types')
+    event_types = [t.strip() for t in types.split(',') if t.strip()] if types else None
+    
+    # Cada conexión ocupa un hilo del servidor mientras está abierta
+    if not event_stream_slots.acquire(blocking=False):
+        response, code = response_error("Too many event stream clients", 503)
+        response.headers['Retry-After'] = str(config.EVENT_STREAM_HEARTBEAT)
+        return response, code
+    
+    subscription = event_system.subscribe(event_types, config.EVENT_STREAM_QUEUE_SIZE)
+    closed = threading.Event()
+    
+    def close():
+        if not closed.is_set():
+            closed.set()
+            event_system.unsubscribe(subscription)
+            event_stream_slots.release()
+    
+    def generate():
+        yield "retry: 3000\n\n"
+        yield format_sse(Event('ready', {
+            'types': event_types,
+            'heartbeat': config.EVENT_STREAM_HEARTBEAT
+        }))
+        
+        while not closed.is_set():
+            event = subscription.next_event(timeout=config.EVENT_STREAM_HEARTBEAT)
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_sse(event)
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Sin buffer en proxies nginx
+    # POR QUÉ: call_on_close corre aunque el generador no llegue a empezar
+    response.call_on_close(close)
+    return response
+
 @app.route('/api/events/types')
 def events_types():
     """Lista de tipos de eventos disponibles"""
@@ -1767,6 +2379,7 @@ def events_types():
         {'type': EventType.PEER_DISCONNECTED, 'description': 'Peer desconectado'},
         {'type': EventType.POOL_BLOCK_MINED, 'description': 'Bloque minado por pool'},
         {'type': EventType.POOL_MINER_JOINED, 'description': 'Minero se unió al pool'},
+        {'type': EventType.POOL_SHARE_SUBMITTED, 'description': 'Share aceptado por el pool'},
     ]
     
     return response_success({
@@ -1792,12 +2405,27 @@ def webhooks_add():
     if not data or 'event_type' not in data or 'url' not in data:
         return response_error("event_type and url required")
     
-    webhook_id = event_system.add_webhook(data['event_type'], data['url'])
+    # Lotes opcionales: un POST por ventana o por batch_size eventos
+    try:
+        batch_size = int(data['batch_size']) if data.get('batch_size') is not None else None
+        batch_window = float(data['batch_window']) if data.get('batch_window') is not None else None
+    except (TypeError, ValueError):
+        return response_error("batch_size and batch_window must be numbers")
+    
+    if (batch_size is not None and batch_size < 1) or (batch_window is not None and batch_window <= 0):
+        return response_error("batch_size and batch_window must be positive")
+    
+    webhook_id = event_system.add_webhook(
+        data['event_type'], data['url'],
+        batch_size=batch_size, batch_window=batch_window, secret=data.get('secret')
+    )
     
     return response_success({
         'webhook_id': webhook_id,
         'event_type': data['event_type'],
-        'url': data['url']
+        'url': data['url'],
+        'batched': bool(batch_size or batch_window),
+        'signed': bool(data.get('secret'))
     }, "Webhook registered successfully")
 
 @app.route('/api/webhooks/<webhook_id>/remove', methods=['POST'])
@@ -1829,6 +2457,26 @@ def webhooks_disable(webhook_id):
         'enabled': False
     }, "Webhook disabled")
 
+@app.route('/api/webhooks/deliveries')
+def webhooks_deliveries():
+    """Estado de la cola de entregas y entregas fallidas"""
+    delivery = event_system.delivery
+    
+    return response_success({
+        'stats': delivery.get_stats(),
+        'dead_letters': delivery.get_dead_letters()
+    })
+
+@app.route('/api/webhooks/dead-letters/retry', methods=['POST'])
+def webhooks_retry_dead_letters():
+    """Vuelve a encolar las entregas fallidas"""
+    data = request.get_json() or {}
+    requeued = event_system.delivery.retry_dead_letters(data.get('webhook_id'))
+    
+    return response_success({
+        'requeued': requeued
+    }, f"{requeued} deliveries requeued")
+
 @app.route('/api/notifications/test', methods=['POST'])
 def notifications_test():
     """Emitir evento de prueba"""
@@ -1996,22 +2644,54 @@ def metrics_api():
     """
     try:
         api_metrics = metrics.get_api_metrics()
+        api_metrics['response_cache'] = response_cache.get_stats()
         return response_success(api_metrics)
     except Exception as e:
         return response_error(f"Error: {str(e)}")
 
+@app.route('/metrics')
+@without_chain_lock
+@limiter.exempt
+def prometheus_metrics():
+    """
+    Métricas en formato de texto de Prometheus
+    
+    POR QUÉ: Los scrapers piden cada pocos segundos; no toman el lock de
+    la cadena ni cuentan para el rate limit
+    """
+    from utils.logger import get_dropped_count
+    
+    gauges = {
+        'colcript_event_stream_clients': ("Clientes SSE conectados", event_system.get_subscriber_count()),
+        'colcript_webhook_queue_pending': ("Entregas de webhooks en cola", event_system.delivery.get_stats()['pending']),
+        'colcript_log_records_dropped': ("Registros de log descartados por cola llena", get_dropped_count())
+    }
+    if blockchain is not None:
+        gauges['colcript_chain_height'] = ("Bloques en la cadena", len(blockchain.chain))
+        gauges['colcript_pending_transactions'] = ("Transacciones pendientes", len(blockchain.pending_transactions))
+    
+    return Response(metrics.to_prometheus(gauges), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/health')
 def health_check():
     """
     Health check del servidor
     
-    POR QUÉ: Verificar que el servidor está funcionando
+    POR QUÉ: Verificar que el servidor está funcionando (y listo:
+    mientras carga la cadena el estado es 'warming')
     """
     try:
         health = metrics.get_health_status()
+        health['startup'] = get_startup_info()
+        
+        if health['startup']['status'] == STARTUP_WARMING:
+            health['status'] = 'warming'
+        elif health['startup']['status'] == STARTUP_FAILED:
+            health['status'] = 'unhealthy'
+            health['issues'].append(f"Startup failed: {health['startup']['error']}")
         
         # Retornar código HTTP según estado
-        status_code = 200 if health['status'] == 'healthy' else (503 if health['status'] == 'unhealthy' else 200)
+        status_code = 200 if health['status'] in ('healthy', 'degraded') else 503
         
         return jsonify({
             'success': True,
@@ -2042,6 +2722,7 @@ def metrics_reset():
 # ==========================================
 
 @app.route('/api/wallet/advanced/contacts', methods=['GET', 'POST', 'DELETE'])
+@without_chain_lock
 def wallet_contacts():
     """
     Gestionar contactos de wallet
@@ -2097,6 +2778,7 @@ def wallet_contacts():
             return jsonify({"success": False, "error": "Contact not found"}), 404
 
 @app.route('/api/wallet/advanced/labels', methods=['GET', 'POST', 'DELETE'])
+@without_chain_lock
 def wallet_labels():
     """
     Gestionar etiquetas de direcciones
@@ -2151,6 +2833,7 @@ def wallet_labels():
             return jsonify({"success": False, "error": "Label not found"}), 404
 
 @app.route('/api/wallet/advanced/history/<address>', methods=['GET'])
+@without_chain_lock
 def wallet_advanced_history(address):
     """Obtener historial de transacciones con labels"""
     from wallet.advanced import AdvancedWallet
@@ -2170,6 +2853,7 @@ def wallet_advanced_history(address):
     })
 
 @app.route('/api/wallet/advanced/stats/<address>', methods=['GET'])
+@without_chain_lock
 def wallet_advanced_stats(address):
     """Obtener estadísticas de transacciones"""
     from wallet.advanced import AdvancedWallet
@@ -2186,6 +2870,7 @@ def wallet_advanced_stats(address):
     })
 
 @app.route('/api/wallet/advanced/export/<address>', methods=['GET'])
+@without_chain_lock
 def wallet_advanced_export(address):
     """Exportar historial completo"""
     from wallet.advanced import AdvancedWallet
@@ -2219,6 +2904,7 @@ def wallet_advanced_export(address):
 # ==========================================
 
 @app.route('/api/explorer/advanced/search/transaction/<tx_hash>')
+@cached_response
 def explorer_search_transaction(tx_hash):
     """Buscar transacción por hash"""
     from blockchain.advanced_explorer import AdvancedExplorer
@@ -2234,6 +2920,7 @@ def explorer_search_transaction(tx_hash):
         return response_error("Transaction not found", 404)
 
 @app.route('/api/explorer/advanced/search/address/<address>')
+@cached_response
 def explorer_search_address(address):
     """Buscar transacciones de una dirección"""
     from blockchain.advanced_explorer import AdvancedExplorer
@@ -2241,16 +2928,25 @@ def explorer_search_address(address):
     init_blockchain()
     explorer = AdvancedExplorer(blockchain)
     
-    limit = request.args.get('limit', 100, type=int)
-    transactions = explorer.search_address_transactions(address, limit=limit)
+    limit = page_limit_arg(100)
+    transactions = explorer.search_address_transactions(
+        address, limit=limit, before=history_cursor_arg()
+    )
+    
+    next_before = None
+    if transactions and len(transactions) == limit:
+        next_before = (transactions[-1]['block'], transactions[-1]['position'])
     
     return response_success({
         'address': address,
         'transactions': transactions,
-        'count': len(transactions)
+        'count': len(transactions),
+        'total': blockchain.get_index().count_address_entries(address),
+        'next': history_cursor_response(next_before)
     })
 
 @app.route('/api/explorer/advanced/top-holders')
+@cached_response
 def explorer_top_holders():
     """Top holders por balance"""
     from blockchain.advanced_explorer import AdvancedExplorer
@@ -2267,6 +2963,7 @@ def explorer_top_holders():
     })
 
 @app.route('/api/explorer/advanced/miner-ranking')
+@cached_response
 def explorer_miner_ranking():
     """Ranking de mineros"""
     from blockchain.advanced_explorer import AdvancedExplorer
@@ -2291,7 +2988,10 @@ def explorer_network_activity():
     explorer = AdvancedExplorer(blockchain)
     
     days = request.args.get('days', 7, type=int)
-    activity = explorer.get_network_activity(days=days)
+    if days < 1:
+        return response_error("days must be >= 1")
+    
+    activity = explorer.get_network_activity(days=min(days, explorer.MAX_ACTIVITY_DAYS))
     
     return response_success(activity)
 
@@ -2308,6 +3008,7 @@ def explorer_realtime():
     return response_success(stats)
 
 @app.route('/api/explorer/advanced/difficulty-history')
+@cached_response
 def explorer_difficulty_history():
     """Historial de dificultad"""
     from blockchain.advanced_explorer import AdvancedExplorer
@@ -2315,7 +3016,7 @@ def explorer_difficulty_history():
     init_blockchain()
     explorer = AdvancedExplorer(blockchain)
     
-    limit = request.args.get('limit', 100, type=int)
+    limit = page_limit_arg(100)
     history = explorer.get_difficulty_history(limit=limit)
     
     return response_success({
@@ -2324,6 +3025,7 @@ def explorer_difficulty_history():
     })
 
 @app.route('/api/explorer/advanced/search/date-range')
+@cached_response
 def explorer_search_date_range():
     """Buscar bloques por rango de fechas"""
     from blockchain.advanced_explorer import AdvancedExplorer
@@ -2337,16 +3039,27 @@ def explorer_search_date_range():
     if not start_date or not end_date:
         return response_error("start and end parameters required")
     
+    limit = page_limit_arg(100)
+    after = request.args.get('after_height', type=int)
+    
     try:
-        results = explorer.search_by_date_range(start_date, end_date)
-        return response_success({
-            'start_date': start_date,
-            'end_date': end_date,
-            'blocks': results,
-            'count': len(results)
-        })
+        # Se pide uno de más para saber si hay otra página
+        results = explorer.search_by_date_range(start_date, end_date, limit=limit + 1, after=after)
     except Exception as e:
         return response_error(f"Invalid date format: {str(e)}")
+    
+    next_page = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_page = {'after_height': results[-1]['index']}
+    
+    return response_success({
+        'start_date': start_date,
+        'end_date': end_date,
+        'blocks': results,
+        'count': len(results),
+        'next': next_page
+    })
 
 
 
@@ -2359,6 +3072,12 @@ if __name__ == '__main__':
     print("\n📡 Starting server...")
     print(f"🔗 API URL: http://localhost:5000")
     print(f"📖 Documentation: http://localhost:5000/api/docs")
+    print("🏭 Production: ./start.sh --production (gunicorn, ver gunicorn.conf.py)")
     print("\n⚠️  Press CTRL+C to stop\n")
     
+    # Con debug, este bloque corre también en el proceso que vigila los
+    # cambios de código; solo el proceso que sirve carga la cadena
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        startup(background=True)
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,18 @@
+# api/wsgi.py - Punto de entrada WSGI para producción
+
+import os
+import sys
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from api.server import app, startup
+
+# Cargar la blockchain al arrancar el worker, no en la primera petición
+# (mientras tanto /api/health responde 'warming')
+startup(background=True)
+
+# Uso: gunicorn -c gunicorn.conf.py api.wsgi:app
+application = app
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# benchmarks/api_benchmark.py - Peticiones por segundo de la API de ColCript
+
+"""
+Mide peticiones por segundo y latencia de los endpoints más consultados:
+/api/info, /api/wallet/balance y /api/explorer/blocks
+
+Uso:
+    # En proceso (cliente WSGI de Flask, cadena en memoria)
+    python benchmarks/api_benchmark.py --blocks 500 --concurrency 8
+
+    # Contra un servidor en marcha (p. ej. ./start.sh --production)
+    # Con API_RATE_LIMITS_ENABLED = True casi todo serán 429
+    python benchmarks/api_benchmark.py --url http://localhost:5000 --create-wallet
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+ENDPOINTS = [
+    '/api/info',
+    '/api/wallet/balance',
+    '/api/explorer/blocks'
+]
+
+
+def percentile(values, p):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class InProcessTarget:
+    """Peticiones con el cliente de pruebas de Flask sobre una cadena en memoria"""
+
+    def __init__(self, blocks):
+        import config
+        import api.server as server
+        from blockchain.blockchain import Blockchain
+        from network.node import Node
+        from wallet.wallet import Wallet
+
+        print(f"⛏️  Preparando cadena de {blocks} bloques en memoria...")
+        # Bloques seguidos subirían la dificultad; aquí solo importa el tamaño de la cadena
+        config.DIFFICULTY_ADJUSTMENT_ENABLED = False
+        blockchain = Blockchain(auto_save=False)
+        blockchain.storage = None
+        blockchain.backup_system = None
+        blockchain.difficulty = 2
+
+        wallet = Wallet("Benchmark")
+        other = Wallet("Other")
+        for i in range(blocks):
+            if i and i % 2 == 0:
+                blockchain.add_transaction(wallet.send_coins(other.get_address(), 1))
+            blockchain.mine_pending_transactions(wallet.get_address() if i % 3 else other.get_address())
+
+        server.blockchain = blockchain
+        server.p2p_node = Node(host='127.0.0.1', port=6000, blockchain=blockchain)
+        server.current_wallet = wallet
+        server.limiter.enabled = False
+
+        self.app = server.app
+        self.local = threading.local()
+
+    def get(self, path):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        return client.get(path).status_code
+
+
+class HttpTarget:
+    """Peticiones HTTP a un servidor en marcha (una sesión por hilo)"""
+
+    def __init__(self, url, create_wallet=False):
+        import requests
+
+        self.url = url.rstrip('/')
+        self.local = threading.local()
+        self.requests = requests
+
+        if create_wallet:
+            requests.post(f"{self.url}/api/wallet/create", json={'name': 'Benchmark'}, timeout=10)
+
+    def get(self, path):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        return session.get(self.url + path, timeout=30).status_code
+
+
+def run_endpoint(target, path, seconds, concurrency):
+    """Lanza peticiones a path durante seconds con concurrency hilos"""
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker():
+        local_latencies = []
+        local_statuses = {}
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = target.get(path)
+            local_latencies.append((time.perf_counter() - start) * 1000)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'path': path,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'statuses': statuses
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la API de ColCript")
+    parser.add_argument('--url', help="Servidor en marcha (por defecto: en proceso)")
+    parser.add_argument('--create-wallet', action='store_true',
+                        help="Con --url: crear la wallet 'Benchmark' para /api/wallet/balance")
+    parser.add_argument('--blocks', type=int, default=300, help="En proceso: bloques de la cadena")
+    parser.add_argument('--seconds', type=float, default=5, help="Duración por endpoint")
+    parser.add_argument('--concurrency', type=int, default=8, help="Hilos cliente")
+    args = parser.parse_args()
+
+    if args.url:
+        target = HttpTarget(args.url, args.create_wallet)
+        mode = args.url
+    else:
+        target = InProcessTarget(args.blocks)
+        mode = f"en proceso, {args.blocks} bloques"
+
+    print(f"\n📊 Benchmark API ({mode}, {args.concurrency} hilos, {args.seconds}s por endpoint)\n")
+    print(f"{'Endpoint':<24} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  Códigos")
+    print("-" * 72)
+
+    for path in ENDPOINTS:
+        result = run_endpoint(target, path, args.seconds, args.concurrency)
+        statuses = ', '.join(f"{code}×{count}" for code, count in sorted(result['statuses'].items()))
+        print(f"{path:<24} {result['rps']:>9.1f} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f}  {statuses}")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
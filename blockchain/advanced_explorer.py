@@ -2,9 +2,9 @@
 
 import os
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Optional, Tuple
-from collections import defaultdict
 
 # Obtener ruta absoluta del proyecto
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -13,103 +13,106 @@ if project_root not in sys.path:
 
 from blockchain.blockchain import Blockchain
 from blockchain.block import Block
+from blockchain.chain_index import timestamp_to_seconds
+from utils.statistics import BlockchainStatistics
 
 class AdvancedExplorer:
     """Explorer avanzado con búsquedas y estadísticas"""
     
+    # Días como máximo en get_network_activity (la serie rellena los días vacíos)
+    MAX_ACTIVITY_DAYS = 1440
+    
     def __init__(self, blockchain: Blockchain):
         self.blockchain = blockchain
     
     # === BÚSQUEDA AVANZADA ===
-    def search_transaction(self, tx_signature: str) -> Optional[Dict]:
+    def search_transaction(self, tx_id: str) -> Optional[Dict]:
         """
-        Buscar transacción por signature
+        Buscar transacción por ID (hash) o por signature
 
-        POR QUÉ: Encontrar transacciones específicas
+        POR QUÉ: Encontrar transacciones específicas. Las recompensas de
+        minería no tienen signature, pero sí ID (Transaction.get_hash)
         """
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                # Buscar por signature (transacciones normales) 
-                if hasattr(tx, 'signature') and tx.signature == tx_signature:
-                    return {
-                        'transaction': tx.to_dict(),
-                        'block': block.index,
-                        'block_hash': block.hash,
-                        'timestamp': block.timestamp,
-                        'confirmations': len(self.blockchain.chain) - block.index
-                    }
-                # También buscar transacciones de minería (sin signature)
-                tx_dict = tx.to_dict()
-                if tx_dict.get('sender') == 'MINING' and str(tx_dict) == tx_signature:
-                    return {
-                        'transaction': tx_dict,
-                        'block': block.index,
-                        'block_hash': block.hash,
-                        'timestamp': block.timestamp,
-                        'confirmations': len(self.blockchain.chain) - block.index
-                    }
-        return None 
+        location = self.blockchain.get_index().find_transaction(tx_id)
+        if location is None:
+            return None
+
+        height, position = location
+        block = self.blockchain.chain[height]
+        tx = block.transactions[position]
+
+        return {
+            'tx_id': tx.get_hash(),
+            'transaction': tx.to_dict(),
+            'block': block.index,
+            'position': position,
+            'block_hash': block.hash,
+            'timestamp': block.timestamp,
+            'confirmations': len(self.blockchain.chain) - block.index
+        }
 
-    def search_address_transactions(self, address: str, limit: int = 100) -> List[Dict]:
+    def search_address_transactions(self, address: str, limit: int = 100,
+                                    before: Optional[Tuple[int, int]] = None) -> List[Dict]:
         """
-        Buscar todas las transacciones de una dirección
+        Buscar las transacciones de una dirección (más recientes primero)
+        
+        before: (altura, posición) de la última transacción de la página anterior
         
-        POR QUÉ: Ver historial completo de una wallet
+        POR QUÉ: Ver historial completo de una wallet; el índice por
+        dirección evita recorrer toda la cadena
         """
         transactions = []
+        index = self.blockchain.get_index()
+        entries = index.get_address_entries(address, limit=limit, before=before)
         
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                if tx.sender == address or tx.recipient == address:
-                    direction = "sent" if tx.sender == address else "received"
-                    
-                    transactions.append({
-                        'hash': tx.hash if hasattr(tx, 'hash') else '',
-                        'block': block.index,
-                        'timestamp': block.timestamp,
-                        'direction': direction,
-                        'amount': tx.amount,
-                        'fee': tx.fee if hasattr(tx, 'fee') else 0,
-                        'from': tx.sender,
-                        'to': tx.recipient,
-                        'confirmations': len(self.blockchain.chain) - block.index
-                    })
-        
-        # Ordenar por más reciente primero
-        transactions.sort(key=lambda x: x['timestamp'], reverse=True)
+        for height, position in entries:
+            block = self.blockchain.chain[height]
+            tx = block.transactions[position]
+            direction = "sent" if tx.sender == address else "received"
+            
+            transactions.append({
+                'hash': tx.get_hash(),
+                'block': block.index,
+                'position': position,
+                'block_hash': block.hash,
+                'timestamp': block.timestamp,
+                'direction': direction,
+                'amount': tx.amount,
+                'fee': tx.fee if hasattr(tx, 'fee') else 0,
+                'from': tx.sender,
+                'to': tx.recipient,
+                'confirmations': len(self.blockchain.chain) - block.index
+            })
         
-        return transactions[:limit]
+        return transactions
 
-    def search_by_date_range(self, start_date: str, end_date: str) -> List[Dict]:
+    def search_by_date_range(self, start_date: str, end_date: str,
+                             limit: Optional[int] = None,
+                             after: Optional[int] = None) -> List[Dict]:
         """
         Buscar bloques en rango de fechas
         
-        POR QUÉ: Análisis histórico por período
+        limit: máximo de bloques
+        after: altura exclusiva (paginación hacia delante)
+        
+        POR QUÉ: Análisis histórico por período; con el índice de timestamps
+        las fechas se parsean una vez y el rango sale por búsqueda binaria
         """
+        start = datetime.fromisoformat(start_date).timestamp()
+        end = datetime.fromisoformat(end_date).timestamp()
+        
+        index = self.blockchain.get_index()
         results = []
         
-        for block in self.blockchain.chain:
-            try:
-                # Manejar timestamp como string o float
-                if isinstance(block.timestamp, float):
-                    block_date = datetime.fromtimestamp(block.timestamp)
-                else:
-                    block_date = datetime.fromisoformat(block.timestamp.replace('Z', '+00:00'))
-                
-                start = datetime.fromisoformat(start_date)
-                end = datetime.fromisoformat(end_date)
-                
-                if start <= block_date <= end:
-                    results.append({
-                        'index': block.index,
-                        'hash': block.hash,
-                        'timestamp': block.timestamp,
-                        'transactions': len(block.transactions),
-                        'miner': block.miner_address
-                    })
-            except Exception as e:
-                # Saltar bloques con timestamps inválidos
-                continue    
+        for height in index.get_heights_in_range(start, end, limit=limit, after=after):
+            block = self.blockchain.chain[height]
+            results.append({
+                'index': block.index,
+                'hash': block.hash,
+                'timestamp': block.timestamp,
+                'transactions': len(block.transactions),
+                'miner': block.miner_address
+            })
 
         return results
     
@@ -121,26 +124,12 @@ class AdvancedExplorer:
         
         POR QUÉ: Ver distribución de riqueza
         """
-        balances = defaultdict(float)
-        
-        # Calcular balances de todas las direcciones
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                if tx.sender != "0":  # Ignorar mining rewards
-                    balances[tx.sender] -= tx.amount
-                    if hasattr(tx, 'fee'):
-                        balances[tx.sender] -= tx.fee
-                
-                balances[tx.recipient] += tx.amount
-        
-        # Ordenar por balance
-        sorted_holders = sorted(balances.items(), key=lambda x: x[1], reverse=True)
-        
-        # Calcular supply total
-        total_supply = sum(balances.values())
+        # Ranking de balances mantenido bloque a bloque (sin ordenar aquí)
+        stats = BlockchainStatistics(self.blockchain)
+        total_supply = stats.get_circulating_supply()
         
         results = []
-        for address, balance in sorted_holders[:limit]:
+        for address, balance in stats.get_top_wallets(limit):
             percentage = (balance / total_supply * 100) if total_supply > 0 else 0
             results.append({
                 'rank': len(results) + 1,
@@ -157,12 +146,16 @@ class AdvancedExplorer:
         
         POR QUÉ: Ver quiénes están minando más
         """
-        miner_stats = defaultdict(lambda: {'blocks': 0, 'rewards': 0})
+        miner_stats = {}
         
-        for block in self.blockchain.chain[1:]:  # Skip genesis
-            miner = block.miner_address
-            miner_stats[miner]['blocks'] += 1
-            miner_stats[miner]['rewards'] += self.blockchain.mining_reward
+        # Índice minero -> alturas (sin recorrer la cadena)
+        for miner, heights in self.blockchain.get_index().by_miner.items():
+            blocks = sum(1 for h in heights if h > 0)  # Skip genesis
+            if blocks:
+                miner_stats[miner] = {
+                    'blocks': blocks,
+                    'rewards': blocks * self.blockchain.mining_reward
+                }
         
         # Ordenar por bloques minados
         sorted_miners = sorted(
@@ -187,38 +180,34 @@ class AdvancedExplorer:
         """
         Actividad de red en últimos N días
         
-        POR QUÉ: Ver tendencias de uso
+        POR QUÉ: Ver tendencias de uso. Lee los intervalos diarios
+        (ver ActivityRollups), días UTC completos, sin tocar los bloques
+        
+        days se limita a 1..MAX_ACTIVITY_DAYS
         """
-        now = datetime.now()
-        start_date = now - timedelta(days=days)
+        days = max(1, min(days, self.MAX_ACTIVITY_DAYS))
+        now = time.time()
+        series = self.blockchain.get_rollups().get_series(
+            'day', since=now - days * 86400, until=now
+        )
         
         activity = {
-            'transactions_per_day': defaultdict(int),
-            'blocks_per_day': defaultdict(int),
-            'volume_per_day': defaultdict(float)
+            'transactions_per_day': {},
+            'blocks_per_day': {},
+            'volume_per_day': {},
+            'fees_per_day': {},
+            'avg_block_time_per_day': {}
         }
         
-        for block in self.blockchain.chain:
-            try:
-                block_date = datetime.fromisoformat(block.timestamp.replace('Z', '+00:00'))
-                
-                if block_date >= start_date:
-                    day_key = block_date.strftime('%Y-%m-%d')
-                    
-                    activity['blocks_per_day'][day_key] += 1
-                    activity['transactions_per_day'][day_key] += len(block.transactions)
-                    
-                    for tx in block.transactions:
-                        activity['volume_per_day'][day_key] += tx.amount
-            except:
-                continue
+        for row in series:
+            day_key = datetime.fromtimestamp(row['start'], timezone.utc).strftime('%Y-%m-%d')
+            activity['blocks_per_day'][day_key] = row['blocks']
+            activity['transactions_per_day'][day_key] = row['transactions']
+            activity['volume_per_day'][day_key] = row['volume']
+            activity['fees_per_day'][day_key] = row['fees']
+            activity['avg_block_time_per_day'][day_key] = row['avg_block_time']
         
-        return {
-            'period_days': days,
-            'transactions_per_day': dict(activity['transactions_per_day']),
-            'blocks_per_day': dict(activity['blocks_per_day']),
-            'volume_per_day': dict(activity['volume_per_day'])
-        }
+        return {'period_days': days, **activity}
     
     def get_realtime_stats(self) -> Dict:
         """
@@ -229,25 +218,15 @@ class AdvancedExplorer:
         recent_blocks = self.blockchain.chain[-10:] if len(self.blockchain.chain) > 10 else self.blockchain.chain
         
         # Calcular tiempo promedio entre bloques
-        block_times = []
-        for i in range(1, len(recent_blocks)):
-            try:
-                prev_time = datetime.fromisoformat(recent_blocks[i-1].timestamp.replace('Z', '+00:00'))
-                curr_time = datetime.fromisoformat(recent_blocks[i].timestamp.replace('Z', '+00:00'))
-                diff = (curr_time - prev_time).total_seconds()
-                block_times.append(diff)
-            except:
-                continue
+        # POR QUÉ timestamp_to_seconds: los bloques guardan epoch (float)
+        times = [timestamp_to_seconds(block.timestamp) for block in recent_blocks]
+        block_times = [curr - prev for prev, curr in zip(times, times[1:])]
         
         avg_block_time = sum(block_times) / len(block_times) if block_times else 0
         
         # Última actividad
         last_block = self.blockchain.chain[-1]
-        try:
-            last_activity = datetime.fromisoformat(last_block.timestamp.replace('Z', '+00:00'))
-            seconds_ago = (datetime.now() - last_activity).total_seconds()
-        except:
-            seconds_ago = 0
+        seconds_ago = time.time() - times[-1]
         
         return {
             'chain_height': len(self.blockchain.chain),
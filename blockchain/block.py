@@ -10,7 +10,10 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from utils.crypto import hash_data
-from blockchain.transaction import Transaction
+from blockchain.transaction import Transaction, verify_transactions_batch
+from utils.logger import get_logger
+
+log = get_logger(__name__)
 
 class Block:
     def __init__(self, index, transactions, previous_hash, miner_address):
@@ -29,9 +32,15 @@ class Block:
         self.nonce = 0
         self.hash = self.calculate_hash()
     
-    def calculate_hash(self):
-        """Calcula el hash del bloque"""
-        block_data = {
+    def hashing_data(self):
+        """
+        Datos que entran en el hash del bloque
+
+        POR QUÉ separado: los trabajos de minería en segundo plano
+        (mining/jobs.py) prueban nonces sobre este diccionario sin
+        necesitar el objeto Block
+        """
+        return {
             'index': self.index,
             'timestamp': self.timestamp,
             'transactions': [tx.to_dict() for tx in self.transactions],
@@ -39,7 +48,10 @@ class Block:
             'miner_address': self.miner_address,
             'nonce': self.nonce
         }
-        return hash_data(block_data)
+
+    def calculate_hash(self):
+        """Calcula el hash del bloque"""
+        return hash_data(self.hashing_data())
     
     def mine_block(self, difficulty):
         """
@@ -48,28 +60,24 @@ class Block:
         """
         target = '0' * difficulty
         
-        print(f"⛏️  Minando bloque {self.index}...")
+        log.debug("⛏️  Minando bloque", block_index=self.index, difficulty=difficulty)
         start_time = time.time()
         
         while self.hash[:difficulty] != target:
             self.nonce += 1
             self.hash = self.calculate_hash()
             
-            # Mostrar progreso cada 10000 intentos
+            # Progreso cada 10000 intentos (solo con nivel DEBUG)
             if self.nonce % 10000 == 0:
-                print(f"   Intentos: {self.nonce}, Hash: {self.hash[:10]}...")
+                log.debug("   Minando...", block_index=self.index, nonce=self.nonce)
         
         elapsed_time = time.time() - start_time
-        print(f"✅ Bloque minado! Nonce: {self.nonce}")
-        print(f"   Hash: {self.hash}")
-        print(f"   Tiempo: {elapsed_time:.2f} segundos")
+        log.info("✅ Bloque minado", block_index=self.index, nonce=self.nonce,
+                 hash=self.hash, seconds=round(elapsed_time, 3))
     
     def has_valid_transactions(self):
         """Verifica que todas las transacciones del bloque sean válidas"""
-        for tx in self.transactions:
-            if not tx.is_valid():
-                return False
-        return True
+        return all(verify_transactions_batch(self.transactions))
     
     def to_dict(self):
         """Convierte el bloque a diccionario"""
@@ -83,6 +91,24 @@ class Block:
             'hash': self.hash
         }
     
+    @staticmethod
+    def from_dict(data):
+        """
+        Reconstruye un bloque desde un diccionario (ver to_dict)
+        
+        POR QUÉ: Los bloques recibidos de otros nodos deben conservar
+        timestamp, nonce y hash originales para poder validarlos
+        """
+        block = Block.__new__(Block)
+        block.index = data['index']
+        block.timestamp = data['timestamp']
+        block.transactions = [Transaction.from_dict(tx) for tx in data['transactions']]
+        block.previous_hash = data['previous_hash']
+        block.miner_address = data['miner_address']
+        block.nonce = data['nonce']
+        block.hash = data['hash']
+        return block
+    
     def __repr__(self):
         return f"Block #{self.index} [{len(self.transactions)} txs] - Hash: {self.hash[:10]}..."
 
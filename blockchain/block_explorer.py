@@ -29,22 +29,23 @@ class BlockExplorer:
     
     def get_block_by_hash(self, block_hash):
         """
-        Busca un bloque por su hash
+        Busca un bloque por su hash (completo o prefijo)
+        
+        POR QUÉ índice: el coste no depende del largo de la cadena
         """
-        for block in self.blockchain.chain:
-            if block.hash == block_hash or block.hash.startswith(block_hash):
-                return block
-        return None
+        height = self.blockchain.get_index().find_block(block_hash)
+        if height is None:
+            return None
+        return self.blockchain.chain[height]
     
-    def search_blocks_by_miner(self, miner_address):
+    def search_blocks_by_miner(self, miner_address, limit=None):
         """
-        Busca todos los bloques minados por una dirección
+        Busca los bloques minados por una dirección (o prefijo)
+        
+        limit: solo los limit más recientes (None = todos)
         """
-        blocks = []
-        for block in self.blockchain.chain:
-            if block.miner_address == miner_address or block.miner_address.startswith(miner_address):
-                blocks.append(block)
-        return blocks
+        heights = self.blockchain.get_index().get_miner_heights(miner_address, limit)
+        return [self.blockchain.chain[h] for h in heights]
     
     def get_block_stats(self, block):
         """
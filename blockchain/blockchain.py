@@ -3,6 +3,7 @@
 import os
 import sys
 import json
+import threading
 
 # Obtener ruta absoluta del proyecto
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,11 +11,17 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from blockchain.block import Block
-from blockchain.transaction import Transaction
+from blockchain.transaction import Transaction, verify_transactions_batch
 from blockchain.difficulty import DifficultyAdjustment
+from blockchain.chain_index import ChainIndex
+from blockchain.rollups import ActivityRollups
 import config
 from blockchain.storage import BlockchainStorage
 from utils.backup_system import BackupSystem
+from utils.rwlock import ReadWriteLock, write_locked
+from utils.logger import get_logger
+
+log = get_logger(__name__)
 
 class Blockchain:
     def __init__(self, auto_save=True, save_filename="colcript_main.json"):
@@ -22,12 +29,16 @@ class Blockchain:
         self.chain = []
         self.pending_transactions = []
         self.difficulty = config.MINING_DIFFICULTY
+        self.difficulty_adjusted_height = None  # Altura del último ajuste de dificultad
         self.mining_reward = config.MINING_REWARD
         self.auto_save = auto_save
         self.save_filename = save_filename
         self.storage = BlockchainStorage()
         self.backup_system = BackupSystem()
         self.backup_interval = 5  # Hacer backup cada 5 bloques
+        self.chain_index = None  # Se crea al primer uso (ver get_index)
+        self.activity_rollups = None  # Se crea al primer uso (ver get_rollups)
+        self.init_locks()
     
         # Crear bloque génesis
         self.create_genesis_block()
@@ -38,16 +49,68 @@ class Blockchain:
         genesis_block = Block(0, [genesis_tx], "0", "GENESIS")
         genesis_block.mine_block(self.difficulty)
         self.chain.append(genesis_block)
-        print(f"✅ Bloque génesis creado: {genesis_block.hash[:20]}...")
+        log.info("✅ Bloque génesis creado", hash=genesis_block.hash)
     
+    def init_locks(self):
+        """
+        Crea los locks de la cadena
+
+        lock: lectores/escritor; los métodos que modifican la cadena o el
+        pool de pendientes escriben con él (ver write_locked) y el servidor
+        lee con él durante cada petición GET.
+        sync_lock: serializa la puesta al día de índices y agregados, que
+        los lectores concurrentes pueden pedir a la vez
+        """
+        self.lock = ReadWriteLock()
+        self.sync_lock = threading.RLock()
+
+    def __getstate__(self):
+        """
+        Estado para copy.deepcopy/pickle sin los locks
+
+        POR QUÉ: Los locks no se pueden copiar; la copia recibe los suyos
+        """
+        state = self.__dict__.copy()
+        state.pop('lock', None)
+        state.pop('sync_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.init_locks()
+
+    def get_index(self):
+        """
+        Índices secundarios de la cadena, al día con self.chain
+
+        POR QUÉ getattr: blockchains cargadas con Blockchain.__new__
+        (ver BlockchainStorage.load_blockchain) pueden no tenerlo
+        """
+        with self.sync_lock:
+            if getattr(self, 'chain_index', None) is None:
+                self.chain_index = ChainIndex()
+
+            self.chain_index.sync(self.chain)
+            return self.chain_index
+
+    def get_rollups(self):
+        """Actividad por minuto/hora/día, al día con self.chain"""
+        with self.sync_lock:
+            if getattr(self, 'activity_rollups', None) is None:
+                self.activity_rollups = ActivityRollups()
+
+            self.activity_rollups.sync(self.chain)
+            return self.activity_rollups
+
     def get_latest_block(self):
         """Obtiene el último bloque de la cadena"""
         return self.chain[-1]
 
+    @write_locked
     def add_transaction(self, transaction):
         """Añade una transacción a las pendientes"""
         if not transaction.is_valid():
-            print("❌ Transacción inválida, no se puede añadir")
+            log.warning("❌ Transacción inválida, no se puede añadir", sender=transaction.sender)
             return False
     
         self.pending_transactions.append(transaction)
@@ -56,19 +119,91 @@ class Blockchain:
         if config.PRIORITIZE_BY_FEE:
             self.pending_transactions.sort(key=lambda tx: tx.fee, reverse=True)
     
-        print(f"✅ Transacción añadida al pool (fee: {transaction.fee} CLC)")
+        log.debug("✅ Transacción añadida al pool", fee=transaction.fee,
+                  pending=len(self.pending_transactions))
         return True
+
+    @write_locked
+    def add_transactions(self, transactions):
+        """
+        Añade un lote de transacciones recibidas de la red
+
+        Returns: lista de transacciones añadidas
+
+        POR QUÉ: Las firmas del lote se verifican de una vez (ver
+        verify_transactions_batch) y el pool se ordena una sola vez.
+        Se descartan recompensas, transacciones ya pendientes o ya
+        confirmadas en la cadena, las que no cumplen check_transfer o
+        gastan más del balance del remitente (descontando lo que ya
+        gasta en el pool) y las que no caben en MEMPOOL_MAX_SIZE.
+        """
+        confirmed = self.get_index().by_transaction
+        pending = {tx.signature for tx in self.pending_transactions if tx.signature}
+
+        # Comprobaciones baratas antes de verificar firmas
+        candidates = []
+        for tx in transactions:
+            if tx.sender == 'MINING' or not tx.signature:
+                continue
+            if tx.signature in pending or tx.signature in confirmed:
+                continue
+            if not self.check_transfer(tx)[0]:
+                continue
+            pending.add(tx.signature)
+            candidates.append(tx)
+
+        # Gasto del pool por remitente
+        spent = {}
+        for tx in self.pending_transactions:
+            if tx.sender != 'MINING':
+                spent[tx.sender] = spent.get(tx.sender, 0) + tx.amount + tx.fee
+
+        room = config.MEMPOOL_MAX_SIZE - len(self.pending_transactions)
+        added = []
+        balances = {}
+
+        for tx, valid in zip(candidates, verify_transactions_batch(candidates)):
+            if len(added) >= room:
+                log.warning("⚠️ Mempool lleno, transacciones descartadas",
+                            max_size=config.MEMPOOL_MAX_SIZE)
+                break
+            if not valid:
+                continue
+
+            if tx.sender not in balances:
+                balances[tx.sender] = self.get_balance(tx.sender) - spent.get(tx.sender, 0)
+            if balances[tx.sender] - tx.amount - tx.fee < -1e-9:
+                continue
+
+            balances[tx.sender] -= tx.amount + tx.fee
+            added.append(tx)
+
+        if added:
+            self.pending_transactions.extend(added)
+
+            if config.PRIORITIZE_BY_FEE:
+                self.pending_transactions.sort(key=lambda tx: tx.fee, reverse=True)
+
+            log.debug("✅ Transacciones añadidas al pool", count=len(added),
+                      pending=len(self.pending_transactions))
+
+        return added
     
-    def mine_pending_transactions(self, miner_address):
+    @write_locked
+    def create_block_template(self, miner_address):
         """
-        Mina las transacciones pendientes y añade el bloque a la cadena
+        Crea el siguiente bloque (sin minar) con las transacciones pendientes
+
+        Ajusta la dificultad si toca y añade la recompensa del minero
+        (recompensa base + fees). No modifica el pool de pendientes.
+
+        Returns: (block, total_fees)
         """
         # Ajustar dificultad si es necesario
         if config.DIFFICULTY_ADJUSTMENT_ENABLED:
             adjusted, old_diff, new_diff, reason = DifficultyAdjustment.adjust_if_needed(self)
             if adjusted:
-                print(f"\n🔧 AJUSTE DE DIFICULTAD: {old_diff} → {new_diff}")
-                print(f"   Razón: {reason}\n") 
+                log.info("🔧 Ajuste de dificultad", old=old_diff, new=new_diff, reason=reason)
 
         # Calcular fees totales de las transacciones pendientes
         total_fees = sum(tx.fee for tx in self.pending_transactions if hasattr(tx, 'fee'))
@@ -76,41 +211,61 @@ class Blockchain:
         # Crear transacción de recompensa para el minero (recompensa base + fees)
         total_reward = self.mining_reward + total_fees
         reward_tx = Transaction('MINING', miner_address, total_reward)
-        self.pending_transactions.append(reward_tx)
 
-        
         # Crear nuevo bloque
         block = Block(
             len(self.chain),
-            self.pending_transactions,
+            self.pending_transactions + [reward_tx],
             self.get_latest_block().hash,
             miner_address
         )
+        return block, total_fees
+
+    @write_locked
+    def mine_pending_transactions(self, miner_address):
+        """
+        Mina las transacciones pendientes y añade el bloque a la cadena
+        """
+        block, total_fees = self.create_block_template(miner_address)
+        total_reward = self.mining_reward + total_fees
         
         # Minar el bloque
         block.mine_block(self.difficulty)
         
-        # Añadir a la cadena
-        self.chain.append(block)
-        
         # Limpiar transacciones pendientes
         self.pending_transactions = []
-        
+
+        log.info("💎 Recompensa de minado", block_index=block.index, reward=total_reward,
+                 base=self.mining_reward, fees=total_fees)
+
+        # Añadir a la cadena
+        self._append_block(block)
+        return block
+
+    def _append_block(self, block):
+        """
+        Añade un bloque ya validado a la cadena y lo persiste
+
+        POR QUÉ: Punto único para bloques minados localmente y bloques
+        recibidos de otros nodos (ver add_block)
+        """
+        self.chain.append(block)
+        index = self.get_index()
+        rollups = self.get_rollups()
 
         # Auto-guardar blockchain
         if self.auto_save:
             self.storage.save_blockchain(self, self.save_filename)
 
-        # Mostrar información de fees
-        if total_fees > 0:
-            print(f"💰 Fees recolectados: {total_fees} CLC")
-            print(f"💎 Recompensa total: {total_reward} CLC (base: {self.mining_reward} + fees: {total_fees})")
-        else:
-            print(f"💎 Recompensa: {self.mining_reward} CLC (sin fees)")
-
         # Guardar blockchain
         if self.storage:
             self.storage.save_blockchain(self, "colcript_main.json")
+
+            # Índices junto al archivo de esta cadena (otra.json -> otra.idx)
+            # POR QUÉ getattr: blockchains cargadas con Blockchain.__new__
+            filename = getattr(self, 'save_filename', None) or "colcript_main.json"
+            self.storage.save_index(index, filename)
+            self.storage.save_rollups(rollups, filename)
     
         # Backup automático cada N bloques
         # POR QUÉ verificar hasattr: blockchain puede ser cargada sin backup_system
@@ -121,51 +276,205 @@ class Blockchain:
         
             if os.path.exists(blockchain_file):
                 self.backup_system.create_backup(blockchain_file, tag=f"block_{len(self.chain)}")
-                print(f"💾 Backup automático creado (bloque #{len(self.chain)})")
+                log.info("💾 Backup automático creado", block_index=block.index)
 
-        print(f"✅ Bloque #{block.index} añadido a la cadena")
-        return block
+        log.info("✅ Bloque añadido a la cadena", block_index=block.index, hash=block.hash,
+                 transactions=len(block.transactions))
+
+    @staticmethod
+    def check_transfer(tx):
+        """
+        Valida amount y fee de una transferencia (no recompensa)
+        Retorna (valid: bool, reason: str)
+
+        POR QUÉ: La firma no impide valores negativos; un amount o fee
+        negativo aumentaría el balance del remitente a costa de otro.
+        Se compara con 'not (x > 0)' para rechazar también NaN.
+        """
+        for value in (tx.amount, tx.fee):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return False, "Transaction amount and fee must be numbers"
+
+        if not tx.amount > 0:
+            return False, "Transaction amount must be positive"
+
+        if not tx.fee >= 0:
+            return False, "Transaction fee cannot be negative"
+
+        return True, "Transaction is valid"
+
+    def validate_block(self, block, difficulty=None):
+        """
+        Valida un bloque candidato a ser el siguiente de la cadena
+        Retorna (valid: bool, reason: str)
+
+        difficulty: proof of work exigido (por defecto self.difficulty)
+
+        Verifica enlace, proof of work, amounts y fees, que las
+        recompensas paguen al minero, que ninguna transacción esté ya
+        confirmada o repetida, recompensa, firmas (en lote) y que ningún
+        remitente gaste más de su balance
+        """
+        latest = self.get_latest_block()
+
+        if block.index != len(self.chain):
+            return False, f"Expected block #{len(self.chain)}, got #{block.index}"
+
+        if block.previous_hash != latest.hash:
+            return False, "Previous hash does not match chain tip"
+
+        if block.hash != block.calculate_hash():
+            return False, "Invalid block hash"
+
+        if difficulty is None:
+            difficulty = self.difficulty
+        if block.hash[:difficulty] != '0' * difficulty:
+            return False, "Invalid proof of work"
+
+        if not block.transactions:
+            return False, "Block has no transactions"
+
+        # Reglas por transacción y repeticiones (en la cadena o en el bloque)
+        # POR QUÉ: Una transacción firmada ya confirmada sigue teniendo
+        # firma válida; sin esto se podría cobrar otra vez
+        confirmed = self.get_index().by_transaction
+        signatures = set()
+        for tx in block.transactions:
+            if tx.sender == 'MINING':
+                if tx.recipient != block.miner_address:
+                    return False, "Mining reward must pay the block miner"
+                continue
+
+            valid, reason = self.check_transfer(tx)
+            if not valid:
+                return False, reason
+
+            if tx.signature in confirmed:
+                return False, "Block contains an already confirmed transaction"
+            if tx.signature in signatures:
+                return False, "Block contains duplicate transactions"
+            if tx.signature:
+                signatures.add(tx.signature)
+
+        # La recompensa no puede superar recompensa base + fees del bloque
+        total_fees = sum(tx.fee for tx in block.transactions if tx.sender != 'MINING')
+        total_rewards = sum(tx.amount for tx in block.transactions if tx.sender == 'MINING')
+        if total_rewards > self.mining_reward + total_fees + 1e-9:
+            return False, "Mining reward exceeds allowed amount"
+
+        # Firmas: las transacciones idénticas a una del pool ya se verificaron
+        # al entrar al pool, el resto se verifica en un solo lote
+        pending = {tx.signature: tx for tx in self.pending_transactions if tx.signature}
+        to_verify = []
+        for tx in block.transactions:
+            known = pending.get(tx.signature) if tx.signature else None
+            if known is None or known.to_dict() != tx.to_dict():
+                to_verify.append(tx)
+
+        if not all(verify_transactions_batch(to_verify)):
+            return False, "Block contains invalid transaction signatures"
+
+        # Balances: aplicar las transacciones en orden
+        # (solo se consulta la cadena para los remitentes)
+        balances = {}
+        credits = {}
+        for tx in block.transactions:
+            if tx.sender != 'MINING':
+                if tx.sender not in balances:
+                    balances[tx.sender] = self.get_balance(tx.sender) + credits.get(tx.sender, 0)
+                balances[tx.sender] -= tx.amount + tx.fee
+                if balances[tx.sender] < -1e-9:
+                    return False, f"Insufficient balance for sender {tx.sender[:20]}..."
+            if tx.recipient in balances:
+                balances[tx.recipient] += tx.amount
+            else:
+                credits[tx.recipient] = credits.get(tx.recipient, 0) + tx.amount
+
+        return True, "Block is valid"
+
+    @write_locked
+    def add_block(self, block):
+        """
+        Valida y añade un bloque recibido de otro nodo
+        Retorna (added: bool, reason: str)
+
+        Las transacciones del bloque se eliminan del pool de pendientes
+        """
+        # Mismo ajuste de dificultad que haría el minero antes de este bloque,
+        # pero solo se aplica si el bloque es válido
+        # POR QUÉ: Un bloque rechazado no debe cambiar la dificultad
+        difficulty = self.difficulty
+        if config.DIFFICULTY_ADJUSTMENT_ENABLED and block.index == len(self.chain):
+            difficulty = DifficultyAdjustment.expected_difficulty(self)
+
+        valid, reason = self.validate_block(block, difficulty)
+        if not valid:
+            return False, reason
+
+        if config.DIFFICULTY_ADJUSTMENT_ENABLED:
+            adjusted, old_diff, new_diff, reason = DifficultyAdjustment.adjust_if_needed(self)
+            if adjusted:
+                log.info("🔧 Ajuste de dificultad", old=old_diff, new=new_diff, reason=reason)
+
+        self._append_block(block)
+        self._evict_pending_transactions(block)
+
+        return True, f"Block #{block.index} added"
+
+    def _evict_pending_transactions(self, block):
+        """Elimina del pool las transacciones confirmadas en el bloque"""
+        confirmed = {tx.signature for tx in block.transactions if tx.signature}
+        if confirmed:
+            self.pending_transactions = [
+                tx for tx in self.pending_transactions
+                if tx.signature not in confirmed
+            ]
 
     def get_balance(self, address):
         """Calcula el balance de una dirección"""
         balance = 0
     
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.sender == address:
-                    balance -= tx.amount
-                    # El remitente también paga el fee
-                    if hasattr(tx, 'fee') and tx.sender != 'MINING':
-                        balance -= tx.fee
-                if tx.recipient == address:
-                    balance += tx.amount
+        # Solo las transacciones de la dirección (índice por dirección)
+        index = self.get_index()
+        for block, tx in index.iter_address_transactions(self.chain, address, newest_first=False):
+            if tx.sender == address:
+                balance -= tx.amount
+                # El remitente también paga el fee
+                if hasattr(tx, 'fee') and tx.sender != 'MINING':
+                    balance -= tx.fee
+            if tx.recipient == address:
+                balance += tx.amount
     
         return balance
 
-    def is_chain_valid(self):
-        """Verifica que la blockchain sea válida"""
-        for i in range(1, len(self.chain)):
+    def is_chain_valid(self, start=1):
+        """
+        Verifica que la blockchain sea válida
+
+        start: primer bloque a verificar (para comprobar solo los nuevos)
+        """
+        for i in range(max(1, start), len(self.chain)):
             current_block = self.chain[i]
             previous_block = self.chain[i - 1]
             
             # Verificar que el hash del bloque sea correcto
             if current_block.hash != current_block.calculate_hash():
-                print(f"❌ Hash inválido en bloque #{i}")
+                log.warning("❌ Hash inválido", block_index=i)
                 return False
             
             # Verificar que el bloque apunte al anterior
             if current_block.previous_hash != previous_block.hash:
-                print(f"❌ Cadena rota en bloque #{i}")
+                log.warning("❌ Cadena rota", block_index=i)
                 return False
             
             # Verificar que las transacciones sean válidas
             if not current_block.has_valid_transactions():
-                print(f"❌ Transacciones inválidas en bloque #{i}")
+                log.warning("❌ Transacciones inválidas", block_index=i)
                 return False
             
             # Verificar proof of work
             if current_block.hash[:self.difficulty] != '0' * self.difficulty:
-                print(f"❌ Proof of work inválido en bloque #{i}")
+                log.warning("❌ Proof of work inválido", block_index=i)
                 return False
         
         return True
@@ -0,0 +1,261 @@
+# blockchain/chain_index.py - Índices secundarios de la cadena
+
+import os
+import sys
+import json
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+def timestamp_to_seconds(timestamp):
+    """Timestamp de bloque (epoch o ISO 8601) en segundos desde epoch"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+class ChainIndex:
+    """
+    Índices secundarios sobre la cadena
+
+    - by_address: dirección -> [[altura, posición], ...] en orden de cadena
+    - by_transaction: ID de transacción (hash) o firma -> [altura, posición]
+    - by_block_hash: hash de bloque -> altura (+ lista ordenada para prefijos)
+    - by_miner: minero -> [alturas] (+ lista ordenada para prefijos)
+    - timestamps: altura -> timestamp (no decreciente, para bisect)
+
+    Se actualiza al añadir cada bloque (ver Blockchain._append_block) y
+    se persiste junto a la blockchain (ver BlockchainStorage.save_index).
+
+    POR QUÉ: Historiales y búsquedas recorrían toda la cadena en cada
+    petición; con el índice cuestan O(resultados)
+    """
+
+    VERSION = 4
+
+    def __init__(self):
+        self.height = 0  # Bloques indexados
+        self.tip_hash = None  # Hash del último bloque indexado
+        self.by_address = {}
+        self.by_transaction = {}
+        self.by_block_hash = {}
+        self.by_miner = {}
+        self.timestamps = []
+
+        # Claves ordenadas para búsqueda por prefijo (no se persisten)
+        self.sorted_hashes = []
+        self.sorted_miners = []
+
+    # ==================== ACTUALIZACIÓN ====================
+
+    def add_block(self, block):
+        """Indexa el siguiente bloque de la cadena"""
+        for position, tx in enumerate(block.transactions):
+            entry = [block.index, position]
+            self.by_address.setdefault(tx.sender, []).append(entry)
+            if tx.recipient != tx.sender:
+                self.by_address.setdefault(tx.recipient, []).append(entry)
+
+            # Se conserva la primera confirmación si un ID se repite
+            self.by_transaction.setdefault(tx.get_hash(), entry)
+            if tx.signature:
+                self.by_transaction.setdefault(tx.signature, entry)
+
+        self.by_block_hash[block.hash] = block.index
+        insort(self.sorted_hashes, block.hash)
+
+        if block.miner_address not in self.by_miner:
+            self.by_miner[block.miner_address] = []
+            insort(self.sorted_miners, block.miner_address)
+        self.by_miner[block.miner_address].append(block.index)
+
+        # Máximo acumulado: si un bloque llega con la hora atrasada la
+        # lista sigue ordenada y bisect sigue siendo válido
+        timestamp = timestamp_to_seconds(block.timestamp)
+        if self.timestamps:
+            timestamp = max(timestamp, self.timestamps[-1])
+        self.timestamps.append(timestamp)
+
+        self.height = block.index + 1
+        self.tip_hash = block.hash
+
+    def sync(self, chain):
+        """
+        Pone el índice al día con la cadena
+
+        Solo indexa los bloques nuevos; si la cadena ya no contiene el
+        último bloque indexado (cadena reemplazada), reconstruye desde cero
+        """
+        if self.height == len(chain) and (not chain or chain[-1].hash == self.tip_hash):
+            return
+
+        if self.height > len(chain) or (self.height and chain[self.height - 1].hash != self.tip_hash):
+            self.__init__()
+
+        for block in chain[self.height:]:
+            self.add_block(block)
+
+    @classmethod
+    def build(cls, chain):
+        index = cls()
+        index.sync(chain)
+        return index
+
+    # ==================== CONSULTAS ====================
+
+    def get_address_entries(self, address, limit=None, before=None, newest_first=True):
+        """
+        Posiciones (altura, posición) de las transacciones de una dirección
+
+        limit: máximo de resultados
+        before: (altura, posición) exclusivo; pagina hacia atrás desde ahí
+        newest_first: orden de más reciente a más antigua
+
+        Coste O(log n + resultados)
+        """
+        entries = self.by_address.get(address, [])
+        end = bisect_left(entries, list(before)) if before is not None else len(entries)
+
+        if newest_first:
+            start = max(0, end - limit) if limit is not None else 0
+            return [tuple(e) for e in reversed(entries[start:end])]
+
+        stop = min(end, limit) if limit is not None else end
+        return [tuple(e) for e in entries[:stop]]
+
+    def find_transaction(self, tx_id):
+        """
+        (altura, posición) de una transacción por ID o por firma; None si no existe
+
+        El ID es Transaction.get_hash(), también para recompensas de
+        minado (no tienen firma). Coste O(1).
+        """
+        entry = self.by_transaction.get(tx_id)
+        return tuple(entry) if entry is not None else None
+
+    def _prefix_range(self, sorted_keys, prefix):
+        """Claves de sorted_keys que empiezan por prefix (bisect)"""
+        start = bisect_left(sorted_keys, prefix)
+        end = start
+        while end < len(sorted_keys) and sorted_keys[end].startswith(prefix):
+            end += 1
+        return sorted_keys[start:end]
+
+    def find_block(self, block_hash):
+        """
+        Altura de un bloque por hash completo o prefijo; None si no existe
+
+        Con un prefijo ambiguo devuelve el primer hash en orden alfabético
+        """
+        if not block_hash:
+            return None
+
+        height = self.by_block_hash.get(block_hash)
+        if height is not None:
+            return height
+
+        start = bisect_left(self.sorted_hashes, block_hash)
+        if start < len(self.sorted_hashes) and self.sorted_hashes[start].startswith(block_hash):
+            return self.by_block_hash[self.sorted_hashes[start]]
+        return None
+
+    def search_block_hashes(self, prefix, limit=10):
+        """Alturas de los bloques cuyo hash empieza por prefix"""
+        if not prefix:
+            return []
+        start = bisect_left(self.sorted_hashes, prefix)
+        heights = []
+        for block_hash in self.sorted_hashes[start:start + limit]:
+            if not block_hash.startswith(prefix):
+                break
+            heights.append(self.by_block_hash[block_hash])
+        return heights
+
+    def get_miner_heights(self, miner, limit=None):
+        """
+        Alturas minadas por una dirección (o por las que empiezan por miner)
+
+        limit: solo las limit más recientes (en orden de cadena)
+
+        Coste O(log mineros + resultados)
+        """
+        if not miner:
+            return []
+
+        miners = self._prefix_range(self.sorted_miners, miner)
+        if len(miners) == 1:
+            heights = self.by_miner[miners[0]]
+            return list(heights[-limit:] if limit else heights)
+        if limit:
+            return sorted(heapq.nlargest(limit, (h for m in miners for h in self.by_miner[m])))
+        return sorted(h for m in miners for h in self.by_miner[m])
+
+    def count_miner_blocks(self, miner):
+        """Número de bloques minados por una dirección (o prefijo), sin listarlos"""
+        if not miner:
+            return 0
+        return sum(len(self.by_miner[m]) for m in self._prefix_range(self.sorted_miners, miner))
+
+    def get_heights_in_range(self, start=None, end=None, limit=None, after=None):
+        """
+        Alturas de los bloques con start <= timestamp <= end (segundos epoch)
+
+        limit: máximo de resultados
+        after: altura exclusiva; pagina hacia delante desde ahí
+
+        Coste O(log n + resultados)
+        """
+        low = bisect_left(self.timestamps, start) if start is not None else 0
+        high = bisect_right(self.timestamps, end) if end is not None else len(self.timestamps)
+        if after is not None:
+            low = max(low, after + 1)
+        if limit is not None:
+            high = min(high, low + limit)
+        return range(low, max(low, high))
+
+    def count_address_entries(self, address):
+        return len(self.by_address.get(address, []))
+
+    def iter_address_transactions(self, chain, address, **kwargs):
+        """(bloque, transacción) de una dirección, mismas opciones que get_address_entries"""
+        for height, position in self.get_address_entries(address, **kwargs):
+            block = chain[height]
+            yield block, block.transactions[position]
+
+    # ==================== PERSISTENCIA ====================
+
+    def to_dict(self):
+        return {
+            'version': self.VERSION,
+            'height': self.height,
+            'tip_hash': self.tip_hash,
+            'by_address': self.by_address,
+            'by_transaction': self.by_transaction,
+            'by_block_hash': self.by_block_hash,
+            'by_miner': self.by_miner,
+            'timestamps': self.timestamps
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restaura un índice guardado; None si la versión no coincide"""
+        if data.get('version') != cls.VERSION:
+            return None
+
+        index = cls()
+        index.height = data['height']
+        index.tip_hash = data['tip_hash']
+        index.by_address = data['by_address']
+        index.by_transaction = data['by_transaction']
+        index.by_block_hash = data['by_block_hash']
+        index.by_miner = data['by_miner']
+        index.timestamps = data['timestamps']
+        index.sorted_hashes = sorted(index.by_block_hash)
+        index.sorted_miners = sorted(index.by_miner)
+        return index
@@ -24,8 +24,12 @@ class DifficultyAdjustment:
         if not config.DIFFICULTY_ADJUSTMENT_ENABLED:
             return False
         
-        # Ajustar cada N bloques
+        # Ajustar cada N bloques, una sola vez por altura
+        # POR QUÉ: La plantilla del minero y add_block pasan por la misma
+        # altura; ajustar dos veces desalinea la dificultad del bloque
         current_height = len(blockchain.chain)
+        if getattr(blockchain, 'difficulty_adjusted_height', None) == current_height:
+            return False
         return current_height > 0 and current_height % config.DIFFICULTY_ADJUSTMENT_INTERVAL == 0
     
     @staticmethod
@@ -80,6 +84,15 @@ class DifficultyAdjustment:
         
         return new_difficulty
     
+    @staticmethod
+    def expected_difficulty(blockchain):
+        """
+        Dificultad que corresponde al siguiente bloque, sin modificar la cadena
+        """
+        if not DifficultyAdjustment.should_adjust(blockchain):
+            return blockchain.difficulty
+        return DifficultyAdjustment.calculate_new_difficulty(blockchain)
+    
     @staticmethod
     def adjust_if_needed(blockchain):
         """
@@ -91,6 +104,7 @@ class DifficultyAdjustment:
         
         old_difficulty = blockchain.difficulty
         new_difficulty = DifficultyAdjustment.calculate_new_difficulty(blockchain)
+        blockchain.difficulty_adjusted_height = len(blockchain.chain)
         
         if old_difficulty == new_difficulty:
             return False, old_difficulty, new_difficulty, "Difficulty unchanged"
@@ -0,0 +1,173 @@
+# blockchain/rollups.py - Agregados de actividad por intervalos de tiempo
+
+import os
+import sys
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from blockchain.chain_index import timestamp_to_seconds
+
+# Campos de cada intervalo (se guardan como lista, en este orden)
+BLOCKS, TRANSACTIONS, VOLUME, FEES, BLOCK_TIME_SUM, BLOCK_TIME_COUNT = range(6)
+
+
+class ActivityRollups:
+    """
+    Actividad de la red agrupada por minuto, hora y día
+
+    Cada intervalo (alineado a epoch UTC) guarda bloques, transacciones,
+    volumen, fees y la suma de tiempos entre bloques para el promedio.
+    Se actualiza al añadir cada bloque (ver Blockchain._append_block) y se
+    persiste junto a la blockchain (ver BlockchainStorage.save_rollups).
+
+    POR QUÉ: Las gráficas de actividad recorrían toda la cadena en cada
+    petición; con los intervalos leen como mucho unos cientos de filas
+    """
+
+    VERSION = 1
+
+    RESOLUTIONS = {
+        'minute': 60,
+        'hour': 3600,
+        'day': 86400
+    }
+
+    def __init__(self):
+        self.height = 0
+        self.tip_hash = None
+        self.last_timestamp = None
+        self.buckets = {resolution: {} for resolution in self.RESOLUTIONS}
+
+    # ==================== ACTUALIZACIÓN ====================
+
+    def add_block(self, block):
+        """Suma el siguiente bloque de la cadena a sus intervalos"""
+        timestamp = timestamp_to_seconds(block.timestamp)
+        volume = sum(tx.amount for tx in block.transactions)
+        fees = sum(getattr(tx, 'fee', 0) for tx in block.transactions if tx.sender != 'MINING')
+
+        for resolution, size in self.RESOLUTIONS.items():
+            buckets = self.buckets[resolution]
+            start = int(timestamp // size) * size
+
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = [0, 0, 0, 0, 0, 0]
+                self._prune(resolution)
+
+            bucket[BLOCKS] += 1
+            bucket[TRANSACTIONS] += len(block.transactions)
+            bucket[VOLUME] += volume
+            bucket[FEES] += fees
+            if self.last_timestamp is not None:
+                bucket[BLOCK_TIME_SUM] += timestamp - self.last_timestamp
+                bucket[BLOCK_TIME_COUNT] += 1
+
+        self.height = block.index + 1
+        self.tip_hash = block.hash
+        self.last_timestamp = timestamp
+
+    def _prune(self, resolution):
+        """Descarta los intervalos más antiguos por encima de la retención"""
+        buckets = self.buckets[resolution]
+        limit = config.ACTIVITY_ROLLUP_RETENTION.get(resolution)
+        if limit is None or len(buckets) <= limit:
+            return
+
+        for start in sorted(buckets)[:len(buckets) - limit]:
+            del buckets[start]
+
+    def sync(self, chain):
+        """
+        Pone los intervalos al día con la cadena
+
+        Solo procesa los bloques nuevos; si la cadena fue reemplazada,
+        recalcula desde cero
+        """
+        if self.height == len(chain) and (not chain or chain[-1].hash == self.tip_hash):
+            return
+
+        if self.height > len(chain) or (self.height and chain[self.height - 1].hash != self.tip_hash):
+            self.__init__()
+
+        for block in chain[self.height:]:
+            self.add_block(block)
+
+    @classmethod
+    def build(cls, chain):
+        rollups = cls()
+        rollups.sync(chain)
+        return rollups
+
+    # ==================== CONSULTAS ====================
+
+    def get_series(self, resolution, since=None, until=None):
+        """
+        Serie continua de intervalos entre since y until (segundos epoch)
+
+        Los intervalos sin bloques se devuelven a cero para que las
+        gráficas no salten huecos. Sin since, empieza en el intervalo
+        guardado más antiguo.
+        """
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+
+        size = self.RESOLUTIONS[resolution]
+        buckets = self.buckets[resolution]
+        if since is None:
+            if not buckets:
+                return []
+            since = min(buckets)
+        if until is None:
+            until = max(buckets) if buckets else since
+
+        series = []
+        start = int(since // size) * size
+        while start <= until:
+            bucket = buckets.get(start, [0, 0, 0, 0, 0, 0])
+            series.append({
+                'start': start,
+                'blocks': bucket[BLOCKS],
+                'transactions': bucket[TRANSACTIONS],
+                'volume': bucket[VOLUME],
+                'fees': bucket[FEES],
+                'avg_block_time': (
+                    round(bucket[BLOCK_TIME_SUM] / bucket[BLOCK_TIME_COUNT], 2)
+                    if bucket[BLOCK_TIME_COUNT] else 0
+                )
+            })
+            start += size
+
+        return series
+
+    # ==================== PERSISTENCIA ====================
+
+    def to_dict(self):
+        return {
+            'version': self.VERSION,
+            'height': self.height,
+            'tip_hash': self.tip_hash,
+            'last_timestamp': self.last_timestamp,
+            'buckets': self.buckets
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restaura intervalos guardados; None si la versión no coincide"""
+        if data.get('version') != cls.VERSION:
+            return None
+
+        rollups = cls()
+        rollups.height = data['height']
+        rollups.tip_hash = data['tip_hash']
+        rollups.last_timestamp = data['last_timestamp']
+        # JSON guarda las claves como texto
+        rollups.buckets = {
+            resolution: {int(start): bucket for start, bucket in data['buckets'].get(resolution, {}).items()}
+            for resolution in cls.RESOLUTIONS
+        }
+        return rollups
@@ -13,6 +13,9 @@ if project_root not in sys.path:
 
 from blockchain.block import Block
 from blockchain.transaction import Transaction
+from utils.logger import get_logger
+
+log = get_logger(__name__)
 
 class BlockchainStorage:
     def __init__(self, data_dir=None):
@@ -44,6 +47,7 @@ class BlockchainStorage:
         blockchain_data = {
             'version': '1.0',
             'difficulty': blockchain.difficulty,
+            'difficulty_adjusted_height': getattr(blockchain, 'difficulty_adjusted_height', None),
             'mining_reward': blockchain.mining_reward,
             'timestamp': datetime.now().isoformat(),
             'blocks': []
@@ -68,7 +72,8 @@ class BlockchainStorage:
                     'recipient': tx.recipient,
                     'amount': tx.amount,
                     'timestamp': tx.timestamp,
-                    'signature': tx.signature
+                    'signature': tx.signature,
+                    'fee': tx.fee
                 }
                 block_data['transactions'].append(tx_data)
             
@@ -78,7 +83,7 @@ class BlockchainStorage:
         with open(filepath, 'w') as f:
             json.dump(blockchain_data, f, indent=2)
         
-        print(f"💾 Blockchain guardada: {filename}")
+        log.debug("💾 Blockchain guardada", file=filename, blocks=len(blockchain.chain))
         return filepath
     
     def load_blockchain(self, filename):
@@ -88,21 +93,23 @@ class BlockchainStorage:
         filepath = os.path.join(self.data_dir, filename)
         
         if not os.path.exists(filepath):
-            print(f"❌ Archivo no encontrado: {filename}")
+            log.warning("❌ Archivo no encontrado", file=filename)
             return None
         
         try:
             with open(filepath, 'r') as f:
                 blockchain_data = json.load(f)
             
-            print(f"📂 Cargando blockchain desde: {filename}")
+            log.info("📂 Cargando blockchain", file=filename)
             
             # Crear blockchain vacía (sin génesis automático)
             from blockchain.blockchain import Blockchain
             blockchain = Blockchain.__new__(Blockchain)
+            blockchain.init_locks()
             blockchain.chain = []
             blockchain.pending_transactions = []
             blockchain.difficulty = blockchain_data['difficulty']
+            blockchain.difficulty_adjusted_height = blockchain_data.get('difficulty_adjusted_height')
             blockchain.mining_reward = blockchain_data['mining_reward']
             
             # Reconstruir cada bloque
@@ -128,7 +135,7 @@ class BlockchainStorage:
                         else:
                             import config
                             tx.fee = config.DEFAULT_TRANSACTION_FEE
-                            print(f"⚠️  Transacción antigua sin fee, asignando {tx.fee} CLC")
+                            log.debug("⚠️  Transacción antigua sin fee", fee=tx.fee)
     
                     transactions.append(tx)
                 
@@ -144,18 +151,79 @@ class BlockchainStorage:
                 
                 blockchain.chain.append(block)
             
-            print(f"✅ Blockchain cargada: {len(blockchain.chain)} bloques")
+            log.info("✅ Blockchain cargada", file=filename, blocks=len(blockchain.chain))
+            
+            # Índices guardados (get_index indexa solo lo que falte)
+            blockchain.chain_index = self.load_index(filename)
+            blockchain.activity_rollups = self.load_rollups(filename)
             
             # Verificar integridad
             if blockchain.is_chain_valid():
-                print("✅ Blockchain válida")
+                log.info("✅ Blockchain válida", file=filename)
                 return blockchain
             else:
-                print("❌ Blockchain corrupta - validación falló")
+                log.error("❌ Blockchain corrupta - validación falló", file=filename)
                 return None
                 
         except Exception as e:
-            print(f"❌ Error al cargar blockchain: {e}")
+            log.error("❌ Error al cargar blockchain", file=filename, error=str(e))
+            return None
+    
+    def _index_path(self, filename, extension='.idx'):
+        """
+        Ruta del índice de una blockchain (colcript_main.json -> colcript_main.idx)
+
+        POR QUÉ .idx: list_blockchains solo lista archivos .json
+        """
+        base = filename[:-5] if filename.endswith('.json') else filename
+        return os.path.join(self.data_dir, base + extension)
+    
+    def save_index(self, index, filename):
+        """Guarda los índices secundarios de una blockchain"""
+        with open(self._index_path(filename), 'w') as f:
+            json.dump(index.to_dict(), f, separators=(',', ':'))
+    
+    def load_index(self, filename):
+        """
+        Carga los índices de una blockchain
+
+        Returns: ChainIndex, o None si no existe o no se puede leer
+        """
+        from blockchain.chain_index import ChainIndex
+        
+        filepath = self._index_path(filename)
+        if not os.path.exists(filepath):
+            return None
+        
+        try:
+            with open(filepath, 'r') as f:
+                return ChainIndex.from_dict(json.load(f))
+        except Exception as e:
+            log.warning("⚠️  Índice ilegible, se reconstruirá", file=filename, error=str(e))
+            return None
+    
+    def save_rollups(self, rollups, filename):
+        """Guarda los intervalos de actividad (colcript_main.rollups)"""
+        with open(self._index_path(filename, '.rollups'), 'w') as f:
+            json.dump(rollups.to_dict(), f, separators=(',', ':'))
+    
+    def load_rollups(self, filename):
+        """
+        Carga los intervalos de actividad de una blockchain
+
+        Returns: ActivityRollups, o None si no existe o no se puede leer
+        """
+        from blockchain.rollups import ActivityRollups
+        
+        filepath = self._index_path(filename, '.rollups')
+        if not os.path.exists(filepath):
+            return None
+        
+        try:
+            with open(filepath, 'r') as f:
+                return ActivityRollups.from_dict(json.load(f))
+        except Exception as e:
+            log.warning("⚠️  Intervalos de actividad ilegibles, se recalcularán", file=filename, error=str(e))
             return None
     
     def list_blockchains(self):
@@ -210,7 +278,7 @@ class BlockchainStorage:
             return blockchains
             
         except Exception as e:
-            print(f"❌ Error al listar blockchains: {e}")
+            log.error("❌ Error al listar blockchains", error=str(e))
             return []
     
     def delete_blockchain(self, filename):
@@ -220,15 +288,15 @@ class BlockchainStorage:
         filepath = os.path.join(self.data_dir, filename)
         
         if not os.path.exists(filepath):
-            print(f"❌ Archivo no encontrado: {filename}")
+            log.warning("❌ Archivo no encontrado", file=filename)
             return False
         
         try:
             os.remove(filepath)
-            print(f"🗑️  Blockchain eliminada: {filename}")
+            log.info("🗑️  Blockchain eliminada", file=filename)
             return True
         except Exception as e:
-            print(f"❌ Error al eliminar: {e}")
+            log.error("❌ Error al eliminar", file=filename, error=str(e))
             return False
 
 # Test
@@ -9,7 +9,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from utils.crypto import hash_data, sign_data, verify_signature
+from utils.crypto import hash_data, sign_data, verify_signature, verify_signatures_batch
 
 class Transaction:
     def __init__(self, sender, recipient, amount, private_key=None, fee=None):
@@ -55,15 +55,17 @@ class Transaction:
         if self.sender == 'MINING':
             return  # Las recompensas de minado no se firman
         
-        transaction_data = {
+        self.signature = sign_data(private_key, self.get_signing_data())
+    
+    def get_signing_data(self):
+        """Datos que cubre la firma (todo excepto la propia firma)"""
+        return {
             'sender': self.sender,
             'recipient': self.recipient,
             'amount': self.amount,
             'timestamp': self.timestamp,
             'fee': self.fee
         }
-        
-        self.signature = sign_data(private_key, transaction_data)
     
     def is_valid(self):
         """Verifica si la transacción es válida"""
@@ -77,15 +79,7 @@ class Transaction:
             return False
         
         # Verificar la firma
-        transaction_data = {
-            'sender': self.sender,
-            'recipient': self.recipient,
-            'amount': self.amount,
-            'timestamp': self.timestamp,
-            'fee': self.fee
-        }
-        
-        is_valid = verify_signature(self.sender, self.signature, transaction_data)
+        is_valid = verify_signature(self.sender, self.signature, self.get_signing_data())
         
         if not is_valid:
             print("❌ Firma inválida")
@@ -96,10 +90,59 @@ class Transaction:
         """Obtiene el hash de la transacción"""
         return hash_data(self.to_dict())
     
+    @staticmethod
+    def from_dict(data):
+        """
+        Reconstruye una transacción desde un diccionario
+        
+        POR QUÉ: Los nodos reciben transacciones como JSON y deben
+        conservar timestamp, fee y firma originales (el constructor
+        los regeneraría y la firma dejaría de ser válida)
+        """
+        tx = Transaction.__new__(Transaction)
+        tx.sender = data['sender']
+        tx.recipient = data['recipient']
+        tx.amount = data['amount']
+        tx.timestamp = data['timestamp']
+        tx.signature = data.get('signature')
+        tx.fee = data.get('fee', 0)
+        return tx
+    
     def __repr__(self):
         fee_str = f" (fee: {self.fee} CLC)" if self.fee > 0 else ""
         return f"Transaction({self.sender[:10]}... -> {self.recipient[:10]}...: {self.amount} CLC{fee_str})"
 
+def verify_transactions_batch(transactions):
+    """
+    Valida las firmas de varias transacciones en un solo lote
+    
+    Returns: lista de bools en el mismo orden que transactions
+    
+    POR QUÉ: Validar un bloque o un lote de red con is_valid() decodifica
+    la clave del remitente una vez por transacción; el lote agrupa por
+    remitente (ver utils.crypto.verify_signatures_batch)
+    """
+    results = [True] * len(transactions)
+    items = []
+    positions = []
+    
+    for i, tx in enumerate(transactions):
+        # Las recompensas de minado son válidas por defecto
+        if tx.sender == 'MINING':
+            continue
+        
+        if not tx.signature:
+            results[i] = False
+            continue
+        
+        items.append((tx.sender, tx.signature, tx.get_signing_data()))
+        positions.append(i)
+    
+    for i, ok in zip(positions, verify_signatures_batch(items)):
+        results[i] = ok
+    
+    return results
+
 # Test
 if __name__ == "__main__":
     print("💰 Probando sistema de transacciones...")
@@ -19,6 +19,7 @@ from utils.charts import create_bar_chart, create_progress_bar, create_percentag
 from wallet.faucet import Faucet
 from contracts.smart_contract import ContractManager, ContractType
 from network.node import Node
+from utils.logger import setup_logging
 import config
 
 class ColCriptCLI:
@@ -1834,5 +1835,7 @@ class ColCriptCLI:
                 print("\n❌ Opción inválida\n")
 
 if __name__ == "__main__":
+    # En la terminal, mensajes legibles en vez de JSON
+    setup_logging(log_format='text')
     cli = ColCriptCLI()
     cli.run()
@@ -13,6 +13,17 @@ BLOCK_TIME = 60  # Tiempo objetivo entre bloques (segundos)
 # Configuración de red
 DEFAULT_PORT = 5000
 NODES = []  # Lista de nodos conocidos
+ORPHAN_POOL_MAX_SIZE = 100  # Máximo de bloques huérfanos en espera
+ORPHAN_EXPIRY_SECONDS = 600  # Tiempo que un huérfano espera a su padre
+MAX_OUTBOUND_PEERS = 8  # Máximo de peers a los que se conecta el nodo
+PEER_MAX_FAILURES = 5  # Fallos seguidos antes de expulsar a un peer
+PEER_BACKOFF_BASE_SECONDS = 2  # Backoff tras el primer fallo (se duplica en cada fallo)
+PEER_BACKOFF_MAX_SECONDS = 300  # Backoff máximo entre reintentos a un peer
+PEER_SYNC_COUNT = 3  # Peers más rápidos usados para sincronizar
+SYNC_BATCH_SIZE = 50  # Bloques por petición al sincronizar
+TX_RELAY_BATCH_WINDOW_MS = 50  # Ventana para agrupar transacciones salientes
+TX_RELAY_MAX_BATCH = 100  # Transacciones por lote (se envía antes si se llena)
+TX_SEEN_CACHE_SIZE = 10000  # Firmas recordadas para no re-propagar transacciones
 
 # Versión
 VERSION = "1.0.0"
@@ -40,5 +51,57 @@ TARGET_BLOCK_TIME = 60  # Tiempo objetivo entre bloques (segundos)
 MIN_DIFFICULTY = 2  # Dificultad mínima permitida
 MAX_DIFFICULTY = 8  # Dificultad máxima permitida
 
+# Minería en segundo plano (ver mining/jobs.py)
+MINING_JOB_WORKERS = 2  # Procesos que prueban nonces en paralelo
+MINING_JOB_CHUNK_SIZE = 20000  # Nonces por tarea (también marca cada cuánto se puede cancelar)
+MINING_JOB_HISTORY = 20  # Trabajos terminados que se recuerdan para consultas
+
+# API
+API_DEFAULT_PAGE_SIZE = 50  # Elementos por página si no se indica limit
+API_MAX_PAGE_SIZE = 500  # Máximo de elementos por página
+RESPONSE_CACHE_MAX_ENTRIES = 256  # Respuestas GET guardadas (LRU, se vacía con cada bloque)
+API_RATE_LIMITS_ENABLED = True  # Desactivar solo para benchmarks (ver benchmarks/api_benchmark.py)
+API_THREADS = 8  # Hilos del servidor en modo producción (ver gunicorn.conf.py)
+
+# Eventos en vivo (GET /api/events/stream)
+EVENT_STREAM_MAX_CLIENTS = 4  # Conexiones abiertas a la vez (cada una ocupa un hilo del servidor)
+EVENT_STREAM_HEARTBEAT = 15  # Segundos sin eventos antes de enviar un comentario keep-alive
+EVENT_STREAM_QUEUE_SIZE = 100  # Eventos en cola por cliente antes de pedirle que resincronice
+
+# Historial de eventos (ver utils/event_history.py)
+EVENT_HISTORY_SIZE = 1000  # Últimos eventos en memoria (todos los tipos)
+EVENT_HISTORY_PER_TYPE = 200  # Últimos eventos en memoria de cada tipo
+EVENT_HISTORY_FILE = None  # Fichero JSONL para historial completo (p. ej. 'data/events.jsonl'; None = solo memoria)
+
+# Entrega de webhooks (ver utils/webhook_delivery.py)
+WEBHOOK_WORKERS = 4  # Hilos que hacen las peticiones HTTP
+WEBHOOK_QUEUE_SIZE = 1000  # Entregas pendientes como máximo (las nuevas se descartan)
+WEBHOOK_TIMEOUT = 5  # Segundos por petición
+WEBHOOK_MAX_ATTEMPTS = 5  # Intentos antes de pasar a dead letters
+WEBHOOK_BACKOFF_BASE = 1  # Segundos antes del primer reintento (se dobla en cada uno)
+WEBHOOK_BACKOFF_MAX = 60  # Espera máxima entre reintentos
+WEBHOOK_MAX_PER_ENDPOINT = 2  # Peticiones a la vez al mismo servidor
+WEBHOOK_DEAD_LETTER_SIZE = 100  # Entregas fallidas que se guardan para reintentar
+WEBHOOK_BATCH_WINDOW = 2  # Segundos que espera un lote si el webhook solo indica batch_size
+WEBHOOK_BATCH_MAX_SIZE = 500  # Eventos por lote como máximo
+
+# Métricas de la API (ver utils/metrics.py y GET /metrics)
+METRICS_LATENCY_BUCKETS = [  # Límites de las cubetas del histograma de latencias (segundos)
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+]
+METRICS_MAX_ROUTES = 200  # Rutas distintas como máximo (el resto se agrupa en '<other>')
+
+# Logging (ver utils/logger.py)
+LOG_LEVEL = "INFO"  # DEBUG muestra también cada transacción, evento, guardado y progreso de minado
+LOG_FORMAT = "json"  # 'json' (una línea por registro) o 'text'
+LOG_QUEUE_SIZE = 10000  # Registros en cola como máximo (con la cola llena se descartan)
+
+# Estadísticas de actividad
+ACTIVITY_ROLLUP_RETENTION = {  # Intervalos guardados por resolución (None = todos)
+    'minute': 1440,  # Último día
+    'hour': 24 * 90,  # Últimos 90 días
+    'day': None
+}
+
 
 print(f"✅ Configuración de {COIN_NAME} ({COIN_SYMBOL}) cargada")
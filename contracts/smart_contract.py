@@ -5,6 +5,7 @@ import sys
 import json
 import time
 from datetime import datetime
+from bisect import bisect_right, insort
 
 # Obtener ruta absoluta del proyecto
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -377,15 +378,29 @@ class ContractManager:
         self.contracts = {}
         self.storage_file = "data/contracts.json"
         self.next_id = 1
+        self.contract_order = []  # Número de secuencia de cada contrato, en orden
         self.load_contracts()
     
+    @staticmethod
+    def _sequence(contract_id):
+        """Número de secuencia de un ID (TL-7 -> 7)"""
+        try:
+            return int(contract_id.rsplit('-', 1)[1])
+        except (IndexError, ValueError):
+            return 0
+    
+    def _add_contract(self, contract):
+        """Registra un contrato en el diccionario y en el orden de creación"""
+        self.contracts[contract.contract_id] = contract
+        insort(self.contract_order, (self._sequence(contract.contract_id), contract.contract_id))
+    
     def create_timelock(self, creator, unlock_block, amount, recipient):
         """Crea un contrato timelock"""
         contract_id = f"TL-{self.next_id}"
         self.next_id += 1
         
         contract = TimelockContract(contract_id, creator, unlock_block, amount, recipient)
-        self.contracts[contract_id] = contract
+        self._add_contract(contract)
         self.save_contracts()
         
         return contract
@@ -396,7 +411,7 @@ class ContractManager:
         self.next_id += 1
         
         contract = MultisigContract(contract_id, creator, required_sigs, signers, amount, recipient)
-        self.contracts[contract_id] = contract
+        self._add_contract(contract)
         self.save_contracts()
         
         return contract
@@ -407,7 +422,7 @@ class ContractManager:
         self.next_id += 1
         
         contract = EscrowContract(contract_id, creator, buyer, seller, arbiter, amount)
-        self.contracts[contract_id] = contract
+        self._add_contract(contract)
         self.save_contracts()
         
         return contract
@@ -418,7 +433,7 @@ class ContractManager:
         self.next_id += 1
         
         contract = ConditionalContract(contract_id, creator, condition_script, amount, recipient)
-        self.contracts[contract_id] = contract
+        self._add_contract(contract)
         self.save_contracts()
         
         return contract
@@ -439,14 +454,28 @@ class ContractManager:
         
         return success, msg
     
-    def list_contracts(self, status=None):
-        """Lista contratos (todos o filtrados por estado)"""
-        contracts = list(self.contracts.values())
+    def list_contracts(self, status=None, limit=None, after=None):
+        """
+        Lista contratos (todos o filtrados por estado) en orden de creación
+        
+        limit: máximo de contratos
+        after: ID del último contrato de la página anterior (exclusivo)
+        """
+        start = 0
+        if after is not None:
+            start = bisect_right(self.contract_order, (self._sequence(after), after))
         
-        if status == 'pending':
-            contracts = [c for c in contracts if not c.executed]
-        elif status == 'executed':
-            contracts = [c for c in contracts if c.executed]
+        contracts = []
+        for _, contract_id in self.contract_order[start:]:
+            if limit is not None and len(contracts) >= limit:
+                break
+            
+            contract = self.contracts[contract_id]
+            if status == 'pending' and contract.executed:
+                continue
+            if status == 'executed' and not contract.executed:
+                continue
+            contracts.append(contract)
         
         return contracts
     
@@ -478,7 +507,7 @@ class ContractManager:
                 self.next_id = data.get('next_id', 1)
                 
                 for cid, cdata in data.get('contracts', {}).items():
-                    self.contracts[cid] = SmartContract.from_dict(cdata)
+                    self._add_contract(SmartContract.from_dict(cdata))
         except Exception as e:
             print(f"Error loading contracts: {e}")
 
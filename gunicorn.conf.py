@@ -0,0 +1,35 @@
+# gunicorn.conf.py - Servidor de producción de la API de ColCript
+#
+# Uso: gunicorn -c gunicorn.conf.py api.wsgi:app  (o ./start.sh --production)
+
+import os
+import sys
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# POR QUÉ from-import: gunicorn lee como ajustes los nombres de este módulo
+# y 'config' es uno de ellos
+from config import DEFAULT_PORT, API_THREADS
+
+bind = f"0.0.0.0:{DEFAULT_PORT}"
+
+# Un solo proceso con varios hilos
+# POR QUÉ: La cadena, el pool de pendientes y el nodo P2P viven en memoria
+# y este proceso es su única copia autoritativa. Con varios procesos cada
+# uno tendría su propia cadena (y su propio nodo en el puerto 6000). Las
+# lecturas se atienden en paralelo en los hilos (lock de lectores/escritor
+# de la cadena) y la prueba de trabajo va a su propio pool de procesos
+# (ver mining/jobs.py)
+workers = 1
+worker_class = 'gthread'
+threads = API_THREADS
+
+# Las peticiones largas (sincronizar con peers) no deben matar al worker
+timeout = 120
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
+loglevel = 'info'
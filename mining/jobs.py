@@ -0,0 +1,291 @@
+# mining/jobs.py - Trabajos de minería en segundo plano
+
+import time
+import uuid
+import threading
+import multiprocessing
+import sys
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Agregar ruta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from utils.crypto import hash_data
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def search_nonces(block_data: dict, difficulty: int, start: int, count: int) -> Tuple[Optional[int], Optional[str], int]:
+    """
+    Prueba los nonces [start, start + count) sobre los datos del bloque
+
+    Se ejecuta en los procesos del pool (debe ser picklable).
+
+    Returns: (nonce, hash, intentos) - nonce y hash son None si no hay solución
+    """
+    target = '0' * difficulty
+    data = dict(block_data)
+
+    for nonce in range(start, start + count):
+        data['nonce'] = nonce
+        block_hash = hash_data(data)
+        if block_hash[:difficulty] == target:
+            return nonce, block_hash, nonce - start + 1
+
+    return None, None, count
+
+
+class MiningJob:
+    """Un trabajo de minería: un bloque candidato y su progreso"""
+
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+
+    def __init__(self, block, difficulty: int):
+        self.job_id = uuid.uuid4().hex[:16]
+        self.block = block
+        self.difficulty = difficulty
+        self.status = self.RUNNING
+        self.error = None
+        self.nonces_tried = 0
+        self.next_nonce = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self.cancel_requested = False
+        self.done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.done.is_set()
+
+    def finish(self, status: str, error: str = None):
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+        self.done.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Espera a que el trabajo termine; False si venció el timeout"""
+        return self.done.wait(timeout)
+
+    def get_hashrate(self) -> float:
+        """Hashes por segundo desde que empezó el trabajo"""
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return self.nonces_tried / elapsed if elapsed > 0 else 0
+
+    def to_dict(self) -> dict:
+        hashrate = self.get_hashrate()
+        # Cada nonce acierta con probabilidad 16^-dificultad y los intentos
+        # no tienen memoria: el tiempo restante esperado no baja con el progreso
+        expected_nonces = 16 ** self.difficulty
+        eta = round(expected_nonces / hashrate, 2) if hashrate and not self.finished else None
+
+        data = {
+            'job_id': self.job_id,
+            'status': self.status,
+            'block_index': self.block.index,
+            'miner': self.block.miner_address,
+            'difficulty': self.difficulty,
+            'transactions': len(self.block.transactions),
+            'nonces_tried': self.nonces_tried,
+            'hashrate': round(hashrate, 2),
+            'expected_nonces': expected_nonces,
+            'eta_seconds': eta,
+            'elapsed': round((self.finished_at or time.time()) - self.started_at, 2),
+            'error': self.error
+        }
+        if self.status == self.COMPLETED:
+            data['block'] = {
+                'index': self.block.index,
+                'hash': self.block.hash,
+                'nonce': self.block.nonce
+            }
+        return data
+
+
+class MiningJobManager:
+    """
+    Minería de bloques en un pool de procesos
+
+    Cada trabajo toma una foto de las transacciones pendientes (ver
+    Blockchain.create_block_template) y reparte rangos de nonces entre
+    los procesos. Un hilo coordinador por trabajo recoge los resultados,
+    actualiza el progreso y, al encontrar el nonce, añade el bloque con
+    Blockchain.add_block (valida de nuevo y quita las confirmadas del pool).
+
+    POR QUÉ: Minar dentro de la petición bloqueaba un worker HTTP durante
+    minutos y el bucle de PoW competía por el GIL con el resto de la API
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = None, history: int = None):
+        self.workers = workers or config.MINING_JOB_WORKERS
+        self.chunk_size = chunk_size or config.MINING_JOB_CHUNK_SIZE
+        self.history = history or config.MINING_JOB_HISTORY
+        self.jobs = OrderedDict()
+        self.active_job = None
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Crea el pool de procesos la primera vez que se usa
+
+        POR QUÉ spawn: hacer fork de un servidor con hilos puede heredar
+        locks tomados por otros hilos
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self.executor
+
+    def _discard_executor(self, executor: Optional[ProcessPoolExecutor]):
+        """Cierra un pool roto y lo olvida si sigue siendo el actual"""
+        with self.lock:
+            if executor is not None and self.executor is executor:
+                self.executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== TRABAJOS ====================
+
+    def submit(self, blockchain, miner_address: str, on_mined: Callable = None) -> Tuple[MiningJob, bool]:
+        """
+        Empieza a minar el siguiente bloque para miner_address
+
+        on_mined(block) se llama tras añadir el bloque a la cadena.
+        Solo hay un trabajo activo a la vez (competirían por el mismo bloque).
+
+        Returns: (job, started) - si ya había uno activo, (ese trabajo, False)
+        """
+        with self.lock:
+            if self.active_job and not self.active_job.finished:
+                return self.active_job, False
+
+            block, _ = blockchain.create_block_template(miner_address)
+            job = MiningJob(block, blockchain.difficulty)
+            self.jobs[job.job_id] = job
+            self.active_job = job
+            self._prune()
+
+        thread = threading.Thread(
+            target=self._run,
+            args=(job, blockchain, on_mined),
+            daemon=True,
+            name=f"mining-job-{job.job_id}"
+        )
+        thread.start()
+
+        log.info("⛏️  Trabajo de minería iniciado", job_id=job.job_id, block_index=block.index)
+        return job, True
+
+    def _prune(self):
+        """Olvida los trabajos terminados más antiguos (llamar con el lock)"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job_id]
+
+    def _run(self, job: MiningJob, blockchain, on_mined: Callable):
+        """Hilo coordinador: reparte rangos de nonces hasta encontrar uno"""
+        block_data = job.block.hashing_data()
+        futures = set()
+        found = None
+        executor = None
+
+        try:
+            executor = self._get_executor()
+
+            while found is None and not job.cancel_requested:
+                while len(futures) < self.workers:
+                    futures.add(executor.submit(
+                        search_nonces, block_data, job.difficulty, job.next_nonce, self.chunk_size
+                    ))
+                    job.next_nonce += self.chunk_size
+
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    nonce, block_hash, tried = future.result()
+                    job.nonces_tried += tried
+                    if nonce is not None and found is None:
+                        found = (nonce, block_hash)
+        except BrokenProcessPool as e:
+            # Un proceso murió (p. ej. OOM): el pool ya no acepta tareas,
+            # el siguiente trabajo crea uno nuevo
+            self._discard_executor(executor)
+            job.finish(MiningJob.FAILED, f"Mining process pool broke: {e}")
+            log.error("❌ Pool de procesos roto, se recreará", job_id=job.job_id, exc_info=True)
+            return
+        except Exception as e:
+            job.finish(MiningJob.FAILED, str(e))
+            log.error("❌ Trabajo de minería fallido", job_id=job.job_id, exc_info=True)
+            return
+        finally:
+            # Los rangos aún en cola no hacen falta
+            for future in futures:
+                future.cancel()
+
+        if found is None:
+            job.finish(MiningJob.CANCELLED)
+            log.info("🛑 Trabajo de minería cancelado", job_id=job.job_id)
+            return
+
+        job.block.nonce, job.block.hash = found
+        added, reason = blockchain.add_block(job.block)
+        if not added:
+            # Otro bloque llegó antes a esta altura
+            job.finish(MiningJob.FAILED, reason)
+            log.warning("⚠️  Bloque del trabajo descartado", job_id=job.job_id, reason=reason)
+            return
+
+        # Anunciar antes de marcar el trabajo como terminado: quien espera
+        # con job.wait() (p. ej. /api/mining/mine) ve el bloque ya anunciado
+        if on_mined:
+            try:
+                on_mined(job.block)
+            except Exception:
+                log.error("❌ Error anunciando el bloque minado", job_id=job.job_id, exc_info=True)
+
+        job.finish(MiningJob.COMPLETED)
+        log.info("✅ Trabajo de minería completado", job_id=job.job_id, block_index=job.block.index,
+                 nonces_tried=job.nonces_tried)
+
+    def cancel(self, job_id: str) -> Tuple[bool, str]:
+        """Pide cancelar un trabajo (se detiene al terminar los rangos en curso)"""
+        job = self.jobs.get(job_id)
+        if not job:
+            return False, "Job not found"
+        if job.finished:
+            return False, f"Job already {job.status}"
+
+        job.cancel_requested = True
+        return True, "Cancellation requested"
+
+    # ==================== CONSULTAS ====================
+
+    def get_job(self, job_id: str) -> Optional[MiningJob]:
+        return self.jobs.get(job_id)
+
+    def get_jobs(self) -> List[dict]:
+        """Trabajos recordados, el más reciente primero"""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def shutdown(self):
+        """Cancela el trabajo activo y cierra el pool de procesos"""
+        if self.active_job and not self.active_job.finished:
+            self.active_job.cancel_requested = True
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
@@ -5,7 +5,7 @@ import threading
 import hashlib
 import sys
 import os
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 from datetime import datetime
 
 # Agregar ruta del proyecto
@@ -13,6 +13,10 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
 class PoolMiner:
     """Representa un minero en el pool"""
     
@@ -88,6 +92,8 @@ class MiningPool:
         self.created_at = time.time()
         self.is_mining = False
         self.mining_thread = None
+        # Protege mineros y shares: mine_block trabaja fuera del lock de la cadena
+        self.lock = threading.RLock()
         
         # Estadísticas
         self.stats = {
@@ -99,19 +105,21 @@ class MiningPool:
     
     def add_miner(self, miner_id: str, address: str) -> Tuple[bool, str]:
         """Agrega un minero al pool"""
-        if miner_id in self.miners:
-            return False, "Miner already in pool"
-        
-        self.miners[miner_id] = PoolMiner(miner_id, address)
-        return True, f"Miner {miner_id} joined the pool"
+        with self.lock:
+            if miner_id in self.miners:
+                return False, "Miner already in pool"
+            
+            self.miners[miner_id] = PoolMiner(miner_id, address)
+            return True, f"Miner {miner_id} joined the pool"
     
     def remove_miner(self, miner_id: str) -> Tuple[bool, str]:
         """Elimina un minero del pool"""
-        if miner_id not in self.miners:
-            return False, "Miner not found"
-        
-        del self.miners[miner_id]
-        return True, f"Miner {miner_id} left the pool"
+        with self.lock:
+            if miner_id not in self.miners:
+                return False, "Miner not found"
+            
+            del self.miners[miner_id]
+            return True, f"Miner {miner_id} left the pool"
     
     def submit_share(self, miner_id: str, nonce: int, 
                      block_hash: str) -> Tuple[bool, str]:
@@ -131,9 +139,10 @@ class MiningPool:
         difficulty = len(block_hash) - len(block_hash.lstrip('0'))
         
         # Agregar share al minero
-        miner.add_share(difficulty)
-        self.current_round_shares += difficulty
-        self.stats['total_shares'] += difficulty
+        with self.lock:
+            miner.add_share(difficulty)
+            self.current_round_shares += difficulty
+            self.stats['total_shares'] += difficulty
         
         # Si el hash cumple la dificultad del bloque real, encontramos bloque
         if self._is_valid_block_hash(block_hash):
@@ -146,38 +155,50 @@ class MiningPool:
         target = '0' * self.blockchain.difficulty
         return block_hash.startswith(target)
     
-    def mine_block(self, timeout: int = 30) -> Tuple[bool, str, dict]:
+    def mine_block(self, timeout: int = 30, mine: Callable = None) -> Tuple[bool, str, dict]:
         """
         Mina un bloque colaborativamente
         
+        Args:
+            mine: mine(address) -> (block, error) hace la prueba de trabajo
+                  (por defecto blockchain.mine_pending_transactions)
+        
         Returns:
             (success, message, distribution)
         """
-        if len(self.miners) == 0:
-            return False, "No miners in pool", {}
-        
-        print(f"\n⛏️  Mining block collaboratively...")
-        print(f"   Pool: {self.pool_name}")
-        print(f"   Miners: {len(self.miners)}")
-        print(f"   Current shares: {self.current_round_shares}")
-        
-        # Resetear shares de esta ronda
-        for miner in self.miners.values():
-            miner.shares = 0
-        self.current_round_shares = 0
+        with self.lock:
+            if len(self.miners) == 0:
+                return False, "No miners in pool", {}
+            
+            log.info("⛏️  Mining block collaboratively", pool=self.pool_name,
+                     miners=len(self.miners), shares=self.current_round_shares)
+            
+            # Resetear shares de esta ronda
+            for miner in self.miners.values():
+                miner.shares = 0
+            self.current_round_shares = 0
         
         # Minar bloque (usar dirección del pool temporalmente)
         pool_address = "POOL_" + hashlib.sha256(
             self.pool_name.encode()
         ).hexdigest()[:20]
         
+        # La prueba de trabajo va sin el lock del pool: los shares siguen entrando
         start_time = time.time()
-        block = self.blockchain.mine_pending_transactions(pool_address)
+        if mine:
+            block, error = mine(pool_address)
+        else:
+            block, error = self.blockchain.mine_pending_transactions(pool_address), None
         mining_time = time.time() - start_time
         
         if not block:
-            return False, "Mining failed", {}
+            return False, error or "Mining failed", {}
         
+        with self.lock:
+            return self._finish_round(block, mining_time)
+    
+    def _finish_round(self, block, mining_time: float) -> Tuple[bool, str, dict]:
+        """Reparte la recompensa del bloque minado (con el lock tomado)"""
         # Simular distribución de shares entre mineros
         # (En realidad, cada minero estaría enviando shares durante el minado)
         self._simulate_shares(mining_time)
@@ -199,15 +220,9 @@ class MiningPool:
         self.total_rewards_distributed += distributable
         self.stats['blocks_found'] += 1
         
-        print(f"\n✅ Block mined! #{block.index}")
-        print(f"   Hash: {block.hash[:20]}...")
-        print(f"   Time: {mining_time:.2f} seconds")
-        print(f"   Total reward: {total_payout} CLC")
-        print(f"   Pool fee ({self.pool_fee}%): {pool_fee_amount} CLC")
-        print(f"   Distributed: {distributable} CLC")
-        print(f"\n💰 Distribution:")
-        for miner_id, amount in distribution.items():
-            print(f"   {miner_id}: {amount:.4f} CLC")
+        log.info("✅ Pool block mined", pool=self.pool_name, block_index=block.index,
+                 hash=block.hash, seconds=round(mining_time, 3), reward=total_payout,
+                 pool_fee=pool_fee_amount, distributed=distributable, distribution=distribution)
         
         return True, "Block mined successfully", distribution
 
@@ -235,7 +250,7 @@ class MiningPool:
             self.current_round_shares += shares
             miner.hashrate = base_hashrate
             
-            print(f"   {miner.miner_id}: {shares} shares ({base_hashrate} H/s)")
+            log.debug("   Simulated shares", miner_id=miner.miner_id, shares=shares, hashrate=base_hashrate)
     
     def _distribute_rewards(self, amount: float) -> Dict[str, float]:
         """
@@ -0,0 +1,215 @@
+# network/block_acceptance.py - Pipeline de aceptación de bloques recibidos
+
+import os
+import sys
+import time
+import threading
+from collections import deque
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+
+
+class BlockAcceptor:
+    """
+    Acepta bloques propagados por otros nodos
+
+    - Bloques que encajan en la punta: se validan y se añaden (Blockchain.add_block)
+    - Bloques del futuro: esperan en el pool de huérfanos hasta que llegue su padre
+    - Bloques ya conocidos: se ignoran
+    - Mide la latencia de aceptación de cada bloque
+    """
+
+    ACCEPTED = 'accepted'
+    ORPHAN = 'orphan'
+    DUPLICATE = 'duplicate'
+    REJECTED = 'rejected'
+
+    def __init__(self, blockchain, max_orphans=None, orphan_expiry=None):
+        self.blockchain = blockchain
+        self.max_orphans = max_orphans or config.ORPHAN_POOL_MAX_SIZE
+        self.orphan_expiry = orphan_expiry or config.ORPHAN_EXPIRY_SECONDS
+
+        # hash -> (bloque, recibido_en) y previous_hash -> set de hashes
+        self.orphans = {}
+        self.orphans_by_parent = {}
+
+        # POR QUÉ lock: Flask puede atender varios bloques a la vez
+        self.lock = threading.Lock()
+
+        # Estadísticas
+        self.latencies_ms = deque(maxlen=1000)
+        self.counts = {
+            self.ACCEPTED: 0,
+            self.ORPHAN: 0,
+            self.DUPLICATE: 0,
+            self.REJECTED: 0
+        }
+
+    def process_block(self, block):
+        """
+        Procesa un bloque recibido
+
+        Returns:
+            dict con status, message, connected (huérfanos conectados)
+            y latency_ms
+        """
+        start = time.perf_counter()
+
+        with self.lock:
+            self._expire_orphans()
+            status, message = self._classify_and_add(block)
+
+            connected = 0
+            if status == self.ACCEPTED:
+                connected = self._connect_orphans(block.hash)
+
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.counts[status] += 1
+            if status == self.ACCEPTED:
+                self.latencies_ms.append(latency_ms)
+
+        return {
+            'status': status,
+            'message': message,
+            'block_index': block.index,
+            'block_hash': block.hash,
+            'connected_orphans': connected,
+            'latency_ms': round(latency_ms, 3)
+        }
+
+    def is_known(self, block_hash, index):
+        """Indica si el bloque ya está en la cadena o en el pool de huérfanos"""
+        chain = self.blockchain.chain
+        if 0 <= index < len(chain) and chain[index].hash == block_hash:
+            return True
+        return block_hash in self.orphans
+
+    def _classify_and_add(self, block):
+        """Decide qué hacer con el bloque (llamar con el lock tomado)"""
+        chain = self.blockchain.chain
+        height = len(chain)
+
+        if block.index < height:
+            if chain[block.index].hash == block.hash:
+                return self.DUPLICATE, f"Block #{block.index} already in chain"
+            return self.REJECTED, f"Block #{block.index} conflicts with local chain"
+
+        if block.hash in self.orphans:
+            return self.DUPLICATE, f"Block #{block.index} already in orphan pool"
+
+        if block.index > height:
+            valid, reason = self._check_orphan(block)
+            if not valid:
+                return self.REJECTED, reason
+            self._add_orphan(block)
+            return self.ORPHAN, f"Block #{block.index} stored as orphan (local height {height})"
+
+        added, reason = self.blockchain.add_block(block)
+        if added:
+            return self.ACCEPTED, reason
+        return self.REJECTED, reason
+
+    def _check_orphan(self, block):
+        """
+        Comprobaciones de un huérfano que no necesitan a su padre
+        Retorna (valid: bool, reason: str)
+
+        POR QUÉ: Sin ellas cualquiera llena el pool con bloques
+        inventados (sin proof of work) y expulsa a los huérfanos reales
+        """
+        if block.hash != block.calculate_hash():
+            return False, "Invalid block hash"
+
+        # La dificultad exigida a esa altura aún no se conoce: cada ajuste
+        # la baja como mucho en 1 (ver DifficultyAdjustment)
+        difficulty = self.blockchain.difficulty
+        if config.DIFFICULTY_ADJUSTMENT_ENABLED:
+            adjustments = (block.index - len(self.blockchain.chain)) // config.DIFFICULTY_ADJUSTMENT_INTERVAL + 1
+            difficulty = max(config.MIN_DIFFICULTY, difficulty - adjustments)
+
+        if block.hash[:difficulty] != '0' * difficulty:
+            return False, "Invalid proof of work"
+
+        return True, "Orphan is valid"
+
+    def _add_orphan(self, block):
+        """Guarda un bloque huérfano, expulsando el más antiguo si está lleno"""
+        if len(self.orphans) >= self.max_orphans:
+            oldest = min(self.orphans, key=lambda h: self.orphans[h][1])
+            self._remove_orphan(oldest)
+
+        self.orphans[block.hash] = (block, time.time())
+        self.orphans_by_parent.setdefault(block.previous_hash, set()).add(block.hash)
+
+    def _remove_orphan(self, block_hash):
+        """Elimina un huérfano del pool"""
+        block, _ = self.orphans.pop(block_hash)
+        siblings = self.orphans_by_parent.get(block.previous_hash)
+        if siblings is not None:
+            siblings.discard(block_hash)
+            if not siblings:
+                del self.orphans_by_parent[block.previous_hash]
+        return block
+
+    def _expire_orphans(self):
+        """Descarta huérfanos que llevan demasiado tiempo esperando"""
+        now = time.time()
+        expired = [
+            h for h, (_, received_at) in self.orphans.items()
+            if now - received_at > self.orphan_expiry
+        ]
+        for block_hash in expired:
+            self._remove_orphan(block_hash)
+
+    def _connect_orphans(self, parent_hash):
+        """
+        Conecta los huérfanos que esperaban al bloque recién añadido
+
+        POR QUÉ iterativo: un solo bloque puede desbloquear una cadena
+        entera de huérfanos llegados fuera de orden
+        """
+        connected = 0
+        parents = [parent_hash]
+
+        while parents:
+            children = self.orphans_by_parent.get(parents.pop(), set())
+            for child_hash in list(children):
+                child = self._remove_orphan(child_hash)
+                added, _ = self.blockchain.add_block(child)
+                if added:
+                    connected += 1
+                    self.counts[self.ACCEPTED] += 1
+                    parents.append(child.hash)
+                    break
+
+        return connected
+
+    def get_stats(self):
+        """Estadísticas de aceptación y latencia"""
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(p):
+            if not latencies:
+                return 0
+            idx = min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))
+            return round(latencies[idx], 3)
+
+        return {
+            'accepted': self.counts[self.ACCEPTED],
+            'orphaned': self.counts[self.ORPHAN],
+            'duplicates': self.counts[self.DUPLICATE],
+            'rejected': self.counts[self.REJECTED],
+            'orphan_pool_size': len(self.orphans),
+            'latency_ms': {
+                'samples': len(latencies),
+                'avg': round(sum(latencies) / len(latencies), 3) if latencies else 0,
+                'p50': percentile(50),
+                'p95': percentile(95),
+                'max': round(latencies[-1], 3) if latencies else 0
+            }
+        }
@@ -0,0 +1,197 @@
+# network/compact_block.py - Compact blocks: header + IDs cortos de transacciones
+
+import os
+import sys
+import time
+import hashlib
+import threading
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from blockchain.block import Block
+from blockchain.transaction import Transaction
+
+SHORT_ID_LENGTH = 12  # Caracteres hex (48 bits)
+
+
+def short_tx_id(tx, block_hash):
+    """
+    ID corto de una transacción dentro de un bloque
+
+    POR QUÉ salar con el hash del bloque: un atacante no puede fabricar
+    transacciones que colisionen a propósito con los IDs de otro bloque
+    """
+    data = f"{block_hash}:{tx.get_hash()}"
+    return hashlib.sha256(data.encode()).hexdigest()[:SHORT_ID_LENGTH]
+
+
+def build_compact_block(block):
+    """
+    Convierte un bloque a formato compacto
+
+    Las recompensas de minado nunca están en el mempool de los peers,
+    así que se envían completas (prefilled)
+    """
+    short_ids = []
+    prefilled = []
+
+    for i, tx in enumerate(block.transactions):
+        if tx.sender == 'MINING':
+            prefilled.append({'index': i, 'tx': tx.to_dict()})
+        else:
+            short_ids.append({'index': i, 'id': short_tx_id(tx, block.hash)})
+
+    return {
+        'header': {
+            'index': block.index,
+            'timestamp': block.timestamp,
+            'previous_hash': block.previous_hash,
+            'miner_address': block.miner_address,
+            'nonce': block.nonce,
+            'hash': block.hash
+        },
+        'tx_count': len(block.transactions),
+        'short_ids': short_ids,
+        'prefilled': prefilled
+    }
+
+
+class CompactBlockReconstructor:
+    """
+    Reconstruye bloques compactos usando el mempool local
+
+    Si faltan transacciones, el bloque queda en espera hasta que el
+    emisor envíe solo las que faltan (ver fill_missing)
+    """
+
+    def __init__(self, blockchain, max_pending=20, pending_expiry=60):
+        self.blockchain = blockchain
+        self.max_pending = max_pending
+        self.pending_expiry = pending_expiry
+
+        # block_hash -> {'header', 'slots', 'missing', 'received_at'}
+        self.pending = {}
+        self.lock = threading.Lock()
+
+        # Estadísticas
+        self.stats = {
+            'received': 0,
+            'reconstructed_from_mempool': 0,
+            'completed_after_fetch': 0,
+            'transactions_from_mempool': 0,
+            'transactions_fetched': 0,
+            'failed': 0
+        }
+
+    def reconstruct(self, compact):
+        """
+        Intenta reconstruir un bloque compacto
+
+        Returns:
+            (block, missing_indexes): block es None si faltan transacciones
+        """
+        header = compact['header']
+        block_hash = header['hash']
+        slots = [None] * compact['tx_count']
+
+        for item in compact['prefilled']:
+            slots[item['index']] = Transaction.from_dict(item['tx'])
+
+        # Indexar el mempool por ID corto (salado con este bloque)
+        mempool = {
+            short_tx_id(tx, block_hash): tx
+            for tx in list(self.blockchain.pending_transactions)
+        }
+
+        missing = []
+        for item in compact['short_ids']:
+            tx = mempool.get(item['id'])
+            if tx is None:
+                missing.append(item['index'])
+            else:
+                slots[item['index']] = Transaction.from_dict(tx.to_dict())
+
+        with self.lock:
+            self.stats['received'] += 1
+            self.stats['transactions_from_mempool'] += len(compact['short_ids']) - len(missing)
+
+            if not missing:
+                block = self._assemble(header, slots)
+                if block is not None:
+                    self.stats['reconstructed_from_mempool'] += 1
+                return block, []
+
+            self._expire_pending()
+            if len(self.pending) >= self.max_pending:
+                oldest = min(self.pending, key=lambda h: self.pending[h]['received_at'])
+                del self.pending[oldest]
+
+            self.pending[block_hash] = {
+                'header': header,
+                'slots': slots,
+                'missing': set(missing),
+                'received_at': time.time()
+            }
+
+        return None, missing
+
+    def fill_missing(self, block_hash, transactions):
+        """
+        Completa un bloque en espera con las transacciones que faltaban
+
+        transactions: lista de {'index': i, 'tx': dict}
+        Returns: el bloque completo o None
+        """
+        with self.lock:
+            entry = self.pending.get(block_hash)
+            if entry is None:
+                return None
+
+            for item in transactions:
+                if item['index'] in entry['missing']:
+                    entry['slots'][item['index']] = Transaction.from_dict(item['tx'])
+                    entry['missing'].discard(item['index'])
+                    self.stats['transactions_fetched'] += 1
+
+            if entry['missing']:
+                return None
+
+            del self.pending[block_hash]
+            block = self._assemble(entry['header'], entry['slots'])
+            if block is not None:
+                self.stats['completed_after_fetch'] += 1
+            return block
+
+    def _assemble(self, header, slots):
+        """
+        Arma el bloque y comprueba que el hash coincide
+
+        POR QUÉ: Una colisión de ID corto daría un bloque distinto;
+        en ese caso el emisor debe enviar el bloque completo
+        """
+        data = dict(header)
+        data['transactions'] = []
+        block = Block.from_dict(data)
+        block.transactions = slots
+
+        if block.calculate_hash() != block.hash:
+            self.stats['failed'] += 1
+            return None
+        return block
+
+    def _expire_pending(self):
+        """Descarta bloques en espera demasiado antiguos"""
+        now = time.time()
+        expired = [
+            h for h, entry in self.pending.items()
+            if now - entry['received_at'] > self.pending_expiry
+        ]
+        for block_hash in expired:
+            del self.pending[block_hash]
+
+    def get_stats(self):
+        """Estadísticas de reconstrucción"""
+        return dict(self.stats, waiting_for_transactions=len(self.pending))
@@ -6,7 +6,7 @@ import json
 import socket
 import threading
 import time
-import requests
+from collections import OrderedDict
 from datetime import datetime
 
 # Obtener ruta absoluta del proyecto
@@ -15,26 +15,42 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 import config
+from network.block_acceptance import BlockAcceptor
+from network.compact_block import build_compact_block, CompactBlockReconstructor
+from network.peer_manager import PeerManager
+from blockchain.block import Block
+from blockchain.transaction import Transaction
 
 class Node:
     """
     Nodo P2P para ColCript
     """
     
-    def __init__(self, host='0.0.0.0', port=6000, blockchain=None):
+    def __init__(self, host='0.0.0.0', port=6000, blockchain=None, peer_manager=None):
         self.host = host
         self.port = port
         self.blockchain = blockchain
-        self.peers = set()  # Set de (host, port)
+        self.peer_manager = peer_manager if peer_manager is not None else PeerManager()
         self.node_id = self._generate_node_id()
         self.running = False
         self.server_thread = None
+        self.block_acceptor = BlockAcceptor(blockchain) if blockchain else None
+        self.compact_reconstructor = CompactBlockReconstructor(blockchain) if blockchain else None
+        
+        # Relay de transacciones por lotes (micro-batching)
+        self.tx_batch_window = config.TX_RELAY_BATCH_WINDOW_MS / 1000
+        self.tx_batch_max = config.TX_RELAY_MAX_BATCH
+        self.outgoing_transactions = []
+        self.tx_flush_timer = None
+        self.tx_batch_lock = threading.Lock()
+        self.seen_transactions = OrderedDict()  # Firmas ya vistas (LRU)
         
         # Estadísticas
         self.blocks_received = 0
         self.blocks_sent = 0
         self.transactions_received = 0
         self.transactions_sent = 0
+        self.transaction_batches_sent = 0
         self.connected_at = time.time()
     
     def _generate_node_id(self):
@@ -43,6 +59,11 @@ class Node:
         data = f"{self.host}:{self.port}:{time.time()}"
         return hashlib.sha256(data.encode()).hexdigest()[:16]
     
+    @property
+    def peers(self):
+        """Set de (host, port) de los peers conectados"""
+        return self.peer_manager.addresses()
+    
     def start(self):
         """Inicia el nodo"""
         self.running = True
@@ -74,14 +95,15 @@ class Node:
         if peer == (self.host, self.port):
             return False, "Cannot add self as peer"
         
-        if peer in self.peers:
-            return False, "Peer already exists"
+        success, msg = self.peer_manager.add(host, port)
+        if not success:
+            return False, msg
         
-        # Verificar que el peer está vivo
+        # Verificar que el peer está vivo (y medir su latencia)
         if not self._ping_peer(host, port):
+            self.peer_manager.remove(host, port)
             return False, "Peer is not responding"
         
-        self.peers.add(peer)
         print(f"✅ Peer agregado: {host}:{port}")
         
         # Sincronizar blockchain con el nuevo peer
@@ -91,10 +113,7 @@ class Node:
     
     def remove_peer(self, host, port):
         """Elimina un peer de la red"""
-        peer = (host, port)
-        
-        if peer in self.peers:
-            self.peers.remove(peer)
+        if self.peer_manager.remove(host, port):
             print(f"❌ Peer eliminado: {host}:{port}")
             return True, f"Peer {host}:{port} removed"
         
@@ -102,56 +121,172 @@ class Node:
     
     def _ping_peer(self, host, port):
         """Verifica si un peer está vivo"""
-        try:
-            response = requests.get(
-                f"http://{host}:{port}/api/info",
-                timeout=2
-            )
-            return response.status_code == 200
-        except:
-            return False
+        response = self.peer_manager.get(host, port, "/api/info", timeout=2)
+        return response is not None and response.status_code == 200
     
     def broadcast_transaction(self, transaction):
-        """Propaga una transacción a todos los peers"""
+        """
+        Encola una transacción para el próximo lote de relay
+        
+        El lote se envía al cerrarse la ventana (TX_RELAY_BATCH_WINDOW_MS)
+        o antes si alcanza TX_RELAY_MAX_BATCH transacciones
+        
+        Returns:
+            número de transacciones esperando en el lote
+        
+        POR QUÉ: Durante una ráfaga de pagos, una petición por transacción
+        y por peer satura la red; un lote por peer y ventana no
+        """
+        self._mark_seen(transaction.signature)
+        
         if not self.peers:
             return 0
         
-        tx_data = transaction.to_dict()
+        batch = None
+        with self.tx_batch_lock:
+            self.outgoing_transactions.append(transaction)
+            queued = len(self.outgoing_transactions)
+            
+            if queued >= self.tx_batch_max:
+                batch = self._take_outgoing_batch()
+            elif self.tx_flush_timer is None:
+                self.tx_flush_timer = threading.Timer(self.tx_batch_window, self.flush_transactions)
+                self.tx_flush_timer.daemon = True
+                self.tx_flush_timer.start()
+        
+        if batch:
+            thread = threading.Thread(target=self.broadcast_transactions, args=(batch,))
+            thread.daemon = True
+            thread.start()
+            return 0
+        
+        return queued
+    
+    def _take_outgoing_batch(self):
+        """Saca el lote pendiente (llamar con tx_batch_lock tomado)"""
+        batch = self.outgoing_transactions
+        self.outgoing_transactions = []
+        
+        if self.tx_flush_timer is not None:
+            self.tx_flush_timer.cancel()
+            self.tx_flush_timer = None
+        
+        return batch
+    
+    def flush_transactions(self):
+        """Envía ya el lote pendiente; devuelve a cuántos peers llegó"""
+        with self.tx_batch_lock:
+            batch = self._take_outgoing_batch()
+        
+        if not batch:
+            return 0
+        
+        return self.broadcast_transactions(batch)
+    
+    def broadcast_transactions(self, transactions):
+        """Envía un lote de transacciones a todos los peers"""
+        if not self.peers or not transactions:
+            return 0
+        
+        batch_data = {'transactions': [tx.to_dict() for tx in transactions]}
         successful = 0
         
-        for host, port in list(self.peers):
-            try:
-                response = requests.post(
-                    f"http://{host}:{port}/api/network/transaction",
-                    json=tx_data,
-                    timeout=5
-                )
-                
-                if response.status_code == 200:
-                    successful += 1
-                    self.transactions_sent += 1
-            except Exception as e:
-                print(f"⚠️  Error enviando tx a {host}:{port}: {e}")
+        # Los fallos los registra el PeerManager (backoff/expulsión)
+        for host, port in self.peer_manager.select_peers():
+            response = self.peer_manager.post(
+                host, port, "/api/network/transactions", json=batch_data
+            )
+            
+            # Peers antiguos sin endpoint de lotes: una petición por transacción
+            if response is not None and response.status_code == 404:
+                sent = self._send_transactions_one_by_one(host, port, batch_data['transactions'])
+            else:
+                sent = response is not None and response.status_code == 200
+            
+            if sent:
+                successful += 1
+                self.transactions_sent += len(transactions)
+                self.transaction_batches_sent += 1
         
         return successful
     
-    def broadcast_block(self, block):
-        """Propaga un bloque a todos los peers"""
+    def _send_transactions_one_by_one(self, host, port, tx_list):
+        """Fallback para peers sin /api/network/transactions"""
+        for tx_data in tx_list:
+            response = self.peer_manager.post(
+                host, port, "/api/network/transaction", json=tx_data
+            )
+            if response is None:
+                return False
+        return True
+    
+    def receive_transactions(self, tx_list):
+        """
+        Procesa un lote de transacciones recibido de un peer
+        
+        tx_list: lista de dicts (Transaction.to_dict)
+        Returns:
+            dict con received, accepted, duplicates y rejected
+        """
+        fresh = []
+        duplicates = 0
+        
+        for tx_data in tx_list:
+            tx = Transaction.from_dict(tx_data)
+            if tx.signature in self.seen_transactions:
+                duplicates += 1
+            else:
+                fresh.append(tx)
+        
+        # Una sola verificación de firmas para todo el lote
+        added = self.blockchain.add_transactions(fresh)
+        self.transactions_received += len(added)
+        
+        # Gossip: solo las nuevas siguen propagándose
+        for tx in added:
+            self.broadcast_transaction(tx)
+        
+        return {
+            'received': len(tx_list),
+            'accepted': len(added),
+            'duplicates': duplicates,
+            'rejected': len(fresh) - len(added)
+        }
+    
+    def _mark_seen(self, signature):
+        """Recuerda una firma (LRU acotado a TX_SEEN_CACHE_SIZE)"""
+        if not signature:
+            return
+        
+        with self.tx_batch_lock:
+            self.seen_transactions[signature] = True
+            self.seen_transactions.move_to_end(signature)
+            while len(self.seen_transactions) > config.TX_SEEN_CACHE_SIZE:
+                self.seen_transactions.popitem(last=False)
+    
+    def broadcast_block(self, block, compact=True):
+        """
+        Propaga un bloque a todos los peers
+        
+        compact: enviar solo header + IDs cortos; el peer reconstruye
+        el bloque desde su mempool y pide únicamente lo que le falta
+        """
         if not self.peers:
             return 0
         
         block_data = block.to_dict()
+        compact_data = build_compact_block(block) if compact else None
         successful = 0
         
-        for host, port in list(self.peers):
+        # Los más rápidos primero: el bloque llega antes a la mayoría
+        for host, port in self.peer_manager.select_peers():
             try:
-                response = requests.post(
-                    f"http://{host}:{port}/api/network/block",
-                    json=block_data,
-                    timeout=5
-                )
+                if compact_data is not None:
+                    sent = self._send_compact_block(host, port, block, compact_data, block_data)
+                else:
+                    sent = self._send_full_block(host, port, block_data)
                 
-                if response.status_code == 200:
+                if sent:
                     successful += 1
                     self.blocks_sent += 1
             except Exception as e:
@@ -159,16 +294,134 @@ class Node:
         
         return successful
     
+    def _send_full_block(self, host, port, block_data):
+        """Envía el bloque completo a un peer"""
+        response = self.peer_manager.post(host, port, "/api/network/block", json=block_data)
+        return response is not None and response.status_code == 200
+    
+    def _send_compact_block(self, host, port, block, compact_data, block_data):
+        """
+        Envía un bloque compacto y completa las transacciones que falten
+        
+        POR QUÉ fallback: peers antiguos (404) o reconstrucciones fallidas
+        por colisión de IDs cortos reciben el bloque completo
+        """
+        response = self.peer_manager.post(host, port, "/api/network/compact_block", json=compact_data)
+        if response is None:
+            return False
+        if response.status_code == 404:
+            return self._send_full_block(host, port, block_data)
+        if response.status_code != 200:
+            return False
+        
+        result = response.json().get('data', {})
+        
+        if result.get('status') == 'incomplete':
+            missing = [
+                {'index': i, 'tx': block.transactions[i].to_dict()}
+                for i in result.get('missing', [])
+            ]
+            response = self.peer_manager.post(
+                host, port, "/api/network/block/transactions",
+                json={'block_hash': block.hash, 'transactions': missing}
+            )
+            if response is None or response.status_code != 200:
+                return False
+            result = response.json().get('data', {})
+        
+        if result.get('status') == 'failed':
+            return self._send_full_block(host, port, block_data)
+        
+        return True
+    
+    def relay_block(self, block):
+        """
+        Propaga un bloque en segundo plano
+        
+        POR QUÉ: Quien mina o acepta un bloque no debe esperar a que
+        todos los peers respondan
+        """
+        if not self.peers:
+            return
+        
+        thread = threading.Thread(target=self.broadcast_block, args=(block,))
+        thread.daemon = True
+        thread.start()
+    
+    def receive_block(self, block):
+        """
+        Procesa un bloque recibido de un peer
+        
+        Returns:
+            dict con el resultado de BlockAcceptor.process_block
+        """
+        self.blocks_received += 1
+        result = self.block_acceptor.process_block(block)
+        
+        # Gossip: los bloques nuevos siguen propagándose (los duplicados no,
+        # así la propagación termina)
+        if result['status'] == BlockAcceptor.ACCEPTED:
+            self.relay_block(block)
+        
+        return result
+    
+    def receive_compact_block(self, compact):
+        """
+        Procesa un bloque compacto recibido de un peer
+        
+        Returns:
+            dict con status 'incomplete' y los índices que faltan,
+            'failed' si no se pudo reconstruir, o el resultado de receive_block
+        """
+        header = compact['header']
+        
+        # Un bloque ya conocido no necesita reconstruirse (sus transacciones
+        # ya salieron del mempool y se pedirían de nuevo)
+        if self.block_acceptor.is_known(header['hash'], header['index']):
+            return {
+                'status': BlockAcceptor.DUPLICATE,
+                'message': f"Block #{header['index']} already known",
+                'block_index': header['index']
+            }
+        
+        block, missing = self.compact_reconstructor.reconstruct(compact)
+        
+        if block is not None:
+            return self.receive_block(block)
+        
+        if missing:
+            return {
+                'status': 'incomplete',
+                'message': f"Missing {len(missing)} transactions",
+                'block_index': header['index'],
+                'missing': missing
+            }
+        
+        return {
+            'status': 'failed',
+            'message': "Compact block reconstruction failed, send full block",
+            'block_index': header['index']
+        }
+    
+    def receive_block_transactions(self, block_hash, transactions):
+        """Completa un bloque compacto con las transacciones que faltaban"""
+        block = self.compact_reconstructor.fill_missing(block_hash, transactions)
+        
+        if block is None:
+            return {
+                'status': 'failed',
+                'message': "Unknown or incomplete compact block, send full block"
+            }
+        
+        return self.receive_block(block)
+    
     def _sync_with_peer(self, host, port):
         """Sincroniza la blockchain con un peer"""
         try:
             # Obtener info del peer
-            response = requests.get(
-                f"http://{host}:{port}/api/blockchain/info",
-                timeout=5
-            )
+            response = self.peer_manager.get(host, port, "/api/blockchain/info")
             
-            if response.status_code != 200:
+            if response is None or response.status_code != 200:
                 return False
             
             peer_info = response.json()
@@ -190,43 +443,69 @@ class Node:
             return False
     
     def _download_blockchain(self, host, port):
-        """Descarga la blockchain de un peer"""
+        """
+        Descarga del peer los bloques que faltan, por páginas
+        
+        Cada bloque pasa por el pipeline de aceptación (enlace, PoW,
+        firmas, balances), igual que un bloque propagado
+        """
         try:
-            response = requests.get(
-                f"http://{host}:{port}/api/blockchain",
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                return False
+            start = len(self.blockchain.chain)
+            downloaded = 0
             
-            peer_chain = response.json()['data']['chain']
-            
-            # Validar que la cadena del peer es válida y más larga
-            if len(peer_chain) > len(self.blockchain.chain):
-                print(f"📥 Descargando {len(peer_chain)} bloques...")
+            while True:
+                response = self.peer_manager.get(
+                    host, port, "/api/network/blocks",
+                    params={'start': start, 'limit': config.SYNC_BATCH_SIZE},
+                    timeout=10
+                )
+                
+                if response is None or response.status_code != 200:
+                    return False
+                
+                blocks = response.json()['data']['blocks']
+                if not blocks:
+                    break
+                
+                print(f"📥 Descargando bloques {start}-{start + len(blocks) - 1}...")
+                
+                for block_data in blocks:
+                    result = self.block_acceptor.process_block(Block.from_dict(block_data))
+                    if result['status'] == BlockAcceptor.REJECTED:
+                        print(f"❌ Bloque #{block_data['index']} rechazado: {result['message']}")
+                        return False
                 
-                # Aquí implementarías la lógica para reemplazar la cadena
-                # Por ahora solo mostramos el mensaje
-                print(f"✅ Sincronización completada")
-                self.blocks_received += len(peer_chain)
-                return True
+                downloaded += len(blocks)
+                self.blocks_received += len(blocks)
+                start = len(self.blockchain.chain)
+                
+                if len(blocks) < config.SYNC_BATCH_SIZE:
+                    break
             
-            return False
+            print(f"✅ Sincronización completada ({downloaded} bloques)")
+            return downloaded > 0
             
         except Exception as e:
             print(f"⚠️  Error descargando blockchain: {e}")
             return False
     
+    def get_blocks(self, start, limit=None):
+        """Bloques de la cadena local desde start (para peers que sincronizan)"""
+        limit = min(limit or config.SYNC_BATCH_SIZE, config.SYNC_BATCH_SIZE)
+        return [block.to_dict() for block in self.blockchain.chain[start:start + limit]]
+    
     def sync_with_network(self):
         """Sincroniza con todos los peers de la red"""
         if not self.peers:
             print("⚠️  No hay peers conectados")
             return
         
-        print(f"\n🔄 Sincronizando con {len(self.peers)} peers...\n")
+        # Solo los peers más rápidos: todos tienen la misma cadena
+        peers = self.peer_manager.select_peers(config.PEER_SYNC_COUNT)
         
-        for host, port in list(self.peers):
+        print(f"\n🔄 Sincronizando con {len(peers)} peers...\n")
+        
+        for host, port in peers:
             self._sync_with_peer(host, port)
         
         print(f"\n✅ Sincronización completada\n")
@@ -248,7 +527,11 @@ class Node:
             'blocks_sent': self.blocks_sent,
             'transactions_received': self.transactions_received,
             'transactions_sent': self.transactions_sent,
-            'blockchain_height': len(self.blockchain.chain) if self.blockchain else 0
+            'transaction_batches_sent': self.transaction_batches_sent,
+            'blockchain_height': len(self.blockchain.chain) if self.blockchain else 0,
+            'peer_health': self.peer_manager.get_stats(),
+            'block_acceptance': self.block_acceptor.get_stats() if self.block_acceptor else None,
+            'compact_blocks': self.compact_reconstructor.get_stats() if self.compact_reconstructor else None
         }
     
     def discover_peers(self, seed_nodes):
@@ -257,19 +540,19 @@ class Node:
         
         for seed_host, seed_port in seed_nodes:
             try:
-                response = requests.get(
-                    f"http://{seed_host}:{seed_port}/api/network/peers",
-                    timeout=5
-                )
+                response = self.peer_manager.get(seed_host, seed_port, "/api/network/peers")
                 
-                if response.status_code == 200:
+                if response is not None and response.status_code == 200:
                     peers = response.json()['data']['peers']
                     
                     for peer_str in peers:
                         host, port = peer_str.split(':')
                         port = int(port)
                         
-                        if (host, port) not in self.peers:
+                        if not self.peer_manager.has_capacity():
+                            return discovered
+                        
+                        if (host, port) not in self.peer_manager:
                             success, msg = self.add_peer(host, port)
                             if success:
                                 discovered += 1
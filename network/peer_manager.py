@@ -0,0 +1,273 @@
+# network/peer_manager.py - Gestión de peers: salud, puntuación y pool de conexiones
+
+import os
+import sys
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+
+
+class PeerInfo:
+    """
+    Estado de salud de un peer
+    """
+
+    # Peso de la última medición en la latencia media (EWMA)
+    LATENCY_ALPHA = 0.3
+
+    # Latencia supuesta para peers sin mediciones (ms)
+    UNKNOWN_LATENCY_MS = 1000.0
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.added_at = time.time()
+        self.last_seen = None
+        self.latency_ms = None
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.backoff_until = 0
+
+    @property
+    def address(self):
+        return (self.host, self.port)
+
+    def record_success(self, latency_ms):
+        """Registra una respuesta del peer"""
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.backoff_until = 0
+        self.last_seen = time.time()
+
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += self.LATENCY_ALPHA * (latency_ms - self.latency_ms)
+
+    def record_failure(self, backoff_base, backoff_max):
+        """
+        Registra un fallo y calcula el backoff exponencial
+
+        POR QUÉ: Un peer caído no debe costar un timeout en cada broadcast;
+        mientras dure el backoff no se le envía nada
+        """
+        self.failures += 1
+        self.consecutive_failures += 1
+        delay = min(backoff_base * (2 ** (self.consecutive_failures - 1)), backoff_max)
+        self.backoff_until = time.time() + delay
+
+    def failure_rate(self):
+        total = self.successes + self.failures
+        return self.failures / total if total else 0.0
+
+    def is_available(self, now=None):
+        """True si el peer no está en backoff"""
+        return (now or time.time()) >= self.backoff_until
+
+    def score(self):
+        """
+        Coste estimado de hablar con el peer (menor es mejor)
+
+        Latencia media penalizada por la tasa de fallos
+        """
+        latency = self.latency_ms if self.latency_ms is not None else self.UNKNOWN_LATENCY_MS
+        return latency * (1 + 4 * self.failure_rate())
+
+    def to_dict(self):
+        return {
+            'peer': f"{self.host}:{self.port}",
+            'latency_ms': round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            'failure_rate': round(self.failure_rate(), 3),
+            'successes': self.successes,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_seen': self.last_seen,
+            'available': self.is_available(),
+            'backoff_remaining': max(0, round(self.backoff_until - time.time(), 1)),
+            'score': round(self.score(), 2)
+        }
+
+
+class PeerManager:
+    """
+    Gestiona los peers de un nodo
+
+    - Mide latencia, tasa de fallos y última respuesta de cada peer
+    - Aplica backoff exponencial y expulsa a los peers que fallan seguido
+    - Limita las conexiones salientes y reutiliza conexiones HTTP
+    - Ordena los peers por puntuación para sync y relay
+    """
+
+    def __init__(self, max_peers=None, max_failures=None,
+                 backoff_base=None, backoff_max=None, session=None):
+        self.max_peers = max_peers or config.MAX_OUTBOUND_PEERS
+        self.max_failures = max_failures or config.PEER_MAX_FAILURES
+        self.backoff_base = backoff_base or config.PEER_BACKOFF_BASE_SECONDS
+        self.backoff_max = backoff_max or config.PEER_BACKOFF_MAX_SECONDS
+
+        self.peers = {}  # (host, port) -> PeerInfo
+        self.lock = threading.Lock()
+        self.session = session or self._create_session()
+
+        # Estadísticas
+        self.requests_sent = 0
+        self.requests_failed = 0
+        self.requests_skipped = 0
+        self.evicted = 0
+
+    def _create_session(self):
+        """
+        Sesión HTTP con pool de conexiones keep-alive
+
+        POR QUÉ: Cada requests.post suelto abre una conexión TCP nueva;
+        con una sesión compartida cada peer mantiene la suya
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_peers, pool_maxsize=self.max_peers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    # ==================== CONJUNTO DE PEERS ====================
+
+    def add(self, host, port):
+        """
+        Agrega un peer
+
+        Returns:
+            (success, message)
+        """
+        with self.lock:
+            if (host, port) in self.peers:
+                return False, "Peer already exists"
+
+            if len(self.peers) >= self.max_peers:
+                return False, f"Max outbound peers reached ({self.max_peers})"
+
+            self.peers[(host, port)] = PeerInfo(host, port)
+            return True, f"Peer {host}:{port} added"
+
+    def remove(self, host, port):
+        """Elimina un peer; True si existía"""
+        with self.lock:
+            return self.peers.pop((host, port), None) is not None
+
+    def has_capacity(self):
+        return len(self.peers) < self.max_peers
+
+    def addresses(self):
+        """Set de (host, port) de todos los peers conocidos"""
+        with self.lock:
+            return set(self.peers)
+
+    def __contains__(self, address):
+        return address in self.peers
+
+    def __len__(self):
+        return len(self.peers)
+
+    def select_peers(self, count=None):
+        """
+        Peers disponibles (sin backoff) ordenados del más rápido al más lento
+
+        count: máximo de peers a devolver (None = todos)
+        """
+        now = time.time()
+        with self.lock:
+            available = [p for p in self.peers.values() if p.is_available(now)]
+
+        available.sort(key=lambda p: p.score())
+        if count is not None:
+            available = available[:count]
+        return [p.address for p in available]
+
+    # ==================== PETICIONES ====================
+
+    def request(self, host, port, method, path, timeout=5, **kwargs):
+        """
+        Hace una petición HTTP a un peer registrando su salud
+
+        Returns:
+            requests.Response, o None si el peer está en backoff o falló
+        """
+        peer = self.peers.get((host, port))
+
+        if peer is not None and not peer.is_available():
+            self.requests_skipped += 1
+            return None
+
+        start = time.time()
+        try:
+            response = self.session.request(
+                method, f"http://{host}:{port}{path}", timeout=timeout, **kwargs
+            )
+        except Exception:
+            response = None
+
+        latency_ms = (time.time() - start) * 1000
+        self.requests_sent += 1
+
+        # Errores de servidor cuentan como fallo; 4xx significa que el peer
+        # respondió (p. ej. un bloque rechazado)
+        failed = response is None or response.status_code >= 500
+
+        if peer is not None:
+            with self.lock:
+                if failed:
+                    self._record_failure(peer)
+                else:
+                    peer.record_success(latency_ms)
+
+        if failed:
+            self.requests_failed += 1
+            return None
+        return response
+
+    def get(self, host, port, path, timeout=5, **kwargs):
+        return self.request(host, port, 'GET', path, timeout=timeout, **kwargs)
+
+    def post(self, host, port, path, json=None, timeout=5, **kwargs):
+        return self.request(host, port, 'POST', path, json=json, timeout=timeout, **kwargs)
+
+    def _record_failure(self, peer):
+        """Registra un fallo y expulsa al peer si falla demasiadas veces seguidas"""
+        peer.record_failure(self.backoff_base, self.backoff_max)
+
+        if peer.consecutive_failures >= self.max_failures:
+            if self.peers.pop(peer.address, None) is not None:
+                self.evicted += 1
+                print(f"❌ Peer expulsado tras {peer.consecutive_failures} fallos: {peer.host}:{peer.port}")
+
+    # ==================== ESTADÍSTICAS ====================
+
+    def get_peer_details(self):
+        """Salud de cada peer, del mejor al peor"""
+        with self.lock:
+            peers = sorted(self.peers.values(), key=lambda p: p.score())
+        return [p.to_dict() for p in peers]
+
+    def get_stats(self):
+        now = time.time()
+        with self.lock:
+            available = sum(1 for p in self.peers.values() if p.is_available(now))
+            total = len(self.peers)
+
+        return {
+            'peers': total,
+            'available': available,
+            'in_backoff': total - available,
+            'max_peers': self.max_peers,
+            'requests_sent': self.requests_sent,
+            'requests_failed': self.requests_failed,
+            'requests_skipped': self.requests_skipped,
+            'evicted': self.evicted
+        }
@@ -0,0 +1,737 @@
+# network/simulation.py - Simulación local de una red de N nodos
+
+"""
+Arranca N nodos ColCript en localhost (en el mismo proceso o como
+subprocesos), los conecta según una topología, inyecta carga de
+transacciones, mina bloques y mide:
+
+- Latencia de propagación de transacciones y bloques (p50/p90/p99)
+- Tiempo de sincronización de un nodo que se une tarde
+- Ancho de banda enviado/recibido por nodo
+
+Funciona sin conexión a Internet: todo el tráfico va a 127.0.0.1 o,
+en modo in-process, no sale del proceso.
+
+Uso:
+    python network/simulation.py --nodes 5 --topology ring --transactions 200 --blocks 5
+    python network/simulation.py --mode subprocess --nodes 4
+"""
+
+import os
+import sys
+import io
+import json
+import math
+import time
+import random
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import contextlib
+from urllib.parse import urlparse
+
+import requests
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from blockchain.blockchain import Blockchain
+from blockchain.block import Block
+from blockchain.transaction import Transaction
+from network.node import Node
+from network.block_acceptance import BlockAcceptor
+from network.peer_manager import PeerManager
+from wallet.wallet import Wallet
+
+TOPOLOGIES = ('full', 'ring', 'line', 'star', 'random')
+
+
+# ==================== NODO INSTRUMENTADO ====================
+
+class SimNode(Node):
+    """
+    Nodo P2P instrumentado para la simulación
+
+    Registra cuándo ve por primera vez cada transacción y bloque, y
+    cuenta los bytes que envía y recibe. Las rutas P2P se atienden en
+    handle_raw(), igual en modo in-process que detrás de HTTP.
+    """
+
+    # Operaciones de control que el orquestador puede invocar
+    CONTROL_OPS = ('connect', 'submit_transactions', 'mine', 'join', 'set_offline', 'get_stats')
+
+    def __init__(self, name, port, blockchain, session):
+        super().__init__(
+            host='127.0.0.1', port=port, blockchain=blockchain,
+            peer_manager=PeerManager(session=session)
+        )
+        self.name = name
+        self.offline = False
+        self.first_seen = {}  # firma de tx o hash de bloque -> timestamp
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.requests_served = 0
+        self.traffic_lock = threading.Lock()
+
+    # ---------- Instrumentación ----------
+
+    def _mark_first_seen(self, key):
+        if key:
+            self.first_seen.setdefault(key, time.time())
+
+    def broadcast_transaction(self, transaction):
+        # Se llama para transacciones locales y para las nuevas recibidas
+        self._mark_first_seen(transaction.signature)
+        return super().broadcast_transaction(transaction)
+
+    def relay_block(self, block):
+        # Se llama para bloques minados aquí y para los aceptados de peers
+        self._mark_first_seen(block.hash)
+        super().relay_block(block)
+
+    def count_traffic(self, sent=0, received=0):
+        with self.traffic_lock:
+            self.bytes_sent += sent
+            self.bytes_received += received
+
+    # ---------- Rutas P2P ----------
+
+    def handle_raw(self, method, path, params, body):
+        """
+        Atiende una petición P2P
+
+        Returns:
+            (status_code, cuerpo JSON en bytes)
+        """
+        payload = json.loads(body) if body else None
+        status, data = self.handle(method, path, params, payload)
+        content = json.dumps(data).encode()
+
+        with self.traffic_lock:
+            self.requests_served += 1
+            self.bytes_received += len(body)
+            self.bytes_sent += len(content)
+
+        return status, content
+
+    def handle(self, method, path, params, payload):
+        """Mismas rutas que api/server.py usa entre nodos"""
+        try:
+            if method == 'GET' and path == '/api/info':
+                return 200, {'success': True, 'data': {'node': self.name}}
+
+            if method == 'GET' and path == '/api/blockchain/info':
+                return 200, {'success': True, 'data': {'bloques': len(self.blockchain.chain)}}
+
+            if method == 'GET' and path == '/api/network/peers':
+                return 200, {'success': True, 'data': {'peers': [f"{h}:{p}" for h, p in self.peers]}}
+
+            if method == 'GET' and path == '/api/network/blocks':
+                start = int(params.get('start', 0))
+                limit = int(params.get('limit', config.SYNC_BATCH_SIZE))
+                return 200, {'success': True, 'data': {'blocks': self.get_blocks(start, limit)}}
+
+            if method == 'POST' and path == '/api/network/transaction':
+                return 200, {'success': True, 'data': self.receive_transactions([payload])}
+
+            if method == 'POST' and path == '/api/network/transactions':
+                return 200, {'success': True, 'data': self.receive_transactions(payload['transactions'])}
+
+            if method == 'POST' and path == '/api/network/block':
+                return self._block_response(self.receive_block(Block.from_dict(payload)))
+
+            if method == 'POST' and path == '/api/network/compact_block':
+                return self._block_response(self.receive_compact_block(payload))
+
+            if method == 'POST' and path == '/api/network/block/transactions':
+                return self._block_response(
+                    self.receive_block_transactions(payload['block_hash'], payload['transactions'])
+                )
+        except Exception as e:
+            return 400, {'success': False, 'message': str(e)}
+
+        return 404, {'success': False, 'message': 'Not found'}
+
+    def _block_response(self, result):
+        if result['status'] == BlockAcceptor.REJECTED:
+            return 400, {'success': False, 'message': result['message']}
+        return 200, {'success': True, 'data': result}
+
+    # ---------- Operaciones de control ----------
+
+    def connect(self, peers):
+        """Agrega peers sin ping ni sync (la topología la decide el orquestador)"""
+        added = 0
+        for host, port in peers:
+            if self.peer_manager.add(host, int(port))[0]:
+                added += 1
+        return {'added': added, 'peers': len(self.peers)}
+
+    def submit_transactions(self, transactions):
+        """Inyecta transacciones locales (como /api/transaction/send)"""
+        txs = [Transaction.from_dict(data) for data in transactions]
+        added = self.blockchain.add_transactions(txs)
+        for tx in added:
+            self.broadcast_transaction(tx)
+        return {'added': len(added)}
+
+    def mine(self, miner_address):
+        """Mina las transacciones pendientes y propaga el bloque"""
+        block = self.blockchain.mine_pending_transactions(miner_address)
+        self.relay_block(block)
+        return {'index': block.index, 'hash': block.hash, 'transactions': len(block.transactions)}
+
+    def join(self, host, port):
+        """Se conecta a un peer y descarga la cadena; mide el tiempo"""
+        start = time.time()
+        height_before = len(self.blockchain.chain)
+        success, message = self.add_peer(host, int(port))
+        return {
+            'success': success,
+            'message': message,
+            'sync_seconds': time.time() - start,
+            'blocks_downloaded': len(self.blockchain.chain) - height_before,
+            'height': len(self.blockchain.chain)
+        }
+
+    def set_offline(self, offline=True):
+        """Simula una caída: el nodo deja de responder"""
+        self.offline = offline
+        return {'offline': self.offline}
+
+    def get_stats(self):
+        return {
+            'name': self.name,
+            'port': self.port,
+            'height': len(self.blockchain.chain),
+            'tip': self.blockchain.chain[-1].hash,
+            'pending': len(self.blockchain.pending_transactions),
+            'peers': len(self.peers),
+            'first_seen': dict(self.first_seen),
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'requests_served': self.requests_served,
+            'transaction_batches_sent': self.transaction_batches_sent,
+            'peer_health': self.peer_manager.get_stats()
+        }
+
+
+# ==================== TRANSPORTES ====================
+
+class LoopbackResponse:
+    """Respuesta con la interfaz mínima de requests.Response"""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class LoopbackSession:
+    """
+    Sesión HTTP en memoria: entrega cada petición al SimNode del puerto
+
+    POR QUÉ: Permite simular decenas de nodos sin sockets, con el mismo
+    código de Node/PeerManager que usa HTTP de verdad
+    """
+
+    def __init__(self, network):
+        self.network = network
+        self.owner = None
+
+    def request(self, method, url, timeout=None, **kwargs):
+        parsed = urlparse(url)
+        target = self.network.get(parsed.port)
+
+        if target is None or target.offline:
+            raise ConnectionError(f"{url} unreachable")
+
+        payload = kwargs.get('json')
+        body = json.dumps(payload).encode() if payload is not None else b''
+        status, content = target.handle_raw(method, parsed.path, kwargs.get('params') or {}, body)
+
+        self.owner.count_traffic(sent=len(body), received=len(content))
+        return LoopbackResponse(status, content)
+
+
+class CountingSession(requests.Session):
+    """Sesión HTTP real que cuenta los bytes del nodo que la usa"""
+
+    def __init__(self):
+        super().__init__()
+        self.owner = None
+
+    def request(self, method, url, **kwargs):
+        payload = kwargs.get('json')
+        sent = len(json.dumps(payload).encode()) if payload is not None else 0
+        response = super().request(method, url, **kwargs)
+        self.owner.count_traffic(sent=sent, received=len(response.content))
+        return response
+
+
+# ==================== CLUSTERS ====================
+
+def build_blockchain(chain_data, difficulty):
+    """Blockchain en memoria a partir de bloques serializados"""
+    blockchain = Blockchain(auto_save=False)
+    blockchain.storage = None
+    blockchain.backup_system = None
+    blockchain.chain = [Block.from_dict(data) for data in chain_data]
+    blockchain.difficulty = difficulty
+    return blockchain
+
+
+class InProcessCluster:
+    """Nodos en el mismo proceso conectados por LoopbackSession"""
+
+    def __init__(self, chain_data, difficulty, base_port=7100, batch_window_ms=None):
+        self.chain_data = chain_data
+        self.difficulty = difficulty
+        self.base_port = base_port
+        self.batch_window_ms = batch_window_ms
+        self.nodes = []
+        self.by_port = {}
+
+    def start_node(self):
+        """Arranca un nodo y devuelve su (host, port)"""
+        index = len(self.nodes)
+        port = self.base_port + index
+        session = LoopbackSession(self.by_port)
+        node = SimNode(f"node{index}", port, build_blockchain(self.chain_data, self.difficulty), session)
+        session.owner = node
+
+        if self.batch_window_ms is not None:
+            node.tx_batch_window = self.batch_window_ms / 1000
+
+        self.nodes.append(node)
+        self.by_port[port] = node
+        return ('127.0.0.1', port)
+
+    def call(self, index, op, **kwargs):
+        return getattr(self.nodes[index], op)(**kwargs)
+
+    def shutdown(self):
+        pass
+
+
+class SubprocessCluster:
+    """
+    Cada nodo es un proceso con su propio servidor HTTP en 127.0.0.1
+
+    El orquestador los controla vía /sim/<operación>
+    """
+
+    def __init__(self, chain_data, difficulty, batch_window_ms=None, startup_timeout=20):
+        self.difficulty = difficulty
+        self.batch_window_ms = batch_window_ms
+        self.startup_timeout = startup_timeout
+        self.processes = []
+        self.addresses = []
+        self.session = requests.Session()
+
+        fd, self.chain_file = tempfile.mkstemp(prefix='colcript_sim_', suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'difficulty': difficulty, 'chain': chain_data}, f)
+
+    def _free_port(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+
+    def start_node(self):
+        index = len(self.processes)
+        port = self._free_port()
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            '--serve', str(port), '--chain-file', self.chain_file, '--name', f"node{index}"
+        ]
+        if self.batch_window_ms is not None:
+            command += ['--batch-window-ms', str(self.batch_window_ms)]
+
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.processes.append(process)
+        self.addresses.append(('127.0.0.1', port))
+
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            try:
+                self.call(index, 'get_stats')
+                return ('127.0.0.1', port)
+            except requests.RequestException:
+                time.sleep(0.1)
+
+        raise RuntimeError(f"node{index} did not start on port {port}")
+
+    def call(self, index, op, **kwargs):
+        host, port = self.addresses[index]
+        response = self.session.post(f"http://{host}:{port}/sim/{op}", json=kwargs, timeout=30)
+        response.raise_for_status()
+        return response.json()['data']
+
+    def shutdown(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if os.path.exists(self.chain_file):
+            os.remove(self.chain_file)
+
+
+def create_node_app(sim_node):
+    """App Flask de un nodo en modo subprocess"""
+    from flask import Flask, Response, request, jsonify
+
+    app = Flask(__name__)
+
+    @app.route('/sim/<op>', methods=['POST'])
+    def control(op):
+        if op not in SimNode.CONTROL_OPS:
+            return jsonify({'success': False, 'message': 'Unknown operation'}), 404
+        return jsonify({'success': True, 'data': getattr(sim_node, op)(**(request.get_json() or {}))})
+
+    @app.route('/<path:path>', methods=['GET', 'POST'])
+    def p2p(path):
+        if sim_node.offline:
+            return Response(status=503)
+        status, content = sim_node.handle_raw(
+            request.method, '/' + path, request.args.to_dict(), request.get_data()
+        )
+        return Response(content, status=status, mimetype='application/json')
+
+    return app
+
+
+def serve_node(port, chain_file, name, batch_window_ms=None):
+    """Punto de entrada de un nodo en modo subprocess"""
+    with open(chain_file) as f:
+        data = json.load(f)
+
+    session = CountingSession()
+    node = SimNode(name, port, build_blockchain(data['chain'], data['difficulty']), session)
+    session.owner = node
+
+    if batch_window_ms is not None:
+        node.tx_batch_window = batch_window_ms / 1000
+
+    create_node_app(node).run(host='127.0.0.1', port=port, threaded=True)
+
+
+# ==================== TOPOLOGÍAS ====================
+
+def build_topology(name, count, degree=3, seed=0):
+    """
+    Aristas (i, j) no dirigidas entre count nodos
+
+    full: todos con todos; ring: anillo; line: cadena;
+    star: todos contra el nodo 0; random: grafo conexo con ~degree vecinos
+    """
+    if name not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{name}' (use: {', '.join(TOPOLOGIES)})")
+
+    edges = set()
+
+    if name == 'full':
+        edges = {(i, j) for i in range(count) for j in range(i + 1, count)}
+    elif name in ('ring', 'line'):
+        edges = {(i, i + 1) for i in range(count - 1)}
+        if name == 'ring' and count > 2:
+            edges.add((0, count - 1))
+    elif name == 'star':
+        edges = {(0, i) for i in range(1, count)}
+    else:
+        rng = random.Random(seed)
+        # Árbol aleatorio (garantiza conexión) + aristas extra hasta ~degree
+        for i in range(1, count):
+            edges.add((rng.randrange(i), i))
+        target = min(count * degree // 2, count * (count - 1) // 2)
+        while len(edges) < target:
+            i, j = sorted(rng.sample(range(count), 2))
+            edges.add((i, j))
+
+    return sorted(edges)
+
+
+# ==================== SIMULACIÓN ====================
+
+def _percentiles(values):
+    """p50/p90/p99/max en ms de una lista de segundos"""
+    values = sorted(v * 1000 for v in values)
+    if not values:
+        return {'samples': 0, 'p50': 0, 'p90': 0, 'p99': 0, 'max': 0}
+
+    def percentile(p):
+        idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+        return round(values[idx], 2)
+
+    return {
+        'samples': len(values),
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p99': percentile(99),
+        'max': round(values[-1], 2)
+    }
+
+
+def _propagation(origins, stats):
+    """
+    Latencias desde el nodo origen hasta cada uno de los demás
+
+    origins: clave (firma o hash) -> índice del nodo origen
+    """
+    latencies = []
+    reached = 0
+    expected = 0
+
+    for key, origin in origins.items():
+        start = stats[origin]['first_seen'].get(key)
+        if start is None:
+            continue
+        for i, node_stats in enumerate(stats):
+            if i == origin:
+                continue
+            expected += 1
+            seen = node_stats['first_seen'].get(key)
+            if seen is not None:
+                reached += 1
+                latencies.append(max(0.0, seen - start))
+
+    result = _percentiles(latencies)
+    result['coverage'] = round(reached / expected, 4) if expected else 1.0
+    return result
+
+
+def _wait_until(cluster, count, condition, timeout):
+    """Sondea get_stats de todos los nodos hasta que condition(stats) sea True"""
+    deadline = time.time() + timeout
+    while True:
+        stats = [cluster.call(i, 'get_stats') for i in range(count)]
+        if condition(stats) or time.time() >= deadline:
+            return stats
+        time.sleep(0.02)
+
+
+def run_simulation(nodes=5, topology='ring', transactions=100, blocks=5, tx_rate=200,
+                   mode='inprocess', difficulty=2, batch_window_ms=None,
+                   degree=3, seed=0, settle_timeout=10, quiet=True):
+    """
+    Ejecuta un escenario completo y devuelve el reporte
+
+    nodes: nodos en la red (más uno extra que se une al final para medir sync)
+    transactions: transacciones totales, repartidas entre los bloques
+    tx_rate: transacciones por segundo inyectadas (0 = sin pausa)
+    """
+    if nodes < 2:
+        raise ValueError("At least 2 nodes are required")
+
+    output = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        return _run(nodes, topology, transactions, blocks, tx_rate, mode, difficulty,
+                    batch_window_ms, degree, seed, settle_timeout)
+
+
+def _run(nodes, topology, transactions, blocks, tx_rate, mode, difficulty,
+         batch_window_ms, degree, seed, settle_timeout):
+    rng = random.Random(seed)
+
+    # Cadena inicial compartida: un bloque de recompensa por remitente
+    # POR QUÉ: Las transacciones deben ser pagables o los bloques se rechazan
+    origin = Blockchain(auto_save=False)
+    origin.storage = None
+    origin.backup_system = None
+    origin.difficulty = difficulty
+
+    fee = config.MIN_TRANSACTION_FEE
+    amount = 0.001
+    per_sender = int(origin.mining_reward // (amount + fee)) - 1
+    senders = [Wallet(f"Sender {i}") for i in range(max(1, math.ceil(transactions / per_sender)))]
+    for wallet in senders:
+        origin.mine_pending_transactions(wallet.get_address())
+
+    chain_data = [block.to_dict() for block in origin.chain]
+    recipients = [Wallet(f"Recipient {i}").get_address() for i in range(4)]
+    miners = [Wallet(f"Miner {i}").get_address() for i in range(nodes)]
+
+    if mode == 'inprocess':
+        cluster = InProcessCluster(chain_data, origin.difficulty, batch_window_ms=batch_window_ms)
+    elif mode == 'subprocess':
+        cluster = SubprocessCluster(chain_data, origin.difficulty, batch_window_ms=batch_window_ms)
+    else:
+        raise ValueError(f"Unknown mode '{mode}' (use: inprocess, subprocess)")
+
+    try:
+        addresses = [cluster.start_node() for _ in range(nodes)]
+
+        # Topología (peers en ambos sentidos)
+        edges = build_topology(topology, nodes, degree, seed)
+        neighbours = {i: [] for i in range(nodes)}
+        for i, j in edges:
+            neighbours[i].append(list(addresses[j]))
+            neighbours[j].append(list(addresses[i]))
+        for i in range(nodes):
+            cluster.call(i, 'connect', peers=neighbours[i])
+
+        tx_origins = {}
+        block_origins = {}
+        started = time.time()
+        sent = 0
+
+        for round_number in range(blocks):
+            # Carga de transacciones, repartida entre nodos
+            round_size = transactions // blocks + (1 if round_number < transactions % blocks else 0)
+            for _ in range(round_size):
+                sender = senders[sent // per_sender]
+                tx = sender.send_coins(rng.choice(recipients), amount, fee)
+                target = rng.randrange(nodes)
+                cluster.call(target, 'submit_transactions', transactions=[tx.to_dict()])
+                tx_origins[tx.signature] = target
+                sent += 1
+                if tx_rate:
+                    time.sleep(1 / tx_rate)
+
+            # Esperar a que las transacciones lleguen a todos los mempools
+            _wait_until(
+                cluster, nodes,
+                lambda stats: all(s['pending'] >= round_size for s in stats),
+                settle_timeout
+            )
+
+            # Minar en un nodo (rotando) y esperar a que todos lo acepten
+            miner_index = round_number % nodes
+            mined = cluster.call(miner_index, 'mine', miner_address=miners[miner_index])
+            block_origins[mined['hash']] = miner_index
+            _wait_until(
+                cluster, nodes,
+                lambda stats: all(s['tip'] == mined['hash'] for s in stats),
+                settle_timeout
+            )
+
+        load_seconds = time.time() - started
+
+        # Un nodo nuevo se une a la red y descarga la cadena
+        late_index = nodes
+        cluster.start_node()
+        sync = cluster.call(late_index, 'join', host=addresses[0][0], port=addresses[0][1])
+
+        stats = [cluster.call(i, 'get_stats') for i in range(nodes)]
+        late_stats = cluster.call(late_index, 'get_stats')
+    finally:
+        cluster.shutdown()
+
+    heights = {s['height'] for s in stats}
+    tips = {s['tip'] for s in stats}
+
+    return {
+        'mode': mode,
+        'nodes': nodes,
+        'topology': topology,
+        'edges': len(edges),
+        'transactions': sent,
+        'blocks': blocks,
+        'load_seconds': round(load_seconds, 3),
+        'converged': len(tips) == 1,
+        'height': max(heights),
+        'transaction_propagation_ms': _propagation(tx_origins, stats),
+        'block_propagation_ms': _propagation(block_origins, stats),
+        'sync': {
+            'success': sync['success'],
+            'seconds': round(sync['sync_seconds'], 3),
+            'blocks_downloaded': sync['blocks_downloaded'],
+            'height': late_stats['height']
+        },
+        'bandwidth': [
+            {
+                'node': s['name'],
+                'peers': s['peers'],
+                'bytes_sent': s['bytes_sent'],
+                'bytes_received': s['bytes_received'],
+                'requests_served': s['requests_served'],
+                'transaction_batches_sent': s['transaction_batches_sent']
+            }
+            for s in stats
+        ]
+    }
+
+
+def format_report(report):
+    """Reporte legible en texto"""
+    lines = [
+        f"\n📡 Simulación: {report['nodes']} nodos ({report['mode']}), topología {report['topology']} ({report['edges']} enlaces)",
+        f"   Carga: {report['transactions']} transacciones, {report['blocks']} bloques en {report['load_seconds']}s",
+        f"   Convergencia: {'✅' if report['converged'] else '❌'} altura {report['height']}",
+        ""
+    ]
+
+    for label, key in (("Transacciones", 'transaction_propagation_ms'), ("Bloques", 'block_propagation_ms')):
+        p = report[key]
+        lines.append(
+            f"   {label:<14} p50 {p['p50']:>8.2f} ms  p90 {p['p90']:>8.2f} ms  "
+            f"p99 {p['p99']:>8.2f} ms  max {p['max']:>8.2f} ms  cobertura {p['coverage'] * 100:.1f}%"
+        )
+
+    sync = report['sync']
+    lines.append(
+        f"\n   Sync nodo nuevo: {sync['blocks_downloaded']} bloques en {sync['seconds']}s "
+        f"({'✅' if sync['success'] else '❌'} altura {sync['height']})\n"
+    )
+
+    lines.append(f"   {'Nodo':<8} {'Peers':>5} {'Enviado':>12} {'Recibido':>12} {'Peticiones':>11} {'Lotes tx':>9}")
+    for row in report['bandwidth']:
+        lines.append(
+            f"   {row['node']:<8} {row['peers']:>5} {row['bytes_sent']:>10} B {row['bytes_received']:>10} B "
+            f"{row['requests_served']:>11} {row['transaction_batches_sent']:>9}"
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación local de una red ColCript")
+    parser.add_argument('--nodes', type=int, default=5)
+    parser.add_argument('--topology', choices=TOPOLOGIES, default='ring')
+    parser.add_argument('--degree', type=int, default=3, help="Vecinos medios (topología random)")
+    parser.add_argument('--transactions', type=int, default=100)
+    parser.add_argument('--blocks', type=int, default=5)
+    parser.add_argument('--tx-rate', type=float, default=200, help="Transacciones por segundo (0 = sin pausa)")
+    parser.add_argument('--mode', choices=('inprocess', 'subprocess'), default='inprocess')
+    parser.add_argument('--difficulty', type=int, default=2)
+    parser.add_argument('--batch-window-ms', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Imprimir el reporte en JSON")
+    parser.add_argument('--verbose', action='store_true', help="Mostrar la salida de los nodos")
+
+    # Uso interno: proceso hijo en modo subprocess
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--chain-file', help=argparse.SUPPRESS)
+    parser.add_argument('--name', default='node', help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve_node(args.serve, args.chain_file, args.name, args.batch_window_ms)
+        return
+
+    report = run_simulation(
+        nodes=args.nodes, topology=args.topology, transactions=args.transactions,
+        blocks=args.blocks, tx_rate=args.tx_rate, mode=args.mode, difficulty=args.difficulty,
+        batch_window_ms=args.batch_window_ms, degree=args.degree, seed=args.seed,
+        quiet=not args.verbose
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 #!/bin/bash
 
+# Uso: ./start.sh               Servidor de desarrollo (Flask, debug)
+#      ./start.sh --production  Servidor de producción (gunicorn, ver gunicorn.conf.py)
+
 echo "🪙 Iniciando ColCript Web Interface..."
 echo ""
 echo "Servidor disponible en:"
@@ -10,4 +13,10 @@ echo "Presiona Ctrl+C para detener"
 echo ""
 
 cd ~/ColCript
+
+if [ "$1" == "--production" ]; then
+    echo "🏭 Modo producción (gunicorn)"
+    exec gunicorn -c gunicorn.conf.py api.wsgi:app
+fi
+
 python api/server.py
@@ -0,0 +1,54 @@
+# tests/conftest.py - Fixtures compartidas por los tests
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from blockchain.blockchain import Blockchain
+from network.node import Node
+
+
+@pytest.fixture
+def make_blockchain():
+    """
+    Fixture: Crea blockchains en memoria con dificultad baja
+
+    POR QUÉ: Evitar escribir en data/ y minar rápido
+    """
+    def make(difficulty=2):
+        blockchain = Blockchain(auto_save=False)
+        blockchain.storage = None
+        blockchain.backup_system = None
+        blockchain.difficulty = difficulty
+        return blockchain
+
+    return make
+
+
+@pytest.fixture
+def api_client(monkeypatch):
+    """
+    Fixture: Cliente Flask de api.server sin cargar la cadena de data/
+
+    api_client(blockchain, **servicios) instala la cadena (con un nodo P2P
+    sobre ella), stubs para contratos y pool, los servicios indicados
+    (nombre del global de api.server -> valor) y desactiva el rate limit.
+    Lo que cargue la API durante el test se deshace al terminar.
+    """
+    import api.server as server
+
+    def setup(blockchain=None, **services):
+        monkeypatch.setattr(server, 'blockchain', blockchain)
+        monkeypatch.setattr(server, 'contract_manager', object())
+        monkeypatch.setattr(server, 'mining_pool', object())
+        if blockchain is not None:
+            monkeypatch.setattr(server, 'p2p_node', Node(host='127.0.0.1', port=6000, blockchain=blockchain))
+        for name, value in services.items():
+            monkeypatch.setattr(server, name, value)
+        monkeypatch.setattr(server.limiter, 'enabled', False)
+        return server.app.test_client()
+
+    return setup
@@ -134,6 +134,18 @@ class TestAdvancedExplorer:
         assert 'volume_per_day' in activity
         assert activity['period_days'] == 7
     
+    def test_network_activity_days_are_bounded(self, explorer):
+        """
+        Test: days se limita a MAX_ACTIVITY_DAYS
+    
+        POR QUÉ: La serie rellena cada día del rango; sin límite un solo
+        ?days= enorme agota CPU y memoria
+        """
+        activity = explorer.get_network_activity(days=300000)
+    
+        assert activity['period_days'] == explorer.MAX_ACTIVITY_DAYS
+        assert len(activity['blocks_per_day']) <= explorer.MAX_ACTIVITY_DAYS + 1
+    
     def test_get_realtime_stats(self, explorer):
         """
         Test: Estadísticas en tiempo real
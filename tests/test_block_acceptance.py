@@ -0,0 +1,307 @@
+# tests/test_block_acceptance.py - Tests para aceptación de bloques recibidos
+
+import pytest
+import sys
+import os
+import copy
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from blockchain.block import Block
+from blockchain.transaction import Transaction, verify_transactions_batch
+from network.block_acceptance import BlockAcceptor
+from wallet.wallet import Wallet
+import config
+
+
+class TestBlockAcceptance:
+    """Tests para BlockAcceptor y Blockchain.add_block"""
+
+    @pytest.fixture
+    def nodes(self, make_blockchain):
+        """
+        Fixture: Dos cadenas con el mismo génesis (origen y receptor)
+
+        POR QUÉ: Los bloques solo encajan si comparten historia
+        """
+        origin = make_blockchain()
+        receiver = copy.deepcopy(origin)
+        return origin, receiver
+
+    @pytest.fixture
+    def miner(self):
+        return Wallet("Miner")
+
+    def test_valid_block_is_appended(self, nodes, miner):
+        """Test: Un bloque válido se añade a la cadena del receptor"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        result = acceptor.process_block(Block.from_dict(block.to_dict()))
+
+        assert result['status'] == BlockAcceptor.ACCEPTED
+        assert len(receiver.chain) == 2
+        assert receiver.chain[-1].hash == block.hash
+        assert receiver.is_chain_valid()
+
+    def test_confirmed_transactions_leave_mempool(self, nodes, miner):
+        """Test: Las transacciones del bloque se eliminan del pool"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+        bob = Wallet("Bob")
+
+        acceptor.process_block(Block.from_dict(
+            origin.mine_pending_transactions(miner.get_address()).to_dict()
+        ))
+
+        tx = miner.send_coins(bob.get_address(), 10)
+        origin.add_transaction(tx)
+        receiver.add_transaction(Transaction.from_dict(tx.to_dict()))
+        assert len(receiver.pending_transactions) == 1
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        result = acceptor.process_block(Block.from_dict(block.to_dict()))
+
+        assert result['status'] == BlockAcceptor.ACCEPTED
+        assert receiver.pending_transactions == []
+        assert receiver.get_balance(bob.get_address()) == 10
+
+    def test_out_of_order_blocks_use_orphan_pool(self, nodes, miner):
+        """Test: Un bloque adelantado espera a su padre y luego se conecta"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+
+        block1 = origin.mine_pending_transactions(miner.get_address())
+        block2 = origin.mine_pending_transactions(miner.get_address())
+
+        result = acceptor.process_block(Block.from_dict(block2.to_dict()))
+        assert result['status'] == BlockAcceptor.ORPHAN
+        assert len(acceptor.orphans) == 1
+        assert len(receiver.chain) == 1
+
+        result = acceptor.process_block(Block.from_dict(block1.to_dict()))
+        assert result['status'] == BlockAcceptor.ACCEPTED
+        assert result['connected_orphans'] == 1
+        assert len(acceptor.orphans) == 0
+        assert receiver.chain[-1].hash == block2.hash
+
+    def test_invalid_orphans_are_not_stored(self, nodes, miner):
+        """Test: Un huérfano con hash alterado o sin proof of work se rechaza"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+        origin.mine_pending_transactions(miner.get_address())
+        block2 = origin.mine_pending_transactions(miner.get_address())
+
+        tampered = Block.from_dict(block2.to_dict())
+        tampered.nonce += 1
+        result = acceptor.process_block(tampered)
+        assert result['status'] == BlockAcceptor.REJECTED
+        assert 'hash' in result['message']
+
+        reward = Transaction('MINING', miner.get_address(), origin.mining_reward)
+        unmined = Block(5, [reward], 'f' * 64, miner.get_address())
+        while unmined.hash.startswith('0'):
+            unmined.nonce += 1
+            unmined.hash = unmined.calculate_hash()
+        result = acceptor.process_block(unmined)
+        assert result['status'] == BlockAcceptor.REJECTED
+        assert 'proof of work' in result['message']
+
+        assert len(acceptor.orphans) == 0
+
+    def test_duplicate_block_is_ignored(self, nodes, miner):
+        """Test: Recibir dos veces el mismo bloque no lo duplica"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+        block = origin.mine_pending_transactions(miner.get_address())
+
+        acceptor.process_block(Block.from_dict(block.to_dict()))
+        result = acceptor.process_block(Block.from_dict(block.to_dict()))
+
+        assert result['status'] == BlockAcceptor.DUPLICATE
+        assert len(receiver.chain) == 2
+
+    def test_invalid_proof_of_work_is_rejected(self, nodes, miner):
+        """Test: Un bloque sin proof of work suficiente se rechaza"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+
+        reward = Transaction('MINING', miner.get_address(), origin.mining_reward)
+        block = Block(1, [reward], origin.chain[-1].hash, miner.get_address())
+        while block.hash.startswith('00'):
+            block.nonce += 1
+            block.hash = block.calculate_hash()
+
+        result = acceptor.process_block(block)
+
+        assert result['status'] == BlockAcceptor.REJECTED
+        assert 'proof of work' in result['message']
+        assert len(receiver.chain) == 1
+
+    def test_rejected_blocks_do_not_adjust_difficulty(self, nodes, miner):
+        """Test: En una altura de ajuste, los bloques rechazados no cambian la dificultad"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+        for _ in range(config.DIFFICULTY_ADJUSTMENT_INTERVAL - 1):
+            block = origin.mine_pending_transactions(miner.get_address())
+            acceptor.process_block(Block.from_dict(block.to_dict()))
+        assert len(receiver.chain) == config.DIFFICULTY_ADJUSTMENT_INTERVAL
+
+        reward = Transaction('MINING', miner.get_address(), origin.mining_reward)
+        for _ in range(3):
+            bad = Block(len(receiver.chain), [reward], receiver.chain[-1].hash, miner.get_address())
+            assert acceptor.process_block(bad)['status'] == BlockAcceptor.REJECTED
+        assert receiver.difficulty == 2
+
+        # El bloque del origen se minó con la dificultad ya ajustada (una vez)
+        block = origin.mine_pending_transactions(miner.get_address())
+        result = acceptor.process_block(Block.from_dict(block.to_dict()))
+
+        assert result['status'] == BlockAcceptor.ACCEPTED
+        assert receiver.difficulty == origin.difficulty == 3
+
+    def test_excessive_reward_is_rejected(self, nodes, miner):
+        """Test: La recompensa no puede superar base + fees"""
+        origin, receiver = nodes
+        reward = Transaction('MINING', miner.get_address(), origin.mining_reward * 10)
+        block = Block(1, [reward], origin.chain[-1].hash, miner.get_address())
+        block.mine_block(origin.difficulty)
+
+        added, reason = receiver.add_block(block)
+
+        assert added is False
+        assert 'reward' in reason
+
+    def test_tampered_signature_is_rejected(self, nodes, miner):
+        """Test: Una transacción alterada invalida el bloque"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+        bob = Wallet("Bob")
+
+        acceptor.process_block(Block.from_dict(
+            origin.mine_pending_transactions(miner.get_address()).to_dict()
+        ))
+
+        tx = miner.send_coins(bob.get_address(), 10)
+        tx.amount = 40  # Alterar después de firmar
+        reward = Transaction('MINING', miner.get_address(), origin.mining_reward + tx.fee)
+        block = Block(2, [tx, reward], receiver.chain[-1].hash, miner.get_address())
+        block.mine_block(receiver.difficulty)
+
+        result = acceptor.process_block(block)
+
+        assert result['status'] == BlockAcceptor.REJECTED
+        assert 'signature' in result['message']
+
+    def test_overspending_is_rejected(self, nodes, miner):
+        """Test: Un remitente sin fondos no puede gastar"""
+        origin, receiver = nodes
+        alice = Wallet("Alice")
+
+        tx = alice.send_coins(miner.get_address(), 10)
+        origin.add_transaction(tx)
+        block = origin.mine_pending_transactions(miner.get_address())
+
+        added, reason = receiver.add_block(Block.from_dict(block.to_dict()))
+
+        assert added is False
+        assert 'Insufficient balance' in reason
+
+    def test_negative_amount_is_rejected(self, nodes, miner):
+        """Test: Un amount negativo firmado no puede vaciar al destinatario"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+        attacker = Wallet("Attacker")
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        acceptor.process_block(Block.from_dict(block.to_dict()))
+
+        tx = Transaction(attacker.get_address(), miner.get_address(), -40, fee=0)
+        tx.sign_transaction(attacker.private_key)
+        reward = Transaction('MINING', attacker.get_address(), origin.mining_reward)
+        block = Block(2, [tx, reward], receiver.chain[-1].hash, attacker.get_address())
+        block.mine_block(receiver.difficulty)
+
+        added, reason = receiver.add_block(block)
+
+        assert added is False
+        assert 'amount' in reason
+        assert receiver.get_balance(miner.get_address()) == origin.mining_reward
+
+    def test_replayed_transaction_is_rejected(self, nodes, miner):
+        """Test: Una transacción ya confirmada (o repetida en el bloque) no entra otra vez"""
+        origin, receiver = nodes
+        bob = Wallet("Bob")
+        receiver.mine_pending_transactions(miner.get_address())
+        receiver.mine_pending_transactions(miner.get_address())
+
+        tx = miner.send_coins(bob.get_address(), 10)
+        receiver.add_transaction(tx)
+        receiver.mine_pending_transactions(miner.get_address())
+
+        def block_with(transactions):
+            reward = Transaction('MINING', miner.get_address(), receiver.mining_reward)
+            block = Block(len(receiver.chain), transactions + [reward],
+                          receiver.chain[-1].hash, miner.get_address())
+            block.mine_block(receiver.difficulty)
+            return block
+
+        added, reason = receiver.add_block(block_with([Transaction.from_dict(tx.to_dict())]))
+        assert added is False
+        assert 'already confirmed' in reason
+
+        tx2 = miner.send_coins(bob.get_address(), 1)
+        added, reason = receiver.add_block(block_with([tx2, Transaction.from_dict(tx2.to_dict())]))
+        assert added is False
+        assert 'duplicate' in reason
+        assert receiver.get_balance(bob.get_address()) == 10
+
+    def test_reward_must_pay_miner(self, nodes, miner):
+        """Test: La recompensa solo puede ir a la dirección del minero del bloque"""
+        origin, receiver = nodes
+        reward = Transaction('MINING', Wallet("Other").get_address(), origin.mining_reward)
+        block = Block(1, [reward], origin.chain[-1].hash, miner.get_address())
+        block.mine_block(origin.difficulty)
+
+        added, reason = receiver.add_block(block)
+
+        assert added is False
+        assert 'miner' in reason
+
+    def test_acceptance_latency_is_measured(self, nodes, miner):
+        """Test: Las estadísticas exponen la latencia de aceptación"""
+        origin, receiver = nodes
+        acceptor = BlockAcceptor(receiver)
+
+        for _ in range(2):
+            block = origin.mine_pending_transactions(miner.get_address())
+            acceptor.process_block(Block.from_dict(block.to_dict()))
+
+        stats = acceptor.get_stats()
+
+        assert stats['accepted'] == 2
+        assert stats['latency_ms']['samples'] == 2
+        assert stats['latency_ms']['p95'] >= stats['latency_ms']['p50'] >= 0
+
+
+class TestBatchSignatureVerification:
+    """Tests para la verificación de firmas en lote"""
+
+    def test_batch_matches_individual_validation(self):
+        """Test: El lote da el mismo resultado que is_valid()"""
+        alice = Wallet("Alice")
+        bob = Wallet("Bob")
+
+        good1 = alice.send_coins(bob.get_address(), 1)
+        good2 = alice.send_coins(bob.get_address(), 2)
+        bad = bob.send_coins(alice.get_address(), 3)
+        bad.amount = 30
+        unsigned = Transaction(alice.get_address(), bob.get_address(), 4)
+        reward = Transaction('MINING', bob.get_address(), 50)
+
+        txs = [good1, bad, good2, unsigned, reward]
+
+        assert verify_transactions_batch(txs) == [True, False, True, False, True]
+        assert verify_transactions_batch(txs) == [tx.is_valid() for tx in txs]
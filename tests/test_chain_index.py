@@ -0,0 +1,344 @@
+# tests/test_chain_index.py - Tests para los índices secundarios de la cadena
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from blockchain.chain_index import ChainIndex
+from blockchain.storage import BlockchainStorage
+from blockchain.advanced_explorer import AdvancedExplorer
+from wallet.transaction_history import TransactionHistory
+from wallet.wallet import Wallet
+
+
+def scan_address(blockchain, address):
+    """Búsqueda lineal de referencia: (altura, posición) en orden de cadena"""
+    return [
+        (block.index, position)
+        for block in blockchain.chain
+        for position, tx in enumerate(block.transactions)
+        if address in (tx.sender, tx.recipient)
+    ]
+
+
+@pytest.fixture
+def chain_with_history(make_blockchain):
+    """
+    Fixture: Cadena con recompensas y varias transferencias por bloque
+
+    POR QUÉ: Las páginas deben poder cortar a mitad de un bloque
+    """
+    blockchain = make_blockchain()
+    alice = Wallet("Alice")
+    bob = Wallet("Bob")
+
+    blockchain.mine_pending_transactions(alice.get_address())
+    for _ in range(3):
+        for amount in (1, 2, 3):
+            blockchain.add_transaction(alice.send_coins(bob.get_address(), amount))
+        blockchain.mine_pending_transactions(alice.get_address())
+
+    return blockchain, alice, bob
+
+
+class TestAddressIndex:
+    """Tests para el índice dirección -> transacciones"""
+
+    def test_index_matches_full_scan(self, chain_with_history):
+        """Test: El índice devuelve lo mismo que recorrer la cadena"""
+        blockchain, alice, bob = chain_with_history
+        index = blockchain.get_index()
+
+        for address in (alice.get_address(), bob.get_address()):
+            expected = scan_address(blockchain, address)
+            assert index.get_address_entries(address, newest_first=False) == expected
+            assert index.get_address_entries(address) == list(reversed(expected))
+
+    def test_pages_cover_history_without_gaps(self, chain_with_history):
+        """Test: Paginar hacia atrás recorre todo el historial una sola vez"""
+        blockchain, alice, _ = chain_with_history
+        history = TransactionHistory(blockchain, alice.get_address())
+
+        seen = []
+        before = None
+        while True:
+            page, before = history.get_page(limit=4, before=before)
+            seen.extend((tx['block'], tx['position']) for tx in page)
+            if before is None:
+                break
+
+        assert seen == list(reversed(scan_address(blockchain, alice.get_address())))
+
+    def test_page_does_not_analyze_full_history(self, chain_with_history, monkeypatch):
+        """Test: get_page solo construye las transacciones que devuelve"""
+        blockchain, alice, _ = chain_with_history
+        history = TransactionHistory(blockchain, alice.get_address())
+        built = []
+        build = history._build_tx_info
+        monkeypatch.setattr(history, '_build_tx_info', lambda *args: built.append(1) or build(*args))
+
+        page, _ = history.get_page(limit=2)
+
+        assert len(page) == len(built) == 2
+        assert history._transactions is None
+        assert history.get_summary()['transacciones_totales'] == len(scan_address(blockchain, alice.get_address()))
+
+    def test_history_and_explorer_use_index(self, chain_with_history):
+        """Test: TransactionHistory y AdvancedExplorer leen del índice"""
+        blockchain, alice, bob = chain_with_history
+        history = TransactionHistory(blockchain, bob.get_address())
+        explorer = AdvancedExplorer(blockchain)
+
+        assert history.get_transaction_count()['recibidas'] == 9
+        assert history.get_total_received() == 18
+
+        latest = explorer.search_address_transactions(bob.get_address(), limit=2)
+        assert [tx['block'] for tx in latest] == [4, 4]
+        assert all(tx['direction'] == 'received' for tx in latest)
+
+    def test_balance_matches_full_scan(self, chain_with_history):
+        """Test: get_balance da lo mismo con el índice"""
+        blockchain, alice, bob = chain_with_history
+
+        for address in (alice.get_address(), bob.get_address()):
+            expected = 0
+            for block in blockchain.chain:
+                for tx in block.transactions:
+                    if tx.sender == address:
+                        expected -= tx.amount + (tx.fee if tx.sender != 'MINING' else 0)
+                    if tx.recipient == address:
+                        expected += tx.amount
+            assert blockchain.get_balance(address) == pytest.approx(expected)
+
+    def test_index_follows_appended_blocks(self, chain_with_history):
+        """Test: Los bloques nuevos se indexan al añadirse"""
+        blockchain, _, _ = chain_with_history
+        carol = Wallet("Carol")
+
+        blockchain.mine_pending_transactions(carol.get_address())
+
+        assert blockchain.get_index().height == len(blockchain.chain)
+        assert blockchain.get_index().get_address_entries(carol.get_address()) == [(5, 0)]
+
+    def test_replaced_chain_is_reindexed(self, chain_with_history, make_blockchain):
+        """Test: Si la cadena cambia por completo, el índice se reconstruye"""
+        blockchain, alice, _ = chain_with_history
+        other = make_blockchain()
+        blockchain.get_index()
+
+        blockchain.chain = other.chain
+
+        assert blockchain.get_index().get_address_entries(alice.get_address()) == []
+        assert blockchain.get_index().height == 1
+
+
+class TestTransactionIndex:
+    """Tests para el índice ID de transacción -> posición"""
+
+    def test_every_transaction_is_found_by_id(self, chain_with_history):
+        """Test: Cada transacción se encuentra por su ID"""
+        blockchain, _, _ = chain_with_history
+        index = blockchain.get_index()
+
+        for block in blockchain.chain:
+            for position, tx in enumerate(block.transactions):
+                assert index.find_transaction(tx.get_hash()) == (block.index, position)
+
+    def test_search_by_signature_and_reward_id(self, chain_with_history):
+        """Test: Se busca por firma o, en recompensas, por ID estable"""
+        blockchain, _, _ = chain_with_history
+        explorer = AdvancedExplorer(blockchain)
+        transfer = blockchain.chain[2].transactions[0]
+        reward = blockchain.chain[2].transactions[-1]
+
+        by_signature = explorer.search_transaction(transfer.signature)
+        by_id = explorer.search_transaction(reward.get_hash())
+
+        assert by_signature['tx_id'] == transfer.get_hash()
+        assert by_signature['block'] == 2
+        assert by_id['transaction']['sender'] == 'MINING'
+        assert by_id['position'] == len(blockchain.chain[2].transactions) - 1
+        assert by_id['confirmations'] == len(blockchain.chain) - 2
+
+    def test_reward_id_survives_reload(self, chain_with_history, tmp_path):
+        """Test: El ID de una recompensa es el mismo tras guardar y cargar"""
+        blockchain, _, _ = chain_with_history
+        storage = BlockchainStorage(data_dir=str(tmp_path))
+        reward_id = blockchain.chain[3].transactions[-1].get_hash()
+
+        storage.save_blockchain(blockchain, "chain.json")
+        loaded = storage.load_blockchain("chain.json")
+
+        assert AdvancedExplorer(loaded).search_transaction(reward_id)['block'] == 3
+
+    def test_unknown_id(self, chain_with_history):
+        """Test: Un ID desconocido devuelve None"""
+        blockchain, _, _ = chain_with_history
+
+        assert AdvancedExplorer(blockchain).search_transaction('f' * 64) is None
+
+
+class TestBlockIndex:
+    """Tests para los índices hash de bloque -> altura y minero -> alturas"""
+
+    def test_find_block_by_hash_and_prefix(self, chain_with_history):
+        """Test: Un bloque se encuentra por hash completo o por prefijo"""
+        blockchain, _, _ = chain_with_history
+        index = blockchain.get_index()
+
+        for block in blockchain.chain:
+            assert index.find_block(block.hash) == block.index
+            assert index.find_block(block.hash[:12]) == block.index
+            assert block.index in index.search_block_hashes(block.hash[:12])
+
+    def test_unknown_hash(self, chain_with_history):
+        """Test: Un hash desconocido no devuelve bloque"""
+        blockchain, _, _ = chain_with_history
+        index = blockchain.get_index()
+
+        assert index.find_block('z' * 64) is None
+        assert index.find_block('') is None
+        assert index.search_block_hashes('z') == []
+
+    def test_miner_heights(self, chain_with_history):
+        """Test: Alturas minadas por dirección completa o prefijo"""
+        blockchain, alice, _ = chain_with_history
+        explorer = AdvancedExplorer(blockchain)
+        index = blockchain.get_index()
+
+        assert index.get_miner_heights(alice.get_address()) == [1, 2, 3, 4]
+        assert index.get_miner_heights(alice.get_address()[:10]) == [1, 2, 3, 4]
+        assert index.get_miner_heights('nadie') == []
+        assert index.count_miner_blocks(alice.get_address()[:10]) == 4
+
+    def test_miner_search_is_bounded(self, chain_with_history):
+        """Test: Un prefijo que coincide con varios mineros devuelve solo los más recientes"""
+        blockchain, alice, _ = chain_with_history
+        for miner in ('miner-a', 'miner-b', 'miner-c'):
+            blockchain.mine_pending_transactions(miner)
+        index = blockchain.get_index()
+
+        assert index.get_miner_heights(alice.get_address(), limit=2) == [3, 4]
+        assert index.get_miner_heights('miner-', limit=2) == [6, 7]
+        assert index.get_miner_heights('miner-') == [5, 6, 7]
+        assert index.count_miner_blocks('miner-') == 3
+
+    def test_block_index_survives_reload(self, chain_with_history, tmp_path):
+        """Test: El índice de bloques se guarda y se recupera con sus prefijos"""
+        blockchain, alice, _ = chain_with_history
+        storage = BlockchainStorage(data_dir=str(tmp_path))
+
+        storage.save_blockchain(blockchain, "chain.json")
+        storage.save_index(blockchain.get_index(), "chain.json")
+        loaded = storage.load_blockchain("chain.json")
+        target = blockchain.chain[3]
+
+        assert loaded.chain_index.find_block(target.hash[:8]) == 3
+        assert loaded.chain_index.get_miner_heights(alice.get_address()) == [1, 2, 3, 4]
+
+
+class TestTimestampIndex:
+    """Tests para el índice de timestamps (rangos de fechas)"""
+
+    @pytest.fixture
+    def dated_chain(self, chain_with_history):
+        """Bloques separados un día entre sí a partir del 1 de enero de 2024"""
+        blockchain, _, _ = chain_with_history
+        first = datetime(2024, 1, 1, 12, 0).timestamp()
+        for block in blockchain.chain:
+            block.timestamp = first + block.index * 86400
+        blockchain.chain_index = None
+        blockchain.activity_rollups = None
+        return blockchain
+
+    def test_date_range_matches_full_scan(self, dated_chain):
+        """Test: El rango por bisect coincide con filtrar toda la cadena"""
+        explorer = AdvancedExplorer(dated_chain)
+
+        results = explorer.search_by_date_range('2024-01-02T00:00:00', '2024-01-04T23:59:59')
+
+        assert [b['index'] for b in results] == [1, 2, 3]
+
+    def test_date_range_pages(self, dated_chain):
+        """Test: Paginar con after recorre el rango sin repetir"""
+        explorer = AdvancedExplorer(dated_chain)
+
+        first = explorer.search_by_date_range('2024-01-01', '2024-12-31', limit=2)
+        second = explorer.search_by_date_range('2024-01-01', '2024-12-31', limit=2,
+                                               after=first[-1]['index'])
+
+        assert [b['index'] for b in first] == [0, 1]
+        assert [b['index'] for b in second] == [2, 3]
+
+    def test_out_of_order_timestamp_keeps_index_sorted(self, dated_chain):
+        """Test: Un bloque con la hora atrasada no rompe la búsqueda binaria"""
+        dated_chain.chain[3].timestamp -= 2 * 86400
+        index = ChainIndex.build(dated_chain.chain)
+
+        assert index.timestamps == sorted(index.timestamps)
+        assert list(index.get_heights_in_range(start=index.timestamps[4])) == [4]
+
+    def test_network_activity_only_reads_period(self, dated_chain):
+        """Test: get_network_activity cuenta solo los bloques del período"""
+        now = datetime.now().timestamp()
+        dated_chain.chain[-1].timestamp = now
+        dated_chain.chain[-2].timestamp = now
+        dated_chain.chain_index = None
+        dated_chain.activity_rollups = None
+
+        activity = AdvancedExplorer(dated_chain).get_network_activity(days=1)
+
+        assert sum(activity['blocks_per_day'].values()) == 2
+        assert sum(activity['transactions_per_day'].values()) == 8
+
+
+class TestIndexPersistence:
+    """Tests para guardar y cargar el índice con BlockchainStorage"""
+
+    def test_index_round_trip(self, chain_with_history, tmp_path):
+        """Test: La cadena y su índice se guardan y se recuperan"""
+        blockchain, alice, _ = chain_with_history
+        storage = BlockchainStorage(data_dir=str(tmp_path))
+
+        storage.save_blockchain(blockchain, "chain.json")
+        storage.save_index(blockchain.get_index(), "chain.json")
+        loaded = storage.load_blockchain("chain.json")
+
+        assert loaded is not None
+        assert loaded.chain_index is not None
+        assert loaded.chain_index.height == len(blockchain.chain)
+        assert loaded.get_balance(alice.get_address()) == pytest.approx(
+            blockchain.get_balance(alice.get_address())
+        )
+        assert 'chain.idx' in os.listdir(tmp_path)
+
+    def test_sidecars_follow_save_filename(self, make_blockchain, tmp_path):
+        """Test: Índice y rollups se guardan con el nombre de la cadena"""
+        blockchain = make_blockchain()
+        blockchain.storage = BlockchainStorage(data_dir=str(tmp_path))
+        blockchain.save_filename = "other.json"
+
+        blockchain.mine_pending_transactions(Wallet("Alice").get_address())
+
+        files = os.listdir(tmp_path)
+        assert 'other.idx' in files and 'other.rollups' in files
+        assert 'colcript_main.idx' not in files
+        assert blockchain.storage.load_index("other.json").height == len(blockchain.chain)
+
+    def test_stale_index_catches_up(self, chain_with_history, tmp_path):
+        """Test: Un índice atrasado solo indexa los bloques que faltan"""
+        blockchain, _, _ = chain_with_history
+        storage = BlockchainStorage(data_dir=str(tmp_path))
+
+        stale = ChainIndex.build(blockchain.chain[:2])
+        storage.save_blockchain(blockchain, "chain.json")
+        storage.save_index(stale, "chain.json")
+        loaded = storage.load_blockchain("chain.json")
+
+        assert loaded.chain_index.height == 2
+        assert loaded.get_index().height == len(blockchain.chain)
+        assert loaded.get_index().by_address == ChainIndex.build(blockchain.chain).by_address
@@ -0,0 +1,199 @@
+# tests/test_chain_lock.py - Tests para el lock de lectores/escritor de la cadena
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import api.server as server
+from mining.jobs import MiningJobManager
+from mining.pool import MiningPool
+from utils.response_cache import ResponseCache
+from utils.rwlock import ReadWriteLock
+from utils.statistics import ChainAggregates
+from wallet.wallet import Wallet
+
+
+def run_in_thread(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestReadWriteLock:
+    """Tests para ReadWriteLock"""
+
+    def test_readers_run_in_parallel(self):
+        """Test: Dos lectores tienen el lock a la vez"""
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.read():
+                barrier.wait()
+
+        threads = [run_in_thread(reader) for _ in range(2)]
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert not barrier.broken
+
+    def test_writer_is_exclusive(self):
+        """Test: Un lector espera a que termine el escritor"""
+        lock = ReadWriteLock()
+        read = threading.Event()
+
+        def reader():
+            with lock.read():
+                read.set()
+
+        with lock.write():
+            thread = run_in_thread(reader)
+            assert not read.wait(timeout=0.2)
+
+        assert read.wait(timeout=5)
+        thread.join(timeout=5)
+
+    def test_waiting_writer_blocks_new_readers(self):
+        """Test: Con un escritor esperando no entran lectores nuevos"""
+        lock = ReadWriteLock()
+        order = []
+
+        def writer():
+            with lock.write():
+                order.append('write')
+
+        def reader():
+            with lock.read():
+                order.append('read')
+
+        with lock.read():
+            writer_thread = run_in_thread(writer)
+            while not lock.get_stats()['writers_waiting']:
+                time.sleep(0.01)
+            reader_thread = run_in_thread(reader)
+            time.sleep(0.1)
+            assert order == []
+
+        writer_thread.join(timeout=5)
+        reader_thread.join(timeout=5)
+        assert order == ['write', 'read']
+
+    def test_reentrancy(self):
+        """Test: Leer o escribir dentro de una escritura no bloquea; escribir dentro de una lectura falla"""
+        lock = ReadWriteLock()
+
+        with lock.write():
+            with lock.read():
+                with lock.write():
+                    pass
+
+        with lock.read():
+            with lock.read():
+                pass
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+        assert lock.get_stats() == {'readers': 0, 'writer_active': False, 'writers_waiting': 0}
+
+
+class TestConcurrentRequests:
+    """Stress test: consultas en paralelo mientras entran bloques y transacciones"""
+
+    @pytest.fixture
+    def setup(self, make_blockchain, api_client):
+        blockchain = make_blockchain()
+        miner = Wallet("Miner")
+        for _ in range(3):
+            blockchain.mine_pending_transactions(miner.get_address())
+
+        api_client(blockchain, current_wallet=miner, response_cache=ResponseCache(max_entries=8))
+
+        return blockchain, miner
+
+    def test_reads_stay_consistent_under_writes(self, setup):
+        """Test: Cada respuesta ve una cadena estable y los agregados no se corrompen"""
+        blockchain, miner = setup
+        errors = []
+        snapshots = []
+        writers_done = threading.Event()
+
+        def reader():
+            client = server.app.test_client()
+            while not writers_done.is_set() or len(snapshots) < 40:
+                for url in ('/api/statistics/dashboard', '/api/explorer/blocks?limit=5', '/api/wallet/balance'):
+                    response = client.get(url)
+                    if response.status_code != 200:
+                        errors.append((url, response.status_code))
+                    elif url == '/api/statistics/dashboard':
+                        snapshots.append(response.get_json()['data'])
+
+        def send_transactions():
+            client = server.app.test_client()
+            for i in range(15):
+                response = client.post('/api/transaction/send', json={
+                    'recipient': Wallet(f"R{i}").get_address(), 'amount': 1, 'fee': 0.5
+                })
+                if response.status_code != 200:
+                    errors.append(('send', response.status_code))
+
+        def mine_blocks():
+            for _ in range(6):
+                blockchain.mine_pending_transactions(miner.get_address())
+
+        readers = [run_in_thread(reader) for _ in range(6)]
+        writers = [run_in_thread(send_transactions), run_in_thread(mine_blocks)]
+        for thread in writers:
+            thread.join(timeout=120)
+        writers_done.set()
+        for thread in readers:
+            thread.join(timeout=120)
+
+        assert errors == []
+        assert len(blockchain.chain) == 10
+
+        # Cada dashboard sale de una sola versión de la cadena
+        for data in snapshots:
+            minted = data['mining']['total_blocks_mined'] * blockchain.mining_reward
+            assert data['supply']['circulating'] == pytest.approx(minted + data['transactions']['total_fees_paid'])
+
+        # Los agregados compartidos coinciden con recalcular desde cero
+        rebuilt = ChainAggregates()
+        rebuilt.sync(blockchain.chain)
+        assert blockchain.chain_aggregates.circulating_supply == pytest.approx(rebuilt.circulating_supply)
+        assert dict(blockchain.chain_aggregates.balances) == pytest.approx(dict(rebuilt.balances))
+        assert blockchain.get_index().height == len(blockchain.chain)
+        assert blockchain.is_chain_valid()
+
+    def test_pool_mine_does_not_block_reads(self, setup, monkeypatch):
+        """Test: Mientras el pool mina, las consultas responden sin esperar"""
+        blockchain, miner = setup
+        blockchain.difficulty = 8
+        manager = MiningJobManager(workers=1, chunk_size=2000)
+        pool = MiningPool(blockchain)
+        pool.add_miner('m1', miner.get_address())
+        monkeypatch.setattr(server, 'mining_jobs', manager)
+        monkeypatch.setattr(server, 'mining_pool', pool)
+
+        responses = []
+        thread = run_in_thread(lambda: responses.append(server.app.test_client().post('/api/pool/mine')))
+        deadline = time.time() + 10
+        while manager.active_job is None and time.time() < deadline:
+            time.sleep(0.01)
+
+        start = time.time()
+        response = server.app.test_client().get('/api/blockchain/info')
+        assert response.status_code == 200
+        assert time.time() - start < 2
+        assert not manager.active_job.finished
+
+        manager.cancel(manager.active_job.job_id)
+        thread.join(timeout=60)
+        manager.shutdown()
+
+        assert 'cancelled' in responses[0].get_json()['error']
+        assert len(blockchain.chain) == 4
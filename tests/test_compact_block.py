@@ -0,0 +1,140 @@
+# tests/test_compact_block.py - Tests para relay de bloques compactos
+
+import pytest
+import sys
+import os
+import copy
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from blockchain.transaction import Transaction
+from network.compact_block import build_compact_block, short_tx_id, CompactBlockReconstructor
+from network.node import Node
+from utils.event_system import EventSystem, EventType
+from wallet.wallet import Wallet
+
+
+class TestCompactBlocks:
+    """Tests para build_compact_block y CompactBlockReconstructor"""
+
+    @pytest.fixture
+    def setup(self, make_blockchain):
+        """
+        Fixture: Origen y receptor con el mismo génesis, minero con fondos
+        y dos transacciones firmadas
+
+        POR QUÉ: Simula dos nodos que comparten mempool vía /api/network/transaction
+        """
+        origin = make_blockchain()
+        receiver = copy.deepcopy(origin)
+        receiver_node = Node(host='127.0.0.1', port=6001, blockchain=receiver)
+
+        miner = Wallet("Miner")
+        bob = Wallet("Bob")
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        receiver_node.receive_block(copy.deepcopy(block))
+
+        txs = [miner.send_coins(bob.get_address(), amount) for amount in (1, 2)]
+        for tx in txs:
+            origin.add_transaction(tx)
+
+        return origin, receiver, receiver_node, miner, txs
+
+    def test_compact_format_prefills_only_rewards(self, setup):
+        """Test: Solo la recompensa viaja completa"""
+        origin, _, _, miner, _ = setup
+        block = origin.mine_pending_transactions(miner.get_address())
+
+        compact = build_compact_block(block)
+
+        assert compact['tx_count'] == 3
+        assert len(compact['short_ids']) == 2
+        assert len(compact['prefilled']) == 1
+        assert compact['prefilled'][0]['tx']['sender'] == 'MINING'
+        assert compact['header']['hash'] == block.hash
+
+    def test_short_ids_are_salted_per_block(self, setup):
+        """Test: El mismo tx tiene IDs distintos en bloques distintos"""
+        _, _, _, _, txs = setup
+
+        assert short_tx_id(txs[0], 'a' * 64) != short_tx_id(txs[0], 'b' * 64)
+
+    def test_reconstruct_from_mempool(self, setup):
+        """Test: Con el mempool completo no hace falta pedir nada"""
+        origin, receiver, receiver_node, miner, txs = setup
+        for tx in txs:
+            receiver.add_transaction(Transaction.from_dict(tx.to_dict()))
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        result = receiver_node.receive_compact_block(build_compact_block(block))
+
+        assert result['status'] == 'accepted'
+        assert receiver.chain[-1].hash == block.hash
+        assert receiver.pending_transactions == []
+        assert receiver_node.compact_reconstructor.stats['reconstructed_from_mempool'] == 1
+
+    def test_missing_transactions_are_requested(self, setup):
+        """Test: Solo se piden las transacciones ausentes del mempool"""
+        origin, receiver, receiver_node, miner, txs = setup
+        receiver.add_transaction(Transaction.from_dict(txs[0].to_dict()))
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        result = receiver_node.receive_compact_block(build_compact_block(block))
+
+        assert result['status'] == 'incomplete'
+        assert result['missing'] == [1]
+
+        missing = [{'index': i, 'tx': block.transactions[i].to_dict()} for i in result['missing']]
+        result = receiver_node.receive_block_transactions(block.hash, missing)
+
+        assert result['status'] == 'accepted'
+        assert receiver.chain[-1].hash == block.hash
+
+    def test_known_block_is_not_reconstructed(self, setup):
+        """Test: Un bloque ya en la cadena no pide transacciones"""
+        origin, receiver, receiver_node, _, _ = setup
+
+        result = receiver_node.receive_compact_block(build_compact_block(receiver.chain[-1]))
+
+        assert result['status'] == 'duplicate'
+        assert receiver_node.compact_reconstructor.stats['received'] == 0
+
+    def test_hash_mismatch_fails_reconstruction(self, setup):
+        """Test: Si el bloque reconstruido no coincide, se pide el completo"""
+        origin, receiver, _, miner, txs = setup
+        reconstructor = CompactBlockReconstructor(receiver)
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        compact = build_compact_block(block)
+        compact['header']['nonce'] += 1
+
+        for tx in txs:
+            receiver.add_transaction(Transaction.from_dict(tx.to_dict()))
+        rebuilt, missing = reconstructor.reconstruct(compact)
+
+        assert rebuilt is None
+        assert missing == []
+        assert reconstructor.stats['failed'] == 1
+
+
+class TestBlockAnnouncement:
+    """Tests para el evento BLOCK_ADDED de /api/network/block"""
+
+    def test_block_added_event_describes_block(self, make_blockchain, api_client):
+        """Test: El evento incluye minero y número de transacciones del bloque"""
+        origin = make_blockchain()
+        receiver = copy.deepcopy(origin)
+        events = EventSystem()
+        client = api_client(receiver, event_system=events)
+        miner = Wallet("Miner")
+
+        block = origin.mine_pending_transactions(miner.get_address())
+        response = client.post('/api/network/block', json=block.to_dict())
+
+        assert response.status_code == 200
+        event = events.get_history(EventType.BLOCK_ADDED)[0]
+        assert event['data']['miner'] == miner.get_address()
+        assert event['data']['transactions'] == 1
+        assert event['data']['hash'] == block.hash
@@ -0,0 +1,107 @@
+# tests/test_event_history.py - Tests para el historial de eventos
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.event_history import EventHistory
+from utils.event_system import Event, EventSystem, EventType
+
+
+def fill(history, count, event_type=EventType.BLOCK_MINED):
+    for i in range(count):
+        history.append(Event(event_type, {'n': i}))
+
+
+class TestEventHistory:
+    """Tests para EventHistory en memoria"""
+
+    def test_newest_first_with_cursor(self):
+        """Test: Las páginas siguen la secuencia sin huecos ni repeticiones"""
+        history = EventHistory(max_events=100, per_type=100)
+        fill(history, 30)
+
+        first = history.query(limit=10)
+        second = history.query(limit=10, before_seq=first[-1]['seq'])
+
+        assert [e['seq'] for e in first] == list(range(30, 20, -1))
+        assert [e['seq'] for e in second] == list(range(20, 10, -1))
+
+    def test_ring_keeps_latest(self):
+        """Test: El anillo descarta los más viejos"""
+        history = EventHistory(max_events=10, per_type=10)
+        fill(history, 25)
+
+        events = history.query(limit=50)
+        assert len(events) == 10
+        assert events[-1]['data'] == {'n': 15}
+
+    def test_rare_types_survive_busy_types(self):
+        """Test: Cada tipo conserva sus eventos aunque otro tipo llene el anillo global"""
+        history = EventHistory(max_events=10, per_type=5)
+        fill(history, 3, EventType.POOL_MINER_JOINED)
+        fill(history, 50, EventType.TRANSACTION_CREATED)
+
+        joined = history.query(EventType.POOL_MINER_JOINED)
+        assert [e['data']['n'] for e in joined] == [2, 1, 0]
+        assert len(history.query(EventType.TRANSACTION_CREATED)) == 5
+
+
+class TestEventHistorySpill:
+    """Tests para el volcado a disco"""
+
+    def test_deep_history_from_file(self, tmp_path):
+        """Test: Lo que ya no está en memoria se lee del fichero, con filtro y cursor"""
+        path = str(tmp_path / 'events.jsonl')
+        history = EventHistory(max_events=10, per_type=10, spill_file=path)
+        history.SPILL_INDEX_INTERVAL = 7
+        for i in range(100):
+            event_type = EventType.BLOCK_MINED if i % 2 else EventType.TRANSACTION_CREATED
+            history.append(Event(event_type, {'n': i}))
+
+        events = history.query(limit=100)
+        assert [e['seq'] for e in events] == list(range(100, 0, -1))
+
+        page = history.query(EventType.BLOCK_MINED, limit=5, before_seq=40)
+        assert [e['seq'] for e in page] == [38, 36, 34, 32, 30]
+        history.close()
+
+    def test_reopen_continues_sequence(self, tmp_path):
+        """Test: Al reabrir se conserva el historial y la secuencia sigue"""
+        path = str(tmp_path / 'events.jsonl')
+        history = EventHistory(max_events=10, per_type=10, spill_file=path)
+        fill(history, 20)
+        history.close()
+
+        # Una escritura cortada a medias no rompe la carga
+        with open(path, 'ab') as f:
+            f.write(b'{"seq": 21, "ty')
+
+        reopened = EventHistory(max_events=10, per_type=10, spill_file=path)
+        fill(reopened, 1)
+
+        events = reopened.query(limit=50)
+        assert [e['seq'] for e in events] == list(range(21, 0, -1))
+        reopened.close()
+
+
+class TestEventsHistoryAPI:
+    """Tests para /api/events/history"""
+
+    def test_cursor_pagination(self, api_client):
+        """Test: next.before_seq lleva a la página siguiente"""
+        events = EventSystem()
+        client = api_client(event_system=events)
+        for i in range(5):
+            events.emit(EventType.BLOCK_MINED, {'n': i})
+
+        first = client.get('/api/events/history?limit=3').get_json()['data']
+        cursor = first['next']['before_seq']
+        second = client.get(f'/api/events/history?limit=3&before_seq={cursor}').get_json()['data']
+
+        assert [e['data']['n'] for e in first['events']] == [4, 3, 2]
+        assert [e['data']['n'] for e in second['events']] == [1, 0]
+        assert second['next'] is None
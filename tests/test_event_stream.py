@@ -0,0 +1,106 @@
+# tests/test_event_stream.py - Tests para los eventos en vivo (SSE)
+
+import pytest
+import sys
+import os
+import json
+import threading
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import api.server as server
+from utils.event_system import EventSystem, EventSubscription, EventType
+from wallet.wallet import Wallet
+
+
+def parse_sse(chunk):
+    """(tipo, payload) de un bloque 'event: ...\\ndata: ...'"""
+    fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n') if ': ' in line)
+    return fields.get('event'), json.loads(fields['data']) if 'data' in fields else None
+
+
+class TestEventSubscription:
+    """Tests para las suscripciones de EventSystem"""
+
+    def test_fan_out_and_filter(self):
+        """Test: Cada suscripción recibe solo los tipos que pidió"""
+        events = EventSystem()
+        everything = events.subscribe()
+        blocks = events.subscribe([EventType.BLOCK_MINED])
+
+        events.emit(EventType.TRANSACTION_CREATED, {'count': 1})
+        events.emit(EventType.BLOCK_MINED, {'block_index': 1})
+
+        assert everything.next_event(0.1).event_type == EventType.TRANSACTION_CREATED
+        assert everything.next_event(0.1).event_type == EventType.BLOCK_MINED
+        assert blocks.next_event(0.1).data == {'block_index': 1}
+        assert blocks.next_event(0.01) is None
+
+        events.unsubscribe(blocks)
+        assert events.get_subscriber_count() == 1
+
+    def test_overflow_asks_for_resync(self):
+        """Test: Un cliente que no lee no bloquea emit y recibe 'resync'"""
+        events = EventSystem()
+        subscription = events.subscribe(max_queue=2)
+
+        for i in range(5):
+            events.emit(EventType.BLOCK_MINED, {'block_index': i})
+
+        event = subscription.next_event(0.1)
+        assert event.event_type == EventSubscription.RESYNC
+        assert event.data == {'dropped': 3}
+        assert subscription.next_event(0.01) is None
+
+
+class TestEventStreamAPI:
+    """Tests para /api/events/stream"""
+
+    @pytest.fixture
+    def client(self, make_blockchain, api_client):
+        blockchain = make_blockchain()
+        wallet = Wallet("Miner")
+        blockchain.mine_pending_transactions(wallet.get_address())
+
+        return api_client(
+            blockchain,
+            current_wallet=wallet,
+            event_system=EventSystem(),
+            event_stream_slots=threading.BoundedSemaphore(1)
+        )
+
+    def test_stream_delivers_events(self, client):
+        """Test: El stream anuncia 'ready' y luego los eventos emitidos"""
+        response = client.get('/api/events/stream?types=transaction_created', buffered=False)
+        chunks = iter(response.response)
+
+        assert response.mimetype == 'text/event-stream'
+        assert next(chunks).startswith(b'retry:')
+        assert parse_sse(next(chunks).decode())[0] == 'ready'
+
+        sent = client.post('/api/transaction/send', json={
+            'recipient': Wallet("Bob").get_address(), 'amount': 1, 'fee': 0.5
+        })
+        assert sent.status_code == 200
+
+        event_type, payload = parse_sse(next(chunks).decode())
+        assert event_type == EventType.TRANSACTION_CREATED
+        assert payload['data']['pending_transactions'] == 1
+        assert payload['data']['amount'] == 1
+
+        response.close()
+        assert server.event_system.get_subscriber_count() == 0
+
+    def test_client_limit(self, client):
+        """Test: Con todas las plazas ocupadas responde 503; al cerrar se liberan"""
+        first = client.get('/api/events/stream', buffered=False)
+        second = client.get('/api/events/stream', buffered=False)
+
+        assert second.status_code == 503
+        assert 'Retry-After' in second.headers
+
+        first.close()
+        third = client.get('/api/events/stream', buffered=False)
+        assert third.status_code == 200
+        third.close()
@@ -0,0 +1,99 @@
+# tests/test_logger.py - Tests para el logging estructurado
+
+import pytest
+import sys
+import os
+import io
+import json
+import logging
+import queue
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from blockchain.blockchain import Blockchain
+from utils.logger import (
+    DroppingQueueHandler, get_logger, setup_logging, shutdown_logging
+)
+from wallet.wallet import Wallet
+
+
+@pytest.fixture
+def capture():
+    """Fixture: Logging hacia un buffer; al terminar vuelve a la configuración normal"""
+    stream = io.StringIO()
+
+    def read(level='INFO', log_format='json'):
+        setup_logging(level=level, log_format=log_format, stream=stream)
+        return stream
+
+    yield read
+    setup_logging()
+
+
+def records(stream):
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestStructuredLogging:
+    """Tests para utils.logger"""
+
+    def test_json_with_fields(self, capture):
+        """Test: Cada registro es una línea JSON con sus campos"""
+        stream = capture()
+        get_logger('test').info("Bloque", block_index=3, hash='00ab')
+
+        entry = records(stream)[0]
+        assert entry['level'] == 'INFO'
+        assert entry['logger'] == 'colcript.test'
+        assert entry['msg'] == 'Bloque'
+        assert entry['block_index'] == 3
+        assert entry['hash'] == '00ab'
+
+    def test_level_filter(self, capture):
+        """Test: Con INFO no sale lo de DEBUG (transacciones, guardados, progreso)"""
+        stream = capture('INFO')
+        blockchain = Blockchain(auto_save=False)
+        blockchain.storage = None
+        blockchain.backup_system = None
+        blockchain.difficulty = 2
+        alice = Wallet("Alice")
+        blockchain.mine_pending_transactions(alice.get_address())
+        blockchain.add_transaction(alice.send_coins(Wallet("Bob").get_address(), 1))
+
+        messages = [entry['msg'] for entry in records(stream)]
+        assert "✅ Bloque añadido a la cadena" in messages
+        assert "✅ Transacción añadida al pool" not in messages
+
+    def test_debug_includes_hot_paths(self, capture):
+        """Test: Con DEBUG aparecen las transacciones añadidas"""
+        stream = capture('DEBUG')
+        blockchain = Blockchain(auto_save=False)
+        alice = Wallet("Alice")
+        blockchain.difficulty = 2
+        blockchain.storage = None
+        blockchain.backup_system = None
+        blockchain.mine_pending_transactions(alice.get_address())
+        blockchain.add_transaction(alice.send_coins(Wallet("Bob").get_address(), 1))
+
+        entries = [e for e in records(stream) if e['msg'] == "✅ Transacción añadida al pool"]
+        assert entries[0]['pending'] == 1
+
+    def test_text_format(self, capture):
+        """Test: El formato de texto añade campo=valor al mensaje"""
+        stream = capture(log_format='text')
+        get_logger('test').warning("Aviso", file='a.json')
+        shutdown_logging()
+
+        assert stream.getvalue().strip() == "Aviso file=a.json"
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test: Con la cola llena el registro se descarta"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord('colcript', logging.INFO, __file__, 1, "msg", None, None)
+
+        handler.handle(record)
+        handler.handle(record)
+
+        assert handler.dropped == 1
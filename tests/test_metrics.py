@@ -0,0 +1,101 @@
+# tests/test_metrics.py - Tests para las métricas de la API
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.metrics import LatencyHistogram, MetricsCollector, OTHER_ROUTE
+
+
+class TestLatencyHistogram:
+    """Tests para LatencyHistogram"""
+
+    def test_percentiles_within_bucket_bounds(self):
+        """Test: p50/p99 caen en la cubeta correcta"""
+        histogram = LatencyHistogram([0.01, 0.1, 1])
+        for _ in range(98):
+            histogram.observe(0.005)
+        histogram.observe(0.5)
+        histogram.observe(0.8)
+
+        assert 0 < histogram.percentile(50) <= 0.01
+        assert 0.1 < histogram.percentile(99) <= 0.8
+        assert histogram.count == 100
+
+    def test_overflow_bucket_uses_max(self):
+        """Test: Por encima de la última cubeta se devuelve el máximo observado"""
+        histogram = LatencyHistogram([0.01])
+        histogram.observe(3.0)
+
+        assert histogram.percentile(99) == 3.0
+        assert histogram.cumulative_counts() == [('0.01', 0), ('+Inf', 1)]
+
+
+class TestMetricsCollector:
+    """Tests para MetricsCollector"""
+
+    def test_routes_are_bounded(self):
+        """Test: Pasado max_routes las rutas nuevas se agrupan en '<other>'"""
+        collector = MetricsCollector(max_routes=3)
+        for i in range(10):
+            collector.record_request(f'/api/route/{i}', 0.01)
+
+        assert len(collector.endpoint_metrics) == 3
+        assert collector.endpoint_metrics[OTHER_ROUTE]['count'] == 8
+
+    def test_api_metrics_percentiles_and_reset(self):
+        """Test: get_api_metrics incluye percentiles; reset_metrics lo vacía"""
+        collector = MetricsCollector()
+        for _ in range(10):
+            collector.record_request('/api/info', 0.02)
+        collector.record_request('/api/info', 0.02, success=False)
+
+        endpoint = collector.get_api_metrics()['top_endpoints'][0]
+        assert endpoint['endpoint'] == '/api/info'
+        assert 10 < endpoint['p95_ms'] <= 20
+        assert endpoint['errors'] == 1
+
+        collector.reset_metrics()
+        assert collector.get_api_metrics()['total_requests'] == 0
+
+    def test_prometheus_format(self):
+        """Test: Buckets acumulados, _sum, _count y gauges adicionales"""
+        collector = MetricsCollector()
+        collector.record_request('/api/explorer/block/<int:block_number>', 0.002)
+        collector.record_request('/api/explorer/block/<int:block_number>', 0.2)
+
+        text = collector.to_prometheus({'colcript_chain_height': ("Bloques", 5)})
+        route = 'route="/api/explorer/block/<int:block_number>"'
+
+        assert '# TYPE colcript_http_request_duration_seconds histogram' in text
+        assert f'colcript_http_request_duration_seconds_bucket{{{route},le="0.0025"}} 1' in text
+        assert f'colcript_http_request_duration_seconds_bucket{{{route},le="+Inf"}} 2' in text
+        assert f'colcript_http_request_duration_seconds_count{{{route}}} 2' in text
+        assert f'colcript_http_requests_total{{{route}}} 2' in text
+        assert 'colcript_chain_height 5' in text
+
+
+class TestMetricsAPI:
+    """Tests para el registro de peticiones y GET /metrics"""
+
+    def test_requests_grouped_by_url_rule(self, api_client):
+        """Test: Se agrupa por regla de URL; sin regla (405) va a '<unmatched>'"""
+        collector = MetricsCollector()
+        client = api_client(metrics=collector)
+        client.get('/api/docs')
+        client.get('/no/existe/1')
+        client.get('/no/existe/2')
+        client.post('/api/docs')
+
+        assert collector.endpoint_metrics['/api/docs']['count'] == 1
+        # Las rutas desconocidas caen en la regla de los ficheros estáticos
+        assert collector.endpoint_metrics['/<path:filename>']['count'] == 2
+        assert collector.endpoint_metrics['<unmatched>']['errors'] == 1
+
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert 'colcript_http_requests_total{route="/api/docs"} 1' in response.get_data(as_text=True)
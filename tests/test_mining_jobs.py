@@ -0,0 +1,211 @@
+# tests/test_mining_jobs.py - Tests para los trabajos de minería en segundo plano
+
+import pytest
+import sys
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import api.server as server
+from mining.jobs import MiningJob, MiningJobManager, search_nonces
+from wallet.wallet import Wallet
+import config
+
+
+@pytest.fixture
+def manager():
+    """Fixture: Gestor con un solo proceso y rangos pequeños"""
+    manager = MiningJobManager(workers=1, chunk_size=2000)
+    yield manager
+    manager.shutdown()
+
+
+class TestSearchNonces:
+    """Tests para la búsqueda de nonces de los procesos"""
+
+    def test_found_nonce_matches_block_hash(self, make_blockchain):
+        """Test: El nonce encontrado da el mismo hash que Block.calculate_hash"""
+        blockchain = make_blockchain()
+        block, _ = blockchain.create_block_template(Wallet("Miner").get_address())
+
+        nonce, block_hash, tried = search_nonces(block.hashing_data(), 2, 0, 100000)
+
+        block.nonce = nonce
+        assert block_hash.startswith('00')
+        assert block.calculate_hash() == block_hash
+        assert tried == nonce + 1
+
+    def test_range_without_solution(self, make_blockchain):
+        """Test: Sin solución en el rango se informa de los intentos"""
+        blockchain = make_blockchain()
+        block, _ = blockchain.create_block_template(Wallet("Miner").get_address())
+
+        assert search_nonces(block.hashing_data(), 64, 10, 50) == (None, None, 50)
+
+
+class TestMiningJobManager:
+    """Tests para MiningJobManager"""
+
+    def test_job_mines_and_appends_block(self, manager, make_blockchain):
+        """Test: El trabajo encuentra el nonce y añade el bloque a la cadena"""
+        blockchain = make_blockchain()
+        miner = Wallet("Miner")
+        mined = []
+
+        job, started = manager.submit(blockchain, miner.get_address(), mined.append)
+        assert started
+        assert job.wait(timeout=60)
+
+        assert job.status == MiningJob.COMPLETED
+        assert blockchain.chain[-1] is job.block
+        assert blockchain.is_chain_valid()
+        assert mined == [job.block]
+
+        progress = job.to_dict()
+        assert progress['nonces_tried'] > 0
+        assert progress['hashrate'] > 0
+        assert progress['block']['hash'] == job.block.hash
+
+    def test_pending_added_while_mining_stay_pending(self, manager, make_blockchain):
+        """Test: El bloque usa una foto del pool; lo que llega después sigue pendiente"""
+        blockchain = make_blockchain()
+        alice = Wallet("Alice")
+        blockchain.mine_pending_transactions(alice.get_address())
+        blockchain.add_transaction(alice.send_coins(Wallet("Bob").get_address(), 5))
+
+        job, _ = manager.submit(blockchain, alice.get_address())
+        late = alice.send_coins(Wallet("Carol").get_address(), 3)
+        blockchain.add_transaction(late)
+        job.wait(timeout=60)
+
+        assert job.status == MiningJob.COMPLETED
+        assert len(job.block.transactions) == 2
+        assert blockchain.pending_transactions == [late]
+
+    def test_only_one_active_job(self, manager, make_blockchain):
+        """Test: Mientras hay un trabajo activo no se empieza otro"""
+        blockchain = make_blockchain()
+        blockchain.difficulty = 8
+
+        first, _ = manager.submit(blockchain, Wallet("A").get_address())
+        second, started = manager.submit(blockchain, Wallet("B").get_address())
+
+        assert not started
+        assert second is first
+
+    def test_cancel(self, manager, make_blockchain):
+        """Test: Un trabajo cancelado termina sin tocar la cadena"""
+        blockchain = make_blockchain()
+        blockchain.difficulty = 8
+
+        job, _ = manager.submit(blockchain, Wallet("Miner").get_address())
+        success, _ = manager.cancel(job.job_id)
+
+        assert success
+        assert job.wait(timeout=60)
+        assert job.status == MiningJob.CANCELLED
+        assert len(blockchain.chain) == 1
+        assert manager.cancel(job.job_id)[0] is False
+
+    def test_stale_block_fails(self, manager, make_blockchain):
+        """Test: Si otro bloque ocupa la altura, el trabajo falla"""
+        blockchain = make_blockchain()
+        miner = Wallet("Miner")
+        competing, _ = blockchain.create_block_template(Wallet("Other").get_address())
+        competing.mine_block(blockchain.difficulty)
+
+        job, _ = manager.submit(blockchain, miner.get_address())
+        blockchain._append_block(competing)
+        job.wait(timeout=60)
+
+        assert job.status == MiningJob.FAILED
+        assert len(blockchain.chain) == 2
+
+    def test_job_at_adjustment_height(self, manager, make_blockchain):
+        """Test: En la altura de ajuste la dificultad sube una vez y el bloque entra"""
+        blockchain = make_blockchain()
+        miner = Wallet("Miner")
+        for _ in range(config.DIFFICULTY_ADJUSTMENT_INTERVAL - 1):
+            blockchain.mine_pending_transactions(miner.get_address())
+
+        job, _ = manager.submit(blockchain, miner.get_address())
+        assert job.wait(timeout=60)
+
+        assert job.status == MiningJob.COMPLETED
+        assert job.difficulty == blockchain.difficulty == 3
+        assert blockchain.is_chain_valid(start=len(blockchain.chain) - 1)
+
+    def test_broken_pool_is_replaced(self, manager, make_blockchain):
+        """Test: Si el pool se rompe, el trabajo falla y el siguiente usa un pool nuevo"""
+        blockchain = make_blockchain()
+        miner = Wallet("Miner")
+
+        class BrokenExecutor:
+            shut_down = False
+
+            def submit(self, *args):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                self.shut_down = True
+
+        broken = BrokenExecutor()
+        manager.executor = broken
+
+        job, _ = manager.submit(blockchain, miner.get_address())
+        assert job.wait(timeout=60)
+        assert job.status == MiningJob.FAILED
+        assert broken.shut_down
+        assert manager.executor is None
+
+        job, _ = manager.submit(blockchain, miner.get_address())
+        assert job.wait(timeout=60)
+        assert job.status == MiningJob.COMPLETED
+        assert len(blockchain.chain) == 2
+
+
+class TestMiningJobsAPI:
+    """Tests para /api/mining/jobs"""
+
+    @pytest.fixture
+    def client(self, make_blockchain, api_client, manager):
+        return api_client(make_blockchain(), mining_jobs=manager, current_wallet=Wallet("Miner"))
+
+    def test_start_and_poll(self, client):
+        """Test: POST devuelve el ID y GET informa del progreso hasta terminar"""
+        response = client.post('/api/mining/jobs')
+        job_id = response.get_json()['data']['job_id']
+
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            job = client.get(f'/api/mining/jobs/{job_id}').get_json()['data']
+            if job['status'] != 'running':
+                break
+            time.sleep(0.05)
+
+        assert job['status'] == 'completed'
+        assert job['block']['index'] == 1
+        assert len(server.blockchain.chain) == 2
+        assert client.get('/api/mining/jobs').get_json()['data']['count'] == 1
+
+    def test_cancel_endpoint(self, client):
+        """Test: DELETE cancela y un segundo POST no duplica el trabajo"""
+        server.blockchain.difficulty = 8
+        job_id = client.post('/api/mining/jobs').get_json()['data']['job_id']
+
+        assert client.post('/api/mining/jobs').status_code == 409
+        assert client.delete(f'/api/mining/jobs/{job_id}').status_code == 200
+
+        server.mining_jobs.get_job(job_id).wait(timeout=60)
+        assert client.get(f'/api/mining/jobs/{job_id}').get_json()['data']['status'] == 'cancelled'
+        assert client.get('/api/mining/jobs/unknown').status_code == 404
+
+    def test_mine_waits_for_job(self, client):
+        """Test: /api/mining/mine mantiene su respuesta usando el pool"""
+        data = client.post('/api/mining/mine').get_json()['data']
+
+        assert data['block']['index'] == 1
+        assert data['block']['hash'] == server.blockchain.chain[1].hash
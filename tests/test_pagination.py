@@ -0,0 +1,119 @@
+# tests/test_pagination.py - Tests para la paginación por cursor de la API
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import config
+import api.server as server
+from contracts.smart_contract import ContractManager
+from wallet.wallet import Wallet
+
+
+@pytest.fixture
+def client(make_blockchain, api_client, tmp_path):
+    """
+    Fixture: Cliente Flask con una cadena de 12 bloques en memoria
+
+    POR QUÉ: init_blockchain no carga nada si los globales ya existen
+    """
+    blockchain = make_blockchain()
+    miner = Wallet("Miner")
+    for _ in range(11):
+        blockchain.mine_pending_transactions(miner.get_address())
+
+    manager = ContractManager(blockchain)
+    manager.contracts = {}
+    manager.contract_order = []
+    manager.storage_file = str(tmp_path / "contracts.json")
+
+    return api_client(blockchain, contract_manager=manager, current_wallet=miner)
+
+
+def walk(client, url, cursor_key, items_key):
+    """Recorre todas las páginas siguiendo 'next'; devuelve las páginas"""
+    pages = []
+    query = ''
+    while True:
+        data = client.get(url + query).get_json()['data']
+        pages.append(data[items_key])
+        if data['next'] is None:
+            return pages
+        separator = '&' if '?' in url else '?'
+        query = separator + '&'.join(f"{k}={v}" for k, v in data['next'].items())
+        assert cursor_key in data['next']
+
+
+class TestBlockPagination:
+    """Tests para /api/blockchain y /api/explorer/blocks"""
+
+    def test_blockchain_pages_cover_chain(self, client):
+        """Test: Las páginas recorren toda la cadena sin repetir"""
+        pages = walk(client, '/api/blockchain?limit=5', 'before_height', 'chain')
+
+        assert [[b['index'] for b in page] for page in pages] == [
+            [7, 8, 9, 10, 11], [2, 3, 4, 5, 6], [0, 1]
+        ]
+
+    def test_default_and_max_page_size(self, client, monkeypatch):
+        """Test: Sin limit se usa el tamaño por defecto y nunca se pasa del máximo"""
+        monkeypatch.setattr(config, 'API_DEFAULT_PAGE_SIZE', 4)
+        monkeypatch.setattr(config, 'API_MAX_PAGE_SIZE', 6)
+
+        default = client.get('/api/blockchain').get_json()['data']
+        capped = client.get('/api/blockchain?limit=1000').get_json()['data']
+
+        assert len(default['chain']) == 4
+        assert len(capped['chain']) == 6
+        assert capped['length'] == 12
+
+    def test_explorer_blocks_keep_latest_first_page(self, client):
+        """Test: Sin cursor, /api/explorer/blocks devuelve los más recientes"""
+        data = client.get('/api/explorer/blocks?limit=3').get_json()['data']
+        older = client.get('/api/explorer/blocks?limit=3&before_height=9').get_json()['data']
+
+        assert [b['index'] for b in data['blocks']] == [9, 10, 11]
+        assert data['next'] == {'before_height': 9}
+        assert [b['index'] for b in older['blocks']] == [6, 7, 8]
+
+
+class TestHistoryPagination:
+    """Tests para /api/wallet/history"""
+
+    def test_history_is_always_paged(self, client):
+        """Test: El historial se pagina aunque no se pida limit"""
+        pages = walk(client, '/api/wallet/history?limit=4', 'before_height', 'transactions')
+        first = client.get('/api/wallet/history').get_json()['data']
+
+        assert [len(page) for page in pages] == [4, 4, 3]
+        assert pages[0][0]['block'] == 11
+        assert 'summary' in first
+        assert first['summary']['transacciones_totales'] == 11
+
+
+class TestContractPagination:
+    """Tests para ContractManager.list_contracts y /api/contracts/list"""
+
+    def test_contracts_pages_in_creation_order(self, client):
+        """Test: Los contratos se paginan por ID en orden de creación"""
+        manager = server.contract_manager
+        ids = [manager.create_timelock("Alice", 100, 1, "Bob").contract_id for _ in range(5)]
+
+        pages = walk(client, '/api/contracts/list?limit=2', 'after_id', 'contracts')
+
+        assert [[c['contract_id'] for c in page] for page in pages] == [ids[0:2], ids[2:4], ids[4:]]
+
+    def test_status_filter_with_cursor(self, client):
+        """Test: El filtro por estado se aplica página a página"""
+        manager = server.contract_manager
+        contracts = [manager.create_timelock("Alice", 100, 1, "Bob") for _ in range(6)]
+        for contract in contracts[::2]:
+            contract.executed = True
+
+        first = manager.list_contracts('executed', limit=2)
+        second = manager.list_contracts('executed', limit=2, after=first[-1].contract_id)
+
+        assert [c.contract_id for c in first + second] == [c.contract_id for c in contracts[::2]]
@@ -0,0 +1,124 @@
+# tests/test_peer_manager.py - Tests para la gestión de peers
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from network.peer_manager import PeerManager
+from network.node import Node
+
+
+class FakeResponse:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """
+    Sesión HTTP simulada
+
+    POR QUÉ: Controlar qué peers responden sin abrir sockets
+    """
+
+    def __init__(self):
+        self.down = set()  # Puertos que no responden
+        self.calls = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append((method, url))
+        port = int(url.split(':')[2].split('/')[0])
+        if port in self.down:
+            raise ConnectionError("peer down")
+        return FakeResponse(200)
+
+
+class TestPeerManager:
+    """Tests para PeerManager"""
+
+    @pytest.fixture
+    def session(self):
+        return FakeSession()
+
+    @pytest.fixture
+    def manager(self, session):
+        return PeerManager(max_peers=3, max_failures=3, backoff_base=60, session=session)
+
+    def test_outbound_cap(self, manager):
+        """Test: No se superan las conexiones salientes máximas"""
+        for port in (7001, 7002, 7003):
+            assert manager.add('10.0.0.1', port)[0]
+
+        success, msg = manager.add('10.0.0.1', 7004)
+
+        assert success is False
+        assert 'Max outbound' in msg
+        assert len(manager) == 3
+
+    def test_fastest_peers_first(self, manager):
+        """Test: select_peers ordena por latencia"""
+        manager.add('10.0.0.1', 7001)
+        manager.add('10.0.0.1', 7002)
+        manager.peers[('10.0.0.1', 7001)].record_success(120)
+        manager.peers[('10.0.0.1', 7002)].record_success(15)
+
+        assert manager.select_peers() == [('10.0.0.1', 7002), ('10.0.0.1', 7001)]
+        assert manager.select_peers(1) == [('10.0.0.1', 7002)]
+
+    def test_failed_peer_backs_off(self, manager, session):
+        """Test: Tras un fallo el peer no recibe peticiones durante el backoff"""
+        manager.add('10.0.0.1', 7001)
+        session.down.add(7001)
+
+        assert manager.post('10.0.0.1', 7001, '/api/network/transaction', json={}) is None
+        assert manager.select_peers() == []
+
+        assert manager.post('10.0.0.1', 7001, '/api/network/transaction', json={}) is None
+        assert len(session.calls) == 1
+        assert manager.get_stats()['requests_skipped'] == 1
+
+    def test_unhealthy_peer_is_evicted(self, session):
+        """Test: Un peer que falla seguido se expulsa"""
+        manager = PeerManager(max_failures=2, backoff_base=0.000001, session=session)
+        manager.add('10.0.0.1', 7001)
+        session.down.add(7001)
+
+        manager.get('10.0.0.1', 7001, '/api/info')
+        manager.peers[('10.0.0.1', 7001)].backoff_until = 0
+        manager.get('10.0.0.1', 7001, '/api/info')
+
+        assert ('10.0.0.1', 7001) not in manager
+        assert manager.get_stats()['evicted'] == 1
+
+    def test_success_resets_consecutive_failures(self, manager, session):
+        """Test: Una respuesta correcta limpia el backoff"""
+        manager.add('10.0.0.1', 7001)
+        peer = manager.peers[('10.0.0.1', 7001)]
+        peer.record_failure(60, 300)
+
+        peer.record_success(10)
+
+        assert peer.consecutive_failures == 0
+        assert peer.is_available()
+        assert peer.failure_rate() == 0.5
+
+    def test_node_broadcast_skips_dead_peers(self, session):
+        """Test: El nodo no vuelve a esperar a un peer caído"""
+        node = Node(host='127.0.0.1', port=6000,
+                    peer_manager=PeerManager(backoff_base=60, session=session))
+        assert node.add_peer('10.0.0.1', 7001)[0]
+        assert node.add_peer('10.0.0.1', 7002)[0]
+        session.down.add(7002)
+
+        class Tx:
+            def to_dict(self):
+                return {}
+
+        assert node.broadcast_transactions([Tx()]) == 1
+        assert node.broadcast_transactions([Tx()]) == 1
+
+        posts_to_dead = [c for c in session.calls if c[0] == 'POST' and ':7002/' in c[1]]
+        assert len(posts_to_dead) == 1
+        assert node.peers == {('10.0.0.1', 7001), ('10.0.0.1', 7002)}
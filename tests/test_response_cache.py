@@ -0,0 +1,122 @@
+# tests/test_response_cache.py - Tests para la caché de respuestas de la API
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import api.server as server
+from utils.response_cache import ResponseCache
+from utils.statistics import BlockchainStatistics
+from wallet.wallet import Wallet
+
+
+class TestResponseCache:
+    """Tests para ResponseCache"""
+
+    def test_hit_and_miss(self):
+        """Test: Una clave guardada se sirve mientras la punta no cambie"""
+        cache = ResponseCache(max_entries=4)
+
+        assert cache.get('a', 'tip1') is None
+        cache.set('a', 'tip1', b'A')
+
+        assert cache.get('a', 'tip1') == b'A'
+        assert cache.get_stats()['hit_ratio'] == 0.5
+
+    def test_new_tip_invalidates_everything(self):
+        """Test: Con otra punta no se sirve nada de lo anterior"""
+        cache = ResponseCache(max_entries=4)
+        cache.set('a', 'tip1', b'A')
+        cache.set('b', 'tip1', b'B')
+
+        assert cache.get('a', 'tip2') is None
+        assert cache.get_stats()['entries'] == 0
+        assert cache.get_stats()['invalidations'] == 1
+
+    def test_lru_eviction(self):
+        """Test: Al llenarse se expulsa la menos usada recientemente"""
+        cache = ResponseCache(max_entries=2)
+        cache.set('a', 'tip', b'A')
+        cache.set('b', 'tip', b'B')
+        cache.get('a', 'tip')
+
+        cache.set('c', 'tip', b'C')
+
+        assert cache.get('b', 'tip') is None
+        assert cache.get('a', 'tip') == b'A'
+        assert cache.get_stats()['evictions'] == 1
+
+
+class TestCachedEndpoints:
+    """Tests para los endpoints con @cached_response"""
+
+    @pytest.fixture
+    def client(self, make_blockchain, api_client):
+        blockchain = make_blockchain()
+        blockchain.mine_pending_transactions(Wallet("Miner").get_address())
+
+        return api_client(blockchain, response_cache=ResponseCache(max_entries=8))
+
+    @pytest.fixture
+    def dashboard_calls(self, monkeypatch):
+        """Cuenta cuántas veces se calcula el dashboard"""
+        calls = []
+        original = BlockchainStatistics.get_complete_dashboard
+
+        def counting(stats):
+            calls.append(1)
+            return original(stats)
+
+        monkeypatch.setattr(BlockchainStatistics, 'get_complete_dashboard', counting)
+        return calls
+
+    def test_repeated_request_is_served_from_cache(self, client, dashboard_calls):
+        """Test: La segunda petición no recalcula el dashboard"""
+        first = client.get('/api/statistics/dashboard')
+        second = client.get('/api/statistics/dashboard')
+
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.get_json() == first.get_json()
+        assert len(dashboard_calls) == 1
+
+    def test_new_block_invalidates(self, client, dashboard_calls):
+        """Test: Un bloque nuevo invalida las respuestas guardadas"""
+        client.get('/api/statistics/dashboard')
+        server.blockchain.mine_pending_transactions(Wallet("Other").get_address())
+
+        response = client.get('/api/statistics/dashboard')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['data']['mining']['total_blocks_mined'] == 2
+        assert len(dashboard_calls) == 2
+
+    def test_args_are_part_of_the_key(self, client):
+        """Test: Distintos parámetros son entradas distintas"""
+        client.get('/api/explorer/blocks?limit=1')
+        response = client.get('/api/explorer/blocks?limit=2')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['data']['count'] == 2
+
+    def test_errors_are_not_cached(self, client):
+        """Test: Las respuestas de error no se guardan"""
+        client.get('/api/explorer/block/99')
+        response = client.get('/api/explorer/block/99')
+
+        assert response.status_code == 404
+        assert response.headers['X-Cache'] == 'MISS'
+
+    def test_hit_ratio_in_api_metrics(self, client):
+        """Test: /api/metrics/api informa del uso de la caché"""
+        client.get('/api/explorer/blocks')
+        client.get('/api/explorer/blocks')
+
+        stats = client.get('/api/metrics/api').get_json()['data']['response_cache']
+
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_ratio'] == 0.5
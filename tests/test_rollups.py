@@ -0,0 +1,134 @@
+# tests/test_rollups.py - Tests para los intervalos de actividad
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import config
+from blockchain.rollups import ActivityRollups
+from blockchain.storage import BlockchainStorage
+from blockchain.advanced_explorer import AdvancedExplorer
+from wallet.wallet import Wallet
+
+# 2024-01-01 00:00:00 UTC
+BASE = 1704067200
+
+
+@pytest.fixture
+def timed_chain(make_blockchain):
+    """
+    Fixture: Bloques con timestamps fijos
+
+    Génesis en BASE, bloques 1-2 en el primer minuto, bloque 3 una hora
+    después y bloque 4 al día siguiente
+    """
+    blockchain = make_blockchain()
+    alice = Wallet("Alice")
+    bob = Wallet("Bob")
+
+    blockchain.mine_pending_transactions(alice.get_address())
+    blockchain.mine_pending_transactions(alice.get_address())
+    blockchain.add_transaction(alice.send_coins(bob.get_address(), 10))
+    blockchain.mine_pending_transactions(alice.get_address())
+    blockchain.mine_pending_transactions(bob.get_address())
+
+    for block, offset in zip(blockchain.chain, (0, 20, 40, 3600, 86400 + 30)):
+        block.timestamp = BASE + offset
+    blockchain.activity_rollups = None
+    return blockchain
+
+
+class TestActivityRollups:
+    """Tests para ActivityRollups"""
+
+    def test_buckets_per_resolution(self, timed_chain):
+        """Test: Cada bloque cae en su minuto, hora y día"""
+        rollups = timed_chain.get_rollups()
+
+        minutes = rollups.get_series('minute', since=BASE, until=BASE)
+        hours = rollups.get_series('hour', since=BASE, until=BASE + 3600)
+        days = rollups.get_series('day')
+
+        assert minutes[0]['blocks'] == 3
+        assert [h['blocks'] for h in hours] == [3, 1]
+        assert [d['blocks'] for d in days] == [4, 1]
+        assert sum(d['transactions'] for d in days) == sum(len(b.transactions) for b in timed_chain.chain)
+
+    def test_volume_fees_and_block_time(self, timed_chain):
+        """Test: Volumen, fees y tiempo medio entre bloques"""
+        rollups = timed_chain.get_rollups()
+        transfer = timed_chain.chain[3].transactions[0]
+
+        hour = rollups.get_series('hour', since=BASE + 3600, until=BASE + 3600)[0]
+
+        assert hour['fees'] == pytest.approx(transfer.fee)
+        assert hour['volume'] == pytest.approx(sum(tx.amount for tx in timed_chain.chain[3].transactions))
+        assert hour['avg_block_time'] == 3560
+        assert rollups.get_series('minute', since=BASE, until=BASE)[0]['avg_block_time'] == 20
+
+    def test_series_fills_gaps(self, timed_chain):
+        """Test: Los intervalos sin bloques se devuelven a cero"""
+        series = timed_chain.get_rollups().get_series('hour', since=BASE, until=BASE + 5 * 3600)
+
+        assert len(series) == 6
+        assert [h['blocks'] for h in series] == [3, 1, 0, 0, 0, 0]
+        assert series[2]['start'] - series[1]['start'] == 3600
+
+    def test_retention_prunes_oldest(self, timed_chain, monkeypatch):
+        """Test: Solo se guardan los intervalos más recientes"""
+        monkeypatch.setitem(config.ACTIVITY_ROLLUP_RETENTION, 'minute', 2)
+
+        buckets = timed_chain.get_rollups().buckets['minute']
+
+        assert sorted(buckets) == [BASE + 3600, BASE + 86400]
+
+    def test_new_blocks_and_replaced_chain(self, timed_chain):
+        """Test: Se suman bloques nuevos y se recalcula si la cadena cambia"""
+        rollups = timed_chain.get_rollups()
+
+        timed_chain.mine_pending_transactions(Wallet("Carol").get_address())
+        assert rollups.height == len(timed_chain.chain)
+
+        timed_chain.chain = timed_chain.chain[:2]
+        days = timed_chain.get_rollups().get_series('day')
+        assert [d['blocks'] for d in days] == [2]
+
+    def test_round_trip(self, timed_chain, tmp_path):
+        """Test: Los intervalos se guardan y se recuperan con BlockchainStorage"""
+        storage = BlockchainStorage(data_dir=str(tmp_path))
+        rollups = timed_chain.get_rollups()
+
+        storage.save_rollups(rollups, "chain.json")
+        loaded = storage.load_rollups("chain.json")
+
+        assert 'chain.rollups' in os.listdir(tmp_path)
+        assert loaded.buckets == rollups.buckets
+        assert loaded.get_series('day') == rollups.get_series('day')
+
+    def test_version_mismatch_is_ignored(self):
+        """Test: Un archivo de otra versión se descarta"""
+        assert ActivityRollups.from_dict({'version': 0}) is None
+
+
+class TestExplorerActivity:
+    """Tests para get_network_activity y get_realtime_stats con timestamps epoch"""
+
+    def test_realtime_stats_with_epoch_timestamps(self, timed_chain):
+        """Test: El tiempo medio de bloque ya no sale a cero"""
+        stats = AdvancedExplorer(timed_chain).get_realtime_stats()
+
+        assert stats['average_block_time'] == pytest.approx((86400 + 30) / 4, abs=0.01)
+        assert stats['last_activity_seconds_ago'] > 0
+
+    def test_network_activity_from_rollups(self, make_blockchain):
+        """Test: La actividad diaria incluye los bloques recientes"""
+        blockchain = make_blockchain()
+        blockchain.mine_pending_transactions(Wallet("Alice").get_address())
+
+        activity = AdvancedExplorer(blockchain).get_network_activity(days=1)
+
+        assert sum(activity['blocks_per_day'].values()) == 2
+        assert set(activity['fees_per_day']) == set(activity['blocks_per_day'])
@@ -0,0 +1,86 @@
+# tests/test_simulation.py - Tests para la simulación de red local
+
+import pytest
+import sys
+import os
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from network.simulation import build_topology, run_simulation, format_report
+
+
+class TestTopologies:
+    """Tests para build_topology"""
+
+    def test_ring_and_line(self):
+        """Test: Anillo cerrado y cadena abierta"""
+        assert build_topology('ring', 4) == [(0, 1), (0, 3), (1, 2), (2, 3)]
+        assert build_topology('line', 4) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_star_and_full(self):
+        """Test: Estrella contra el nodo 0 y malla completa"""
+        assert build_topology('star', 4) == [(0, 1), (0, 2), (0, 3)]
+        assert len(build_topology('full', 5)) == 10
+
+    def test_random_is_connected_and_reproducible(self):
+        """Test: El grafo aleatorio es conexo y depende solo de la semilla"""
+        edges = build_topology('random', 8, degree=3, seed=7)
+
+        reached = {0}
+        changed = True
+        while changed:
+            changed = False
+            for i, j in edges:
+                if (i in reached) != (j in reached):
+                    reached |= {i, j}
+                    changed = True
+
+        assert reached == set(range(8))
+        assert edges == build_topology('random', 8, degree=3, seed=7)
+
+    def test_unknown_topology(self):
+        """Test: Topología desconocida"""
+        with pytest.raises(ValueError):
+            build_topology('mesh', 3)
+
+
+@pytest.fixture(scope='module')
+def report():
+    """
+    Fixture: Una simulación pequeña compartida por los tests
+
+    POR QUÉ: Cada simulación crea varias cadenas y mina bloques
+    """
+    return run_simulation(nodes=3, topology='line', transactions=9, blocks=2, tx_rate=0)
+
+
+class TestSimulation:
+    """Tests para run_simulation (modo in-process)"""
+
+    def test_network_converges(self, report):
+        """Test: Todos los nodos terminan con la misma cadena"""
+        assert report['converged'] is True
+        assert report['transactions'] == 9
+
+    def test_propagation_reaches_every_node(self, report):
+        """Test: Transacciones y bloques llegan a todos los nodos"""
+        tx = report['transaction_propagation_ms']
+        block = report['block_propagation_ms']
+
+        assert tx['coverage'] == 1.0
+        assert tx['samples'] == 9 * 2
+        assert block['coverage'] == 1.0
+        assert block['p99'] >= block['p50'] >= 0
+
+    def test_late_node_syncs(self, report):
+        """Test: Un nodo nuevo descarga los bloques que faltan"""
+        assert report['sync']['success'] is True
+        assert report['sync']['blocks_downloaded'] == 2
+        assert report['sync']['height'] == report['height']
+
+    def test_bandwidth_per_node(self, report):
+        """Test: Se mide el tráfico de cada nodo"""
+        assert len(report['bandwidth']) == 3
+        assert all(row['bytes_sent'] > 0 and row['bytes_received'] > 0 for row in report['bandwidth'])
+        assert 'p99' in format_report(report)
@@ -0,0 +1,143 @@
+# tests/test_startup.py - Tests para el arranque explícito del servidor
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import api.server as server
+from blockchain.storage import BlockchainStorage
+from network.node import Node
+from wallet.wallet import Wallet
+
+
+class GatedStorage(BlockchainStorage):
+    """Almacenamiento cuya carga espera a que el test la libere"""
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.release = threading.Event()
+        self.loads = 0
+
+    def load_blockchain(self, filename):
+        self.loads += 1
+        self.release.wait(timeout=30)
+        return super().load_blockchain(filename)
+
+
+@pytest.fixture
+def storage(make_blockchain, api_client, tmp_path):
+    """
+    Fixture: Servidor sin arrancar con una cadena de 4 bloques en disco
+
+    POR QUÉ: Los globales a None hacen que startup cargue desde el almacenamiento
+    """
+    blockchain = make_blockchain()
+    miner = Wallet("Miner")
+    for _ in range(3):
+        blockchain.mine_pending_transactions(miner.get_address())
+
+    storage = GatedStorage(str(tmp_path))
+    storage.save_blockchain(blockchain, "colcript_main.json")
+
+    api_client(
+        storage=storage,
+        p2p_node=Node(host='127.0.0.1', port=6000, blockchain=blockchain),
+        mining_jobs=None,
+        startup_state={
+            'status': server.STARTUP_STOPPED, 'started_at': None, 'ready_at': None, 'error': None
+        }
+    )
+
+    yield storage
+    storage.release.set()
+
+
+def wait_ready(timeout=30):
+    deadline = time.time() + timeout
+    while server.startup_state['status'] == server.STARTUP_WARMING and time.time() < deadline:
+        time.sleep(0.01)
+    return server.startup_state['status']
+
+
+class TestStartup:
+    """Tests para startup y /api/health"""
+
+    def test_warming_then_ready(self, storage):
+        """Test: Mientras carga, health dice 'warming' y la API responde 503"""
+        client = server.app.test_client()
+        server.startup(background=True)
+
+        health = client.get('/api/health')
+        info = client.get('/api/info')
+
+        assert health.status_code == 503
+        assert health.get_json()['data']['status'] == 'warming'
+        assert info.status_code == 503
+        assert info.headers['Retry-After'] == '2'
+
+        storage.release.set()
+        assert wait_ready() == server.STARTUP_READY
+
+        health = client.get('/api/health').get_json()['data']
+        assert health['startup']['status'] == 'ready'
+        assert client.get('/api/info').get_json()['data']['blocks_count'] == 4
+
+    def test_chain_is_indexed_before_ready(self, storage):
+        """Test: Índices y agregados quedan calculados en el arranque"""
+        storage.release.set()
+        server.startup()
+
+        blockchain = server.blockchain
+        assert blockchain.chain_index.height == 4
+        assert blockchain.activity_rollups.height == 4
+        assert blockchain.chain_aggregates.height == 4
+
+    def test_requests_do_not_reload_after_startup(self, storage, monkeypatch):
+        """Test: Tras el arranque, init_blockchain ya no carga nada"""
+        storage.release.set()
+        server.startup()
+        server.startup()
+
+        def fail():
+            raise AssertionError("services reloaded")
+
+        monkeypatch.setattr(server, '_load_services', fail)
+
+        assert server.init_blockchain() is server.blockchain
+        assert server.app.test_client().get('/api/blockchain/info').status_code == 200
+        assert storage.loads == 1
+
+    def test_failed_startup_is_not_retried_per_request(self, storage, monkeypatch):
+        """Test: Si el arranque falla, las peticiones responden 503 sin recargar"""
+        storage.release.set()
+
+        def broken(blockchain):
+            raise RuntimeError("contracts unavailable")
+
+        monkeypatch.setattr(server, 'contract_manager', None)
+        monkeypatch.setattr(server, 'ContractManager', broken)
+        server.startup()
+
+        client = server.app.test_client()
+        for _ in range(3):
+            response = client.get('/api/info')
+            assert response.status_code == 503
+            assert response.get_json()['status'] == server.STARTUP_FAILED
+        assert client.get('/api/health').get_json()['data']['status'] == 'unhealthy'
+        assert storage.loads == 1
+
+    def test_lazy_mode_skips_load_once_services_exist(self, make_blockchain, api_client, monkeypatch):
+        """Test: Sin startup, con los servicios creados no se vuelve a cargar"""
+        client = api_client(make_blockchain(), mining_jobs=object())
+
+        def fail():
+            raise AssertionError("services reloaded")
+
+        monkeypatch.setattr(server, '_load_services', fail)
+
+        assert client.get('/api/blockchain/info').status_code == 200
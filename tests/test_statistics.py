@@ -0,0 +1,181 @@
+# tests/test_statistics.py - Tests para los agregados de estadísticas
+
+import pytest
+import sys
+import os
+import copy
+import random
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.statistics import BlockchainStatistics, BalanceRanking
+from wallet.wallet import Wallet
+
+
+def scan_balances(blockchain):
+    """Balances recorriendo toda la cadena (referencia)"""
+    balances = {}
+    for block in blockchain.chain:
+        for tx in block.transactions:
+            if tx.recipient != 'GENESIS':
+                balances[tx.recipient] = balances.get(tx.recipient, 0) + tx.amount
+            if tx.sender not in ('MINING', 'GENESIS'):
+                balances[tx.sender] = balances.get(tx.sender, 0) - tx.amount - tx.fee
+    return balances
+
+
+def total_fees(transactions):
+    """Fees de las transferencias (se suman a la recompensa del minero)"""
+    return sum(tx.fee for tx in transactions)
+
+
+@pytest.fixture
+def chain_with_activity(make_blockchain):
+    """Fixture: Dos mineros y transferencias con fee"""
+    blockchain = make_blockchain()
+    alice = Wallet("Alice")
+    bob = Wallet("Bob")
+
+    blockchain.mine_pending_transactions(alice.get_address())
+    blockchain.mine_pending_transactions(bob.get_address())
+    for amount in (5, 7):
+        blockchain.add_transaction(alice.send_coins(bob.get_address(), amount))
+    blockchain.mine_pending_transactions(alice.get_address())
+
+    return blockchain, alice, bob
+
+
+class TestChainAggregates:
+    """Tests para ChainAggregates y BlockchainStatistics"""
+
+    def test_aggregates_match_full_scan(self, chain_with_activity):
+        """Test: Los agregados coinciden con recorrer la cadena"""
+        blockchain, alice, _ = chain_with_activity
+        stats = BlockchainStatistics(blockchain)
+        transfers = [tx for b in blockchain.chain for tx in b.transactions if tx.sender != 'MINING']
+
+        assert stats.get_wallet_balances() == pytest.approx(scan_balances(blockchain))
+        assert stats.get_circulating_supply() == pytest.approx(3 * blockchain.mining_reward + total_fees(transfers))
+        assert stats.get_address_count() == 2
+
+        tx_stats = stats.get_transaction_stats()
+        assert tx_stats['transfers'] == 2
+        assert tx_stats['total_fees_paid'] == pytest.approx(total_fees(transfers))
+
+        mining = stats.get_mining_stats()
+        assert mining['total_blocks_mined'] == 3
+        assert mining['top_miner'] == alice.get_address()
+        assert mining['top_miner_blocks'] == 2
+
+    def test_aggregates_outlive_statistics_instance(self, chain_with_activity):
+        """Test: Una nueva instancia solo procesa los bloques nuevos"""
+        blockchain, _, bob = chain_with_activity
+        BlockchainStatistics(blockchain).get_complete_dashboard()
+        aggregates = blockchain.chain_aggregates
+
+        blockchain.mine_pending_transactions(bob.get_address())
+        dashboard = BlockchainStatistics(blockchain).get_complete_dashboard()
+
+        assert blockchain.chain_aggregates is aggregates
+        assert aggregates.height == len(blockchain.chain)
+        assert dashboard['mining']['total_blocks_mined'] == 4
+        assert dashboard['supply']['circulating'] == pytest.approx(
+            sum(tx.amount for b in blockchain.chain for tx in b.transactions if tx.sender == 'MINING')
+        )
+
+    def test_top_miner_tie_keeps_first_seen(self, chain_with_activity):
+        """Test: En empate gana el minero que apareció antes (como max())"""
+        blockchain, alice, bob = chain_with_activity
+
+        blockchain.mine_pending_transactions(bob.get_address())
+
+        assert BlockchainStatistics(blockchain).get_mining_stats()['top_miner'] == alice.get_address()
+
+    def test_validity_checks_only_new_blocks(self, chain_with_activity, monkeypatch):
+        """Test: La salud de red no vuelve a verificar bloques ya verificados"""
+        blockchain, alice, _ = chain_with_activity
+        starts = []
+        original = blockchain.is_chain_valid
+
+        def recording(start=1):
+            starts.append(start)
+            return original(start=start)
+
+        monkeypatch.setattr(blockchain, 'is_chain_valid', recording)
+        stats = BlockchainStatistics(blockchain)
+
+        assert stats.get_network_health()['blockchain_valid'] is True
+        blockchain.mine_pending_transactions(alice.get_address())
+        assert stats.get_network_health()['blockchain_valid'] is True
+        stats.get_network_health()
+
+        assert starts == [1, 4]
+
+    def test_replaced_chain_is_recomputed(self, chain_with_activity):
+        """Test: Si la cadena cambia por completo, los agregados se recalculan"""
+        blockchain, _, _ = chain_with_activity
+        stats = BlockchainStatistics(blockchain)
+        stats.get_complete_dashboard()
+
+        replacement = copy.deepcopy(blockchain.chain[:2])
+        blockchain.chain = replacement
+
+        assert stats.get_circulating_supply() == blockchain.mining_reward
+        assert stats.get_mining_stats()['total_blocks_mined'] == 1
+
+
+class TestBalanceRanking:
+    """Tests para BalanceRanking (top-K, mediana y top N%)"""
+
+    @pytest.fixture
+    def balances(self):
+        """Balances variados con empates y negativos"""
+        rng = random.Random(3)
+        return {f"CLC{i:04d}": float(rng.randint(-5, 500)) for i in range(1500)}
+
+    def make_ranking(self, balances):
+        ranking = BalanceRanking()
+        ranking.LOAD = 16  # Cubos pequeños para forzar particiones
+        for address, balance in balances.items():
+            ranking.add(address, balance)
+        return ranking
+
+    def test_matches_sorted_balances(self, balances):
+        """Test: top, kth y top_sum coinciden con ordenar la lista"""
+        ranking = self.make_ranking(balances)
+        expected = sorted(balances.items(), key=lambda x: (-x[1], x[0]))
+
+        assert len(ranking) == len(balances)
+        assert ranking.top(10) == expected[:10]
+        assert ranking.kth(len(balances) // 2) == expected[len(balances) // 2][1]
+        for k in (1, 15, 150, 1500):
+            assert ranking.top_sum(k) == pytest.approx(sum(b for _, b in expected[:k]))
+
+    def test_updates_keep_order(self, balances):
+        """Test: Cambiar balances mantiene el orden sin reordenar todo"""
+        ranking = self.make_ranking(balances)
+
+        for i, address in enumerate(list(balances)[:300]):
+            new_balance = balances[address] + (i % 7) * 100 - 250
+            ranking.update(address, balances[address], new_balance)
+            balances[address] = new_balance
+
+        expected = sorted(balances.items(), key=lambda x: (-x[1], x[0]))
+        assert ranking.top(len(balances)) == expected
+
+    def test_dashboard_distribution(self, chain_with_activity):
+        """Test: Top wallets y distribución salen del ranking"""
+        blockchain, _, _ = chain_with_activity
+        stats = BlockchainStatistics(blockchain)
+        balances = sorted(scan_balances(blockchain).values(), reverse=True)
+
+        distribution = stats.get_wealth_distribution()
+        top = stats.get_top_wallets(5)
+
+        assert [b for _, b in top] == pytest.approx(balances)
+        assert distribution['total_wallets'] == 2
+        assert distribution['median_balance'] == pytest.approx(balances[1])
+        assert distribution['top_1_percent'] == pytest.approx(
+            balances[0] / stats.get_circulating_supply() * 100
+        )
@@ -0,0 +1,172 @@
+# tests/test_tx_relay.py - Tests para el relay de transacciones por lotes
+
+import pytest
+import sys
+import os
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import blockchain.blockchain as blockchain_module
+from blockchain.transaction import Transaction
+from network.node import Node
+from network.peer_manager import PeerManager
+from wallet.wallet import Wallet
+
+
+class FakeResponse:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Sesión HTTP simulada que guarda las peticiones enviadas"""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, timeout=None, json=None, **kwargs):
+        self.calls.append((method, url, json))
+        return FakeResponse(200)
+
+    def posts(self, path):
+        return [c for c in self.calls if c[0] == 'POST' and c[1].endswith(path)]
+
+
+class TestTransactionRelay:
+    """Tests para broadcast_transaction (micro-batching) y receive_transactions"""
+
+    @pytest.fixture
+    def session(self):
+        return FakeSession()
+
+    @pytest.fixture
+    def alice(self):
+        return Wallet("Alice")
+
+    @pytest.fixture
+    def node(self, session, make_blockchain, alice):
+        """Nodo con dos peers; Alice tiene fondos para enviar"""
+        blockchain = make_blockchain()
+        blockchain.mine_pending_transactions(alice.get_address())
+        node = Node(host='127.0.0.1', port=6000, blockchain=blockchain,
+                    peer_manager=PeerManager(session=session))
+        node.peer_manager.add('10.0.0.1', 7001)
+        node.peer_manager.add('10.0.0.1', 7002)
+        return node
+
+    @pytest.fixture
+    def transactions(self, alice):
+        bob = Wallet("Bob")
+        return [alice.send_coins(bob.get_address(), i + 1) for i in range(5)]
+
+    def test_burst_is_sent_as_one_batch_per_peer(self, node, session, transactions):
+        """Test: Una ráfaga dentro de la ventana viaja en un solo lote"""
+        node.tx_batch_window = 0.05
+
+        for tx in transactions:
+            node.broadcast_transaction(tx)
+        time.sleep(0.3)
+
+        batches = session.posts('/api/network/transactions')
+        assert len(batches) == 2
+        assert all(len(c[2]['transactions']) == 5 for c in batches)
+        assert session.posts('/api/network/transaction') == []
+        assert node.transaction_batches_sent == 2
+
+    def test_full_batch_is_sent_before_window(self, node, session, transactions):
+        """Test: Un lote lleno no espera a la ventana"""
+        node.tx_batch_window = 60
+        node.tx_batch_max = 5
+
+        for tx in transactions:
+            node.broadcast_transaction(tx)
+        time.sleep(0.3)
+
+        assert len(session.posts('/api/network/transactions')) == 2
+        assert node.outgoing_transactions == []
+        assert node.tx_flush_timer is None
+
+    def test_batch_uses_single_signature_check(self, node, transactions, monkeypatch):
+        """Test: El lote recibido se verifica con una sola llamada en lote"""
+        calls = []
+        original = blockchain_module.verify_transactions_batch
+
+        def counting(txs):
+            calls.append(len(txs))
+            return original(txs)
+
+        monkeypatch.setattr(blockchain_module, 'verify_transactions_batch', counting)
+
+        tampered = transactions[0].to_dict()
+        tampered['amount'] = 999
+        batch = [tampered] + [tx.to_dict() for tx in transactions[1:]]
+
+        result = node.receive_transactions(batch)
+
+        assert calls == [5]
+        assert result['accepted'] == 4
+        assert result['rejected'] == 1
+        assert len(node.blockchain.pending_transactions) == 4
+
+    def test_known_transactions_are_not_relayed_again(self, node, session, transactions):
+        """Test: Las transacciones ya vistas se ignoran (fin del gossip)"""
+        node.tx_batch_window = 0.01
+        batch = [tx.to_dict() for tx in transactions]
+
+        node.receive_transactions(batch)
+        time.sleep(0.2)
+        result = node.receive_transactions(batch)
+        time.sleep(0.2)
+
+        assert result['duplicates'] == 5
+        assert result['accepted'] == 0
+        assert len(node.blockchain.pending_transactions) == 5
+        assert len(session.posts('/api/network/transactions')) == 2
+
+    def test_mining_rewards_are_rejected(self, node):
+        """Test: Un peer no puede inyectar recompensas en el pool"""
+        reward = Transaction('MINING', Wallet("Eve").get_address(), 50)
+
+        result = node.receive_transactions([reward.to_dict()])
+
+        assert result['rejected'] == 1
+        assert node.blockchain.pending_transactions == []
+
+    def test_confirmed_transactions_are_not_readmitted(self, node, transactions):
+        """Test: Una transacción ya minada no vuelve al pool (aunque salga del LRU)"""
+        node.receive_transactions([tx.to_dict() for tx in transactions])
+        node.blockchain.mine_pending_transactions(Wallet("Miner").get_address())
+        node.seen_transactions.clear()
+
+        result = node.receive_transactions([tx.to_dict() for tx in transactions])
+
+        assert result['accepted'] == 0
+        assert result['rejected'] == 5
+        assert node.blockchain.pending_transactions == []
+
+    def test_invalid_amounts_and_overspending_are_rejected(self, node, alice):
+        """Test: amount/fee negativos y gastos por encima del balance no entran"""
+        bob = Wallet("Bob")
+        negative = Transaction(bob.get_address(), alice.get_address(), -40, fee=0)
+        negative.sign_transaction(bob.private_key)
+        negative_fee = alice.send_coins(bob.get_address(), 1, fee=-5)
+        first = alice.send_coins(bob.get_address(), 30)
+        overspend = alice.send_coins(bob.get_address(), 30)
+
+        result = node.receive_transactions(
+            [tx.to_dict() for tx in (negative, negative_fee, first, overspend)]
+        )
+
+        assert result['accepted'] == 1
+        assert [tx.signature for tx in node.blockchain.pending_transactions] == [first.signature]
+
+    def test_mempool_size_is_bounded(self, node, transactions, monkeypatch):
+        """Test: No se admiten más de MEMPOOL_MAX_SIZE transacciones pendientes"""
+        monkeypatch.setattr(blockchain_module.config, 'MEMPOOL_MAX_SIZE', 3)
+
+        result = node.receive_transactions([tx.to_dict() for tx in transactions])
+
+        assert result['accepted'] == 3
+        assert len(node.blockchain.pending_transactions) == 3
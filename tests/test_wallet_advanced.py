@@ -8,7 +8,10 @@ import json
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+import config
+import api.server as server
 from wallet.advanced import AdvancedWallet
+from wallet.wallet import Wallet
 
 class TestAdvancedWallet:
     """Tests para funcionalidades avanzadas de wallet"""
@@ -27,6 +30,7 @@ class TestAdvancedWallet:
         # Sobrescribir rutas de archivos para usar directorio temporal
         wallet.contacts_file = tmp_path / f"wallet_{test_address[:10]}_contacts.json"
         wallet.labels_file = tmp_path / f"wallet_{test_address[:10]}_labels.json"
+        wallet.history_file = tmp_path / f"wallet_{test_address[:10]}_history.json"
         
         # Reiniciar contactos y etiquetas (vacíos)
         wallet.contacts = {}
@@ -191,5 +195,112 @@ class TestAdvancedWallet:
         assert stats["total_received"] == 0
         assert stats["total_fees"] == 0
 
+
+class FlaskSession:
+    """Sesión HTTP que envía las peticiones al servidor Flask en proceso"""
+
+    def __init__(self, client, node_url):
+        self.client = client
+        self.node_url = node_url
+        self.urls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.urls.append(url)
+        return FlaskResponse(self.client.get(url[len(self.node_url):], query_string=params))
+
+
+class FlaskResponse:
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self._response = response
+
+    def json(self):
+        return self._response.get_json()
+
+    def raise_for_status(self):
+        assert self.status_code == 200
+
+
+class TestTransactionHistorySync:
+    """Tests para el historial paginado con caché incremental"""
+
+    @pytest.fixture
+    def node(self, make_blockchain, api_client):
+        """Servidor con una cadena en memoria: Alice mina y envía a Bob"""
+        blockchain = make_blockchain()
+
+        alice = Wallet("Alice")
+        bob = Wallet("Bob")
+        blockchain.mine_pending_transactions(alice.get_address())
+        for amount in (1, 2, 3):
+            blockchain.add_transaction(alice.send_coins(bob.get_address(), amount))
+            blockchain.mine_pending_transactions(alice.get_address())
+
+        api_client(blockchain)
+
+        return blockchain, alice, bob
+
+    def make_wallet(self, address, tmp_path):
+        node_url = "http://node"
+        session = FlaskSession(server.app.test_client(), node_url)
+        wallet = AdvancedWallet(address, node_url=node_url, session=session)
+        wallet.history_file = tmp_path / "history.json"
+        return wallet
+
+    def test_history_matches_chain(self, node, tmp_path):
+        """Test: El historial coincide con las transacciones de la cadena"""
+        blockchain, alice, bob = node
+        wallet = self.make_wallet(bob.get_address(), tmp_path)
+
+        history = wallet.get_transaction_history()
+
+        assert [tx["amount"] for tx in history] == [1, 2, 3]
+        assert all(tx["direction"] == "received" and tx["fee"] == 0 for tx in history)
+        assert history[0]["other_party"] == alice.get_address()
+        assert not any('/api/explorer/block/' in url for url in wallet.session.urls)
+
+    def test_refresh_only_fetches_new_transactions(self, node, tmp_path, monkeypatch):
+        """Test: Con la caché al día solo se pide la página más reciente"""
+        blockchain, alice, _ = node
+        monkeypatch.setattr(config, 'API_MAX_PAGE_SIZE', 2)
+        wallet = self.make_wallet(alice.get_address(), tmp_path)
+
+        first = wallet.get_transaction_history(limit=1000)
+        requests_first = len(wallet.session.urls)
+        blockchain.mine_pending_transactions(alice.get_address())
+        second = wallet.get_transaction_history(limit=1000)
+
+        assert requests_first == 4  # 7 transacciones en páginas de 2
+        assert len(wallet.session.urls) - requests_first == 1
+        assert second[:-1] == first
+        assert second[-1]["type"] == "mining"
+        assert second[-1]["block"] == len(blockchain.chain) - 1
+
+    def test_replaced_chain_rebuilds_cache(self, node, tmp_path):
+        """Test: Si la cadena del nodo cambia, la caché se descarga de nuevo"""
+        blockchain, alice, _ = node
+        wallet = self.make_wallet(alice.get_address(), tmp_path)
+        wallet.get_transaction_history()
+
+        blockchain.chain = blockchain.chain[:2]
+        blockchain.mine_pending_transactions(alice.get_address())
+        history = wallet.get_transaction_history()
+
+        assert [tx["block"] for tx in history] == [1, 2]
+        assert history[-1]["block_hash"] == blockchain.chain[2].hash
+
+    def test_offline_uses_cache(self, node, tmp_path):
+        """Test: Sin conexión con el nodo se devuelve lo que hay en caché"""
+        _, _, bob = node
+        wallet = self.make_wallet(bob.get_address(), tmp_path)
+        cached = wallet.get_transaction_history()
+
+        def offline(*args, **kwargs):
+            raise ConnectionError("node down")
+
+        wallet.session.get = offline
+
+        assert wallet.get_transaction_history() == cached
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,232 @@
+# tests/test_webhook_delivery.py - Tests para la entrega de webhooks en segundo plano
+
+import pytest
+import sys
+import os
+import json
+import threading
+import time
+
+import requests
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from utils.event_system import EventSystem, EventType, WebhookListener
+from utils.webhook_delivery import WebhookDeliveryQueue
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeServer:
+    """
+    Sustituye a requests.Session: responde con los códigos de statuses
+    (uno por petición, el último se repite) y registra la concurrencia
+    """
+
+    def __init__(self, statuses=(200,), delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = []
+        self.headers = []
+        self.active = {}
+        self.max_active = {}
+        self.sessions = 0
+
+    def session(self):
+        with self.lock:
+            self.sessions += 1
+        return self
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        host = url.split('/')[2]
+        with self.lock:
+            self.calls.append((url, json.loads(data)))
+            self.headers.append(headers)
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[host] -= 1
+
+        if status is None:
+            raise requests.ConnectionError("connection refused")
+        return FakeResponse(status)
+
+
+def make_queue(server, **kwargs):
+    options = dict(workers=4, max_queue=100, max_attempts=3, backoff_base=0.01,
+                   backoff_max=0.05, max_per_endpoint=2, timeout=1,
+                   session_factory=server.session)
+    options.update(kwargs)
+    return WebhookDeliveryQueue(**options)
+
+
+@pytest.fixture
+def cleanup():
+    queues = []
+    yield queues.append
+    for queue in queues:
+        queue.shutdown()
+
+
+class TestWebhookDeliveryQueue:
+    """Tests para WebhookDeliveryQueue"""
+
+    def test_emit_does_not_wait_for_webhooks(self, cleanup):
+        """Test: emit vuelve enseguida aunque el webhook tarde"""
+        server = FakeServer(delay=0.5)
+        events = EventSystem()
+        events.delivery = make_queue(server)
+        cleanup(events.delivery)
+        events.webhooks = {EventType.BLOCK_MINED: [WebhookListener(EventType.BLOCK_MINED, 'http://slow/hook')]}
+
+        start = time.time()
+        events.emit(EventType.BLOCK_MINED, {'block_index': 1})
+        assert time.time() - start < 0.2
+
+        assert events.delivery.wait_idle(timeout=5)
+        webhook = events.webhooks[EventType.BLOCK_MINED][0]
+        assert webhook.success_count == 1
+        assert server.calls[0][1]['data'] == {'block_index': 1}
+
+    def test_retries_until_success(self, cleanup):
+        """Test: Errores de red y 5xx se reintentan con backoff"""
+        server = FakeServer(statuses=[None, 503, 200])
+        queue = make_queue(server)
+        cleanup(queue)
+        webhook = WebhookListener(EventType.BLOCK_MINED, 'http://flaky/hook')
+
+        queue.enqueue(webhook, {'id': 'e1'})
+        assert queue.wait_idle(timeout=5)
+
+        assert len(server.calls) == 3
+        assert webhook.success_count == 1
+        assert queue.get_stats()['retries'] == 2
+        assert queue.get_dead_letters() == []
+
+    def test_dead_letters_and_retry(self, cleanup):
+        """Test: Agotados los intentos va a dead letters; se puede reencolar"""
+        server = FakeServer(statuses=[500, 500, 500, 200])
+        queue = make_queue(server)
+        cleanup(queue)
+        webhook = WebhookListener(EventType.BLOCK_MINED, 'http://down/hook')
+
+        queue.enqueue(webhook, {'id': 'e1', 'type': EventType.BLOCK_MINED})
+        assert queue.wait_idle(timeout=5)
+
+        dead = queue.get_dead_letters()
+        assert len(dead) == 1
+        assert dead[0]['attempts'] == 3
+        assert dead[0]['error'] == 'HTTP 500'
+        assert webhook.error_count == 1
+
+        assert queue.retry_dead_letters() == 1
+        assert queue.wait_idle(timeout=5)
+        assert queue.get_dead_letters() == []
+        assert webhook.success_count == 1
+
+    def test_client_errors_are_not_retried(self, cleanup):
+        """Test: Un 4xx (salvo 429) va directo a dead letters"""
+        server = FakeServer(statuses=[404])
+        queue = make_queue(server)
+        cleanup(queue)
+
+        queue.enqueue(WebhookListener(EventType.BLOCK_MINED, 'http://gone/hook'), {'id': 'e1'})
+        assert queue.wait_idle(timeout=5)
+
+        assert len(server.calls) == 1
+        assert queue.get_stats()['dead_lettered'] == 1
+
+    def test_per_endpoint_concurrency(self, cleanup):
+        """Test: Como mucho max_per_endpoint peticiones a la vez por servidor"""
+        server = FakeServer(delay=0.05)
+        queue = make_queue(server, workers=6, max_per_endpoint=2)
+        cleanup(queue)
+        slow = WebhookListener(EventType.BLOCK_MINED, 'http://slow/hook')
+        other = WebhookListener(EventType.BLOCK_MINED, 'http://other/hook')
+
+        for i in range(8):
+            queue.enqueue(slow, {'id': i})
+        queue.enqueue(other, {'id': 'other'})
+        assert queue.wait_idle(timeout=10)
+
+        assert server.max_active['slow'] == 2
+        assert len(server.calls) == 9
+        # Una sesión por hilo: las conexiones se reutilizan
+        assert server.sessions <= 6
+
+    def test_bounded_queue(self, cleanup):
+        """Test: Con la cola llena las entregas nuevas se descartan"""
+        server = FakeServer(delay=0.2)
+        queue = make_queue(server, workers=1, max_queue=2, max_per_endpoint=1)
+        cleanup(queue)
+        webhook = WebhookListener(EventType.BLOCK_MINED, 'http://slow/hook')
+
+        results = [queue.enqueue(webhook, {'id': i}) for i in range(4)]
+
+        assert results == [True, True, False, False]
+        assert queue.get_stats()['dropped'] == 2
+        assert queue.wait_idle(timeout=5)
+
+
+class TestWebhookBatches:
+    """Tests para los webhooks con lotes"""
+
+    def test_batch_size_closes_batch(self, cleanup):
+        """Test: Una ráfaga de eventos llega en pocos POST con secuencia creciente"""
+        server = FakeServer()
+        events = EventSystem()
+        events.delivery = make_queue(server)
+        cleanup(events.delivery)
+        webhook = WebhookListener(EventType.TRANSACTION_CREATED, 'http://hook/tx', batch_size=50, batch_window=10)
+        events.webhooks = {EventType.TRANSACTION_CREATED: [webhook]}
+
+        for i in range(100):
+            events.emit(EventType.TRANSACTION_CREATED, {'n': i})
+        assert events.delivery.wait_idle(timeout=5)
+
+        payloads = [payload for _, payload in server.calls]
+        assert [p['sequence'] for p in sorted(payloads, key=lambda p: p['sequence'])] == [1, 2]
+        assert all(p['count'] == 50 and p['type'] == 'batch' for p in payloads)
+        numbers = sorted(e['data']['n'] for p in payloads for e in p['events'])
+        assert numbers == list(range(100))
+
+    def test_time_window_closes_batch(self, cleanup):
+        """Test: Un lote incompleto se entrega al cumplirse su ventana"""
+        server = FakeServer()
+        queue = make_queue(server)
+        cleanup(queue)
+        webhook = WebhookListener(EventType.TRANSACTION_CREATED, 'http://hook/tx', batch_window=0.1)
+
+        queue.add_to_batch(webhook, {'id': 'e1'})
+        queue.add_to_batch(webhook, {'id': 'e2'})
+        assert server.calls == []
+        assert queue.wait_idle(timeout=5)
+
+        payload = server.calls[0][1]
+        assert [e['id'] for e in payload['events']] == ['e1', 'e2']
+        assert server.headers[0]['X-ColCript-Sequence'] == '1'
+
+    def test_signed_payload(self, cleanup):
+        """Test: Con secret, la firma HMAC del cuerpo va en la cabecera"""
+        import hashlib
+        import hmac
+
+        server = FakeServer()
+        queue = make_queue(server)
+        cleanup(queue)
+        webhook = WebhookListener(EventType.BLOCK_MINED, 'http://hook/blocks', batch_size=1, secret='s3cret')
+
+        queue.add_to_batch(webhook, {'id': 'e1'})
+        assert queue.wait_idle(timeout=5)
+
+        body = json.dumps(server.calls[0][1]).encode()
+        expected = 'sha256=' + hmac.new(b's3cret', body, hashlib.sha256).hexdigest()
+        assert server.headers[0]['X-ColCript-Signature'] == expected
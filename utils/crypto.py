@@ -3,6 +3,7 @@
 import hashlib
 import json
 from ecdsa import SigningKey, VerifyingKey, SECP256k1
+from ecdsa.ellipticcurve import PointJacobi
 import binascii
 
 def hash_data(data):
@@ -59,6 +60,76 @@ def verify_signature(public_key_hex, signature_hex, data):
     except:
         return False
 
+def _load_verifying_key(public_key_hex, precompute=False):
+    """
+    Decodifica una clave pública, opcionalmente con tablas precomputadas
+
+    POR QUÉ: Con precompute las multiplicaciones sobre la clave usan
+    tablas (se calculan en la primera verificación), lo que acelera las
+    siguientes verificaciones del mismo remitente
+    """
+    public_key = VerifyingKey.from_string(
+        binascii.unhexlify(public_key_hex),
+        curve=SECP256k1
+    )
+
+    if not precompute:
+        return public_key
+
+    point = public_key.pubkey.point
+    precomputed = PointJacobi(
+        SECP256k1.curve, point.x(), point.y(), 1,
+        SECP256k1.order, generator=True
+    )
+    return VerifyingKey.from_public_point(precomputed, curve=SECP256k1)
+
+def verify_signatures_batch(items):
+    """
+    Verifica un lote de firmas de una sola vez
+
+    items: lista de tuplas (public_key_hex, signature_hex, data)
+    Returns: lista de bools en el mismo orden que items
+
+    POR QUÉ: ECDSA no admite verificación agregada real, pero en un bloque
+    o en un lote de red el mismo remitente firma muchas transacciones.
+    Decodificar la clave una sola vez por remitente (con tablas
+    precomputadas si firma varias) abarata cada verificación.
+    """
+    results = [False] * len(items)
+    keys = {}
+
+    # Firmas por remitente: precomputar solo compensa si son varias
+    uses = {}
+    for public_key_hex, _, _ in items:
+        uses[public_key_hex] = uses.get(public_key_hex, 0) + 1
+
+    for i, (public_key_hex, signature_hex, data) in enumerate(items):
+        if not public_key_hex or not signature_hex:
+            continue
+
+        if public_key_hex not in keys:
+            try:
+                keys[public_key_hex] = _load_verifying_key(
+                    public_key_hex,
+                    precompute=uses[public_key_hex] >= 4
+                )
+            except:
+                keys[public_key_hex] = None
+
+        public_key = keys[public_key_hex]
+        if public_key is None:
+            continue
+
+        if isinstance(data, dict):
+            data = json.dumps(data, sort_keys=True)
+
+        try:
+            results[i] = public_key.verify(binascii.unhexlify(signature_hex), data.encode())
+        except:
+            results[i] = False
+
+    return results
+
 # Test
 if __name__ == "__main__":
     print("🔐 Probando funciones criptográficas...")
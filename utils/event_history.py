@@ -0,0 +1,214 @@
+# utils/event_history.py - Historial de eventos en anillo con volcado a disco
+
+import json
+import os
+import sys
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Optional
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+
+
+def newest_first(events: deque, before_seq: Optional[int], limit: int) -> list:
+    """
+    Hasta limit eventos con seq < before_seq, del más nuevo al más viejo
+
+    POR QUÉ: El anillo está ordenado por seq; una búsqueda binaria sitúa
+    el cursor sin recorrer ni ordenar todo el historial
+    """
+    end = len(events)
+    if before_seq is not None:
+        lo, hi = 0, end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if events[mid].seq < before_seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        end = lo
+
+    return [events[i] for i in range(end - 1, max(end - limit, 0) - 1, -1)]
+
+
+class EventHistory:
+    """
+    Historial de eventos en anillos (deque) ordenados por secuencia
+
+    - Un anillo con todos los eventos y otro por tipo: añadir es O(1) y
+      cada tipo conserva sus últimos eventos aunque otros tipos sean
+      mucho más frecuentes
+    - Cada evento recibe un número de secuencia creciente que sirve de
+      cursor (before_seq) para paginar
+    - Con spill_file, cada evento se añade además a un fichero JSONL de
+      solo escritura al final; las consultas que van más atrás que la
+      memoria siguen leyendo del fichero con un índice disperso de
+      (seq, offset)
+    """
+
+    # Un punto del índice disperso cada N eventos del fichero
+    SPILL_INDEX_INTERVAL = 256
+
+    def __init__(self, max_events: int = None, per_type: int = None,
+                 spill_file: Optional[str] = None):
+        self.events = deque(maxlen=max_events or config.EVENT_HISTORY_SIZE)
+        self.per_type = per_type or config.EVENT_HISTORY_PER_TYPE
+        self.by_type: Dict[str, deque] = {}
+        self.lock = threading.Lock()
+        self.next_seq = 1
+
+        self.spill_file = spill_file
+        self.spill_index = []  # [(primer seq del tramo, offset)]
+        self.spill_count = 0
+        self.spill_size = 0
+        self.spill_handle = None
+        if spill_file:
+            self._open_spill()
+
+        # Los eventos anteriores solo pueden estar en el fichero
+        self.first_seq = self.next_seq
+
+    # ==================== ESCRITURA ====================
+
+    def append(self, event):
+        """Asigna event.seq y guarda el evento"""
+        with self.lock:
+            event.seq = self.next_seq
+            self.next_seq += 1
+
+            self.events.append(event)
+            if event.event_type not in self.by_type:
+                self.by_type[event.event_type] = deque(maxlen=self.per_type)
+            self.by_type[event.event_type].append(event)
+
+            if self.spill_handle:
+                self._spill(event)
+
+    def _spill(self, event):
+        """Añade el evento al fichero (con lock tomado)"""
+        line = (json.dumps(event.to_dict()) + '\n').encode()
+        if self.spill_count % self.SPILL_INDEX_INTERVAL == 0:
+            self.spill_index.append((event.seq, self.spill_size))
+
+        self.spill_handle.write(line)
+        self.spill_handle.flush()
+        self.spill_count += 1
+        self.spill_size += len(line)
+
+    def _open_spill(self):
+        """
+        Reconstruye el índice disperso de un fichero existente y lo abre para añadir
+
+        Una última línea incompleta (parada a medio escribir) se descarta
+        """
+        directory = os.path.dirname(self.spill_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.spill_file):
+            with open(self.spill_file, 'rb+') as f:
+                offset = 0
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        f.truncate(offset)
+                        break
+                    try:
+                        seq = json.loads(line)['seq']
+                    except (ValueError, KeyError):
+                        offset += len(line)
+                        continue
+
+                    if self.spill_count % self.SPILL_INDEX_INTERVAL == 0:
+                        self.spill_index.append((seq, offset))
+                    self.spill_count += 1
+                    self.next_seq = seq + 1
+                    offset += len(line)
+                self.spill_size = offset
+
+        self.spill_handle = open(self.spill_file, 'ab')
+
+    def close(self):
+        with self.lock:
+            if self.spill_handle:
+                self.spill_handle.close()
+                self.spill_handle = None
+
+    # ==================== CONSULTAS ====================
+
+    def query(self, event_type: Optional[str] = None, limit: int = 50,
+              before_seq: Optional[int] = None) -> List[dict]:
+        """
+        Eventos del más nuevo al más viejo
+
+        Args:
+            event_type: Filtrar por tipo (opcional)
+            limit: Número máximo de eventos
+            before_seq: Cursor: solo eventos con seq menor
+
+        Returns:
+            Lista de Event.to_dict()
+        """
+        with self.lock:
+            source = self.by_type.get(event_type, deque()) if event_type else self.events
+            results = [event.to_dict() for event in newest_first(source, before_seq, limit)]
+
+            # Si el anillo nunca descartó nada, lo anterior solo está en el fichero
+            # si es de una ejecución previa
+            if len(source) == source.maxlen:
+                disk_before = source[0].seq
+            else:
+                disk_before = self.first_seq
+            if before_seq is not None:
+                disk_before = min(disk_before, before_seq)
+
+            spill = self.spill_file if self.spill_handle else None
+            spill_index = list(self.spill_index)
+            spill_size = self.spill_size
+
+        if len(results) < limit and spill and spill_index:
+            results.extend(self._read_spill(
+                spill, spill_index, spill_size, event_type, disk_before, limit - len(results)
+            ))
+        return results
+
+    def _read_spill(self, spill_file, spill_index, spill_size, event_type, before_seq, limit):
+        """Recorre el fichero hacia atrás, tramo a tramo, desde before_seq"""
+        results = []
+        block = bisect_left(spill_index, (before_seq,)) - 1
+
+        with open(spill_file, 'rb') as f:
+            while block >= 0 and len(results) < limit:
+                start = spill_index[block][1]
+                end = spill_index[block + 1][1] if block + 1 < len(spill_index) else spill_size
+                f.seek(start)
+
+                for line in reversed(f.read(end - start).splitlines()):
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event['seq'] >= before_seq or (event_type and event['type'] != event_type):
+                        continue
+                    results.append(event)
+                    if len(results) == limit:
+                        break
+
+                block -= 1
+
+        return results
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                'in_memory': len(self.events),
+                'types': len(self.by_type),
+                'next_seq': self.next_seq,
+                'spill_file': self.spill_file,
+                'spilled': self.spill_count
+            }
@@ -1,11 +1,25 @@
 # utils/event_system.py - Sistema de Eventos y Notificaciones
 
 import time
-import requests
+import queue
+import threading
 from typing import Dict, List, Callable, Optional
 from datetime import datetime
 import json
 import os
+import sys
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+from utils.event_history import EventHistory
+from utils.webhook_delivery import WebhookDeliveryQueue
+from utils.logger import get_logger
+
+log = get_logger(__name__)
 
 class EventType:
     """Tipos de eventos del sistema"""
@@ -22,6 +36,7 @@ class EventType:
     PEER_DISCONNECTED = "peer_disconnected"
     POOL_BLOCK_MINED = "pool_block_mined"
     POOL_MINER_JOINED = "pool_miner_joined"
+    POOL_SHARE_SUBMITTED = "pool_share_submitted"
 
 class Event:
     """Representa un evento del sistema"""
@@ -31,10 +46,12 @@ class Event:
         self.data = data
         self.timestamp = time.time()
         self.id = f"{event_type}_{int(self.timestamp * 1000)}"
+        self.seq = None  # Lo asigna EventHistory al guardarlo
     
     def to_dict(self):
         return {
             'id': self.id,
+            'seq': self.seq,
             'type': self.event_type,
             'data': self.data,
             'timestamp': self.timestamp,
@@ -50,9 +67,19 @@ class EventListener:
         self.id = f"listener_{int(time.time() * 1000000)}"
 
 class WebhookListener:
-    """Listener de webhook"""
+    """
+    Listener de webhook
+    
+    Las entregas las hace WebhookDeliveryQueue, que actualiza los contadores.
     
-    def __init__(self, event_type: str, url: str):
+    Con batch_size o batch_window, los eventos se agrupan en un solo
+    payload (con número de secuencia) cada batch_window segundos o cada
+    batch_size eventos. Con secret, cada payload va firmado con HMAC-SHA256
+    en la cabecera X-ColCript-Signature.
+    """
+    
+    def __init__(self, event_type: str, url: str, batch_size: Optional[int] = None,
+                 batch_window: Optional[float] = None, secret: Optional[str] = None):
         self.event_type = event_type
         self.url = url
         self.id = f"webhook_{int(time.time() * 1000000)}"
@@ -60,31 +87,13 @@ class WebhookListener:
         self.last_triggered = None
         self.success_count = 0
         self.error_count = 0
-    
-    def trigger(self, event: Event) -> bool:
-        """Dispara el webhook"""
-        if not self.enabled:
-            return False
         
-        try:
-            response = requests.post(
-                self.url,
-                json=event.to_dict(),
-                timeout=5
-            )
-            
-            self.last_triggered = time.time()
-            
-            if response.status_code == 200:
-                self.success_count += 1
-                return True
-            else:
-                self.error_count += 1
-                return False
-        except Exception as e:
-            self.error_count += 1
-            print(f"Webhook error: {e}")
-            return False
+        # Lotes: el que falte toma el valor de config
+        self.batched = bool(batch_size or batch_window)
+        self.batch_size = min(batch_size or config.WEBHOOK_BATCH_MAX_SIZE, config.WEBHOOK_BATCH_MAX_SIZE)
+        self.batch_window = batch_window or config.WEBHOOK_BATCH_WINDOW
+        self.batch_sequence = 0
+        self.secret = secret
     
     def to_dict(self):
         return {
@@ -92,6 +101,11 @@ class WebhookListener:
             'event_type': self.event_type,
             'url': self.url,
             'enabled': self.enabled,
+            'batched': self.batched,
+            'batch_size': self.batch_size if self.batched else None,
+            'batch_window': self.batch_window if self.batched else None,
+            'batch_sequence': self.batch_sequence,
+            'signed': bool(self.secret),
             'success_count': self.success_count,
             'error_count': self.error_count,
             'last_triggered': datetime.fromtimestamp(
@@ -99,6 +113,58 @@ class WebhookListener:
             ).isoformat() if self.last_triggered else None
         }
 
+class EventSubscription:
+    """
+    Suscripción en vivo a eventos (una por cliente de /api/events/stream)
+    
+    Los eventos se encolan en una cola acotada; el cliente los consume
+    con next_event desde su propio hilo.
+    
+    POR QUÉ: emit no puede esperar a un cliente lento. Si la cola se
+    llena se descartan los eventos nuevos y el cliente recibe un aviso
+    de resincronización (vuelve a cargar el estado completo una vez)
+    """
+    
+    RESYNC = "resync"
+    
+    def __init__(self, event_types: Optional[List[str]] = None, max_queue: int = 100):
+        self.event_types = set(event_types) if event_types else None
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+        self.dropped = 0
+        self.id = f"subscription_{int(time.time() * 1000000)}"
+    
+    def wants(self, event_type: str) -> bool:
+        return self.event_types is None or event_type in self.event_types
+    
+    def push(self, event: Event):
+        """Encola un evento sin bloquear"""
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+            self.dropped += 1
+    
+    def next_event(self, timeout: float) -> Optional[Event]:
+        """
+        Siguiente evento, o None si no llega ninguno en timeout segundos
+        
+        Tras un desbordamiento, vacía la cola y devuelve un evento RESYNC
+        """
+        if self.overflowed:
+            self.overflowed = False
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            return Event(self.RESYNC, {'dropped': self.dropped})
+        
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
 class EventSystem:
     """
     Sistema central de eventos y notificaciones
@@ -107,14 +173,17 @@ class EventSystem:
     - Emitir eventos
     - Suscribirse a eventos (callbacks)
     - Registrar webhooks
+    - Suscripciones en vivo (Server-Sent Events)
     - Historial de eventos
     """
     
     def __init__(self):
         self.listeners: Dict[str, List[EventListener]] = {}
         self.webhooks: Dict[str, List[WebhookListener]] = {}
-        self.event_history: List[Event] = []
-        self.max_history = 100
+        self.subscriptions: List[EventSubscription] = []
+        self.subscriptions_lock = threading.Lock()
+        self.delivery = WebhookDeliveryQueue()
+        self.history = EventHistory(spill_file=config.EVENT_HISTORY_FILE)
         
         # Cargar webhooks persistentes
         self.load_webhooks()
@@ -129,10 +198,8 @@ class EventSystem:
         """
         event = Event(event_type, data)
         
-        # Agregar a historial
-        self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
+        # Agregar a historial (asigna event.seq)
+        self.history.append(event)
         
         # Notificar listeners
         if event_type in self.listeners:
@@ -140,15 +207,27 @@ class EventSystem:
                 try:
                     listener.callback(event)
                 except Exception as e:
-                    print(f"Listener error: {e}")
+                    log.error("Listener error", event_type=event_type, exc_info=True)
+        
+        # Notificar suscripciones en vivo
+        with self.subscriptions_lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            if subscription.wants(event_type):
+                subscription.push(event)
         
-        # Notificar webhooks
+        # Notificar webhooks (en segundo plano, ver WebhookDeliveryQueue)
         if event_type in self.webhooks:
+            payload = event.to_dict()
             for webhook in self.webhooks[event_type]:
-                webhook.trigger(event)
+                if not webhook.enabled:
+                    continue
+                if webhook.batched:
+                    self.delivery.add_to_batch(webhook, payload)
+                else:
+                    self.delivery.enqueue(webhook, payload)
         
-        # Log
-        print(f"📢 Event: {event_type} - {data}")
+        log.debug("📢 Event", event_type=event_type, seq=event.seq, data=data)
     
     def on(self, event_type: str, callback: Callable) -> str:
         """
@@ -176,13 +255,44 @@ class EventSystem:
                 l for l in listeners if l.id != listener_id
             ]
     
-    def add_webhook(self, event_type: str, url: str) -> str:
+    def subscribe(self, event_types: Optional[List[str]] = None,
+                  max_queue: int = 100) -> EventSubscription:
+        """
+        Abre una suscripción en vivo
+        
+        Args:
+            event_types: Tipos a recibir (None = todos)
+            max_queue: Eventos que se guardan mientras el cliente no lee
+        
+        Returns:
+            EventSubscription (cerrar con unsubscribe)
+        """
+        subscription = EventSubscription(event_types, max_queue)
+        with self.subscriptions_lock:
+            self.subscriptions.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: EventSubscription):
+        """Cierra una suscripción en vivo"""
+        with self.subscriptions_lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+    
+    def get_subscriber_count(self) -> int:
+        with self.subscriptions_lock:
+            return len(self.subscriptions)
+    
+    def add_webhook(self, event_type: str, url: str, batch_size: Optional[int] = None,
+                    batch_window: Optional[float] = None, secret: Optional[str] = None) -> str:
         """
         Registra un webhook
         
         Args:
             event_type: Tipo de evento
             url: URL del webhook
+            batch_size: Eventos por lote (opcional, activa lotes)
+            batch_window: Segundos máximos de espera de un lote (opcional, activa lotes)
+            secret: Clave para firmar los payloads (opcional)
         
         Returns:
             ID del webhook
@@ -190,7 +300,7 @@ class EventSystem:
         if event_type not in self.webhooks:
             self.webhooks[event_type] = []
         
-        webhook = WebhookListener(event_type, url)
+        webhook = WebhookListener(event_type, url, batch_size, batch_window, secret)
         self.webhooks[event_type].append(webhook)
         
         # Guardar
@@ -232,26 +342,19 @@ class EventSystem:
         self.save_webhooks()
     
     def get_history(self, event_type: Optional[str] = None, 
-                    limit: int = 50) -> List[dict]:
+                    limit: int = 50, before_seq: Optional[int] = None) -> List[dict]:
         """
-        Obtiene historial de eventos
+        Obtiene historial de eventos (más recientes primero)
         
         Args:
             event_type: Filtrar por tipo (opcional)
             limit: Número máximo de eventos
+            before_seq: Cursor: solo eventos anteriores a esa secuencia
         
         Returns:
             Lista de eventos
         """
-        events = self.event_history
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
-        
-        # Más recientes primero
-        events = sorted(events, key=lambda e: e.timestamp, reverse=True)
-        
-        return [e.to_dict() for e in events[:limit]]
+        return self.history.query(event_type, limit, before_seq)
     
     def save_webhooks(self):
         """Guarda webhooks en archivo"""
@@ -264,7 +367,10 @@ class EventSystem:
                 webhooks_data.append({
                     'event_type': webhook.event_type,
                     'url': webhook.url,
-                    'enabled': webhook.enabled
+                    'enabled': webhook.enabled,
+                    'batch_size': webhook.batch_size if webhook.batched else None,
+                    'batch_window': webhook.batch_window if webhook.batched else None,
+                    'secret': webhook.secret
                 })
         
         with open(filepath, 'w') as f:
@@ -282,7 +388,10 @@ class EventSystem:
                 webhooks_data = json.load(f)
             
             for data in webhooks_data:
-                webhook = WebhookListener(data['event_type'], data['url'])
+                webhook = WebhookListener(
+                    data['event_type'], data['url'],
+                    data.get('batch_size'), data.get('batch_window'), data.get('secret')
+                )
                 webhook.enabled = data.get('enabled', True)
                 
                 if data['event_type'] not in self.webhooks:
@@ -290,7 +399,7 @@ class EventSystem:
                 
                 self.webhooks[data['event_type']].append(webhook)
         except Exception as e:
-            print(f"Error loading webhooks: {e}")
+            log.error("Error loading webhooks", error=str(e))
 
 # Instancia global del sistema de eventos
 event_system = EventSystem()
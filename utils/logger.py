@@ -0,0 +1,177 @@
+# utils/logger.py - Logging estructurado y asíncrono
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+
+# Todos los loggers del proyecto cuelgan de este
+ROOT_LOGGER = 'colcript'
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro: ts, level, logger, msg y los campos del registro"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in (getattr(record, 'data', None) or {}).items():
+            entry.setdefault(key, value)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Mensaje legible seguido de campo=valor (para la CLI)"""
+
+    def format(self, record):
+        message = record.getMessage()
+        data = getattr(record, 'data', None)
+        if data:
+            message += ' ' + ' '.join(f"{key}={value}" for key, value in data.items())
+        if record.exc_info:
+            message += '\n' + self.formatException(record.exc_info)
+        return message
+
+
+class StdoutHandler(logging.StreamHandler):
+    """
+    StreamHandler que escribe en el sys.stdout actual
+
+    POR QUÉ: Si sys.stdout se sustituye (pytest, redirecciones), el hilo
+    del listener no debe seguir escribiendo en el objeto antiguo
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler que descarta registros con la cola llena en vez de bloquear"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Misma cola en memoria del mismo proceso: exc_info se conserva para
+        # el formateador; solo se fijan los argumentos del mensaje
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    log.info("Mensaje", campo=valor, ...)
+
+    Los argumentos con nombre van como campos del registro (claves del
+    JSON). Si el nivel está desactivado no se formatea nada.
+    """
+
+    RESERVED = {'exc_info', 'stack_info', 'stacklevel', 'extra'}
+
+    def process(self, msg, kwargs):
+        data = {key: kwargs.pop(key) for key in list(kwargs) if key not in self.RESERVED}
+        if data:
+            kwargs['extra'] = {**kwargs.get('extra', {}), 'data': data}
+        return msg, kwargs
+
+
+_lock = threading.Lock()
+_listener = None
+_handler = None
+
+
+def setup_logging(level: str = None, log_format: str = None, stream=None) -> logging.Logger:
+    """
+    Configura (o reconfigura) el logging del proyecto
+
+    Los registros se encolan con un QueueHandler y un QueueListener los
+    formatea y escribe en su propio hilo: quien registra no hace I/O.
+
+    Args:
+        level: Nivel mínimo (por defecto config.LOG_LEVEL)
+        log_format: 'json' o 'text' (por defecto config.LOG_FORMAT)
+        stream: Destino (por defecto sys.stdout)
+    """
+    global _listener, _handler
+
+    with _lock:
+        if _listener:
+            _listener.stop()
+
+        target = logging.StreamHandler(stream) if stream else StdoutHandler()
+        if (log_format or config.LOG_FORMAT) == 'json':
+            target.setFormatter(JsonFormatter())
+        else:
+            target.setFormatter(TextFormatter())
+
+        log_queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+        _handler = DroppingQueueHandler(log_queue)
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_handler)
+        root.setLevel((level or config.LOG_LEVEL).upper())
+        root.propagate = False
+
+        _listener = QueueListener(log_queue, target)
+        _listener.start()
+        return root
+
+
+def shutdown_logging():
+    """Escribe lo que quede en la cola y para el hilo del listener"""
+    global _listener
+
+    with _lock:
+        if _listener:
+            _listener.stop()
+            _listener = None
+
+
+def get_dropped_count() -> int:
+    """Registros descartados por tener la cola llena"""
+    return _handler.dropped if _handler else 0
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """Logger del módulo name (configura el logging la primera vez)"""
+    if _listener is None:
+        setup_logging()
+    return StructuredLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"), {})
+
+
+atexit.register(shutdown_logging)
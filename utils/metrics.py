@@ -2,9 +2,18 @@
 
 import time
 import os
-from collections import defaultdict
+import sys
+import threading
+from bisect import bisect_left
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
 
 try:
     import psutil
@@ -12,29 +21,127 @@ try:
 except ImportError:
     HAS_PSUTIL = False
 
+# Ruta para las peticiones sin regla de URL (p. ej. 405)
+UNMATCHED_ROUTE = '<unmatched>'
+# Ruta que agrupa todo lo que pase de METRICS_MAX_ROUTES
+OTHER_ROUTE = '<other>'
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con cubetas fijas (límites superiores en segundos)
+    
+    observe es O(log cubetas) y la memoria no crece con las peticiones.
+    Los percentiles se interpolan dentro de la cubeta, como
+    histogram_quantile de Prometheus.
+    """
+    
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = sorted(buckets or config.METRICS_LATENCY_BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)  # La última es +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+    
+    def percentile(self, p: float) -> float:
+        """Valor aproximado bajo el que queda el p% de las observaciones"""
+        if not self.count:
+            return 0.0
+        
+        rank = self.count * p / 100
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if i == len(self.buckets):
+                    # Cubeta +Inf: lo único que se sabe es el máximo
+                    return self.max
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = min(self.buckets[i], self.max)
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.max
+    
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """[(le, observaciones <= le)] incluida +Inf (formato Prometheus)"""
+        result = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + [None], self.counts):
+            cumulative += bucket_count
+            result.append(('+Inf' if bound is None else format_float(bound), cumulative))
+        return result
+
+def format_float(value: float) -> str:
+    """Número para Prometheus (sin ceros de más)"""
+    return repr(float(value)) if value != int(value) else f"{int(value)}.0"
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
 class MetricsCollector:
-    """Sistema de métricas"""
-    
-    def __init__(self):
-        self.start_time = time.time()
-        self.request_count = 0
-        self.error_count = 0
-        self.endpoint_metrics = defaultdict(lambda: {
-            'count': 0,
-            'total_time': 0,
-            'errors': 0
-        })
+    """
+    Sistema de métricas
+    
+    Las peticiones se agrupan por ruta (la regla de URL de Flask, p. ej.
+    /api/explorer/block/<int:block_number>), con un histograma de
+    latencias por ruta.
+    
+    POR QUÉ: Agrupar por request.path crea una entrada por cada bloque o
+    dirección consultada; las medias esconden la latencia de cola
+    """
+    
+    def __init__(self, max_routes: int = None):
+        self.max_routes = max_routes or config.METRICS_MAX_ROUTES
+        self.lock = threading.Lock()
+        self.reset_metrics()
+    
+    def reset_metrics(self):
+        """Vuelve a empezar todas las métricas de la API"""
+        with self.lock:
+            self.start_time = time.time()
+            self.request_count = 0
+            self.error_count = 0
+            self.endpoint_metrics = {}
+    
+    def _route_metrics(self, route: str) -> dict:
+        """Entrada de una ruta (con lock tomado), acotando el número de rutas"""
+        entry = self.endpoint_metrics.get(route)
+        if entry is None:
+            # La última plaza queda para OTHER_ROUTE
+            if len(self.endpoint_metrics) >= self.max_routes - 1 and route != OTHER_ROUTE:
+                return self._route_metrics(OTHER_ROUTE)
+            entry = self.endpoint_metrics[route] = {
+                'count': 0,
+                'total_time': 0,
+                'errors': 0,
+                'histogram': LatencyHistogram()
+            }
+        return entry
     
     def record_request(self, endpoint: str, duration: float, success: bool = True):
-        """Registra una request"""
-        self.request_count += 1
-        
-        if not success:
-            self.error_count += 1
-            self.endpoint_metrics[endpoint]['errors'] += 1
+        """
+        Registra una request
         
-        self.endpoint_metrics[endpoint]['count'] += 1
-        self.endpoint_metrics[endpoint]['total_time'] += duration
+        Args:
+            endpoint: Regla de URL de la ruta (no la ruta concreta)
+            duration: Segundos
+            success: False para respuestas 4xx/5xx
+        """
+        with self.lock:
+            self.request_count += 1
+            entry = self._route_metrics(endpoint or UNMATCHED_ROUTE)
+            
+            if not success:
+                self.error_count += 1
+                entry['errors'] += 1
+            
+            entry['count'] += 1
+            entry['total_time'] += duration
+            entry['histogram'].observe(duration)
     
     def get_system_metrics(self) -> Dict:
         """Métricas del sistema"""
@@ -80,26 +187,32 @@ class MetricsCollector:
     
     def get_api_metrics(self) -> Dict:
         """Métricas de la API"""
-        uptime = time.time() - self.start_time
-        
-        top_endpoints = sorted(
-            self.endpoint_metrics.items(),
-            key=lambda x: x[1]['count'],
-            reverse=True
-        )[:10]
-        
-        endpoint_stats = []
-        for endpoint, m in top_endpoints:
-            avg = (m['total_time'] / m['count']) if m['count'] > 0 else 0
-            err_rate = (m['errors'] / m['count']) if m['count'] > 0 else 0
+        with self.lock:
+            uptime = time.time() - self.start_time
             
-            endpoint_stats.append({
-                'endpoint': endpoint,
-                'requests': m['count'],
-                'avg_time_ms': round(avg * 1000, 2),
-                'error_rate': round(err_rate * 100, 2),
-                'errors': m['errors']
-            })
+            top_endpoints = sorted(
+                self.endpoint_metrics.items(),
+                key=lambda x: x[1]['count'],
+                reverse=True
+            )[:10]
+            
+            endpoint_stats = []
+            for endpoint, m in top_endpoints:
+                avg = (m['total_time'] / m['count']) if m['count'] > 0 else 0
+                err_rate = (m['errors'] / m['count']) if m['count'] > 0 else 0
+                histogram = m['histogram']
+                
+                endpoint_stats.append({
+                    'endpoint': endpoint,
+                    'requests': m['count'],
+                    'avg_time_ms': round(avg * 1000, 2),
+                    'p50_ms': round(histogram.percentile(50) * 1000, 2),
+                    'p95_ms': round(histogram.percentile(95) * 1000, 2),
+                    'p99_ms': round(histogram.percentile(99) * 1000, 2),
+                    'max_ms': round(histogram.max * 1000, 2),
+                    'error_rate': round(err_rate * 100, 2),
+                    'errors': m['errors']
+                })
         
         return {
             'uptime_seconds': round(uptime, 2),
@@ -140,6 +253,52 @@ class MetricsCollector:
             'issues': issues
         }
     
+    def to_prometheus(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """
+        Métricas en formato de texto de Prometheus (para GET /metrics)
+        
+        Args:
+            gauges: {nombre: (descripción, valor)} adicionales
+        """
+        lines = []
+        
+        def header(name, kind, description):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        with self.lock:
+            routes = sorted(self.endpoint_metrics.items())
+            
+            header('colcript_http_requests_total', 'counter', 'Peticiones HTTP por ruta')
+            for route, m in routes:
+                lines.append(f'colcript_http_requests_total{{route="{escape_label(route)}"}} {m["count"]}')
+            
+            header('colcript_http_request_errors_total', 'counter', 'Respuestas 4xx/5xx por ruta')
+            for route, m in routes:
+                lines.append(f'colcript_http_request_errors_total{{route="{escape_label(route)}"}} {m["errors"]}')
+            
+            header('colcript_http_request_duration_seconds', 'histogram', 'Latencia de las peticiones por ruta')
+            for route, m in routes:
+                label = escape_label(route)
+                histogram = m['histogram']
+                for le, cumulative in histogram.cumulative_counts():
+                    lines.append(
+                        f'colcript_http_request_duration_seconds_bucket{{route="{label}",le="{le}"}} {cumulative}'
+                    )
+                lines.append(f'colcript_http_request_duration_seconds_sum{{route="{label}"}} {histogram.sum}')
+                lines.append(f'colcript_http_request_duration_seconds_count{{route="{label}"}} {histogram.count}')
+            
+            uptime = time.time() - self.start_time
+        
+        header('colcript_uptime_seconds', 'gauge', 'Segundos desde el arranque o el último reset')
+        lines.append(f"colcript_uptime_seconds {round(uptime, 3)}")
+        
+        for name, (description, value) in (gauges or {}).items():
+            header(name, 'gauge', description)
+            lines.append(f"{name} {value}")
+        
+        return '\n'.join(lines) + '\n'
+    
     def _format_uptime(self, seconds: float) -> str:
         """Formatea uptime"""
         days = int(seconds // 86400)
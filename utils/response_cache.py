@@ -0,0 +1,97 @@
+# utils/response_cache.py - Caché de respuestas de la API
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import config
+
+class ResponseCache:
+    """
+    Caché LRU de respuestas ligada a la punta de la cadena
+
+    Las entradas se guardan por (endpoint, argumentos) y solo valen para
+    la punta (hash del último bloque) con la que se calcularon: en cuanto
+    llega una consulta con otra punta, la caché se vacía entera.
+
+    POR QUÉ: Estadísticas y explorer son funciones puras de (cadena,
+    parámetros); mientras no llega un bloque nuevo no hace falta
+    recalcularlas en cada petición
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or config.RESPONSE_CACHE_MAX_ENTRIES
+        self.entries = OrderedDict()
+        self.tip = None
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_tip(self, tip: Hashable):
+        """Vacía la caché si la cadena cambió (llamar con el lock)"""
+        if tip != self.tip:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.tip = tip
+
+    def get(self, key: Hashable, tip: Hashable) -> Optional[object]:
+        """Respuesta guardada para key con esta punta, o None"""
+        with self.lock:
+            self._check_tip(tip)
+
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, tip: Hashable, value: object):
+        """Guarda una respuesta calculada con esta punta"""
+        with self.lock:
+            self._check_tip(tip)
+
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+
+            # Expulsar las menos usadas recientemente
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Vacía la caché"""
+        with self.lock:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Estadísticas de uso (para /api/metrics/api)"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+# Instancia global
+response_cache = ResponseCache()
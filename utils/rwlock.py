@@ -0,0 +1,142 @@
+# utils/rwlock.py - Lock de lectores/escritor
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+# Obtener ruta absoluta del proyecto
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+class ReadWriteLock:
+    """
+    Lock de lectores/escritor con preferencia de escritura
+
+    Muchos hilos pueden leer a la vez; escribir es exclusivo. Cuando un
+    escritor espera, no entran lectores nuevos (así un flujo continuo de
+    lecturas no deja sin turno a los bloques y transacciones).
+
+    Es reentrante por hilo: leer dentro de una lectura o de una escritura
+    y escribir dentro de una escritura no bloquean. Escribir dentro de una
+    lectura lanza RuntimeError (dos hilos haciéndolo se bloquearían entre sí).
+
+    POR QUÉ: La cadena se lee en casi todas las peticiones y se modifica
+    en pocas (bloques, pool de pendientes)
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def _read_state(self):
+        """(profundidad de lectura, lector contado) del hilo actual"""
+        return getattr(self._local, 'depth', 0), getattr(self._local, 'counted', False)
+
+    # ==================== LECTURA ====================
+
+    def acquire_read(self):
+        depth, counted = self._read_state()
+        if depth or self._writer == threading.get_ident():
+            self._local.depth = depth + 1
+            self._local.counted = counted
+            return
+
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+        self._local.depth = 1
+        self._local.counted = True
+
+    def release_read(self):
+        depth, counted = self._read_state()
+        if depth <= 0:
+            raise RuntimeError("Read lock released without being held")
+
+        self._local.depth = depth - 1
+        if depth > 1 or not counted:
+            return
+
+        self._local.counted = False
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    # ==================== ESCRITURA ====================
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+
+        if self._read_state()[0]:
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        if self._writer != threading.get_ident():
+            raise RuntimeError("Write lock released by a thread that does not hold it")
+
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+    # ==================== ESTADO ====================
+
+    def get_stats(self) -> dict:
+        """Estado actual del lock (para diagnóstico)"""
+        with self._cond:
+            return {
+                'readers': self._readers,
+                'writer_active': self._writer is not None,
+                'writers_waiting': self._writers_waiting
+            }
+
+
+def write_locked(method):
+    """Decorador: ejecuta el método con self.lock tomado para escritura"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -4,6 +4,7 @@ import os
 import sys
 from datetime import datetime, timedelta
 from collections import defaultdict
+from bisect import bisect_left, insort
 
 # Obtener ruta absoluta del proyecto
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,31 +13,277 @@ if project_root not in sys.path:
 
 import config
 
+class BalanceRanking:
+    """
+    Balances ordenados de mayor a menor (lista ordenada por cubos)
+    
+    Cada cubo es una lista ordenada de claves (-balance, dirección) con
+    su suma; insertar o quitar cuesta O(log n + LOAD) y las consultas
+    por posición (top-K, mediana, suma del top N) recorren cubos en vez
+    de elementos. En empate de balance ordena por dirección.
+    
+    POR QUÉ: Top wallets y distribución de riqueza ordenaban todos los
+    balances en cada petición del dashboard
+    """
+    
+    LOAD = 256  # Tamaño objetivo de cada cubo
+    
+    def __init__(self):
+        self._buckets = []
+        self._maxes = []  # Última clave de cada cubo (para bisect)
+        self._sums = []
+        self._len = 0
+    
+    def __len__(self):
+        return self._len
+    
+    def add(self, address, balance):
+        key = (-balance, address)
+        self._len += 1
+        
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._sums.append(balance)
+            return
+        
+        i = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        self._sums[i] += balance
+        
+        # Partir cubos grandes para mantener O(LOAD) por operación
+        if len(bucket) > 2 * self.LOAD:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+            self._sums[i] = -sum(k[0] for k in bucket)
+            self._sums.insert(i + 1, -sum(k[0] for k in half))
+    
+    def remove(self, address, balance):
+        key = (-balance, address)
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        self._len -= 1
+        
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._sums[i] -= balance
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            del self._sums[i]
+    
+    def update(self, address, old_balance, new_balance):
+        """Cambia el balance de una dirección (old_balance None si es nueva)"""
+        if old_balance is not None:
+            self.remove(address, old_balance)
+        self.add(address, new_balance)
+    
+    def top(self, k):
+        """Las k direcciones con más balance: [(dirección, balance), ...]"""
+        result = []
+        for bucket in self._buckets:
+            for neg_balance, address in bucket:
+                if len(result) >= k:
+                    return result
+                result.append((address, -neg_balance))
+        return result
+    
+    def kth(self, position):
+        """Balance en la posición dada (0 = el mayor)"""
+        for bucket in self._buckets:
+            if position < len(bucket):
+                return -bucket[position][0]
+            position -= len(bucket)
+        raise IndexError(position)
+    
+    def top_sum(self, k):
+        """Suma de los k mayores balances"""
+        total = 0
+        for bucket, bucket_sum in zip(self._buckets, self._sums):
+            if k >= len(bucket):
+                total += bucket_sum
+                k -= len(bucket)
+            else:
+                total -= sum(key[0] for key in bucket[:k])
+                break
+        return total
+
+
+class ChainAggregates:
+    """
+    Agregados de la cadena mantenidos bloque a bloque
+    
+    Supply, balances (y por tanto el conjunto de direcciones), volumen,
+    fees, bloques por minero y tiempos de minado. sync() solo procesa los
+    bloques nuevos; si la cadena fue reemplazada, recalcula desde cero.
+    
+    POR QUÉ: BlockchainStatistics se crea en cada petición y recorría la
+    cadena varias veces para el dashboard; los agregados viven con la
+    blockchain (ver BlockchainStatistics.get_aggregates)
+    """
+    
+    def __init__(self):
+        self.height = 0
+        self.tip_hash = None
+        self.first_timestamp = None
+        self.last_timestamp = None
+        
+        # Supply y balances
+        self.circulating_supply = 0
+        self.balances = defaultdict(float)
+        self.ranking = BalanceRanking()
+        
+        # Transacciones
+        self.total_transactions = 0
+        self.total_volume = 0
+        self.total_fees = 0
+        self.mining_rewards = 0
+        self.transfers = 0
+        
+        # Minería (sin génesis)
+        self.blocks_by_miner = {}
+        self.total_blocks_mined = 0
+        self.total_nonces = 0
+        self.top_miner = None
+        
+        # Validez: bloques ya verificados y dificultad usada
+        self.valid = True
+        self.verified_height = 1
+        self.verified_difficulty = None
+    
+    def sync(self, chain):
+        """Procesa los bloques añadidos desde la última llamada"""
+        if self.height == len(chain) and (not chain or chain[-1].hash == self.tip_hash):
+            return
+        
+        if self.height > len(chain) or (self.height and chain[self.height - 1].hash != self.tip_hash):
+            self.__init__()
+        
+        for block in chain[self.height:]:
+            self.add_block(block)
+    
+    def add_block(self, block):
+        """Suma un bloque a los agregados"""
+        # Balance previo de cada dirección tocada (None si es nueva)
+        touched = {}
+        
+        for tx in block.transactions:
+            self.total_transactions += 1
+            self.total_volume += tx.amount
+            self.total_fees += getattr(tx, 'fee', 0)
+            
+            if tx.sender == 'MINING':
+                self.mining_rewards += 1
+                self.circulating_supply += tx.amount
+            else:
+                self.transfers += 1
+            
+            # Recipient recibe
+            if tx.recipient != 'GENESIS':
+                touched.setdefault(tx.recipient, self.balances.get(tx.recipient))
+                self.balances[tx.recipient] += tx.amount
+            
+            # Sender paga importe y fee (si no es MINING)
+            if tx.sender != 'MINING' and tx.sender != 'GENESIS':
+                touched.setdefault(tx.sender, self.balances.get(tx.sender))
+                self.balances[tx.sender] -= tx.amount + getattr(tx, 'fee', 0)
+        
+        # Una actualización del ranking por dirección y bloque
+        for address, old_balance in touched.items():
+            self.ranking.update(address, old_balance, self.balances[address])
+        
+        if self.first_timestamp is None:
+            self.first_timestamp = block.timestamp
+        
+        if block.index > 0:  # Skip génesis
+            self.total_blocks_mined += 1
+            self.total_nonces += block.nonce
+            
+            miner = block.miner_address
+            self.blocks_by_miner[miner] = self.blocks_by_miner.get(miner, 0) + 1
+            if self._is_new_top_miner(miner):
+                self.top_miner = miner
+        
+        self.height = block.index + 1
+        self.tip_hash = block.hash
+        self.last_timestamp = block.timestamp
+    
+    def _is_new_top_miner(self, miner):
+        """Mismo desempate que max(): gana el minero que apareció antes"""
+        if self.top_miner is None or self.top_miner == miner:
+            return True
+        
+        count = self.blocks_by_miner[miner]
+        top_count = self.blocks_by_miner[self.top_miner]
+        if count != top_count:
+            return count > top_count
+        
+        for address in self.blocks_by_miner:
+            if address in (miner, self.top_miner):
+                return address == miner
+    
+    def is_chain_valid(self, blockchain):
+        """
+        Validez de la cadena verificando solo los bloques nuevos
+        
+        Si cambia la dificultad se vuelve a verificar todo (la prueba de
+        trabajo se comprueba contra la dificultad actual)
+        """
+        if blockchain.difficulty != self.verified_difficulty:
+            self.valid = True
+            self.verified_height = 1
+            self.verified_difficulty = blockchain.difficulty
+        
+        if self.valid and self.verified_height < len(blockchain.chain):
+            self.valid = blockchain.is_chain_valid(start=self.verified_height)
+            self.verified_height = len(blockchain.chain)
+        
+        return self.valid
+    
+    @property
+    def total_mining_time(self):
+        """Suma de tiempos entre bloques = último timestamp - génesis"""
+        if self.height < 2:
+            return 0
+        return self.last_timestamp - self.first_timestamp
+
+
 class BlockchainStatistics:
     def __init__(self, blockchain):
         """
         Inicializa el analizador de estadísticas
         """
         self.blockchain = blockchain
-        self._cache = {}
+    
+    def get_aggregates(self):
+        """
+        Agregados de la blockchain, al día con la cadena
+        
+        POR QUÉ en la blockchain: así sobreviven a esta instancia (el
+        servidor crea una por petición)
+        """
+        with self.blockchain.sync_lock:
+            aggregates = getattr(self.blockchain, 'chain_aggregates', None)
+            if aggregates is None:
+                aggregates = ChainAggregates()
+                self.blockchain.chain_aggregates = aggregates
+            
+            aggregates.sync(self.blockchain.chain)
+            return aggregates
     
     def get_total_supply(self):
         """Retorna el supply total configurado"""
         return config.TOTAL_SUPPLY
     
     def get_circulating_supply(self):
-        """Calcula CLC en circulación (minados hasta ahora)"""
-        if 'circulating_supply' in self._cache:
-            return self._cache['circulating_supply']
-        
-        total = 0
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                if tx.sender == 'MINING':
-                    total += tx.amount
-        
-        self._cache['circulating_supply'] = total
-        return total
+        """CLC en circulación (minados hasta ahora)"""
+        return self.get_aggregates().circulating_supply
     
     def get_supply_percentage(self):
         """Porcentaje del supply total que está en circulación"""
@@ -46,48 +293,25 @@ class BlockchainStatistics:
     
     def get_all_addresses(self):
         """Obtiene todas las direcciones únicas en la blockchain"""
-        addresses = set()
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                if tx.sender != 'MINING' and tx.sender != 'GENESIS':
-                    addresses.add(tx.sender)
-                if tx.recipient != 'GENESIS':
-                    addresses.add(tx.recipient)
-        return addresses
+        # Toda dirección que aparece tiene entrada en los balances
+        return set(self.get_aggregates().balances)
+    
+    def get_address_count(self):
+        """Número de direcciones únicas, sin copiar el conjunto"""
+        return len(self.get_aggregates().balances)
     
     def get_wallet_balances(self):
-        """Calcula el balance de todas las wallets"""
-        if 'wallet_balances' in self._cache:
-            return self._cache['wallet_balances']
-        
-        balances = defaultdict(float)
-        
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                # Recipient recibe
-                if tx.recipient != 'GENESIS':
-                    balances[tx.recipient] += tx.amount
-                
-                # Sender paga (si no es MINING)
-                if tx.sender != 'MINING' and tx.sender != 'GENESIS':
-                    balances[tx.sender] -= tx.amount
-                    # También paga el fee
-                    if hasattr(tx, 'fee'):
-                        balances[tx.sender] -= tx.fee
-        
-        self._cache['wallet_balances'] = dict(balances)
-        return dict(balances)
+        """Balance de todas las wallets"""
+        return dict(self.get_aggregates().balances)
     
     def get_top_wallets(self, limit=10):
         """Obtiene las wallets con más CLC"""
-        balances = self.get_wallet_balances()
-        sorted_wallets = sorted(balances.items(), key=lambda x: x[1], reverse=True)
-        return sorted_wallets[:limit]
+        return self.get_aggregates().ranking.top(limit)
     
     def get_wealth_distribution(self):
         """Analiza la distribución de riqueza"""
-        balances = self.get_wallet_balances()
-        total_wallets = len(balances)
+        ranking = self.get_aggregates().ranking
+        total_wallets = len(ranking)
         
         if total_wallets == 0:
             return {
@@ -97,22 +321,20 @@ class BlockchainStatistics:
                 'median_balance': 0
             }
         
-        sorted_balances = sorted(balances.values(), reverse=True)
         circulating = self.get_circulating_supply()
         
         # Top 1% y 10%
         top_1_count = max(1, total_wallets // 100)
         top_10_count = max(1, total_wallets // 10)
         
-        top_1_wealth = sum(sorted_balances[:top_1_count])
-        top_10_wealth = sum(sorted_balances[:top_10_count])
+        top_1_wealth = ranking.top_sum(top_1_count)
+        top_10_wealth = ranking.top_sum(top_10_count)
         
         top_1_percent = (top_1_wealth / circulating * 100) if circulating > 0 else 0
         top_10_percent = (top_10_wealth / circulating * 100) if circulating > 0 else 0
         
         # Mediana
-        median_idx = total_wallets // 2
-        median_balance = sorted_balances[median_idx] if sorted_balances else 0
+        median_balance = ranking.kth(total_wallets // 2)
         
         return {
             'top_1_percent': top_1_percent,
@@ -123,74 +345,44 @@ class BlockchainStatistics:
     
     def get_mining_stats(self):
         """Estadísticas de minería"""
-        miners = defaultdict(int)
-        total_blocks = 0
-        total_mining_time = 0
-        total_nonces = 0
-        
-        for block in self.blockchain.chain:
-            if block.index == 0:  # Skip génesis
-                continue
-            
-            total_blocks += 1
-            miners[block.miner_address] += 1
-            total_nonces += block.nonce
-            
-            # Estimar tiempo (si hay timestamps)
-            if hasattr(block, 'timestamp') and block.index > 0:
-                prev_block = self.blockchain.chain[block.index - 1]
-                if hasattr(prev_block, 'timestamp'):
-                    time_diff = block.timestamp - prev_block.timestamp
-                    total_mining_time += time_diff
+        aggregates = self.get_aggregates()
+        total_blocks = aggregates.total_blocks_mined
         
-        avg_block_time = total_mining_time / total_blocks if total_blocks > 0 else 0
-        avg_nonce = total_nonces / total_blocks if total_blocks > 0 else 0
+        avg_block_time = aggregates.total_mining_time / total_blocks if total_blocks > 0 else 0
+        avg_nonce = aggregates.total_nonces / total_blocks if total_blocks > 0 else 0
         
         # Top minero
-        top_miner = max(miners.items(), key=lambda x: x[1]) if miners else (None, 0)
+        top_miner = aggregates.top_miner
         
         return {
-            'total_miners': len(miners),
+            'total_miners': len(aggregates.blocks_by_miner),
             'total_blocks_mined': total_blocks,
             'avg_block_time': avg_block_time,
             'avg_nonce': avg_nonce,
             'estimated_hashrate': avg_nonce / avg_block_time if avg_block_time > 0 else 0,
-            'top_miner': top_miner[0],
-            'top_miner_blocks': top_miner[1]
+            'top_miner': top_miner,
+            'top_miner_blocks': aggregates.blocks_by_miner.get(top_miner, 0)
         }
     
     def get_transaction_stats(self):
         """Estadísticas de transacciones"""
-        total_tx = 0
-        total_volume = 0
-        total_fees = 0
-        tx_by_type = defaultdict(int)
-        
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                total_tx += 1
-                total_volume += tx.amount
-                
-                if hasattr(tx, 'fee'):
-                    total_fees += tx.fee
-                
-                if tx.sender == 'MINING':
-                    tx_by_type['mining_rewards'] += 1
-                else:
-                    tx_by_type['transfers'] += 1
+        aggregates = self.get_aggregates()
+        total_tx = aggregates.total_transactions
         
         return {
             'total_transactions': total_tx,
-            'total_volume': total_volume,
-            'total_fees_paid': total_fees,
-            'mining_rewards': tx_by_type['mining_rewards'],
-            'transfers': tx_by_type['transfers'],
+            'total_volume': aggregates.total_volume,
+            'total_fees_paid': aggregates.total_fees,
+            'mining_rewards': aggregates.mining_rewards,
+            'transfers': aggregates.transfers,
             'avg_tx_per_block': total_tx / len(self.blockchain.chain) if self.blockchain.chain else 0
         }
     
     def get_network_health(self):
         """Indicadores de salud de la red"""
-        is_valid = self.blockchain.is_chain_valid()
+        # Solo se verifican los bloques nuevos desde la última consulta
+        with self.blockchain.sync_lock:
+            is_valid = self.get_aggregates().is_chain_valid(self.blockchain)
         
         # Calcular descentralización (basado en distribución de minería)
         mining_stats = self.get_mining_stats()
@@ -217,7 +409,7 @@ class BlockchainStatistics:
                 'percentage': self.get_supply_percentage()
             },
             'wallets': {
-                'total_wallets': len(self.get_all_addresses()),
+                'total_wallets': self.get_address_count(),
                 'top_wallets': self.get_top_wallets(5),
                 'distribution': self.get_wealth_distribution()
             },
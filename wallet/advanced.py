@@ -16,12 +16,31 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+import config
+
+_session = None
+
+def get_session() -> requests.Session:
+    """
+    Sesión HTTP compartida por todas las wallets
+    
+    POR QUÉ: Reutiliza las conexiones keep-alive con el nodo en vez de
+    abrir una conexión por petición
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
 class AdvancedWallet:
-    def __init__(self, wallet_address: str, node_url: str = "http://localhost:5000"):
+    def __init__(self, wallet_address: str, node_url: str = "http://localhost:5000",
+                 session: Optional[requests.Session] = None):
         self.address = wallet_address
         self.node_url = node_url
+        self.session = session or get_session()
         self.contacts_file = Path(f"wallet/wallet_{wallet_address[:10]}_contacts.json")
         self.labels_file = Path(f"wallet/wallet_{wallet_address[:10]}_labels.json")
+        self.history_file = Path(f"wallet/wallet_{wallet_address[:10]}_history.json")
         
         # Cargar contactos y etiquetas
         self.contacts = self._load_contacts()
@@ -114,68 +133,104 @@ class AdvancedWallet:
         return None
     
     # === HISTORIAL ===
+    
+    def _load_history_cache(self) -> List[Dict]:
+        """Historial ya descargado, en orden de cadena"""
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, 'r') as f:
+                    return json.load(f).get("transactions", [])
+            except (OSError, ValueError):
+                return []
+        return []
+    
+    def _save_history_cache(self, transactions: List[Dict]):
+        """Guardar historial descargado"""
+        with open(self.history_file, 'w') as f:
+            json.dump({"address": self.address, "transactions": transactions}, f)
+    
+    def _format_history_entry(self, tx: Dict) -> Dict:
+        """Entrada de historial a partir de la búsqueda por dirección del nodo"""
+        direction = tx["direction"]
+        return {
+            "hash": tx["hash"],
+            "block": tx["block"],
+            "position": tx["position"],
+            "block_hash": tx["block_hash"],
+            "timestamp": tx["timestamp"],
+            "direction": direction,
+            "amount": tx["amount"],
+            "fee": tx["fee"] if direction == "sent" else 0,
+            "type": "mining" if tx["from"] == "MINING" else "transfer",
+            "from": tx["from"],
+            "to": tx["to"],
+            "other_party": tx["to"] if direction == "sent" else tx["from"],
+        }
+    
+    def _fetch_new_transactions(self, known: Optional[Dict]) -> Optional[List[Dict]]:
+        """
+        Descarga, de la más reciente hacia atrás, las transacciones
+        posteriores a known (la última en caché)
+        
+        Returns: nuevas transacciones en orden de cadena, o None si known
+        ya no está en la cadena del nodo (cadena reemplazada)
+        """
+        url = f"{self.node_url}/api/explorer/advanced/search/address/{self.address}"
+        params = {"limit": config.API_MAX_PAGE_SIZE}
+        new = []
+        
+        while True:
+            response = self.session.get(url, params=params, timeout=5)
+            response.raise_for_status()
+            data = response.json()["data"]
+            
+            for tx in data["transactions"]:
+                if known and (tx["block"], tx["position"]) <= (known["block"], known["position"]):
+                    # Hemos llegado a la caché: debe ser la misma transacción
+                    if (tx["block"], tx["position"], tx["hash"], tx["block_hash"]) == \
+                            (known["block"], known["position"], known["hash"], known["block_hash"]):
+                        return new[::-1]
+                    return None
+                new.append(self._format_history_entry(tx))
+            
+            if not data.get("next"):
+                return None if known else new[::-1]
+            params.update(data["next"])
+    
+    def refresh_transaction_history(self) -> List[Dict]:
+        """
+        Pone al día la caché local del historial
+        
+        Solo descarga las transacciones nuevas desde la última vez; si la
+        cadena del nodo cambió, descarga todo de nuevo.
+        
+        POR QUÉ: Antes se pedía cada bloque de la cadena por HTTP
+        """
+        cached = self._load_history_cache()
+        new = self._fetch_new_transactions(cached[-1] if cached else None)
+        changed = bool(new)
+        
+        if new is None:
+            cached = []
+            new = self._fetch_new_transactions(None)
+            changed = True
+        
+        if changed:
+            cached.extend(new)
+            self._save_history_cache(cached)
+        
+        return cached
+    
     def get_transaction_history(self, limit: int = 100) -> List[Dict]:
-        """Obtener historial completo de transacciones"""
+        """Obtener historial de transacciones (en orden de cadena)"""
         try:
-            # Primero obtener info de cuántos bloques hay
-            info_response = requests.get(f"{self.node_url}/api/blockchain/info", timeout=5)
-            if info_response.status_code != 200:
-                return []
-
-            info_data = info_response.json()
-            total_blocks = info_data.get("data", {}).get("bloques", 0)
-
-            transactions = []
-
-            # Iterar por cada bloque
-            for block_index in range(total_blocks):
-                block_response = requests.get(
-                    f"{self.node_url}/api/explorer/block/{block_index}", 
-                    timeout=5
-                )
-                
-                if block_response.status_code != 200:
-                    continue
-
-                block_data = block_response.json()
-                block_info = block_data.get("data", {}).get("block", {})
-                block_txs = block_data.get("data", {}).get("transactions", [])
-                
-                block_time = block_info.get("timestamp", 0)
-                
-                for tx in block_txs:
-                    sender = tx.get("sender", "")
-                    recipient = tx.get("recipient", "")
-                    amount = tx.get("amount", 0)
-                    fee = tx.get("fee", 0)
-                    signature = tx.get("signature", "")
-
-                    # Solo incluir transacciones relacionadas con esta wallet
-                    if sender == self.address or recipient == self.address:
-                        direction = "sent" if sender == self.address else "received"
-                        other_party = recipient if direction == "sent" else sender
-
-                        transactions.append({
-                            "hash": signature or f"block_{block_index}_tx",
-                            "block": block_index,
-                            "timestamp": block_time,
-                            "direction": direction,
-                            "amount": amount,
-                            "fee": fee if direction == "sent" else 0,
-                            "type": "mining" if sender == "MINING" else "transfer",
-                            "from": sender,
-                            "to": recipient,
-                            "other_party": other_party,
-                        })
-
-                        if len(transactions) >= limit:
-                            return transactions[:limit]
-
-            return transactions
-
+            transactions = self.refresh_transaction_history()
         except Exception as e:
+            # Sin nodo: lo que ya esté en caché
             print(f"Error getting transaction history: {e}")
-            return []
+            transactions = self._load_history_cache()
+        
+        return transactions[:limit]
     
     def get_transaction_stats(self) -> Dict:
         """Obtener estadísticas de transacciones"""
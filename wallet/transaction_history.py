@@ -17,30 +17,73 @@ class TransactionHistory:
         """
         self.blockchain = blockchain
         self.wallet_address = wallet_address
-        self.transactions = []
-        self._analyze_transactions()
+        self._transactions = None  # Se extraen al primer uso (ver transactions)
+    
+    @property
+    def transactions(self):
+        """
+        Todas las transacciones de la wallet, de la más antigua a la más reciente
+        
+        POR QUÉ lazy: get_page solo lee las entradas del índice que
+        devuelve; el historial completo (y el hash de cada transacción)
+        solo hace falta para el resumen, los listados y la exportación
+        """
+        if self._transactions is None:
+            self._analyze_transactions()
+        return self._transactions
     
     def _analyze_transactions(self):
         """
-        Analiza toda la blockchain y extrae transacciones relevantes
+        Extrae las transacciones de la wallet usando el índice por dirección
+        
+        POR QUÉ: Solo se visitan las transacciones de la wallet, no toda la cadena
         """
-        self.transactions = []
+        self._transactions = [
+            self._build_tx_info(block, tx)
+            for block, tx in self._iter_transactions(newest_first=False)
+        ]
+    
+    def _iter_transactions(self, **kwargs):
+        """(bloque, transacción) de la wallet según el índice de la cadena"""
+        index = self.blockchain.get_index()
+        return index.iter_address_transactions(self.blockchain.chain, self.wallet_address, **kwargs)
+    
+    def _build_tx_info(self, block, tx):
+        """Información de una transacción de la wallet"""
+        return {
+            'tx_id': tx.get_hash(),
+            'block': block.index,
+            'timestamp': tx.timestamp,
+            'sender': tx.sender,
+            'recipient': tx.recipient,
+            'amount': tx.amount,
+            'signature': tx.signature,
+            'block_hash': block.hash,
+            'type': self._get_transaction_type(tx)
+        }
+    
+    def get_page(self, limit=50, before=None):
+        """
+        Página de transacciones, de la más reciente a la más antigua
+        
+        before: (altura, posición) de la última transacción de la página
+        anterior; None para empezar por la más reciente
+        
+        Returns:
+            (transacciones, cursor de la siguiente página o None)
+        """
+        index = self.blockchain.get_index()
+        entries = index.get_address_entries(self.wallet_address, limit=limit, before=before)
+        
+        page = []
+        for height, position in entries:
+            block = self.blockchain.chain[height]
+            tx_info = self._build_tx_info(block, block.transactions[position])
+            tx_info['position'] = position
+            page.append(tx_info)
         
-        for block in self.blockchain.chain:
-            for tx in block.transactions:
-                # Verificar si la wallet está involucrada
-                if tx.sender == self.wallet_address or tx.recipient == self.wallet_address:
-                    tx_info = {
-                        'block': block.index,
-                        'timestamp': tx.timestamp,
-                        'sender': tx.sender,
-                        'recipient': tx.recipient,
-                        'amount': tx.amount,
-                        'signature': tx.signature,
-                        'block_hash': block.hash,
-                        'type': self._get_transaction_type(tx)
-                    }
-                    self.transactions.append(tx_info)
+        next_before = entries[-1] if len(entries) == limit else None
+        return page, next_before
     
     def _get_transaction_type(self, tx):
         """
@@ -41,8 +41,10 @@ class ColCriptAPI {
 
     // ==================== BLOCKCHAIN ====================
     
-    async getBlockchain() {
-        return this.request('/blockchain');
+    async getBlockchain(beforeHeight = null) {
+        // Página de bloques; beforeHeight viene de data.next de la página anterior
+        const cursor = beforeHeight !== null ? `?before_height=${beforeHeight}` : '';
+        return this.request(`/blockchain${cursor}`);
     }
 
     async getBlockchainInfo() {
@@ -152,6 +154,10 @@ class ColCriptAPI {
         return this.request(`/statistics/wallets?limit=${limit}`);
     }
 
+    async getActivity(resolution = 'hour', points = 24) {
+        return this.request(`/statistics/activity?resolution=${resolution}&points=${points}`);
+    }
+
     // ==================== FAUCET ====================
     
     async getFaucetInfo() {
@@ -193,6 +199,23 @@ class ColCriptAPI {
             })
         });
     }
+
+    // ==================== EVENTOS EN VIVO ====================
+
+    subscribeEvents(handlers) {
+        // Server-Sent Events: handlers = { tipo_de_evento: función(data) }
+        // EventSource reconecta solo si se cae la conexión
+        const types = Object.keys(handlers).filter(type => type !== 'ready' && type !== 'resync');
+        const source = new EventSource(`${this.baseURL}/events/stream?types=${types.join(',')}`);
+
+        Object.entries(handlers).forEach(([type, handler]) => {
+            source.addEventListener(type, (message) => {
+                handler(JSON.parse(message.data).data);
+            });
+        });
+
+        return source;
+    }
 }
 
 // Instancia global de la API
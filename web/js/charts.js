@@ -2,6 +2,7 @@
 
 let supplyChart = null;
 let walletsChart = null;
+let activityChart = null;
 
 // ==================== SUPPLY CHART ====================
 
@@ -136,6 +137,93 @@ function createWalletsChart(wallets) {
     });
 }
 
+// ==================== ACTIVITY CHART ====================
+
+function createActivityChart(activity) {
+    const ctx = document.getElementById('activityChart');
+    if (!ctx) return;
+
+    // Destruir gráfica anterior si existe
+    if (activityChart) {
+        activityChart.destroy();
+    }
+
+    // Intervalos ya agregados por el servidor (no se leen bloques)
+    const series = activity.series;
+    const labels = series.map(bucket => {
+        const date = new Date(bucket.start * 1000);
+        return activity.resolution === 'day'
+            ? date.toLocaleDateString()
+            : date.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+    });
+
+    activityChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [
+                {
+                    label: 'Transacciones',
+                    data: series.map(bucket => bucket.transactions),
+                    backgroundColor: 'rgba(59, 130, 246, 0.8)',
+                    borderColor: 'rgba(59, 130, 246, 1)',
+                    borderWidth: 2
+                },
+                {
+                    label: 'Bloques',
+                    data: series.map(bucket => bucket.blocks),
+                    backgroundColor: 'rgba(16, 185, 129, 0.8)',
+                    borderColor: 'rgba(16, 185, 129, 1)',
+                    borderWidth: 2
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: true,
+            plugins: {
+                legend: {
+                    position: 'bottom',
+                    labels: {
+                        color: '#e2e8f0'
+                    }
+                },
+                tooltip: {
+                    callbacks: {
+                        afterBody: function(items) {
+                            const bucket = series[items[0].dataIndex];
+                            return [
+                                `Volumen: ${formatNumber(bucket.volume)} CLC`,
+                                `Fees: ${formatNumber(bucket.fees)} CLC`,
+                                `Tiempo medio de bloque: ${bucket.avg_block_time}s`
+                            ];
+                        }
+                    }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    ticks: {
+                        color: '#94a3b8'
+                    },
+                    grid: {
+                        color: 'rgba(51, 65, 85, 0.3)'
+                    }
+                },
+                x: {
+                    ticks: {
+                        color: '#94a3b8'
+                    },
+                    grid: {
+                        color: 'rgba(51, 65, 85, 0.3)'
+                    }
+                }
+            }
+        }
+    });
+}
+
 // ==================== UPDATE CHARTS ====================
 
 async function updateCharts() {
@@ -156,6 +244,12 @@ async function updateCharts() {
                 createWalletsChart(data.wallets.top_wallets);
             }
         }
+
+        // Activity chart (intervalos por hora)
+        const activity = await api.getActivity('hour', 24);
+        if (activity.success) {
+            createActivityChart(activity.data);
+        }
     } catch (error) {
         console.error('Error updating charts:', error);
     }
@@ -165,4 +259,5 @@ async function updateCharts() {
 
 window.createSupplyChart = createSupplyChart;
 window.createWalletsChart = createWalletsChart;
+window.createActivityChart = createActivityChart;
 window.updateCharts = updateCharts;
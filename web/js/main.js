@@ -4,6 +4,8 @@
 
 let currentWallet = null;
 let updateInterval = null;
+let eventSource = null;
+let chartsTimer = null;
 
 // ==================== INITIALIZATION ====================
 
@@ -19,8 +21,8 @@ document.addEventListener('DOMContentLoaded', () => {
     // Load dashboard
     loadDashboard();
     
-    // Start auto-update
-    startAutoUpdate();
+    // Live updates (Server-Sent Events)
+    startLiveUpdates();
 });
 
 // ==================== NAVIGATION ====================
@@ -175,20 +177,7 @@ async function loadDashboard() {
 
             console.log('🔄 [10] Actualizando wallet balance...');
             // Update wallet balance
-            try {
-                const balance = await api.getWalletBalance();
-                if (balance.success) {
-                    document.getElementById('myBalance').textContent =
-                        formatNumber(balance.data.balance) + ' CLC';
-                    document.getElementById('walletStatus').textContent =
-                        balance.data.wallet;
-                    currentWallet = balance.data;
-                }
-            } catch {
-                document.getElementById('myBalance').textContent = '-- CLC';
-                document.getElementById('walletStatus').textContent = 'Sin wallet';
-                currentWallet = null;
-            }
+            await refreshBalance();
 
             console.log('🔄 [11] Llamando updateCharts()...');
             // Update charts
@@ -211,6 +200,45 @@ async function loadDashboard() {
 }
 
 
+async function refreshBalance() {
+    try {
+        const balance = await api.getWalletBalance();
+        if (balance.success) {
+            document.getElementById('myBalance').textContent =
+                formatNumber(balance.data.balance) + ' CLC';
+            document.getElementById('walletStatus').textContent =
+                balance.data.wallet;
+            currentWallet = balance.data;
+        }
+    } catch {
+        document.getElementById('myBalance').textContent = '-- CLC';
+        document.getElementById('walletStatus').textContent = 'Sin wallet';
+        currentWallet = null;
+    }
+}
+
+function renderBlockItem(block) {
+    const blockEl = document.createElement('div');
+    blockEl.className = 'block-item';
+    blockEl.innerHTML = `
+        <div class="block-number">#${block.index}</div>
+        <div class="block-info">
+            <div class="block-hash" onclick="copyToClipboard('${block.hash}')" style="cursor: pointer;" title="Click para copiar">
+                ${formatHash(block.hash)}
+            </div>
+            <div class="block-meta">
+                <span>⛏️ ${formatAddress(block.miner)}</span>
+                <span>📝 ${block.transactions} tx</span>
+                <span>🕐 ${formatTimeAgo(block.timestamp)}</span>
+            </div>
+        </div>
+        <button class="btn btn-secondary" onclick="viewBlock(${block.index})">
+            Ver
+        </button>
+    `;
+    return blockEl;
+}
+
 async function loadRecentBlocks() {
     const container = document.getElementById('recentBlocks');
     
@@ -221,25 +249,7 @@ async function loadRecentBlocks() {
             container.innerHTML = '';
             
             blocks.data.blocks.reverse().forEach(block => {
-                const blockEl = document.createElement('div');
-                blockEl.className = 'block-item';
-                blockEl.innerHTML = `
-                    <div class="block-number">#${block.index}</div>
-                    <div class="block-info">
-                        <div class="block-hash" onclick="copyToClipboard('${block.hash}')" style="cursor: pointer;" title="Click para copiar">
-                            ${formatHash(block.hash)}
-                        </div>
-                        <div class="block-meta">
-                            <span>⛏️ ${formatAddress(block.miner)}</span>
-                            <span>📝 ${block.transactions} tx</span>
-                            <span>🕐 ${formatTimeAgo(block.timestamp)}</span>
-                        </div>
-                    </div>
-                    <button class="btn btn-secondary" onclick="viewBlock(${block.index})">
-                        Ver
-                    </button>
-                `;
-                container.appendChild(blockEl);
+                container.appendChild(renderBlockItem(block));
             });
         } else {
             container.innerHTML = '<p class="no-data">No hay bloques</p>';
@@ -743,16 +753,25 @@ async function loadExplorerPage() {
     loadAllBlocks();
 }
 
-async function loadAllBlocks() {
+async function loadAllBlocks(beforeHeight = null) {
     const container = document.getElementById('allBlocks');
-    container.innerHTML = '<p class="loading">Cargando bloques...</p>';
+    if (beforeHeight === null) {
+        container.innerHTML = '<p class="loading">Cargando bloques...</p>';
+    }
     
     try {
-        const blockchain = await api.getBlockchain();
+        const blockchain = await api.getBlockchain(beforeHeight);
         
         if (blockchain.success && blockchain.data.chain.length > 0) {
-            container.innerHTML = '<div style="display: flex; flex-direction: column; gap: 1rem;"></div>';
-            const list = container.querySelector('div');
+            // Primera página: lista nueva; siguientes: se añaden al final
+            let list = container.querySelector('.blocks-list');
+            if (beforeHeight === null || !list) {
+                container.innerHTML = '<div class="blocks-list" style="display: flex; flex-direction: column; gap: 1rem;"></div>';
+                list = container.querySelector('.blocks-list');
+            }
+            
+            const moreButton = container.querySelector('.load-more-blocks');
+            if (moreButton) moreButton.remove();
             
             // Mostrar en orden inverso (más reciente primero)
             blockchain.data.chain.reverse().forEach(block => {
@@ -776,7 +795,17 @@ async function loadAllBlocks() {
                 
                 list.appendChild(blockEl);
             });
-        } else {
+            
+            // Bloques más antiguos bajo demanda
+            const next = blockchain.data.next;
+            if (next) {
+                const button = document.createElement('button');
+                button.className = 'btn btn-secondary load-more-blocks';
+                button.textContent = 'Cargar más';
+                button.onclick = () => loadAllBlocks(next.before_height);
+                container.appendChild(button);
+            }
+        } else if (beforeHeight === null) {
             container.innerHTML = '<p class="no-data">No hay bloques</p>';
         }
     } catch (error) {
@@ -1138,7 +1167,91 @@ async function toggleAutoAdjust() {
     }
 }
 
-// ==================== AUTO UPDATE ====================
+// ==================== LIVE UPDATES ====================
+
+function startLiveUpdates() {
+    // Sin EventSource: volver a consultar el dashboard cada 30 segundos
+    if (!window.EventSource) {
+        startAutoUpdate();
+        return;
+    }
+
+    let connected = false;
+    eventSource = api.subscribeEvents({
+        ready: () => {
+            // Tras una reconexión pudimos perder eventos
+            if (connected) refreshActivePage();
+            connected = true;
+        },
+        resync: () => refreshActivePage(),
+        block_mined: onBlockEvent,
+        block_added: onBlockEvent,
+        pool_block_mined: (data) => {
+            onBlockEvent(data);
+            renderPoolInfo(data.pool_stats);
+        },
+        transaction_created: (data) => updatePendingCount(data.pending_transactions),
+        pool_share_submitted: (data) => renderPoolInfo(data.pool_stats),
+        pool_miner_joined: (data) => renderPoolInfo(data.pool_stats)
+    });
+}
+
+function refreshActivePage() {
+    const activePage = document.querySelector('.page.active');
+    if (activePage) {
+        loadPageData(activePage.id);
+    }
+}
+
+function onBlockEvent(data) {
+    document.getElementById('totalBlocks').textContent = data.blockchain_height;
+    updatePendingCount(data.pending_transactions);
+
+    // Bloques minados aquí traen todo lo necesario; los de la red se piden (respuesta cacheada)
+    const container = document.getElementById('recentBlocks');
+    if (data.miner && container.querySelector('.block-item')) {
+        container.prepend(renderBlockItem({
+            index: data.block_index,
+            hash: data.hash,
+            miner: data.miner,
+            transactions: data.transactions,
+            timestamp: data.timestamp
+        }));
+        container.querySelectorAll('.block-item').forEach((el, i) => {
+            if (i >= 5) el.remove();
+        });
+    } else {
+        loadRecentBlocks();
+    }
+
+    refreshSupply();
+    refreshBalance();
+    scheduleChartsUpdate();
+}
+
+function updatePendingCount(count) {
+    if (count !== undefined) {
+        document.getElementById('pendingTx').textContent = count;
+    }
+}
+
+async function refreshSupply() {
+    try {
+        const supply = await api.getSupply();
+        if (supply.success) {
+            document.getElementById('circulating').textContent =
+                formatNumber(supply.data.circulating) + ' CLC';
+        }
+    } catch (error) {
+        console.error('Error loading supply:', error);
+    }
+}
+
+function scheduleChartsUpdate() {
+    // Varios bloques seguidos: una sola actualización de las gráficas
+    clearTimeout(chartsTimer);
+    chartsTimer = setTimeout(updateCharts, 5000);
+}
 
 function startAutoUpdate() {
     // Update every 30 seconds
@@ -1641,42 +1754,7 @@ async function loadPoolInfo() {
         const response = await api.request('/pool/info');
         
         if (response.success) {
-            const info = response.data;
-            
-            container.innerHTML = `
-                <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem;">
-                    <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
-                        <div style="font-size: 2rem; color: var(--primary);">⛏️</div>
-                        <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.pool_name}</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">Pool Name</div>
-                    </div>
-                    <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
-                        <div style="font-size: 2rem; color: var(--warning);">💰</div>
-                        <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.pool_fee}%</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">Pool Fee</div>
-                    </div>
-                    <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
-                        <div style="font-size: 2rem; color: var(--success);">👷</div>
-                        <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.total_miners}</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">Total Miners</div>
-                    </div>
-                    <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
-                        <div style="font-size: 2rem; color: var(--primary);">✅</div>
-                        <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.active_miners}</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">Active Miners</div>
-                    </div>
-                    <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
-                        <div style="font-size: 2rem;">📦</div>
-                        <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.blocks_found}</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">Blocks Found</div>
-                    </div>
-                    <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
-                        <div style="font-size: 2rem;">💎</div>
-                        <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${formatNumber(info.rewards_distributed)}</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">CLC Distributed</div>
-                    </div>
-                </div>
-            `;
+            renderPoolInfo(response.data);
         }
     } catch (error) {
         console.error('Error loading pool info:', error);
@@ -1684,6 +1762,46 @@ async function loadPoolInfo() {
     }
 }
 
+function renderPoolInfo(info) {
+    const container = document.getElementById('poolInfo');
+    if (!container || !info) return;
+    
+    container.innerHTML = `
+        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem;">
+            <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
+                <div style="font-size: 2rem; color: var(--primary);">⛏️</div>
+                <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.pool_name}</div>
+                <div style="color: var(--text-secondary); font-size: 0.9rem;">Pool Name</div>
+            </div>
+            <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
+                <div style="font-size: 2rem; color: var(--warning);">💰</div>
+                <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.pool_fee}%</div>
+                <div style="color: var(--text-secondary); font-size: 0.9rem;">Pool Fee</div>
+            </div>
+            <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
+                <div style="font-size: 2rem; color: var(--success);">👷</div>
+                <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.total_miners}</div>
+                <div style="color: var(--text-secondary); font-size: 0.9rem;">Total Miners</div>
+            </div>
+            <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
+                <div style="font-size: 2rem; color: var(--primary);">✅</div>
+                <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.active_miners}</div>
+                <div style="color: var(--text-secondary); font-size: 0.9rem;">Active Miners</div>
+            </div>
+            <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
+                <div style="font-size: 2rem;">📦</div>
+                <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${info.blocks_found}</div>
+                <div style="color: var(--text-secondary); font-size: 0.9rem;">Blocks Found</div>
+            </div>
+            <div style="padding: 1rem; background: var(--dark); border-radius: 8px; text-align: center;">
+                <div style="font-size: 2rem;">💎</div>
+                <div style="font-size: 1.5rem; font-weight: bold; margin-top: 0.5rem;">${formatNumber(info.rewards_distributed)}</div>
+                <div style="color: var(--text-secondary); font-size: 0.9rem;">CLC Distributed</div>
+            </div>
+        </div>
+    `;
+}
+
 async function loadPoolMiners() {
     const container = document.getElementById('poolMinersList');
     container.innerHTML = '<p class="loading">Loading miners...</p>';
@@ -2532,6 +2650,7 @@ function displayTransactionSearchResult(tx) {
         <div class="section-card" style="margin-top: 1rem;">
             <h4>✅ Transaction Found</h4>
             <table class="info-table">
+                <tr><td><strong>Transaction ID:</strong></td><td><code>${tx.tx_id}</code></td></tr>
                 <tr><td><strong>Signature:</strong></td><td><code>${tx.transaction.signature || 'N/A'}</code></td></tr>
                 <tr><td><strong>Block:</strong></td><td>#${tx.block}</td></tr>
                 <tr><td><strong>From:</strong></td><td><code>${tx.transaction.sender}</code></td></tr>